@@ -143,6 +143,26 @@ if frontend_loader.exists():
 
 STORAGE_PROVIDER = os.getenv('STORAGE_PROVIDER', 'local')  # defaults to local, s3
 STORAGE_LOCAL_CACHE = os.getenv('STORAGE_LOCAL_CACHE', 'true').lower() == 'true'
+# Local copies of cloud-stored files are kept as an LRU cache of at most this many MB (0: unbounded)
+# and revalidated against the object's ETag once they are older than the interval (seconds).
+try:
+    STORAGE_LOCAL_CACHE_MAX_SIZE = int(os.getenv('STORAGE_LOCAL_CACHE_MAX_SIZE', '10240'))
+except ValueError:
+    STORAGE_LOCAL_CACHE_MAX_SIZE = 10240
+try:
+    STORAGE_LOCAL_CACHE_REVALIDATE_INTERVAL = int(os.getenv('STORAGE_LOCAL_CACHE_REVALIDATE_INTERVAL', '300'))
+except ValueError:
+    STORAGE_LOCAL_CACHE_REVALIDATE_INTERVAL = 300
+
+# Uploads to S3 / GCS / Azure above this many MB are sent in parts of this size, several at a time.
+try:
+    STORAGE_UPLOAD_PART_SIZE = int(os.getenv('STORAGE_UPLOAD_PART_SIZE', '8'))
+except ValueError:
+    STORAGE_UPLOAD_PART_SIZE = 8
+try:
+    STORAGE_UPLOAD_CONCURRENCY = int(os.getenv('STORAGE_UPLOAD_CONCURRENCY', '4'))
+except ValueError:
+    STORAGE_UPLOAD_CONCURRENCY = 4
 
 S3_ACCESS_KEY_ID = os.getenv('S3_ACCESS_KEY_ID', None)
 S3_SECRET_ACCESS_KEY = os.getenv('S3_SECRET_ACCESS_KEY', None)
@@ -1167,6 +1187,26 @@ WEB_LOADER_CONCURRENT_REQUESTS = int(os.getenv('WEB_LOADER_CONCURRENT_REQUESTS',
 
 WEB_LOADER_TIMEOUT = os.getenv('WEB_LOADER_TIMEOUT', '')
 
+# Connection pool shared by web loader fetches; the per-host limit caps concurrent requests to one site.
+try:
+    WEB_FETCH_POOL_CONNECTIONS = int(os.getenv('WEB_FETCH_POOL_CONNECTIONS', '100'))
+except ValueError:
+    WEB_FETCH_POOL_CONNECTIONS = 100
+try:
+    WEB_FETCH_POOL_CONNECTIONS_PER_HOST = int(os.getenv('WEB_FETCH_POOL_CONNECTIONS_PER_HOST', '4'))
+except ValueError:
+    WEB_FETCH_POOL_CONNECTIONS_PER_HOST = 4
+
+# Seconds extracted page text is reused for the same URL (0 disables), and pages kept on disk without Redis.
+try:
+    WEB_FETCH_CACHE_TTL = int(os.getenv('WEB_FETCH_CACHE_TTL', '600'))
+except ValueError:
+    WEB_FETCH_CACHE_TTL = 600
+try:
+    WEB_FETCH_CACHE_MAX_ENTRIES = int(os.getenv('WEB_FETCH_CACHE_MAX_ENTRIES', '1000'))
+except ValueError:
+    WEB_FETCH_CACHE_MAX_ENTRIES = 1000
+
 
 ENABLE_WEB_LOADER_SSL_VERIFICATION = os.getenv('ENABLE_WEB_LOADER_SSL_VERIFICATION', 'True').lower() == 'true'
 
@@ -122,6 +122,7 @@ class ERROR_MESSAGES(str, Enum):
     FEATURE_DISABLED = lambda name='': f'{name} is disabled'
     INPUT_TOO_LONG = lambda size='': f'Input prompt exceeds maximum length of {size}'
     SERVER_CONNECTION_ERROR = 'Open WebUI: Server Connection Error'
+    CONNECTION_UNAVAILABLE = 'Open WebUI: Connection unavailable after repeated failures, retrying shortly'
     REQUIRED_FIELD_EMPTY = lambda name='': f'Required field {name} is empty'
     OAUTH_NOT_CONFIGURED = lambda name='': f"Provider '{name}' is not configured"
 
@@ -354,10 +354,64 @@ if DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL is not None:
     except Exception:
         DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL = 0.0
 
+# In-process cache of authenticated users by id, so get_current_user does not
+# hit the database on every request.  Updates through the Users table evict
+# the entry locally and, with Redis, on every other worker.  0 disables.
+try:
+    USER_CACHE_TTL = float(os.getenv('USER_CACHE_TTL', '10'))
+except (ValueError, TypeError):
+    USER_CACHE_TTL = 10.0
+
+try:
+    USER_CACHE_SIZE = int(os.getenv('USER_CACHE_SIZE', '10000'))
+except ValueError:
+    USER_CACHE_SIZE = 10000
+
+# Per-user cache of group memberships (and the group permissions they carry),
+# read by every access-control check.  Every write to groups or group members
+# evicts the affected users locally and, with Redis, on every other worker, so
+# the TTL only bounds staleness when an invalidation is missed.  0 disables.
+try:
+    USER_GROUPS_CACHE_TTL = float(os.getenv('USER_GROUPS_CACHE_TTL', '60'))
+except (ValueError, TypeError):
+    USER_GROUPS_CACHE_TTL = 60.0
+
+# Last-active timestamps are collected in memory and written with one bulk
+# UPDATE every USER_LAST_ACTIVE_FLUSH_INTERVAL seconds (shared across workers
+# through Redis when it is configured).  0 writes on every request, subject
+# to DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL.
+try:
+    USER_LAST_ACTIVE_FLUSH_INTERVAL = float(os.getenv('USER_LAST_ACTIVE_FLUSH_INTERVAL', '10'))
+except (ValueError, TypeError):
+    USER_LAST_ACTIVE_FLUSH_INTERVAL = 10.0
+
+# Config reads are served from an in-process snapshot of the config table.
+# Writes invalidate it locally and, with Redis, on every other worker;
+# CONFIG_CACHE_MAX_AGE seconds bounds staleness otherwise (0 = no bound).
+ENABLE_CONFIG_CACHE = os.getenv('ENABLE_CONFIG_CACHE', 'True').lower() == 'true'
+
+try:
+    CONFIG_CACHE_MAX_AGE = float(os.getenv('CONFIG_CACHE_MAX_AGE', '60'))
+except (ValueError, TypeError):
+    CONFIG_CACHE_MAX_AGE = 60.0
+
 DATABASE_ENABLE_SESSION_SHARING = os.getenv('DATABASE_ENABLE_SESSION_SHARING', 'False').lower() == 'true'
 ENABLE_PUBLIC_ACTIVE_USERS_COUNT = os.getenv('ENABLE_PUBLIC_ACTIVE_USERS_COUNT', 'True').lower() == 'true'
 RESET_CONFIG_ON_START = os.getenv('RESET_CONFIG_ON_START', 'False').lower() == 'true'
 ENABLE_REALTIME_CHAT_SAVE = os.getenv('ENABLE_REALTIME_CHAT_SAVE', 'False').lower() == 'true'
+
+# Write-behind tuning for ENABLE_REALTIME_CHAT_SAVE: streaming output is
+# written at most every REALTIME_CHAT_SAVE_FLUSH_INTERVAL seconds, or sooner
+# once REALTIME_CHAT_SAVE_FLUSH_BYTES of new content are pending.
+try:
+    REALTIME_CHAT_SAVE_FLUSH_INTERVAL = float(os.getenv('REALTIME_CHAT_SAVE_FLUSH_INTERVAL', '1.0'))
+except (ValueError, TypeError):
+    REALTIME_CHAT_SAVE_FLUSH_INTERVAL = 1.0
+
+try:
+    REALTIME_CHAT_SAVE_FLUSH_BYTES = int(os.getenv('REALTIME_CHAT_SAVE_FLUSH_BYTES', '16384'))
+except (ValueError, TypeError):
+    REALTIME_CHAT_SAVE_FLUSH_BYTES = 16384
 ENABLE_QUERIES_CACHE = os.getenv('ENABLE_QUERIES_CACHE', 'False').lower() == 'true'
 RAG_SYSTEM_CONTEXT = os.getenv('RAG_SYSTEM_CONTEXT', 'False').lower() == 'true'
 
@@ -497,6 +551,46 @@ else:
     except ValueError:
         WEBSOCKET_EVENT_CALLER_TIMEOUT = 300
 
+# Side effects of emitter events (status, message, embeds, files, sources) are
+# accumulated per message and written in one transaction per interval, or
+# immediately when the response completes.  Set to 0 to write every event.
+try:
+    WEBSOCKET_EVENT_EMITTER_FLUSH_INTERVAL = float(os.getenv('WEBSOCKET_EVENT_EMITTER_FLUSH_INTERVAL', '0.5'))
+except ValueError:
+    WEBSOCKET_EVENT_EMITTER_FLUSH_INTERVAL = 0.5
+
+# With WEBSOCKET_MANAGER=redis, MODELS, SESSION_POOL and USAGE_POOL are Redis
+# hashes.  When cached, each worker keeps an in-memory mirror kept coherent
+# over pub/sub: reads never touch Redis and writes are pipelined in the
+# background.  Values of at least WEBSOCKET_REDIS_DICT_COMPRESSION_THRESHOLD
+# bytes are stored zlib-compressed (0 = never; only enable once every worker
+# runs a version that understands compressed values).
+WEBSOCKET_REDIS_DICT_CACHE = os.getenv('WEBSOCKET_REDIS_DICT_CACHE', 'True').lower() == 'true'
+
+try:
+    WEBSOCKET_REDIS_DICT_COMPRESSION_THRESHOLD = int(os.getenv('WEBSOCKET_REDIS_DICT_COMPRESSION_THRESHOLD', '0'))
+except ValueError:
+    WEBSOCKET_REDIS_DICT_COMPRESSION_THRESHOLD = 0
+
+# Collaborative (Yjs) documents are kept as a merged snapshot plus a log of
+# recent binary updates.  The log is folded into the snapshot once it holds
+# YDOC_COMPACTION_UPDATES updates or YDOC_COMPACTION_BYTES bytes, or its
+# oldest update is YDOC_COMPACTION_INTERVAL seconds old.
+try:
+    YDOC_COMPACTION_UPDATES = int(os.getenv('YDOC_COMPACTION_UPDATES', '100'))
+except ValueError:
+    YDOC_COMPACTION_UPDATES = 100
+
+try:
+    YDOC_COMPACTION_BYTES = int(os.getenv('YDOC_COMPACTION_BYTES', '262144'))
+except ValueError:
+    YDOC_COMPACTION_BYTES = 262144
+
+try:
+    YDOC_COMPACTION_INTERVAL = float(os.getenv('YDOC_COMPACTION_INTERVAL', '30'))
+except ValueError:
+    YDOC_COMPACTION_INTERVAL = 30.0
+
 
 import ssl as _ssl
 
@@ -754,6 +848,51 @@ BYPASS_RETRIEVAL_ACCESS_CONTROL = os.getenv('BYPASS_RETRIEVAL_ACCESS_CONTROL', '
 # for non-admin users.  When False (default), unknown collection names are
 # denied — closing the legacy unscoped namespace.
 ENABLE_RETRIEVAL_UNSCOPED_COLLECTIONS = os.getenv('ENABLE_RETRIEVAL_UNSCOPED_COLLECTIONS', 'False').lower() == 'true'
+
+# Keep a persistent BM25 index per collection for hybrid search, updated as
+# chunks are written, instead of rebuilding one from the whole collection on
+# every query.  Collections are indexed lazily on their first hybrid query.
+ENABLE_RAG_BM25_INDEX = os.getenv('ENABLE_RAG_BM25_INDEX', 'True').lower() == 'true'
+
+# Cache of query embeddings keyed by engine, model, prefix and text, so the
+# same question is not re-embedded per collection, regeneration or retry.
+# Only calls with at most RAG_EMBEDDING_CACHE_MAX_BATCH texts are cached,
+# which keeps document ingestion out of it.  Size 0 disables the cache.
+try:
+    RAG_EMBEDDING_CACHE_SIZE = int(os.getenv('RAG_EMBEDDING_CACHE_SIZE', '1000'))
+except ValueError:
+    RAG_EMBEDDING_CACHE_SIZE = 1000
+
+try:
+    RAG_EMBEDDING_CACHE_TTL = int(os.getenv('RAG_EMBEDDING_CACHE_TTL', '3600'))
+except ValueError:
+    RAG_EMBEDDING_CACHE_TTL = 3600
+
+try:
+    RAG_EMBEDDING_CACHE_MAX_BATCH = int(os.getenv('RAG_EMBEDDING_CACHE_MAX_BATCH', '16'))
+except ValueError:
+    RAG_EMBEDDING_CACHE_MAX_BATCH = 16
+
+# Share cached embeddings across workers through Redis (requires REDIS_URL).
+ENABLE_RAG_EMBEDDING_CACHE_REDIS = os.getenv('ENABLE_RAG_EMBEDDING_CACHE_REDIS', 'False').lower() == 'true'
+
+# Store document chunk embeddings by model and text hash, and reuse them when
+# the same chunk is embedded again (reindexing, re-uploads, duplicate files).
+ENABLE_RAG_CHUNK_EMBEDDING_REUSE = os.getenv('ENABLE_RAG_CHUNK_EMBEDDING_REUSE', 'True').lower() == 'true'
+
+# Micro-batching for the local SentenceTransformers engine: concurrent encode
+# requests are held for up to RAG_EMBEDDING_MICRO_BATCH_WAIT_MS and run as one
+# batch on a dedicated inference thread.  Size 0 disables batching.
+try:
+    RAG_EMBEDDING_MICRO_BATCH_SIZE = int(os.getenv('RAG_EMBEDDING_MICRO_BATCH_SIZE', '32'))
+except ValueError:
+    RAG_EMBEDDING_MICRO_BATCH_SIZE = 32
+
+try:
+    RAG_EMBEDDING_MICRO_BATCH_WAIT_MS = float(os.getenv('RAG_EMBEDDING_MICRO_BATCH_WAIT_MS', '5'))
+except ValueError:
+    RAG_EMBEDDING_MICRO_BATCH_WAIT_MS = 5.0
+
 MINERU_MAX_MARKDOWN_BYTES = (
     int(os.getenv('MINERU_MAX_MARKDOWN_BYTES')) if os.getenv('MINERU_MAX_MARKDOWN_BYTES') else None
 )
@@ -925,6 +1064,108 @@ else:
     except Exception:
         MODELS_CACHE_TTL = 1
 
+# /api/models keeps the aggregated model list for MODEL_LIST_CACHE_TTL seconds
+# and each user's filtered response until the list, the user's groups or role,
+# or any model, function or model access grant changes.  0 disables.
+try:
+    MODEL_LIST_CACHE_TTL = float(os.getenv('MODEL_LIST_CACHE_TTL', '10'))
+except (ValueError, TypeError):
+    MODEL_LIST_CACHE_TTL = 10.0
+
+try:
+    MODEL_LIST_CACHE_SIZE = int(os.getenv('MODEL_LIST_CACHE_SIZE', '10000'))
+except ValueError:
+    MODEL_LIST_CACHE_SIZE = 10000
+
+# Each OpenAI/Ollama connection's model list is refreshed in the background
+# every MODELS_REFRESH_INTERVAL seconds; requests are served the last list that
+# was fetched successfully instead of waiting on the connection.  Connections
+# whose responses depend on the requesting user are still fetched inline.
+# 0 fetches inline on every aggregation.
+try:
+    MODELS_REFRESH_INTERVAL = float(os.getenv('MODELS_REFRESH_INTERVAL', '60'))
+except (ValueError, TypeError):
+    MODELS_REFRESH_INTERVAL = 60.0
+
+# Circuit breaker for OpenAI/Ollama connections: after this many consecutive
+# connection failures (errors, timeouts, 502/503/504) a connection is skipped
+# and probed again after CONNECTION_CIRCUIT_BACKOFF seconds, doubling after each
+# failed probe up to CONNECTION_CIRCUIT_MAX_BACKOFF.  0 disables.
+try:
+    CONNECTION_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CONNECTION_CIRCUIT_FAILURE_THRESHOLD', '3'))
+except ValueError:
+    CONNECTION_CIRCUIT_FAILURE_THRESHOLD = 3
+
+try:
+    CONNECTION_CIRCUIT_BACKOFF = float(os.getenv('CONNECTION_CIRCUIT_BACKOFF', '5'))
+except (ValueError, TypeError):
+    CONNECTION_CIRCUIT_BACKOFF = 5.0
+
+try:
+    CONNECTION_CIRCUIT_MAX_BACKOFF = float(os.getenv('CONNECTION_CIRCUIT_MAX_BACKOFF', '300'))
+except (ValueError, TypeError):
+    CONNECTION_CIRCUIT_MAX_BACKOFF = 300.0
+
+# Routing between connections serving the same model: the one with the fewest
+# in-flight requests (weighted by its recent response latency) is chosen.  An
+# Ollama backend that does not have the model loaded (per /api/ps, re-checked
+# every OLLAMA_RESIDENT_MODELS_TTL seconds) counts as this many extra requests
+# to avoid cold loads; 0 ignores residency.
+try:
+    OLLAMA_ROUTING_COLD_LOAD_PENALTY = float(os.getenv('OLLAMA_ROUTING_COLD_LOAD_PENALTY', '2'))
+except (ValueError, TypeError):
+    OLLAMA_ROUTING_COLD_LOAD_PENALTY = 2.0
+
+try:
+    OLLAMA_RESIDENT_MODELS_TTL = float(os.getenv('OLLAMA_RESIDENT_MODELS_TTL', '10'))
+except (ValueError, TypeError):
+    OLLAMA_RESIDENT_MODELS_TTL = 10.0
+
+
+####################################
+# WEBHOOKS
+####################################
+
+# Event webhook deliveries are queued in the database and posted by a bounded
+# pool on every worker: at most WEBHOOK_DISPATCH_CONCURRENCY posts at a time,
+# WEBHOOK_ENDPOINT_CONCURRENCY of them to the same URL.  Failed deliveries are
+# retried after WEBHOOK_RETRY_BACKOFF seconds, doubling up to
+# WEBHOOK_RETRY_MAX_BACKOFF, until WEBHOOK_MAX_ATTEMPTS attempts were made.
+try:
+    WEBHOOK_DISPATCH_CONCURRENCY = int(os.getenv('WEBHOOK_DISPATCH_CONCURRENCY', '16'))
+except ValueError:
+    WEBHOOK_DISPATCH_CONCURRENCY = 16
+
+try:
+    WEBHOOK_ENDPOINT_CONCURRENCY = int(os.getenv('WEBHOOK_ENDPOINT_CONCURRENCY', '4'))
+except ValueError:
+    WEBHOOK_ENDPOINT_CONCURRENCY = 4
+
+try:
+    WEBHOOK_DISPATCH_BATCH_SIZE = int(os.getenv('WEBHOOK_DISPATCH_BATCH_SIZE', '100'))
+except ValueError:
+    WEBHOOK_DISPATCH_BATCH_SIZE = 100
+
+try:
+    WEBHOOK_DISPATCH_POLL_INTERVAL = float(os.getenv('WEBHOOK_DISPATCH_POLL_INTERVAL', '2'))
+except (ValueError, TypeError):
+    WEBHOOK_DISPATCH_POLL_INTERVAL = 2.0
+
+try:
+    WEBHOOK_MAX_ATTEMPTS = int(os.getenv('WEBHOOK_MAX_ATTEMPTS', '8'))
+except ValueError:
+    WEBHOOK_MAX_ATTEMPTS = 8
+
+try:
+    WEBHOOK_RETRY_BACKOFF = float(os.getenv('WEBHOOK_RETRY_BACKOFF', '5'))
+except (ValueError, TypeError):
+    WEBHOOK_RETRY_BACKOFF = 5.0
+
+try:
+    WEBHOOK_RETRY_MAX_BACKOFF = float(os.getenv('WEBHOOK_RETRY_MAX_BACKOFF', '3600'))
+except (ValueError, TypeError):
+    WEBHOOK_RETRY_MAX_BACKOFF = 3600.0
+
 
 ####################################
 # CHAT
@@ -954,6 +1195,21 @@ else:
     except Exception:
         CHAT_RESPONSE_STREAM_DELTA_CHUNK_SIZE = 1
 
+# chat:completion emits are coalesced per user: at most one every
+# CHAT_RESPONSE_STREAM_FLUSH_INTERVAL seconds, each carrying the latest state.
+# The interval doubles (up to CHAT_RESPONSE_STREAM_MAX_FLUSH_INTERVAL) while the
+# user's sockets have a send backlog or emits are slow, and shrinks back once
+# they keep up.  0 only batches by CHAT_RESPONSE_STREAM_DELTA_CHUNK_SIZE.
+try:
+    CHAT_RESPONSE_STREAM_FLUSH_INTERVAL = float(os.getenv('CHAT_RESPONSE_STREAM_FLUSH_INTERVAL', '0.05'))
+except (ValueError, TypeError):
+    CHAT_RESPONSE_STREAM_FLUSH_INTERVAL = 0.05
+
+try:
+    CHAT_RESPONSE_STREAM_MAX_FLUSH_INTERVAL = float(os.getenv('CHAT_RESPONSE_STREAM_MAX_FLUSH_INTERVAL', '1'))
+except (ValueError, TypeError):
+    CHAT_RESPONSE_STREAM_MAX_FLUSH_INTERVAL = 1.0
+
 
 # Maximum tool-call iterations per chat response. Set to -1 for unlimited.
 # The old CHAT_RESPONSE_MAX_TOOL_CALL_RETRIES name is accepted as a fallback.
@@ -12,7 +12,6 @@ from open_webui.env import VERSION
 from open_webui.models.config import Config
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 from open_webui.retrieval.web.utils import validate_url
-from open_webui.utils.webhook import post_webhook
 
 log = logging.getLogger(__name__)
 
@@ -987,41 +986,49 @@ def build_event(
     )
 
 
-async def dispatch_webhook_event(app: Any, event: Event) -> None:
-    name = getattr(getattr(app, 'state', None), 'WEBUI_NAME', 'Open WebUI')
-    subject = event.subject or {}
-    subject_id = subject.get('id')
-    definition = EVENT_DEFINITIONS_BY_NAME.get(event.event)
-    message = event.message or (definition.message if definition else event.event)
-    if subject_id:
-        message = f'{message} ({subject_id})'
-
-    for webhook in await get_event_webhooks():
-        if not webhook.get('url') or not await event_webhook_matches(webhook, event):
-            continue
-
-        try:
-            await post_webhook(
-                name,
-                webhook['url'],
-                message,
-                event.model_dump(),
-                description=definition.description if definition else None,
-            )
-        except Exception:
-            log.exception('Event webhook failed for %s', webhook.get('id'))
+async def get_webhook_deliveries(events: list[Event]) -> list[dict[str, Any]]:
+    """One delivery per event and matching webhook, as queued by ``utils/webhook_dispatch.py``."""
+    webhooks = [webhook for webhook in await get_event_webhooks() if webhook.get('url')]
+    if not webhooks:
+        return []
 
+    deliveries = []
+    for event in events:
+        subject = event.subject or {}
+        subject_id = subject.get('id')
+        definition = EVENT_DEFINITIONS_BY_NAME.get(event.event)
+        message = event.message or (definition.message if definition else event.event)
+        if subject_id:
+            message = f'{message} ({subject_id})'
+
+        payload = None
+        for webhook in webhooks:
+            try:
+                if not await event_webhook_matches(webhook, event):
+                    continue
+            except Exception:
+                log.exception('Event webhook targets could not be matched for %s', webhook.get('id'))
+                continue
 
-def schedule_webhook_dispatch(app: Any, event: Event) -> None:
-    try:
-        asyncio.create_task(dispatch_webhook_event(app, event))
-    except RuntimeError:
-        log.exception('Event webhook delivery could not be scheduled for %s', event.event)
+            payload = payload or event.model_dump()
+            deliveries.append(
+                {
+                    'webhook_id': webhook.get('id'),
+                    'url': webhook['url'],
+                    'event': event.event,
+                    'message': message,
+                    'description': definition.description if definition else None,
+                    'payload': payload,
+                }
+            )
+    return deliveries
 
 
 class WebhookEventSink:
     async def handle_event(self, app: Any, event: Event, request: Any | None = None) -> None:
-        schedule_webhook_dispatch(app, event)
+        from open_webui.utils.webhook_dispatch import WEBHOOK_DISPATCHER
+
+        WEBHOOK_DISPATCHER.enqueue(app, event)
 
 
 async def dispatch_event_functions(app: Any, event: Event, request: Any | None = None) -> None:
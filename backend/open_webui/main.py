@@ -7,7 +7,7 @@ import mimetypes
 import os
 import sys
 import time
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, nullcontext
 from uuid import uuid4
 
 import aiohttp
@@ -129,8 +129,9 @@ from open_webui.events import (
 from open_webui.internal.db import engine, get_async_session
 from open_webui.models.access_grants import AccessGrants
 from open_webui.models.channels import Channels
+from open_webui.models.chat_search import backfill_chat_search_index
 from open_webui.models.chats import ChatForm, Chats
-from open_webui.models.config import Config
+from open_webui.models.config import Config, redis_config_cache_listener
 from open_webui.models.functions import Functions
 from open_webui.models.messages import Messages
 from open_webui.models.models import Models
@@ -180,6 +181,8 @@ from open_webui.socket.main import (
     get_user_id_from_session_pool,
     periodic_session_pool_cleanup,
     periodic_usage_pool_cleanup,
+    start_redis_dicts,
+    stop_redis_dicts,
 )
 from open_webui.socket.main import (
     app as socket_app,
@@ -219,6 +222,7 @@ from open_webui.utils.chat import (
     generate_chat_completion as chat_completion_handler,
 )
 from open_webui.utils.embeddings import generate_embeddings
+from open_webui.utils.last_active import LAST_ACTIVE_BUFFER
 from open_webui.utils.logger import start_logger
 from open_webui.utils.middleware import (
     background_tasks_handler,
@@ -226,11 +230,12 @@ from open_webui.utils.middleware import (
     process_chat_payload,
     process_chat_response,
 )
+from open_webui.utils.model_list_cache import redis_model_list_cache_listener
 from open_webui.utils.models import (
     check_model_access,
     get_all_base_models,
     get_all_models,
-    get_filtered_models,
+    get_model_list_response,
 )
 from open_webui.utils.oauth import (
     OAuthClientInformationFull,
@@ -249,6 +254,9 @@ from open_webui.utils.redis import get_redis_client
 from open_webui.utils.security_headers import SecurityHeadersMiddleware
 from open_webui.utils.session_pool import get_session
 from open_webui.utils.tools import set_terminal_servers, set_tool_servers
+from open_webui.utils.upstream_models import UPSTREAM_MODELS, refresh_models_periodically
+from open_webui.utils.user_cache import redis_user_cache_listener
+from open_webui.utils.webhook_dispatch import WEBHOOK_DISPATCHER
 
 if SAFE_MODE:
     print('SAFE MODE ENABLED')
@@ -336,10 +344,15 @@ async def lifespan(app: FastAPI):
     log.info('Installing external dependencies of functions and tools...')
     await install_tool_and_function_dependencies()
 
+    await start_redis_dicts()
+
     app.state.redis = get_redis_client(async_mode=True)
 
     if app.state.redis is not None:
         app.state.redis_task_command_listener = asyncio.create_task(redis_task_command_listener(app))
+        app.state.redis_user_cache_listener = asyncio.create_task(redis_user_cache_listener(app))
+        app.state.redis_config_cache_listener = asyncio.create_task(redis_config_cache_listener(app))
+        app.state.redis_model_list_cache_listener = asyncio.create_task(redis_model_list_cache_listener(app))
 
     if THREAD_POOL_SIZE and THREAD_POOL_SIZE > 0:
         limiter = anyio.to_thread.current_default_thread_limiter()
@@ -351,6 +364,8 @@ async def lifespan(app: FastAPI):
     from open_webui.utils.automations import scheduler_worker_loop
 
     asyncio.create_task(scheduler_worker_loop(app))
+    app.state.webhook_dispatcher = asyncio.create_task(WEBHOOK_DISPATCHER.run(app))
+    asyncio.create_task(backfill_chat_search_index())
 
     if await Config.get('models.base_models_cache'):
         try:
@@ -376,6 +391,27 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             log.warning(f'Failed to pre-fetch models at startup: {e}')
 
+    app.state.model_refresh_task = asyncio.create_task(
+        refresh_models_periodically(
+            Request(
+                # Stand-in request for the background refresh, like the pre-fetch above
+                {
+                    'type': 'http',
+                    'asgi.version': '3.0',
+                    'asgi.spec_version': '2.0',
+                    'method': 'GET',
+                    'path': '/internal',
+                    'query_string': b'',
+                    'headers': Headers({}).raw,
+                    'client': ('127.0.0.1', 12345),
+                    'server': ('127.0.0.1', 80),
+                    'scheme': 'http',
+                    'app': app,
+                }
+            )
+        )
+    )
+
     # Pre-fetch tool server specs so the first request doesn't pay the latency cost
     if len(await Config.get('tool_server.connections', []) or []) > 0:
         mock_request = Request(
@@ -416,15 +452,35 @@ async def lifespan(app: FastAPI):
     await publish_event(app, EVENTS.SYSTEM_SHUTDOWN_STARTED, source='system')
 
     # Shutdown: clean up shared resources
+    from open_webui.retrieval.web.utils import close_web_fetch_sessions
     from open_webui.utils.session_pool import close_session
 
     await close_session()
+    await close_web_fetch_sessions()
+    await LAST_ACTIVE_BUFFER.close()
+    await stop_redis_dicts()
 
     if hasattr(app.state, 'redis_task_command_listener'):
         app.state.redis_task_command_listener.cancel()
 
+    if hasattr(app.state, 'redis_user_cache_listener'):
+        app.state.redis_user_cache_listener.cancel()
+
+    if hasattr(app.state, 'redis_config_cache_listener'):
+        app.state.redis_config_cache_listener.cancel()
+
+    if hasattr(app.state, 'redis_model_list_cache_listener'):
+        app.state.redis_model_list_cache_listener.cancel()
+
+    if hasattr(app.state, 'model_refresh_task'):
+        app.state.model_refresh_task.cancel()
+
     await publish_event(app, EVENTS.SYSTEM_SHUTDOWN_COMPLETED, source='system')
 
+    if hasattr(app.state, 'webhook_dispatcher'):
+        app.state.webhook_dispatcher.cancel()
+    await WEBHOOK_DISPATCHER.close()
+
 
 app = FastAPI(
     title='Open WebUI',
@@ -799,57 +855,14 @@ if audit_level != AuditLevel.NONE:
 @app.get('/api/models')
 @app.get('/api/v1/models')  # Experimental: Compatibility with OpenAI API
 async def get_models(request: Request, refresh: bool = False, user=Depends(get_verified_user)):
-    all_models = await get_all_models(request, refresh=refresh, user=user)
-
-    models = []
-    for model in all_models:
-        # Filter out filter pipelines
-        if 'pipeline' in model and model['pipeline'].get('type', None) == 'filter':
-            continue
-
-        # Remove profile image URL to reduce payload size
-        if model.get('info', {}).get('meta', {}).get('profile_image_url'):
-            model['info']['meta'].pop('profile_image_url', None)
-
-        try:
-            model_tags = [tag.get('name') for tag in model.get('info', {}).get('meta', {}).get('tags', [])]
-            tags = [tag.get('name') for tag in model.get('tags', [])]
-
-            tags = list(set(model_tags + tags))
-            model['tags'] = [{'name': tag} for tag in tags]
-        except Exception as e:
-            log.debug(f'Error processing model tags: {e}')
-            model['tags'] = []
-            pass
-
-        models.append(model)
-
-    # Chat requests resolve models by ID from request.app.state.MODELS, where
-    # duplicate IDs collapse to the last model. Return the same effective list.
-    models = list({model['id']: model for model in models}.values())
-
-    model_order_list = await Config.get('ui.model_order_list')
-    if model_order_list:
-        model_order_dict = {model_id: i for i, model_id in enumerate(model_order_list)}
-        # Sort models by order list priority, with fallback for those not in the list
-        models.sort(
-            key=lambda model: (
-                model_order_dict.get(model.get('id', ''), float('inf')),
-                (model.get('name', '') or ''),
-            )
-        )
-
-    models = await get_filtered_models(models, user)
-
-    log.debug(
-        f'/api/models returned filtered models accessible to the user: {json.dumps([model.get("id") for model in models])}'
-    )
-    return {'data': models}
+    with UPSTREAM_MODELS.forced() if refresh else nullcontext():
+        return await get_model_list_response(request, refresh=refresh, user=user)
 
 
 @app.get('/api/models/base')
 async def get_base_models(request: Request, user=Depends(get_admin_user)):
-    models = await get_all_base_models(request, user=user)
+    with UPSTREAM_MODELS.forced():
+        models = await get_all_base_models(request, user=user)
     # Keep the shared base-model cache in sync with the admin-facing source of truth.
     request.app.state.BASE_MODELS = models
     return {'data': models}
@@ -1353,7 +1366,7 @@ async def chat_completion(
                     # now the backend owns persistence.
                     chat_files = metadata.get('files')
                     if chat_files is not None or selected_chat_models:
-                        existing_chat = await Chats.get_chat_by_id(chat_id)
+                        existing_chat = await Chats.get_chat_by_id(chat_id, hydrate=False)
                         if existing_chat:
                             updated = {**existing_chat.chat}
                             if chat_files is not None:
@@ -2075,6 +2088,11 @@ async def get_event_webhooks_api(user=Depends(get_admin_user)):
     return await get_event_webhooks()
 
 
+@app.get('/api/events/webhooks/queue')
+async def get_event_webhook_queue(user=Depends(get_admin_user)):
+    return await WEBHOOK_DISPATCHER.get_stats()
+
+
 @app.post('/api/events/webhooks')
 async def create_event_webhook(form_data: EventWebhookForm, user=Depends(get_admin_user)):
     try:
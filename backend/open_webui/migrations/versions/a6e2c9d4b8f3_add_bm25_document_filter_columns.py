@@ -0,0 +1,61 @@
+"""add bm25 document filter columns
+
+Revision ID: a6e2c9d4b8f3
+Revises: f3b8d1e6a7c2
+Create Date: 2026-10-17 23:12:44.190352
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6e2c9d4b8f3'
+down_revision: Union[str, None] = 'f3b8d1e6a7c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FILTER_COLUMNS = ('file_id', 'hash')
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'bm25_document' not in inspector.get_table_names():
+        return
+
+    existing_columns = {column['name'] for column in inspector.get_columns('bm25_document')}
+    existing_indexes = {index['name'] for index in inspector.get_indexes('bm25_document')}
+
+    # Existing rows have no filter columns; clear the index instead of backfilling it.
+    # Collections are rebuilt lazily on their next hybrid query.
+    op.execute(sa.text('DELETE FROM bm25_posting'))
+    op.execute(sa.text('DELETE FROM bm25_document'))
+    op.execute(sa.text('DELETE FROM bm25_collection'))
+
+    for column in FILTER_COLUMNS:
+        if column not in existing_columns:
+            op.add_column('bm25_document', sa.Column(column, sa.Text(), nullable=True))
+        index_name = f'bm25_document_collection_{column}_idx'
+        if index_name not in existing_indexes:
+            op.create_index(index_name, 'bm25_document', ['collection_name', column])
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if 'bm25_document' not in inspector.get_table_names():
+        return
+
+    existing_columns = {column['name'] for column in inspector.get_columns('bm25_document')}
+    existing_indexes = {index['name'] for index in inspector.get_indexes('bm25_document')}
+
+    for column in FILTER_COLUMNS:
+        index_name = f'bm25_document_collection_{column}_idx'
+        if index_name in existing_indexes:
+            op.drop_index(index_name, table_name='bm25_document')
+        if column in existing_columns:
+            with op.batch_alter_table('bm25_document') as batch_op:
+                batch_op.drop_column(column)
@@ -0,0 +1,71 @@
+"""add bm25 index
+
+Revision ID: b3d9e5f1a7c2
+Revises: e7a1c3f9b2d4
+Create Date: 2026-10-17 11:38:05.517203
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d9e5f1a7c2'
+down_revision: Union[str, None] = 'e7a1c3f9b2d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    existing_tables = set(sa.inspect(conn).get_table_names())
+
+    # Collections are indexed lazily on their first hybrid query, so there is
+    # nothing to backfill here.
+    if 'bm25_collection' not in existing_tables:
+        op.create_table(
+            'bm25_collection',
+            sa.Column('name', sa.Text(), primary_key=True),
+            sa.Column('ready', sa.Boolean(), nullable=False, server_default=sa.false()),
+            sa.Column('doc_count', sa.BigInteger(), nullable=False, server_default='0'),
+            sa.Column('total_length', sa.BigInteger(), nullable=False, server_default='0'),
+            sa.Column('total_enriched_length', sa.BigInteger(), nullable=False, server_default='0'),
+            sa.Column('updated_at', sa.BigInteger()),
+        )
+
+    if 'bm25_document' not in existing_tables:
+        op.create_table(
+            'bm25_document',
+            sa.Column('collection_name', sa.Text(), primary_key=True),
+            sa.Column('chunk_id', sa.Text(), primary_key=True),
+            sa.Column('text', sa.Text(), nullable=True),
+            sa.Column('meta', sa.JSON(), nullable=True),
+            sa.Column('length', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('enriched_length', sa.Integer(), nullable=False, server_default='0'),
+        )
+
+    if 'bm25_posting' not in existing_tables:
+        op.create_table(
+            'bm25_posting',
+            sa.Column('collection_name', sa.Text(), primary_key=True),
+            sa.Column('term', sa.Text(), primary_key=True),
+            sa.Column('chunk_id', sa.Text(), primary_key=True),
+            sa.Column('tf', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('enriched_tf', sa.Integer(), nullable=False, server_default='0'),
+        )
+        op.create_index('bm25_posting_collection_chunk_idx', 'bm25_posting', ['collection_name', 'chunk_id'])
+
+
+def downgrade() -> None:
+    existing_tables = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'bm25_posting' in existing_tables:
+        op.drop_index('bm25_posting_collection_chunk_idx', table_name='bm25_posting')
+        op.drop_table('bm25_posting')
+    if 'bm25_document' in existing_tables:
+        op.drop_table('bm25_document')
+    if 'bm25_collection' in existing_tables:
+        op.drop_table('bm25_collection')
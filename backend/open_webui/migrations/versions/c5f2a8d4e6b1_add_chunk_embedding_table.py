@@ -0,0 +1,37 @@
+"""add chunk embedding table
+
+Revision ID: c5f2a8d4e6b1
+Revises: b3d9e5f1a7c2
+Create Date: 2026-10-17 13:02:47.880146
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5f2a8d4e6b1'
+down_revision: Union[str, None] = 'b3d9e5f1a7c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if 'chunk_embedding' in set(sa.inspect(op.get_bind()).get_table_names()):
+        return
+
+    op.create_table(
+        'chunk_embedding',
+        sa.Column('model', sa.Text(), primary_key=True),
+        sa.Column('hash', sa.Text(), primary_key=True),
+        sa.Column('vector', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.BigInteger()),
+    )
+
+
+def downgrade() -> None:
+    if 'chunk_embedding' in set(sa.inspect(op.get_bind()).get_table_names()):
+        op.drop_table('chunk_embedding')
@@ -0,0 +1,35 @@
+"""add ydoc snapshot to note
+
+Revision ID: d8a3f6c1e9b2
+Revises: c5f2a8d4e6b1
+Create Date: 2026-10-17 16:41:09.527318
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8a3f6c1e9b2'
+down_revision: Union[str, None] = 'c5f2a8d4e6b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    columns = [col['name'] for col in inspector.get_columns('note')]
+
+    if 'ydoc' not in columns:
+        op.add_column('note', sa.Column('ydoc', sa.LargeBinary(), nullable=True))
+    if 'ydoc_updated_at' not in columns:
+        op.add_column('note', sa.Column('ydoc_updated_at', sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('note', 'ydoc_updated_at')
+    op.drop_column('note', 'ydoc')
@@ -0,0 +1,85 @@
+"""add chat search index
+
+Revision ID: e7a1c3f9b2d4
+Revises: 42e2978c7933
+Create Date: 2026-10-17 09:12:41.204518
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a1c3f9b2d4'
+down_revision: Union[str, None] = '42e2978c7933'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'chat_search' in set(inspector.get_table_names()):
+        return
+
+    op.create_table(
+        'chat_search',
+        sa.Column('id', sa.Text(), primary_key=True),
+        sa.Column('chat_id', sa.Text(), nullable=False),
+        sa.Column('message_id', sa.Text(), nullable=False),
+        sa.Column('user_id', sa.Text(), nullable=False),
+        sa.Column('body', sa.Text(), nullable=True),
+        sa.Column('updated_at', sa.BigInteger()),
+        sa.ForeignKeyConstraint(['chat_id'], ['chat.id'], ondelete='CASCADE'),
+    )
+    op.create_index('chat_search_chat_id_idx', 'chat_search', ['chat_id'])
+    op.create_index('chat_search_user_id_idx', 'chat_search', ['user_id'])
+
+    if conn.dialect.name == 'sqlite':
+        # External-content FTS5 table; triggers keep it in sync with chat_search.
+        op.execute(
+            'CREATE VIRTUAL TABLE chat_search_fts USING fts5('
+            "body, content='chat_search', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2')"
+        )
+        op.execute(
+            'CREATE TRIGGER chat_search_ai AFTER INSERT ON chat_search BEGIN '
+            'INSERT INTO chat_search_fts(rowid, body) VALUES (new.rowid, new.body); END'
+        )
+        op.execute(
+            'CREATE TRIGGER chat_search_ad AFTER DELETE ON chat_search BEGIN '
+            "INSERT INTO chat_search_fts(chat_search_fts, rowid, body) VALUES ('delete', old.rowid, old.body); END"
+        )
+        op.execute(
+            'CREATE TRIGGER chat_search_au AFTER UPDATE ON chat_search BEGIN '
+            "INSERT INTO chat_search_fts(chat_search_fts, rowid, body) VALUES ('delete', old.rowid, old.body); "
+            'INSERT INTO chat_search_fts(rowid, body) VALUES (new.rowid, new.body); END'
+        )
+    elif conn.dialect.name == 'postgresql':
+        op.execute(
+            'ALTER TABLE chat_search ADD COLUMN tsv tsvector '
+            "GENERATED ALWAYS AS (to_tsvector('simple', coalesce(body, ''))) STORED"
+        )
+        op.execute('CREATE INDEX chat_search_tsv_idx ON chat_search USING GIN (tsv)')
+
+    # Existing chats are indexed in the background at startup
+    # (see open_webui.models.chat_search.backfill_chat_search_index).
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if conn.dialect.name == 'sqlite':
+        op.execute('DROP TRIGGER IF EXISTS chat_search_ai')
+        op.execute('DROP TRIGGER IF EXISTS chat_search_ad')
+        op.execute('DROP TRIGGER IF EXISTS chat_search_au')
+        op.execute('DROP TABLE IF EXISTS chat_search_fts')
+
+    if 'chat_search' in set(inspector.get_table_names()):
+        op.drop_index('chat_search_user_id_idx', table_name='chat_search')
+        op.drop_index('chat_search_chat_id_idx', table_name='chat_search')
+        op.drop_table('chat_search')
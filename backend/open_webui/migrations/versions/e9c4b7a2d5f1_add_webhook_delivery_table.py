@@ -0,0 +1,62 @@
+"""add webhook delivery table
+
+Revision ID: e9c4b7a2d5f1
+Revises: d8a3f6c1e9b2
+Create Date: 2026-10-17 19:12:44.208531
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9c4b7a2d5f1'
+down_revision: Union[str, None] = 'd8a3f6c1e9b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _index_exists(inspector, index_name, table_name):
+    """Check if an index already exists on the given table (works for both SQLite and PostgreSQL)."""
+    indexes = inspector.get_indexes(table_name)
+    return any(idx['name'] == index_name for idx in indexes)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'webhook_delivery' not in inspector.get_table_names():
+        op.create_table(
+            'webhook_delivery',
+            sa.Column('id', sa.Text(), primary_key=True),
+            sa.Column('webhook_id', sa.Text(), nullable=True),
+            sa.Column('url', sa.Text(), nullable=False),
+            sa.Column('event', sa.Text(), nullable=False),
+            sa.Column('message', sa.Text(), nullable=False),
+            sa.Column('description', sa.Text(), nullable=True),
+            sa.Column('payload', sa.JSON(), nullable=False),
+            sa.Column('status', sa.Text(), nullable=False),
+            sa.Column('attempts', sa.Integer(), nullable=False, default=0),
+            sa.Column('next_attempt_at', sa.BigInteger(), nullable=False),
+            sa.Column('claim_token', sa.Text(), nullable=True),
+            sa.Column('last_error', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.BigInteger(), nullable=False),
+            sa.Column('updated_at', sa.BigInteger(), nullable=False),
+        )
+
+    inspector.clear_cache()
+    if not _index_exists(inspector, 'ix_webhook_delivery_status_next_attempt', 'webhook_delivery'):
+        op.create_index(
+            'ix_webhook_delivery_status_next_attempt',
+            'webhook_delivery',
+            ['status', 'next_attempt_at'],
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_webhook_delivery_status_next_attempt', table_name='webhook_delivery')
+    op.drop_table('webhook_delivery')
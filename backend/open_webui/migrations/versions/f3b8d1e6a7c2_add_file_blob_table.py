@@ -0,0 +1,50 @@
+"""add file blob table
+
+Revision ID: f3b8d1e6a7c2
+Revises: e9c4b7a2d5f1
+Create Date: 2026-10-17 21:03:18.560217
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8d1e6a7c2'
+down_revision: Union[str, None] = 'e9c4b7a2d5f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _index_exists(inspector, index_name, table_name):
+    """Check if an index already exists on the given table (works for both SQLite and PostgreSQL)."""
+    indexes = inspector.get_indexes(table_name)
+    return any(idx['name'] == index_name for idx in indexes)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'file_blob' not in inspector.get_table_names():
+        op.create_table(
+            'file_blob',
+            sa.Column('hash', sa.Text(), primary_key=True),
+            sa.Column('path', sa.Text(), nullable=False, unique=True),
+            sa.Column('size', sa.BigInteger(), nullable=True),
+            sa.Column('ref_count', sa.Integer(), nullable=False, default=0),
+            sa.Column('created_at', sa.BigInteger(), nullable=False),
+            sa.Column('updated_at', sa.BigInteger(), nullable=False),
+        )
+
+    # Files sharing a stored object are looked up by path.
+    if not _index_exists(inspector, 'ix_file_path', 'file'):
+        op.create_index('ix_file_path', 'file', ['path'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_file_path', table_name='file')
+    op.drop_table('file_blob')
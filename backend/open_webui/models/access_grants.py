@@ -4,6 +4,7 @@ import uuid
 from typing import Optional
 
 from open_webui.internal.db import Base, get_async_db_context
+from open_webui.utils.model_list_cache import MODEL_LIST_CACHE
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Column, Text, UniqueConstraint, and_, delete, or_, select
 from sqlalchemy.dialects.postgresql import JSONB
@@ -280,6 +281,11 @@ def grants_to_access_control(grants: list) -> Optional[dict]:
 
 
 class AccessGrantsTable:
+    async def _invalidate(self, resource_type: str) -> None:
+        # Model grants decide which models each user sees in /api/models.
+        if resource_type == 'model':
+            await MODEL_LIST_CACHE.invalidate()
+
     async def grant_access(
         self,
         resource_type: str,
@@ -317,6 +323,7 @@ class AccessGrantsTable:
             db.add(grant)
             await db.commit()
             await db.refresh(grant)
+            await self._invalidate(resource_type)
             return AccessGrantModel.model_validate(grant)
 
     async def revoke_access(
@@ -340,6 +347,7 @@ class AccessGrantsTable:
                 )
             )
             await db.commit()
+            await self._invalidate(resource_type)
             return result.rowcount > 0
 
     async def revoke_all_access(
@@ -357,6 +365,7 @@ class AccessGrantsTable:
                 )
             )
             await db.commit()
+            await self._invalidate(resource_type)
             return result.rowcount
 
     async def set_access_control(
@@ -394,6 +403,7 @@ class AccessGrantsTable:
                 results.append(grant)
 
             await db.commit()
+            await self._invalidate(resource_type)
 
             return [AccessGrantModel.model_validate(g) for g in results]
 
@@ -432,6 +442,7 @@ class AccessGrantsTable:
                 results.append(grant)
 
             await db.commit()
+            await self._invalidate(resource_type)
             return [AccessGrantModel.model_validate(g) for g in results]
 
     async def get_access_control(
@@ -0,0 +1,481 @@
+"""Persistent BM25 index for hybrid search.
+
+Hybrid search used to fetch a whole collection from the vector DB and build
+an in-memory ``BM25Retriever`` on every query.  This keeps the inverted index
+in the database instead:
+
+- ``bm25_collection``: one row per indexed collection with the corpus
+  statistics BM25 needs (document count and total length).
+- ``bm25_document``: chunk text and metadata, so results can be returned
+  without touching the vector DB.  The metadata keys files are deleted by
+  (``file_id``, ``hash``) are also stored as indexed columns.
+- ``bm25_posting``: term frequencies per (collection, term, chunk).
+
+Each posting and document carries two sets of counts: one for the chunk text
+alone and one for the text enriched with file name, title and headings (see
+``get_enriched_text``), so either hybrid search mode can use the same index.
+
+Collections are indexed lazily on their first hybrid query.  From then on the
+vector DB client keeps them in sync on insert, upsert and delete; if an
+incremental update fails the collection's index is dropped and rebuilt on the
+next query.
+"""
+
+import logging
+import math
+import re
+import time
+from collections import Counter
+from typing import Any, Awaitable, Callable, Optional
+
+from open_webui.internal.db import Base, get_async_db_context
+from open_webui.utils.misc import sanitize_data_for_db, sanitize_text_for_db
+from sqlalchemy import JSON, BigInteger, Boolean, Column, Index, Integer, Text, delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+log = logging.getLogger(__name__)
+
+# Okapi BM25 parameters; the same defaults as rank_bm25 / langchain's BM25Retriever.
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Tokens longer than this (hashes, base64 blobs, ...) are not worth indexing.
+MAX_TERM_LENGTH = 64
+
+# Chunks per transaction when (re)building an index.
+BUILD_BATCH_SIZE = 500
+
+# A build that has not finished after this long is assumed to have died.
+BUILD_TIMEOUT = 600
+
+# Metadata keys stored as indexed ``bm25_document`` columns, so deletes by them need no scan.
+FILTER_COLUMNS = ('file_id', 'hash')
+
+####################
+# Helpers
+####################
+
+
+def get_terms(text: str) -> list[str]:
+    return [term for term in re.findall(r'\w+', (text or '').lower()) if len(term) <= MAX_TERM_LENGTH]
+
+
+def get_enriched_text(text: str, metadata: Optional[dict]) -> str:
+    """Chunk text with file name, title, headings and source appended for BM25 scoring."""
+    metadata = metadata or {}
+    metadata_parts = [text]
+
+    # Add filename (repeat twice for extra weight in BM25 scoring)
+    if metadata.get('name'):
+        filename = metadata['name']
+        filename_tokens = filename.replace('_', ' ').replace('-', ' ').replace('.', ' ')
+        metadata_parts.append(f'Filename: {filename} {filename_tokens} {filename_tokens}')
+
+    # Add title if available
+    if metadata.get('title'):
+        metadata_parts.append(f'Title: {metadata["title"]}')
+
+    # Add document section headings if available (from markdown splitter)
+    if metadata.get('headings') and isinstance(metadata['headings'], list):
+        headings = ' > '.join(str(h) for h in metadata['headings'])
+        metadata_parts.append(f'Section: {headings}')
+
+    # Add source URL/path if available
+    if metadata.get('source'):
+        metadata_parts.append(f'Source: {metadata["source"]}')
+
+    # Add snippet for web search results
+    if metadata.get('snippet'):
+        metadata_parts.append(f'Snippet: {metadata["snippet"]}')
+
+    return ' '.join(metadata_parts)
+
+
+def _item_fields(item: Any) -> tuple[str, str, dict]:
+    """(id, text, metadata) of a vector DB item given as a dict or ``VectorItem``."""
+    if isinstance(item, dict):
+        return str(item['id']), item.get('text') or '', item.get('metadata') or {}
+    return str(item.id), item.text or '', item.metadata or {}
+
+
+def _matches_filter(metadata: dict, filter: dict) -> bool:
+    return all(metadata.get(key) == value for key, value in filter.items())
+
+
+def _filter_value(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+####################
+# BM25 DB Schema
+####################
+
+
+class BM25Collection(Base):
+    __tablename__ = 'bm25_collection'
+
+    name = Column(Text, primary_key=True)
+    ready = Column(Boolean, nullable=False, default=False)
+
+    doc_count = Column(BigInteger, nullable=False, default=0)
+    total_length = Column(BigInteger, nullable=False, default=0)
+    total_enriched_length = Column(BigInteger, nullable=False, default=0)
+
+    updated_at = Column(BigInteger)
+
+
+class BM25Document(Base):
+    __tablename__ = 'bm25_document'
+
+    collection_name = Column(Text, primary_key=True)
+    chunk_id = Column(Text, primary_key=True)
+
+    text = Column(Text, nullable=True)
+    meta = Column(JSON, nullable=True)
+
+    length = Column(Integer, nullable=False, default=0)
+    enriched_length = Column(Integer, nullable=False, default=0)
+
+    # Copies of ``meta['file_id']`` / ``meta['hash']``; see FILTER_COLUMNS
+    file_id = Column(Text, nullable=True)
+    hash = Column(Text, nullable=True)
+
+    __table_args__ = (
+        Index('bm25_document_collection_file_id_idx', 'collection_name', 'file_id'),
+        Index('bm25_document_collection_hash_idx', 'collection_name', 'hash'),
+    )
+
+
+class BM25Posting(Base):
+    __tablename__ = 'bm25_posting'
+
+    collection_name = Column(Text, primary_key=True)
+    term = Column(Text, primary_key=True)
+    chunk_id = Column(Text, primary_key=True)
+
+    # Occurrences in the chunk text / in the enriched text.  A posting exists
+    # when the term occurs in the enriched text, so ``tf`` may be 0.
+    tf = Column(Integer, nullable=False, default=0)
+    enriched_tf = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (Index('bm25_posting_collection_chunk_idx', 'collection_name', 'chunk_id'),)
+
+
+####################
+# Table Operations
+####################
+
+
+class BM25IndexTable:
+    async def is_ready(self, collection_name: str, db: Optional[AsyncSession] = None) -> bool:
+        async with get_async_db_context(db) as db:
+            collection = await db.get(BM25Collection, collection_name)
+            return bool(collection and collection.ready)
+
+    async def _is_indexed(self, collection_name: str, db: AsyncSession) -> bool:
+        return await db.get(BM25Collection, collection_name) is not None
+
+    async def _insert_documents(self, collection_name: str, items: list, db: AsyncSession) -> tuple[int, int, int]:
+        """Insert documents and postings; returns (count, total length, total enriched length)."""
+        documents = []
+        postings = []
+        total_length = total_enriched_length = 0
+
+        # Last write wins for ids repeated within one call.
+        for chunk_id, text, metadata in {fields[0]: fields for fields in map(_item_fields, items)}.values():
+            text = sanitize_text_for_db(text)
+
+            terms = Counter(get_terms(text))
+            enriched_terms = Counter(get_terms(get_enriched_text(text, metadata)))
+            length = sum(terms.values())
+            enriched_length = sum(enriched_terms.values())
+
+            documents.append(
+                {
+                    'collection_name': collection_name,
+                    'chunk_id': chunk_id,
+                    'text': text,
+                    'meta': sanitize_data_for_db(metadata),
+                    'length': length,
+                    'enriched_length': enriched_length,
+                    **{key: _filter_value(metadata.get(key)) for key in FILTER_COLUMNS},
+                }
+            )
+            postings.extend(
+                {
+                    'collection_name': collection_name,
+                    'term': term,
+                    'chunk_id': chunk_id,
+                    'tf': terms.get(term, 0),
+                    'enriched_tf': enriched_tf,
+                }
+                for term, enriched_tf in enriched_terms.items()
+            )
+            total_length += length
+            total_enriched_length += enriched_length
+
+        if documents:
+            await db.execute(insert(BM25Document), documents)
+        if postings:
+            await db.execute(insert(BM25Posting), postings)
+        return len(documents), total_length, total_enriched_length
+
+    async def _delete_documents(
+        self, collection_name: str, chunk_ids: list[str], db: AsyncSession
+    ) -> tuple[int, int, int]:
+        """Delete documents and postings; returns (count, total length, total enriched length)."""
+        count = length = enriched_length = 0
+        # Batched to stay under the bound parameter limit.
+        for start in range(0, len(chunk_ids), BUILD_BATCH_SIZE):
+            batch = chunk_ids[start : start + BUILD_BATCH_SIZE]
+            result = await db.execute(
+                select(
+                    func.count(BM25Document.chunk_id),
+                    func.coalesce(func.sum(BM25Document.length), 0),
+                    func.coalesce(func.sum(BM25Document.enriched_length), 0),
+                ).filter(BM25Document.collection_name == collection_name, BM25Document.chunk_id.in_(batch))
+            )
+            batch_count, batch_length, batch_enriched_length = result.one()
+            count += batch_count
+            length += batch_length
+            enriched_length += batch_enriched_length
+
+            await db.execute(
+                delete(BM25Posting).filter(
+                    BM25Posting.collection_name == collection_name, BM25Posting.chunk_id.in_(batch)
+                )
+            )
+            await db.execute(
+                delete(BM25Document).filter(
+                    BM25Document.collection_name == collection_name, BM25Document.chunk_id.in_(batch)
+                )
+            )
+        return count, length, enriched_length
+
+    async def _update_stats(
+        self,
+        collection_name: str,
+        count: int,
+        length: int,
+        enriched_length: int,
+        db: AsyncSession,
+    ) -> None:
+        # Relative update so concurrent writers on other workers don't clobber each other.
+        await db.execute(
+            update(BM25Collection)
+            .filter(BM25Collection.name == collection_name)
+            .values(
+                doc_count=BM25Collection.doc_count + count,
+                total_length=BM25Collection.total_length + length,
+                total_enriched_length=BM25Collection.total_enriched_length + enriched_length,
+                updated_at=int(time.time()),
+            )
+        )
+
+    async def build(self, collection_name: str, load_items: Callable[[], Awaitable[list]]) -> bool:
+        """Index a whole collection.  Returns False if another worker is already building it.
+
+        ``load_items`` is only called once the collection is registered, so
+        writes racing with the build are either in its snapshot or applied
+        incrementally.
+        """
+        async with get_async_db_context() as db:
+            collection = await db.get(BM25Collection, collection_name)
+            if collection is not None:
+                if collection.ready or (collection.updated_at or 0) > time.time() - BUILD_TIMEOUT:
+                    return False
+                # A previous build never finished; start over.
+                log.info(f'Restarting stale BM25 index build for {collection_name}')
+
+        await self.drop(collection_name)
+
+        try:
+            async with get_async_db_context() as db:
+                db.add(BM25Collection(name=collection_name, ready=False, updated_at=int(time.time())))
+                await db.commit()
+        except Exception:
+            # Lost the race to another worker.
+            return False
+
+        try:
+            items = await load_items()
+            for start in range(0, len(items), BUILD_BATCH_SIZE):
+                async with get_async_db_context() as db:
+                    batch = items[start : start + BUILD_BATCH_SIZE]
+                    # Writes that landed while building were already indexed incrementally.
+                    existing = await db.execute(
+                        select(BM25Document.chunk_id).filter(
+                            BM25Document.collection_name == collection_name,
+                            BM25Document.chunk_id.in_([_item_fields(item)[0] for item in batch]),
+                        )
+                    )
+                    existing_ids = set(existing.scalars().all())
+                    batch = [item for item in batch if _item_fields(item)[0] not in existing_ids]
+
+                    await self._update_stats(
+                        collection_name, *(await self._insert_documents(collection_name, batch, db)), db=db
+                    )
+                    await db.commit()
+
+            async with get_async_db_context() as db:
+                await db.execute(
+                    update(BM25Collection)
+                    .filter(BM25Collection.name == collection_name)
+                    .values(ready=True, updated_at=int(time.time()))
+                )
+                await db.commit()
+            log.info(f'Built BM25 index for {collection_name} ({len(items)} chunks)')
+            return True
+        except Exception:
+            await self.drop(collection_name)
+            raise
+
+    async def upsert(self, collection_name: str, items: list) -> None:
+        """Index chunks written to an indexed collection; no-op for unindexed ones."""
+        if not items:
+            return
+        async with get_async_db_context() as db:
+            if not await self._is_indexed(collection_name, db):
+                return
+            chunk_ids = [_item_fields(item)[0] for item in items]
+            removed = await self._delete_documents(collection_name, chunk_ids, db)
+            added = await self._insert_documents(collection_name, items, db)
+            await self._update_stats(
+                collection_name,
+                added[0] - removed[0],
+                added[1] - removed[1],
+                added[2] - removed[2],
+                db=db,
+            )
+            await db.commit()
+
+    async def delete(
+        self,
+        collection_name: str,
+        ids: Optional[list[str]] = None,
+        filter: Optional[dict] = None,
+    ) -> None:
+        """Mirror a vector DB delete by ids and/or metadata filter."""
+        async with get_async_db_context() as db:
+            if not await self._is_indexed(collection_name, db):
+                return
+
+            if filter and any(key.startswith('$') for key in filter):
+                # Operator filters are backend specific; rebuild instead.
+                await self.drop(collection_name, db=db)
+                return
+
+            chunk_ids = [str(chunk_id) for chunk_id in ids or []]
+            if filter:
+                query = select(BM25Document.chunk_id, BM25Document.meta).filter(
+                    BM25Document.collection_name == collection_name
+                )
+                # Narrow by the indexed keys in SQL; the full filter is still checked below.
+                for key in FILTER_COLUMNS:
+                    if key in filter:
+                        query = query.filter(getattr(BM25Document, key) == _filter_value(filter[key]))
+                result = await db.execute(query)
+                matched = [chunk_id for chunk_id, meta in result.all() if _matches_filter(meta or {}, filter)]
+                if ids is not None:
+                    matched_ids = set(matched)
+                    matched = [chunk_id for chunk_id in chunk_ids if chunk_id in matched_ids]
+                chunk_ids = matched
+            elif ids is None:
+                await self.drop(collection_name, db=db)
+                return
+
+            removed = await self._delete_documents(collection_name, chunk_ids, db)
+            await self._update_stats(collection_name, -removed[0], -removed[1], -removed[2], db=db)
+            await db.commit()
+
+    async def drop(self, collection_name: str, db: Optional[AsyncSession] = None) -> None:
+        async with get_async_db_context(db) as db:
+            await db.execute(delete(BM25Posting).filter(BM25Posting.collection_name == collection_name))
+            await db.execute(delete(BM25Document).filter(BM25Document.collection_name == collection_name))
+            await db.execute(delete(BM25Collection).filter(BM25Collection.name == collection_name))
+            await db.commit()
+
+    async def reset(self) -> None:
+        async with get_async_db_context() as db:
+            await db.execute(delete(BM25Posting))
+            await db.execute(delete(BM25Document))
+            await db.execute(delete(BM25Collection))
+            await db.commit()
+
+    async def search(
+        self,
+        collection_name: str,
+        query: str,
+        k: int,
+        enriched: bool = False,
+        db: Optional[AsyncSession] = None,
+    ) -> list[tuple[str, dict, float]]:
+        """Top ``k`` chunks for ``query`` as ``(text, metadata, score)``, best first."""
+        terms = list(dict.fromkeys(get_terms(query)))
+        if not terms or k <= 0:
+            return []
+
+        tf_column = BM25Posting.enriched_tf if enriched else BM25Posting.tf
+        length_column = BM25Document.enriched_length if enriched else BM25Document.length
+
+        async with get_async_db_context(db) as db:
+            collection = await db.get(BM25Collection, collection_name)
+            if collection is None or not collection.doc_count:
+                return []
+
+            doc_count = collection.doc_count
+            total_length = collection.total_enriched_length if enriched else collection.total_length
+            avg_length = (total_length / doc_count) or 1.0
+
+            result = await db.execute(
+                select(BM25Posting.term, func.count())
+                .filter(
+                    BM25Posting.collection_name == collection_name,
+                    BM25Posting.term.in_(terms),
+                    tf_column > 0,
+                )
+                .group_by(BM25Posting.term)
+            )
+            idf = {term: math.log(1 + (doc_count - df + 0.5) / (df + 0.5)) for term, df in result.all()}
+            if not idf:
+                return []
+
+            result = await db.execute(
+                select(BM25Posting.chunk_id, BM25Posting.term, tf_column, length_column)
+                .join(
+                    BM25Document,
+                    (BM25Document.collection_name == BM25Posting.collection_name)
+                    & (BM25Document.chunk_id == BM25Posting.chunk_id),
+                )
+                .filter(
+                    BM25Posting.collection_name == collection_name,
+                    BM25Posting.term.in_(list(idf)),
+                    tf_column > 0,
+                )
+            )
+
+            scores: dict[str, float] = {}
+            for chunk_id, term, tf, length in result.all():
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf[term] * tf * (BM25_K1 + 1) / (tf + norm)
+
+            top = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+            if not top:
+                return []
+
+            result = await db.execute(
+                select(BM25Document.chunk_id, BM25Document.text, BM25Document.meta).filter(
+                    BM25Document.collection_name == collection_name,
+                    BM25Document.chunk_id.in_([chunk_id for chunk_id, _ in top]),
+                )
+            )
+            documents = {chunk_id: (text, meta) for chunk_id, text, meta in result.all()}
+
+            return [
+                (documents[chunk_id][0] or '', documents[chunk_id][1] or {}, score)
+                for chunk_id, score in top
+                if chunk_id in documents
+            ]
+
+
+BM25Index = BM25IndexTable()
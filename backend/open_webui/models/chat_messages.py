@@ -1,4 +1,5 @@
 import json
+import logging
 import time
 import uuid
 from typing import Any, Optional
@@ -6,6 +7,7 @@ from typing import Any, Optional
 from sqlalchemy import select, delete, func, cast, Integer, distinct
 from sqlalchemy.ext.asyncio import AsyncSession
 from open_webui.internal.db import Base, get_async_db_context
+from open_webui.models.chat_search import TITLE_MESSAGE_ID, ChatSearch, ChatSearchEntry
 from open_webui.utils.response import merge_usage, normalize_usage
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import (
@@ -24,6 +26,8 @@ from sqlalchemy import (
 )
 from sqlalchemy.ext.asyncio import AsyncSession
 
+log = logging.getLogger(__name__)
+
 ####################
 # Helpers
 ####################
@@ -208,7 +212,10 @@ class ChatMessageTable:
                 existing.updated_at = now
                 await db.commit()
                 await db.refresh(existing)
-                return ChatMessageModel.model_validate(existing)
+                model = ChatMessageModel.model_validate(existing)
+                if {'content', 'output', 'done'} & data.keys():
+                    await self._index_message(existing, message_id, db=db)
+                return model
             else:
                 # Insert new
                 # Extract and normalize usage
@@ -236,7 +243,26 @@ class ChatMessageTable:
                 db.add(message)
                 await db.commit()
                 await db.refresh(message)
-                return ChatMessageModel.model_validate(message)
+                model = ChatMessageModel.model_validate(message)
+                await self._index_message(message, message_id, db=db)
+                return model
+
+    async def _index_message(self, row: ChatMessage, message_id: str, db: AsyncSession) -> None:
+        # Index finished messages only; streaming snapshots are superseded anyway.
+        if not row.done or row.user_id.startswith('shared-'):
+            return
+        try:
+            await ChatSearch.index_message(
+                row.chat_id,
+                message_id,
+                row.user_id,
+                {'content': row.content, 'output': row.output},
+                db=db,
+            )
+        except Exception as e:
+            # The message itself is already saved; leave the session usable for the caller.
+            log.warning(f'Failed to index message {message_id} of chat {row.chat_id}: {e}')
+            await db.rollback()
 
     async def get_message_by_id(self, id: str, db: Optional[AsyncSession] = None) -> Optional[ChatMessageModel]:
         async with get_async_db_context(db) as db:
@@ -262,6 +288,68 @@ class ChatMessageTable:
     # DB-internal columns excluded from the reconstructed message dict.
     EXCLUDED_COLUMNS = frozenset({'id', 'chat_id', 'user_id', 'updated_at'})
 
+    def _row_to_message_dict(self, row: ChatMessage, chat_id: str, default_content: bool = True) -> dict:
+        """Convert a ``chat_message`` row into the legacy history message shape.
+
+        With ``default_content=False`` unset columns are simply omitted, so the
+        result can be overlaid onto a message from the embedded history.
+        """
+        # Strip the composite-id prefix ("{chat_id}-") to recover the
+        # original message_id used as map key.
+        prefix = f'{chat_id}-'
+        msg_id = row.id[len(prefix) :] if row.id.startswith(prefix) else row.id
+
+        msg: dict = {'id': msg_id}
+        for column in ChatMessage.__table__.columns:
+            key = column.key
+            if key in self.EXCLUDED_COLUMNS:
+                continue
+            val = getattr(row, key)
+            if val is None:
+                continue
+            json_key = self.DB_TO_JSON_KEY_MAP.get(key, key)
+            msg[json_key] = val
+
+        # Ensure content always has a value
+        if default_content:
+            msg.setdefault('content', '')
+
+        # Mirror usage into info.usage for callers that read it there
+        if 'usage' in msg:
+            msg['info'] = {'usage': msg['usage']}
+
+        return msg
+
+    async def get_message_by_chat_id_and_message_id(
+        self, chat_id: str, message_id: str, db: Optional[AsyncSession] = None
+    ) -> Optional[dict]:
+        """Return a single message in the legacy history shape, or None."""
+        async with get_async_db_context(db) as db:
+            row = await db.get(ChatMessage, f'{chat_id}-{message_id}')
+            return self._row_to_message_dict(row, chat_id, default_content=False) if row else None
+
+    async def get_messages_maps_by_chat_ids(
+        self, chat_ids: list[str], db: Optional[AsyncSession] = None
+    ) -> dict[str, dict[str, dict]]:
+        """Bulk variant of ``get_messages_map_by_chat_id``.
+
+        Returns ``{chat_id: {message_id: message_dict}}`` for chats that have
+        rows.  Tree links (``childrenIds``) are not reconstructed here; callers
+        overlay these bodies onto the tree stored in ``chat.chat``.
+        """
+        if not chat_ids:
+            return {}
+
+        async with get_async_db_context(db) as db:
+            result = await db.execute(select(ChatMessage).filter(ChatMessage.chat_id.in_(chat_ids)))
+            rows = result.scalars().all()
+
+        maps: dict[str, dict[str, dict]] = {}
+        for row in rows:
+            msg = self._row_to_message_dict(row, row.chat_id, default_content=False)
+            maps.setdefault(row.chat_id, {})[msg['id']] = msg
+        return maps
+
     async def get_messages_map_by_chat_id(self, chat_id: str, db: Optional[AsyncSession] = None) -> Optional[dict]:
         """Build a {message_id: message_dict} map from chat_message rows.
 
@@ -277,34 +365,10 @@ class ChatMessageTable:
         if not rows:
             return None
 
-        # Strip the composite-id prefix ("{chat_id}-") to recover the
-        # original message_id used as map key.
-        prefix = f'{chat_id}-'
-        prefix_len = len(prefix)
-        col_keys = [c.key for c in ChatMessage.__table__.columns]
-
         messages_map: dict[str, dict] = {}
         for row in rows:
-            msg_id = row.id[prefix_len:] if row.id.startswith(prefix) else row.id
-
-            msg: dict = {'id': msg_id}
-            for key in col_keys:
-                if key in self.EXCLUDED_COLUMNS:
-                    continue
-                val = getattr(row, key)
-                if val is None:
-                    continue
-                json_key = self.DB_TO_JSON_KEY_MAP.get(key, key)
-                msg[json_key] = val
-
-            # Ensure content always has a value
-            msg.setdefault('content', '')
-
-            # Mirror usage into info.usage for callers that read it there
-            if 'usage' in msg:
-                msg['info'] = {'usage': msg['usage']}
-
-            messages_map[msg_id] = msg
+            msg = self._row_to_message_dict(row, chat_id)
+            messages_map[msg['id']] = msg
 
         # Reconstruct childrenIds from parentId links so that the map
         # is fully navigable (callers like the frontend rely on this).
@@ -399,6 +463,11 @@ class ChatMessageTable:
     async def delete_messages_by_chat_id(self, chat_id: str, db: Optional[AsyncSession] = None) -> bool:
         async with get_async_db_context(db) as db:
             await db.execute(delete(ChatMessage).filter_by(chat_id=chat_id))
+            await db.execute(
+                delete(ChatSearchEntry).filter(
+                    ChatSearchEntry.chat_id == chat_id, ChatSearchEntry.message_id != TITLE_MESSAGE_ID
+                )
+            )
             await db.commit()
             return True
 
@@ -417,6 +486,11 @@ class ChatMessageTable:
                 .where(ChatMessage.chat_id == chat_id)
                 .where(ChatMessage.id.in_({f'{chat_id}-{mid}' for mid in message_ids}))
             )
+            await db.execute(
+                delete(ChatSearchEntry)
+                .where(ChatSearchEntry.chat_id == chat_id)
+                .where(ChatSearchEntry.id.in_({f'{chat_id}-{mid}' for mid in message_ids}))
+            )
             await db.commit()
             return True
 
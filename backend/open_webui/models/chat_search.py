@@ -0,0 +1,320 @@
+"""Full-text index over chat titles and message bodies.
+
+One ``chat_search`` row per indexed document: the chat title (``message_id``
+is ``''``) and every message with text.  The full-text structure itself is
+dialect specific and created by migration:
+
+- SQLite: an FTS5 external-content table ``chat_search_fts`` kept in sync
+  with ``chat_search`` by triggers.
+- PostgreSQL: a generated ``tsv`` tsvector column with a GIN index.
+
+Rows are written incrementally from ``ChatMessages.upsert_message`` and the
+title setters in ``ChatTable``; ``backfill_chat_search_index`` indexes chats
+that predate the index.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from typing import Optional
+
+from open_webui.internal.db import Base, get_async_db_context
+from sqlalchemy import BigInteger, Column, Float, ForeignKey, Index, Text, select, text
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+log = logging.getLogger(__name__)
+
+TITLE_MESSAGE_ID = ''
+SNIPPET_WORDS = 24
+
+DIALECT_INSERTS = {'postgresql': postgresql_insert, 'sqlite': sqlite_insert}
+
+####################
+# Helpers
+####################
+
+
+def get_message_search_text(message: dict) -> str:
+    """Plain text of a message: ``content`` plus text parts of ``output``."""
+    parts = []
+
+    content = message.get('content')
+    if isinstance(content, str):
+        parts.append(content)
+    elif isinstance(content, list):
+        for block in content:
+            if isinstance(block, dict) and isinstance(block.get('text'), str):
+                parts.append(block['text'])
+
+    for item in message.get('output') or []:
+        if not isinstance(item, dict) or item.get('type') != 'message':
+            continue
+        for part in item.get('content') or []:
+            if isinstance(part, dict) and part.get('type') == 'output_text' and isinstance(part.get('text'), str):
+                parts.append(part['text'])
+
+    # Output usually mirrors content; avoid indexing the same text twice.
+    return '\n'.join(dict.fromkeys(part.strip() for part in parts if part and part.strip()))
+
+
+def get_search_tokens(search_text: str) -> list[str]:
+    return re.findall(r'\w+', search_text.lower())
+
+
+####################
+# ChatSearch DB Schema
+####################
+
+
+class ChatSearchEntry(Base):
+    __tablename__ = 'chat_search'
+
+    # Composite ID: {chat_id}-{message_id}; the title uses {chat_id}-
+    id = Column(Text, primary_key=True)
+    chat_id = Column(Text, ForeignKey('chat.id', ondelete='CASCADE'), nullable=False)
+    message_id = Column(Text, nullable=False)
+    user_id = Column(Text, nullable=False)
+
+    body = Column(Text, nullable=True)
+    updated_at = Column(BigInteger)
+
+    __table_args__ = (
+        Index('chat_search_chat_id_idx', 'chat_id'),
+        Index('chat_search_user_id_idx', 'user_id'),
+    )
+
+
+####################
+# Table Operations
+####################
+
+
+class ChatSearchTable:
+    async def upsert_entry(
+        self,
+        chat_id: str,
+        message_id: str,
+        user_id: str,
+        body: str,
+        overwrite: bool = True,
+        db: Optional[AsyncSession] = None,
+    ) -> None:
+        """Index ``body`` for the message; with ``overwrite=False`` an existing entry is kept.
+
+        The same finished message can be saved concurrently (possibly by different
+        workers), so the write is a single INSERT ... ON CONFLICT where supported.
+        """
+        entry_id = f'{chat_id}-{message_id}'
+        now = int(time.time())
+        async with get_async_db_context(db) as db:
+            dialect_insert = DIALECT_INSERTS.get(db.bind.dialect.name)
+            if dialect_insert is not None:
+                stmt = dialect_insert(ChatSearchEntry).values(
+                    id=entry_id,
+                    chat_id=chat_id,
+                    message_id=message_id,
+                    user_id=user_id,
+                    body=body,
+                    updated_at=now,
+                )
+                if overwrite:
+                    # Skip unchanged bodies so the full-text index is not rewritten.
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=['id'],
+                        set_={'body': stmt.excluded.body, 'updated_at': stmt.excluded.updated_at},
+                        where=ChatSearchEntry.body.is_distinct_from(stmt.excluded.body),
+                    )
+                else:
+                    stmt = stmt.on_conflict_do_nothing(index_elements=['id'])
+                await db.execute(stmt)
+                await db.commit()
+                return
+
+            entry = await db.get(ChatSearchEntry, entry_id)
+            if entry is None:
+                db.add(
+                    ChatSearchEntry(
+                        id=entry_id,
+                        chat_id=chat_id,
+                        message_id=message_id,
+                        user_id=user_id,
+                        body=body,
+                        updated_at=now,
+                    )
+                )
+            elif overwrite and entry.body != body:
+                entry.body = body
+                entry.updated_at = now
+            else:
+                return
+            await db.commit()
+
+    async def index_title(
+        self, chat_id: str, user_id: str, title: str, overwrite: bool = True, db: Optional[AsyncSession] = None
+    ) -> None:
+        await self.upsert_entry(chat_id, TITLE_MESSAGE_ID, user_id, title or '', overwrite=overwrite, db=db)
+
+    async def index_message(
+        self,
+        chat_id: str,
+        message_id: str,
+        user_id: str,
+        message: dict,
+        overwrite: bool = True,
+        db: Optional[AsyncSession] = None,
+    ) -> None:
+        await self.upsert_entry(
+            chat_id, message_id, user_id, get_message_search_text(message), overwrite=overwrite, db=db
+        )
+
+    def get_match_subquery(self, dialect_name: str, user_id: str, search_text: str):
+        """Subquery of ``(chat_id, score)`` for the user's chats matching every token.
+
+        Higher ``score`` is a better match.  Returns None when ``search_text``
+        has no searchable tokens.
+        """
+        tokens = get_search_tokens(search_text)
+        if not tokens:
+            return None
+
+        if dialect_name == 'sqlite':
+            # FTS5 ``rank`` is bm25(), lower-is-better; negate so both dialects
+            # sort descending.  bm25() itself cannot be used inside an aggregate.
+            stmt = text(
+                'SELECT chat_search.chat_id AS chat_id, MAX(-chat_search_fts.rank) AS score '
+                'FROM chat_search_fts JOIN chat_search ON chat_search.rowid = chat_search_fts.rowid '
+                'WHERE chat_search_fts MATCH :search_query AND chat_search.user_id = :search_user_id '
+                'GROUP BY chat_search.chat_id'
+            ).bindparams(
+                search_query=' '.join(f'"{token}"*' for token in tokens),
+                search_user_id=user_id,
+            )
+        elif dialect_name == 'postgresql':
+            stmt = text(
+                "SELECT chat_id, MAX(ts_rank(tsv, to_tsquery('simple', :search_query))) AS score "
+                'FROM chat_search '
+                "WHERE user_id = :search_user_id AND tsv @@ to_tsquery('simple', :search_query) "
+                'GROUP BY chat_id'
+            ).bindparams(
+                search_query=' & '.join(f'{token}:*' for token in tokens),
+                search_user_id=user_id,
+            )
+        else:
+            raise NotImplementedError(f'Unsupported dialect: {dialect_name}')
+
+        return stmt.columns(chat_id=Text, score=Float).subquery('chat_search_matches')
+
+    async def get_snippets(
+        self,
+        user_id: str,
+        chat_ids: list[str],
+        search_text: str,
+        db: Optional[AsyncSession] = None,
+    ) -> dict[str, str]:
+        """Best-matching message excerpt per chat, for the given page of results."""
+        tokens = get_search_tokens(search_text)
+        if not tokens or not chat_ids:
+            return {}
+
+        async with get_async_db_context(db) as db:
+            bind = await db.connection()
+            dialect_name = bind.dialect.name
+
+            params = {'search_user_id': user_id}
+            id_params = {f'chat_id_{idx}': chat_id for idx, chat_id in enumerate(chat_ids)}
+            id_list = ', '.join(f':{key}' for key in id_params)
+            params.update(id_params)
+
+            if dialect_name == 'sqlite':
+                params['search_query'] = ' '.join(f'"{token}"*' for token in tokens)
+                stmt = text(
+                    'SELECT chat_search.chat_id, '
+                    f"snippet(chat_search_fts, 0, '', '', '...', {SNIPPET_WORDS}) "
+                    'FROM chat_search_fts JOIN chat_search ON chat_search.rowid = chat_search_fts.rowid '
+                    'WHERE chat_search_fts MATCH :search_query AND chat_search.user_id = :search_user_id '
+                    f"AND chat_search.message_id != '' AND chat_search.chat_id IN ({id_list}) "
+                    'ORDER BY chat_search_fts.rank'
+                )
+            elif dialect_name == 'postgresql':
+                params['search_query'] = ' & '.join(f'{token}:*' for token in tokens)
+                stmt = text(
+                    "SELECT chat_id, ts_headline('simple', body, to_tsquery('simple', :search_query), "
+                    f'\'StartSel="",StopSel="",MaxWords={SNIPPET_WORDS},MinWords=8,ShortWord=0\') '
+                    'FROM chat_search '
+                    "WHERE user_id = :search_user_id AND tsv @@ to_tsquery('simple', :search_query) "
+                    f"AND message_id != '' AND chat_id IN ({id_list}) "
+                    "ORDER BY ts_rank(tsv, to_tsquery('simple', :search_query)) DESC"
+                )
+            else:
+                raise NotImplementedError(f'Unsupported dialect: {dialect_name}')
+
+            result = await db.execute(stmt, params)
+            snippets: dict[str, str] = {}
+            for chat_id, snippet in result.all():
+                if chat_id not in snippets and snippet:
+                    snippets[chat_id] = ' '.join(snippet.split())
+            return snippets
+
+    async def backfill(self, batch_size: int = 200) -> int:
+        """Index chats that have no title entry yet.  Returns the number indexed."""
+        from open_webui.models.chats import Chat, Chats
+
+        total = 0
+        # Chats that could not even be marked; left for the next start.
+        skipped: set[str] = set()
+        while True:
+            async with get_async_db_context() as db:
+                indexed = select(ChatSearchEntry.chat_id).filter(ChatSearchEntry.message_id == TITLE_MESSAGE_ID)
+                query = select(Chat.id).filter(~Chat.id.in_(indexed), ~Chat.user_id.like('shared-%'))
+                if skipped:
+                    query = query.filter(Chat.id.not_in(skipped))
+                result = await db.execute(query.limit(batch_size))
+                chat_ids = [row[0] for row in result.all()]
+
+            if not chat_ids:
+                return total
+
+            for chat_id in chat_ids:
+                chat = await Chats.get_chat_by_id(chat_id)
+                if chat is None:
+                    continue
+                # Entries written meanwhile (by live saves or another worker's backfill) are newer; keep them.
+                try:
+                    async with get_async_db_context() as db:
+                        messages = (chat.chat.get('history') or {}).get('messages') or {}
+                        for message_id, message in messages.items():
+                            if isinstance(message, dict) and message.get('role'):
+                                await self.index_message(
+                                    chat.id, message_id, chat.user_id, message, overwrite=False, db=db
+                                )
+                        # Title last: its presence marks the chat as indexed.
+                        await self.index_title(chat.id, chat.user_id, chat.title, overwrite=False, db=db)
+                except Exception as e:
+                    log.warning('Failed to index chat %s for search: %s', chat_id, e)
+                    # Mark it anyway so a bad chat cannot stall the backfill.
+                    try:
+                        await self.index_title(chat.id, chat.user_id, chat.title, overwrite=False)
+                    except Exception as e:
+                        log.warning('Failed to mark chat %s as indexed: %s', chat_id, e)
+                        skipped.add(chat_id)
+                        continue
+                total += 1
+
+            # Yield to request handling between batches.
+            await asyncio.sleep(0)
+
+
+ChatSearch = ChatSearchTable()
+
+
+async def backfill_chat_search_index():
+    """Startup job: index chats created before the search index existed."""
+    try:
+        count = await ChatSearch.backfill()
+        if count:
+            log.info('Indexed %d chat(s) for full-text search', count)
+    except Exception as e:
+        log.warning(f'Chat search backfill failed: {e}')
@@ -11,6 +11,7 @@ import uuid
 from open_webui.internal.db import Base, JSONField, get_async_db_context
 from open_webui.models.automations import AutomationRun
 from open_webui.models.chat_messages import ChatMessage, ChatMessages
+from open_webui.models.chat_search import ChatSearch, ChatSearchEntry
 from open_webui.models.folders import Folders
 from open_webui.models.tags import Tag, TagModel, Tags
 from open_webui.utils.misc import sanitize_data_for_db, sanitize_text_for_db
@@ -36,10 +37,29 @@ from sqlalchemy import (
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm.attributes import flag_modified
 from sqlalchemy.sql import exists
-from sqlalchemy.sql.expression import bindparam
 
 log = logging.getLogger(__name__)
 
+# Message keys stored in ``chat_message`` columns.  Once a message has a row,
+# these are dropped from the embedded ``chat.chat`` history and assembled back
+# on read, so per-message updates never rewrite the whole chat blob.
+MESSAGE_BODY_KEYS = frozenset(
+    {
+        'content',
+        'output',
+        'files',
+        'sources',
+        'embeds',
+        'statusHistory',
+        'error',
+        'usage',
+        'contextSummary',
+    }
+)
+
+# Keys an existing message can be updated with without touching the tree.
+MESSAGE_ROW_KEYS = MESSAGE_BODY_KEYS | {'id', 'role', 'model', 'done'}
+
 
 class Chat(Base):  # database table mapping for chat entity
     __tablename__ = 'chat'
@@ -348,6 +368,14 @@ class ChatTable:
         history['currentId'] = latest_leaf_id
         return True
 
+    async def _index_title(self, chat_item: Chat, db: AsyncSession | None = None) -> None:
+        if chat_item.user_id.startswith('shared-'):
+            return
+        try:
+            await ChatSearch.index_title(chat_item.id, chat_item.user_id, chat_item.title, db=db)
+        except Exception as e:
+            log.warning(f'Failed to index title for chat {chat_item.id}: {e}')
+
     async def insert_new_chat(
         self, id: str, user_id: str, form_data: ChatForm, db: AsyncSession | None = None
     ) -> ChatModel | None:
@@ -371,6 +399,7 @@ class ChatTable:
             session.add(chat_item)
             await session.commit()
             await session.refresh(chat_item)
+            await self._index_title(chat_item, db=session)
 
             # Dual-write initial messages to chat_message table
             try:
@@ -436,6 +465,8 @@ class ChatTable:
 
             session.add_all(chats)
             await session.commit()
+            for chat_obj in chats:
+                await self._index_title(chat_obj, db=session)
 
             # Dual-write messages to chat_message table
             for form_data, chat_obj in zip(chat_import_forms, chats):
@@ -474,6 +505,7 @@ class ChatTable:
                 chat_item.updated_at = int(time.time())
 
                 await session.commit()
+                await self._index_title(chat_item, db=session)
 
                 return ChatModel.model_validate(chat_item)
         except Exception:
@@ -502,6 +534,7 @@ class ChatTable:
                 chat_item.chat = {**(chat_item.chat or {}), 'title': clean_title}
                 await session.commit()
                 await session.refresh(chat_item)
+                await self._index_title(chat_item, db=session)
                 return ChatModel.model_validate(chat_item)
         except Exception:
             return None
@@ -573,6 +606,79 @@ class ChatTable:
 
         return {**(existing_history or {}), **(incoming_history or {}), 'messages': merged, 'currentId': current_id}
 
+    @staticmethod
+    def strip_message_body(message: dict) -> dict:
+        """Return the tree/metadata part of a message for the embedded history.
+
+        Bodies live in ``chat_message``; ``chat.chat`` only keeps what is
+        needed to navigate the tree.
+        """
+        return {key: value for key, value in message.items() if key not in MESSAGE_BODY_KEYS}
+
+    @staticmethod
+    def hydrate_history(chat: dict, messages_map: dict[str, dict]) -> dict:
+        """Overlay ``chat_message`` bodies onto the tree stored in ``chat.chat``.
+
+        Returns a new chat dict; ``chat`` itself is not mutated.  Tree links
+        (``parentId``/``childrenIds``/``currentId``) from the embedded history
+        win, everything else is taken from the rows.
+        """
+        if not messages_map:
+            return chat
+
+        history = chat.get('history')
+        if not isinstance(history, dict):
+            return chat
+
+        embedded = history.get('messages') or {}
+        messages = {}
+        for message_id, message in embedded.items():
+            row = messages_map.get(message_id)
+            if not isinstance(message, dict) or row is None:
+                messages[message_id] = message
+                continue
+
+            merged = {**message, **row}
+            if 'parentId' in message:
+                merged['parentId'] = message['parentId']
+            if 'childrenIds' in message:
+                merged['childrenIds'] = message['childrenIds']
+            if isinstance(message.get('info'), dict) and 'info' in row:
+                merged['info'] = {**message['info'], **row['info']}
+            messages[message_id] = merged
+
+        # Rows that never made it into the tree (e.g. a failed blob write):
+        # attach them under their parent so the history stays navigable.
+        for message_id, row in messages_map.items():
+            if message_id in messages:
+                continue
+            messages[message_id] = {**row, 'childrenIds': []}
+            parent = messages.get(row.get('parentId'))
+            if isinstance(parent, dict):
+                children = list(parent.get('childrenIds') or [])
+                if message_id not in children:
+                    parent = {**parent, 'childrenIds': [*children, message_id]}
+                    messages[row['parentId']] = parent
+
+        return {**chat, 'history': {**history, 'messages': messages}}
+
+    async def _hydrate_chat_models(self, chats: list[ChatModel], db: AsyncSession | None = None) -> list[ChatModel]:
+        """Assemble the legacy ``chat.history`` for each chat from ``chat_message`` rows."""
+        if not chats:
+            return chats
+
+        messages_maps = await ChatMessages.get_messages_maps_by_chat_ids([chat.id for chat in chats], db=db)
+        for chat in chats:
+            messages_map = messages_maps.get(chat.id)
+            if messages_map:
+                chat.chat = self.hydrate_history(chat.chat or {}, messages_map)
+        return chats
+
+    async def hydrate_chat(self, id: str, chat: dict, db: AsyncSession | None = None) -> dict:
+        """Return ``chat`` (a raw ``Chat.chat`` blob) with message bodies assembled."""
+        messages_maps = await ChatMessages.get_messages_maps_by_chat_ids([id], db=db)
+        return self.hydrate_history(chat or {}, messages_maps.get(id) or {})
+
     @staticmethod
     def delete_message_from_history(history: dict, message_id: str) -> set[str]:
         messages = history.get('messages') or {}
@@ -613,10 +719,13 @@ class ChatTable:
         history['currentId'] = current_id if current_id in messages else None
         return deleted_ids
 
-    async def backfill_messages_by_chat_id(self, chat_id: str, user_id: str, messages: dict[str, dict]) -> None:
+    async def backfill_messages_by_chat_id(self, chat_id: str, user_id: str, messages: dict[str, dict]) -> set[str]:
         """Write messages to the ``chat_message`` table so future lookups
         use the fast path.  Errors are logged but never raised.
+
+        Returns the IDs of the messages written.
         """
+        written = set()
         for message_id, message in messages.items():
             if not isinstance(message, dict) or not message.get('role'):
                 continue
@@ -627,19 +736,33 @@ class ChatTable:
                     user_id=user_id,
                     data=message,
                 )
+                written.add(message_id)
             except Exception as e:
                 log.warning('Backfill failed for message %s in chat %s: %s', message_id, chat_id, e)
+        return written
 
-    async def reconcile_messages_by_chat_id(self, chat_id: str, user_id: str, messages: dict[str, dict]) -> None:
-        """Sync ``chat_message`` rows with the committed JSON blob.
+    async def reconcile_messages_by_chat_id(self, chat_id: str, user_id: str, messages: dict[str, dict]) -> set[str]:
+        """Sync ``chat_message`` rows with ``messages``.
 
-        Upserts current messages via ``backfill_messages_by_chat_id``.
-        Best-effort: errors are logged but never raised.
+        Upserts current messages via ``backfill_messages_by_chat_id`` and
+        returns the IDs written.  Best-effort: errors are logged but never raised.
         """
         try:
-            await self.backfill_messages_by_chat_id(chat_id, user_id, messages)
+            return await self.backfill_messages_by_chat_id(chat_id, user_id, messages)
         except Exception as e:
             log.warning('Failed to reconcile chat_message rows for chat %s: %s', chat_id, e)
+            return set()
+
+    def strip_history_bodies(self, chat: dict, message_ids: set[str]) -> dict:
+        """Copy of ``chat`` with the bodies of ``message_ids`` removed from its history."""
+        history = chat.get('history')
+        if not message_ids or not isinstance(history, dict):
+            return chat
+        messages = {
+            message_id: self.strip_message_body(message) if message_id in message_ids else message
+            for message_id, message in (history.get('messages') or {}).items()
+        }
+        return {**chat, 'history': {**history, 'messages': messages}}
 
     async def get_messages_map_by_chat_id(self, id: str) -> dict | None:
         """Message map for walking history (see ``get_message_list``).
@@ -695,24 +818,69 @@ class ChatTable:
         return history_messages
 
     async def get_message_by_id_and_message_id(self, id: str, message_id: str) -> dict | None:
-        chat = await self.get_chat_by_id(id)
-        if chat is None:
-            return None
+        """Return one message without loading the whole chat history."""
+        async with get_async_db_context() as session:
+            result = await session.execute(
+                select(Chat.id, Chat.chat[('history', 'messages', message_id)]).filter_by(id=id)
+            )
+            row = result.first()
+            if row is None:
+                return None
 
-        return chat.chat.get('history', {}).get('messages', {}).get(message_id, {})
+            message = row[1] if isinstance(row[1], dict) else {}
+            body = await ChatMessages.get_message_by_chat_id_and_message_id(id, message_id, db=session)
+
+        if body is None:
+            return message
+        chat = self.hydrate_history({'history': {'messages': {message_id: message}}}, {message_id: body})
+        return chat['history']['messages'][message_id]
 
     async def upsert_message_to_chat_by_id_and_message_id(
         self, id: str, message_id: str, message: dict
     ) -> ChatModel | None:
-        chat = await self.get_chat_by_id(id)
-        if chat is None:
-            return None
+        """Upsert one message.
 
+        Message bodies are written to ``chat_message`` only.  ``chat.chat`` is
+        rewritten just when the tree changes (new message, new links, a new
+        ``currentId``, or keys that have no ``chat_message`` column), and then
+        only with the stripped message.
+        """
         # Sanitize message content for null characters before upserting
         if isinstance(message.get('content'), str):
             message['content'] = sanitize_text_for_db(message['content'])
 
-        user_id = chat.user_id
+        async with get_async_db_context() as session:
+            result = await session.execute(
+                select(Chat.user_id, Chat.chat[('history', 'currentId')].as_string()).filter_by(id=id)
+            )
+            row = result.first()
+            if row is None:
+                return None
+            user_id, current_id = row
+
+            # Fast path: body-only update of a message that already has a row
+            # and is already the current leaf.
+            if (
+                current_id == message_id
+                and set(message) <= MESSAGE_ROW_KEYS
+                and await session.get(ChatMessage, f'{id}-{message_id}') is not None
+            ):
+                await ChatMessages.upsert_message(
+                    message_id=message_id,
+                    chat_id=id,
+                    user_id=user_id,
+                    data=message,
+                    db=session,
+                )
+                await session.execute(update(Chat).filter_by(id=id).values(updated_at=int(time.time())))
+                await session.commit()
+                chat_item = await session.get(Chat, id)
+                return ChatModel.model_validate(chat_item) if chat_item else None
+
+        chat = await self.get_chat_by_id(id, hydrate=False)
+        if chat is None:
+            return None
+
         chat = chat.chat
         history = chat.get('history', {})
         messages = history.setdefault('messages', {})
@@ -758,9 +926,8 @@ class ChatTable:
 
         history['currentId'] = message_id
 
-        chat['history'] = history
-
-        # Dual-write to chat_message table
+        # Write the body first; only strip it from the blob once the row
+        # holds it, so a failed row write never loses content.
         try:
             await ChatMessages.upsert_message(
                 message_id=message_id,
@@ -768,9 +935,12 @@ class ChatTable:
                 user_id=user_id,
                 data=messages[message_id],
             )
+            messages[message_id] = self.strip_message_body(messages[message_id])
         except Exception as e:
             log.warning(f'Failed to write to chat_message table: {e}')
 
+        chat['history'] = history
+
         return await self.update_chat_by_id(id, chat)
 
     async def delete_message_from_chat_by_id_and_message_id(self, id: str, message_id: str) -> ChatModel | None:
@@ -786,50 +956,65 @@ class ChatTable:
 
         messages = history.get('messages') or {}
         chat['history'] = history
-        updated_chat = await self.update_chat_by_id(id, chat)
+        written = await self.backfill_messages_by_chat_id(id, chat_model.user_id, messages)
+        updated_chat = await self.update_chat_by_id(id, self.strip_history_bodies(chat, written))
 
-        await self.backfill_messages_by_chat_id(id, chat_model.user_id, messages)
         await ChatMessages.delete_message_ids_by_chat_id(id, deleted_ids)
 
         return updated_chat
 
+    async def update_message_body_by_id_and_message_id(self, id: str, message_id: str, data: dict) -> ChatModel | None:
+        """Write body keys of an existing message straight to ``chat_message``.
+
+        Unlike ``upsert_message_to_chat_by_id_and_message_id`` this never moves
+        ``currentId``.  Falls back to the full upsert for legacy chats whose
+        message has no row yet.
+        """
+        async with get_async_db_context() as session:
+            result = await session.execute(select(Chat.user_id).filter_by(id=id))
+            user_id = result.scalar()
+            if user_id is None:
+                return None
+
+            if await session.get(ChatMessage, f'{id}-{message_id}') is None:
+                return await self.upsert_message_to_chat_by_id_and_message_id(id, message_id, data)
+
+            await ChatMessages.upsert_message(
+                message_id=message_id,
+                chat_id=id,
+                user_id=user_id,
+                data=data,
+                db=session,
+            )
+            await session.execute(update(Chat).filter_by(id=id).values(updated_at=int(time.time())))
+            await session.commit()
+            chat_item = await session.get(Chat, id)
+            return ChatModel.model_validate(chat_item) if chat_item else None
+
     async def add_message_status_to_chat_by_id_and_message_id(
         self, id: str, message_id: str, status: dict
     ) -> ChatModel | None:
-        chat = await self.get_chat_by_id(id)
-        if chat is None:
+        message = await self.get_message_by_id_and_message_id(id, message_id)
+        if message is None:
             return None
 
-        chat = chat.chat
-        history = chat.get('history', {})
-
-        if message_id in history.get('messages', {}):
-            status_history = history['messages'][message_id].get('statusHistory', [])
-            status_history.append(status)
-            history['messages'][message_id]['statusHistory'] = status_history
+        if not message:
+            return await self.get_chat_by_id(id)
 
-        chat['history'] = history
-        return await self.update_chat_by_id(id, chat)
+        status_history = [*(message.get('statusHistory') or []), status]
+        return await self.update_message_body_by_id_and_message_id(id, message_id, {'statusHistory': status_history})
 
     async def add_message_files_by_id_and_message_id(self, id: str, message_id: str, files: list[dict]) -> list[dict]:
-        async with get_async_db_context() as session:
-            chat = await self.get_chat_by_id(id, db=session)
-            if chat is None:
-                return None
-
-            chat = chat.chat
-            history = chat.get('history', {})
-
-            message_files = []
+        message = await self.get_message_by_id_and_message_id(id, message_id)
+        if message is None:
+            return None
 
-            if message_id in history.get('messages', {}):
-                message_files = history['messages'][message_id].get('files', [])
-                message_files = message_files + files
-                history['messages'][message_id]['files'] = message_files
+        message_files = []
 
-            chat['history'] = history
-            await self.update_chat_by_id(id, chat, db=session)
-            return message_files
+        if message:
+            message_files = (message.get('files') or []) + files
+            await self.update_message_body_by_id_and_message_id(id, message_id, {'files': message_files})
+        return message_files
 
     async def insert_shared_chat_by_chat_id(self, chat_id: str, db: AsyncSession | None = None) -> ChatModel | None:
         """Create a shared snapshot for a chat. Returns the original chat with share_id set."""
@@ -1127,7 +1312,7 @@ class ChatTable:
                 select(Chat).filter(Chat.id.in_(chat_ids)).filter_by(archived=False).order_by(Chat.updated_at.desc())
             )
             all_chats = result.scalars().all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return await self._hydrate_chat_models([ChatModel.model_validate(chat) for chat in all_chats], db=session)
 
     async def get_chat_metas_by_chat_ids(
         self,
@@ -1213,8 +1398,13 @@ class ChatTable:
         self,
         id: str,
         db: AsyncSession | None = None,
+        hydrate: bool = True,
     ) -> ChatModel | None:
-        """Fetch a chat by PK, auto-sanitizing null bytes on read."""
+        """Fetch a chat by PK, auto-sanitizing null bytes on read.
+
+        With ``hydrate=False`` the raw ``chat.chat`` tree is returned without
+        message bodies from ``chat_message``.
+        """
         try:
             async with get_async_db_context(db) as session:
                 chat_item = await session.get(Chat, id)
@@ -1228,7 +1418,10 @@ class ChatTable:
                     await session.commit()
                     await session.refresh(chat_item)
 
-                return ChatModel.model_validate(chat_item)
+                chat = ChatModel.model_validate(chat_item)
+                if hydrate:
+                    await self._hydrate_chat_models([chat], db=session)
+                return chat
         except Exception:
             return None
 
@@ -1270,7 +1463,9 @@ class ChatTable:
                     await session.commit()
                     await session.refresh(chat)
 
-                return ChatModel.model_validate(chat)
+                chat_model = ChatModel.model_validate(chat)
+                await self._hydrate_chat_models([chat_model], db=session)
+                return chat_model
         except Exception:
             return None
 
@@ -1303,7 +1498,7 @@ class ChatTable:
         async with get_async_db_context(db) as session:
             result = await session.execute(select(Chat).order_by(Chat.updated_at.desc()))
             all_chats = result.scalars().all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return await self._hydrate_chat_models([ChatModel.model_validate(chat) for chat in all_chats], db=session)
 
     # list user conversations
     async def get_chats_by_user_id(
@@ -1349,7 +1544,9 @@ class ChatTable:
 
             return ChatListResponse(
                 **{
-                    'items': [ChatModel.model_validate(chat) for chat in all_chats],
+                    'items': await self._hydrate_chat_models(
+                        [ChatModel.model_validate(chat) for chat in all_chats], db=session
+                    ),
                     'total': total,
                 }
             )
@@ -1383,7 +1580,9 @@ class ChatTable:
             result = await session.execute(
                 select(Chat).filter_by(user_id=user_id, archived=True).order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in result.scalars().all()]
+            return await self._hydrate_chat_models(
+                [ChatModel.model_validate(chat) for chat in result.scalars().all()], db=session
+            )
 
     # search user conversations
     async def get_chats_by_user_id_and_search_text(
@@ -1394,9 +1593,10 @@ class ChatTable:
         skip: int = 0,
         limit: int = 60,
         db: AsyncSession | None = None,
-    ) -> list[ChatModel]:
+    ) -> list[ChatTitleIdResponse]:
         """
-        Filters chats based on a search query using Python, allowing pagination using skip and limit.
+        Filters chats by title and message text through the ``chat_search`` full-text
+        index, best matches first, allowing pagination using skip and limit.
         """
         search_text = sanitize_text_for_db(search_text).lower().strip()
 
@@ -1452,7 +1652,9 @@ class ChatTable:
         search_text = ' '.join(search_text_words)
 
         async with get_async_db_context(db) as session:
-            stmt = select(Chat).filter(Chat.user_id == user_id)
+            stmt = select(Chat.id, Chat.title, Chat.updated_at, Chat.created_at, Chat.last_read_at).filter(
+                Chat.user_id == user_id
+            )
 
             if is_archived is not None:
                 stmt = stmt.filter(Chat.archived == is_archived)
@@ -1471,27 +1673,20 @@ class ChatTable:
             if folder_ids:
                 stmt = stmt.filter(Chat.folder_id.in_(folder_ids))
 
-            stmt = stmt.order_by(Chat.updated_at.desc(), Chat.id)
-
             # Check if the database dialect is either 'sqlite' or 'postgresql'
             bind = await session.connection()
             dialect_name = bind.dialect.name
-            if dialect_name == 'sqlite':
-                # SQLite case: using JSON1 extension for JSON searching
-                sqlite_content_sql = (
-                    'EXISTS ('
-                    '    SELECT 1 '
-                    "    FROM json_each(Chat.chat, '$.messages') AS message "
-                    "    WHERE LOWER(message.value->>'content') LIKE '%' || :content_key || '%'"
-                    ')'
-                )
-                sqlite_content_clause = text(sqlite_content_sql)
-                stmt = stmt.filter(
-                    or_(Chat.title.ilike(bindparam('title_key')), sqlite_content_clause).params(
-                        title_key=f'%{search_text}%', content_key=search_text
-                    )
+
+            # Title and message text come from the chat_search full-text index
+            matches = ChatSearch.get_match_subquery(dialect_name, user_id, search_text)
+            if matches is not None:
+                stmt = stmt.join(matches, matches.c.chat_id == Chat.id).order_by(
+                    matches.c.score.desc(), Chat.updated_at.desc(), Chat.id
                 )
+            else:
+                stmt = stmt.order_by(Chat.updated_at.desc(), Chat.id)
 
+            if dialect_name == 'sqlite':
                 # Check if there are any tags to filter
                 if 'none' in tag_ids:
                     stmt = stmt.filter(
@@ -1519,30 +1714,6 @@ class ChatTable:
                     )
 
             elif dialect_name == 'postgresql':
-                # Safety filter: JSON field must not contain \u0000
-                stmt = stmt.filter(text("Chat.chat::text NOT LIKE '%\\\\u0000%'"))
-
-                # Safety filter: title must not contain actual null bytes
-                stmt = stmt.filter(text("Chat.title::text NOT LIKE '%\\x00%'"))
-
-                postgres_content_sql = """
-                EXISTS (
-                    SELECT 1
-                    FROM json_array_elements(Chat.chat->'messages') AS message
-                    WHERE json_typeof(message->'content') = 'string'
-                    AND LOWER(message->>'content') LIKE '%' || :content_key || '%'
-                )
-                """
-
-                postgres_content_clause = text(postgres_content_sql)
-
-                stmt = stmt.filter(
-                    or_(
-                        Chat.title.ilike(bindparam('title_key')),
-                        postgres_content_clause,
-                    )
-                ).params(title_key=f'%{search_text}%', content_key=search_text.lower())
-
                 if 'none' in tag_ids:
                     stmt = stmt.filter(
                         text("""
@@ -1573,12 +1744,27 @@ class ChatTable:
             # Perform pagination at the SQL level
             stmt = stmt.offset(skip).limit(limit)
             result = await session.execute(stmt)
-            all_chats = result.scalars().all()
+            all_chats = result.all()
 
             log.info(f'The number of chats: {len(all_chats)}')
 
-            # Validate and return chats
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            snippets = {}
+            if matches is not None:
+                snippets = await ChatSearch.get_snippets(
+                    user_id, [chat.id for chat in all_chats], search_text, db=session
+                )
+
+            return [
+                ChatTitleIdResponse(
+                    id=chat.id,
+                    title=chat.title,
+                    updated_at=chat.updated_at,
+                    created_at=chat.created_at,
+                    last_read_at=chat.last_read_at,
+                    snippet=snippets.get(chat.id),
+                )
+                for chat in all_chats
+            ]
 
     async def get_chats_by_folder_id_and_user_id(
         self,
@@ -1667,7 +1853,7 @@ class ChatTable:
 
             result = await session.execute(stmt)
             all_chats = result.scalars().all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return await self._hydrate_chat_models([ChatModel.model_validate(chat) for chat in all_chats], db=session)
 
     async def update_chat_folder_id_by_id_and_user_id(
         self, id: str, user_id: str, folder_id: str, db: AsyncSession | None = None
@@ -1861,6 +2047,7 @@ class ChatTable:
             async with get_async_db_context(db) as session:
                 await session.execute(update(AutomationRun).filter_by(chat_id=id).values(chat_id=None))
                 await session.execute(delete(ChatMessage).filter_by(chat_id=id))
+                await session.execute(delete(ChatSearchEntry).filter_by(chat_id=id))
                 await session.execute(delete(Chat).filter_by(id=id))
                 await session.commit()
 
@@ -1873,6 +2060,7 @@ class ChatTable:
             async with get_async_db_context(db) as session:
                 await session.execute(update(AutomationRun).filter_by(chat_id=id).values(chat_id=None))
                 await session.execute(delete(ChatMessage).filter_by(chat_id=id))
+                await session.execute(delete(ChatSearchEntry).filter_by(chat_id=id, user_id=user_id))
                 await session.execute(delete(Chat).filter_by(id=id, user_id=user_id))
                 await session.commit()
 
@@ -1894,6 +2082,7 @@ class ChatTable:
                 await session.execute(
                     delete(ChatMessage).filter(ChatMessage.chat_id.in_(select(Chat.id).filter_by(user_id=user_id)))
                 )
+                await session.execute(delete(ChatSearchEntry).filter_by(user_id=user_id))
                 await session.execute(delete(Chat).filter_by(user_id=user_id))
                 await session.commit()
 
@@ -1911,6 +2100,7 @@ class ChatTable:
                     update(AutomationRun).filter(AutomationRun.chat_id.in_(chat_ids_stmt)).values(chat_id=None)
                 )
                 await session.execute(delete(ChatMessage).filter(ChatMessage.chat_id.in_(chat_ids_stmt)))
+                await session.execute(delete(ChatSearchEntry).filter(ChatSearchEntry.chat_id.in_(chat_ids_stmt)))
                 await session.execute(delete(Chat).filter_by(user_id=user_id, folder_id=folder_id))
                 await session.commit()
 
@@ -0,0 +1,109 @@
+"""Embeddings of document chunks, keyed by embedding model and chunk text hash.
+
+``save_docs_to_vector_db`` looks chunks up here before calling the embedding
+engine, so reindexing or re-uploading unchanged content does not pay for the
+same embeddings twice.  Vectors are stored as packed float32, the precision
+the vector databases keep them at anyway.
+"""
+
+import logging
+import time
+from array import array
+from typing import Optional
+
+from open_webui.internal.db import Base, get_async_db_context
+from sqlalchemy import BigInteger, Column, LargeBinary, Text, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+log = logging.getLogger(__name__)
+
+# Hashes per query, to stay under the bound parameter limit.
+LOOKUP_BATCH_SIZE = 500
+# Rows per INSERT (four parameters each), for the same reason.
+INSERT_BATCH_SIZE = 200
+
+DIALECT_INSERTS = {'postgresql': postgresql_insert, 'sqlite': sqlite_insert}
+
+####################
+# ChunkEmbedding DB Schema
+####################
+
+
+class ChunkEmbedding(Base):
+    __tablename__ = 'chunk_embedding'
+
+    # Embedding space, e.g. "openai:text-embedding-3-small:<prefix>"
+    model = Column(Text, primary_key=True)
+    # SHA-256 of the exact text sent to the embedding engine
+    hash = Column(Text, primary_key=True)
+
+    vector = Column(LargeBinary, nullable=False)
+    created_at = Column(BigInteger)
+
+
+####################
+# Table Operations
+####################
+
+
+class ChunkEmbeddingsTable:
+    async def get_vectors(
+        self, model: str, hashes: list[str], db: Optional[AsyncSession] = None
+    ) -> dict[str, list[float]]:
+        vectors = {}
+        unique_hashes = list(dict.fromkeys(hashes))
+        async with get_async_db_context(db) as db:
+            for start in range(0, len(unique_hashes), LOOKUP_BATCH_SIZE):
+                result = await db.execute(
+                    select(ChunkEmbedding.hash, ChunkEmbedding.vector).filter(
+                        ChunkEmbedding.model == model,
+                        ChunkEmbedding.hash.in_(unique_hashes[start : start + LOOKUP_BATCH_SIZE]),
+                    )
+                )
+                for hash, vector in result.all():
+                    vectors[hash] = array('f', vector).tolist()
+        return vectors
+
+    async def insert_vectors(
+        self, model: str, vectors: dict[str, list[float]], db: Optional[AsyncSession] = None
+    ) -> None:
+        """Store ``vectors`` by chunk hash, skipping hashes already stored.
+
+        Another upload of the same content may store some of these hashes
+        concurrently; those rows are left as they are rather than failing the
+        whole batch.
+        """
+        if not vectors:
+            return
+        now = int(time.time())
+        rows = [
+            {'model': model, 'hash': hash, 'vector': array('f', vector).tobytes(), 'created_at': now}
+            for hash, vector in vectors.items()
+        ]
+        async with get_async_db_context(db) as db:
+            dialect_insert = DIALECT_INSERTS.get(db.bind.dialect.name)
+            if dialect_insert is not None:
+                for start in range(0, len(rows), INSERT_BATCH_SIZE):
+                    await db.execute(
+                        dialect_insert(ChunkEmbedding)
+                        .values(rows[start : start + INSERT_BATCH_SIZE])
+                        .on_conflict_do_nothing(index_elements=['model', 'hash'])
+                    )
+            else:
+                existing = await self.get_vectors(model, list(vectors), db=db)
+                for row in rows:
+                    if row['hash'] in existing:
+                        continue
+                    try:
+                        async with db.begin_nested():
+                            db.add(ChunkEmbedding(**row))
+                    except IntegrityError:
+                        # Stored concurrently; keep the other row.
+                        pass
+            await db.commit()
+
+
+ChunkEmbeddings = ChunkEmbeddingsTable()
@@ -4,22 +4,30 @@ Replaces the old single-row JSON blob machinery with a simple per-key model
 mirroring cptr's Config.
 
 Each config key is stored as its own row: key TEXT PK, value JSON.
-Reads are direct DB lookups. Writes are explicit awaited upserts that raise on
-failure (no more fire-and-forget create_task).
+Reads are served from an in-process snapshot of the whole table (see
+``ConfigCache``). Writes are explicit awaited upserts that raise on failure
+(no more fire-and-forget create_task) and invalidate the snapshot on every
+worker.
 """
 
 from __future__ import annotations
 
+import asyncio
+import copy
 import logging
 import time
 from typing import Any, ClassVar
 
 from fastapi.encoders import jsonable_encoder
+from open_webui.env import CONFIG_CACHE_MAX_AGE, ENABLE_CONFIG_CACHE, REDIS_KEY_PREFIX
 from open_webui.internal.db import Base, get_async_db
+from open_webui.utils.redis import get_redis_client, publish, subscribe
 from sqlalchemy import JSON, BigInteger, Column, Text, delete, select
 
 log = logging.getLogger(__name__)
 
+REDIS_CONFIG_INVALIDATE_CHANNEL = f'{REDIS_KEY_PREFIX}:config:invalidate'
+
 API_CONFIG_KEYS = ('openai.api_configs', 'ollama.api_configs')
 DICT_CONFIG_KEY_ALIASES = {
     'openai.api_configs': ('OPENAI_API_CONFIGS',),
@@ -91,6 +99,95 @@ def _json_value(value: Any) -> Any:
     return jsonable_encoder(value)
 
 
+def _copy_value(value: Any) -> Any:
+    # Callers often edit the dict they read and upsert it back; never let
+    # them edit the cached one.
+    return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+
+
+# ── Cache ────────────────────────────────────────────────────────────────────
+
+
+class ConfigCache:
+    """In-process snapshot of the config table.
+
+    Loaded in one query on first use and after each invalidation; reads are
+    dictionary lookups.  ``version`` is bumped on every invalidation, so a
+    load that raced a write is not installed.  ``max_age`` bounds staleness
+    when an invalidation from another worker is missed.
+    """
+
+    def __init__(self, enabled: bool = ENABLE_CONFIG_CACHE, max_age: float = CONFIG_CACHE_MAX_AGE):
+        self.enabled = enabled
+        self.max_age = max_age
+
+        self.version = 0
+        self._values: dict[str, Any] | None = None
+        self._loaded_at = 0.0
+        self._lock: asyncio.Lock | None = None
+
+    def _fresh(self) -> dict[str, Any] | None:
+        if self._values is None:
+            return None
+        if self.max_age and time.monotonic() - self._loaded_at > self.max_age:
+            return None
+        return self._values
+
+    async def get_values(self) -> dict[str, Any]:
+        """All persisted config values.  Treat as read-only."""
+        values = self._fresh()
+        if values is not None:
+            return values
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            values = self._fresh()
+            if values is not None:
+                return values
+
+            version = self.version
+            async with get_async_db() as db:
+                result = await db.execute(select(Config.key, Config.value))
+                values = {key: value for key, value in result.all()}
+            if version == self.version:
+                self._values = values
+                self._loaded_at = time.monotonic()
+            return values
+
+    def reset(self) -> None:
+        self.version += 1
+        self._values = None
+
+    async def invalidate(self) -> None:
+        """Drop the snapshot here and on every other worker."""
+        self.reset()
+        if not self.enabled:
+            return
+
+        redis = get_redis_client(async_mode=True)
+        if redis is None:
+            return
+        try:
+            await publish(redis, REDIS_CONFIG_INVALIDATE_CHANNEL, str(self.version))
+        except Exception as e:
+            log.warning(f'Failed to publish config invalidation: {e}')
+
+
+CONFIG_CACHE = ConfigCache()
+
+
+async def redis_config_cache_listener(app):
+    """Drop the config snapshot when another worker writes config."""
+    if CONFIG_CACHE.enabled:
+        await subscribe(
+            app.state.redis,
+            REDIS_CONFIG_INVALIDATE_CHANNEL,
+            lambda _: CONFIG_CACHE.reset(),
+            CONFIG_CACHE.reset,
+        )
+
+
 # ── Model ────────────────────────────────────────────────────────────────────
 
 
@@ -138,6 +235,9 @@ class Config(Base):
         """Get a config value by key. Returns default if not set."""
         if not Config.persistent_enabled_for(key):
             return Config.default_value(key, default)
+        if CONFIG_CACHE.enabled:
+            values = await CONFIG_CACHE.get_values()
+            return _copy_value(values[key]) if key in values else Config.default_value(key, default)
         async with get_async_db() as db:
             row = await db.get(Config, key)
             return row.value if row else Config.default_value(key, default)
@@ -153,14 +253,18 @@ class Config(Base):
         enabled_keys = {key for key in keys if Config.persistent_enabled_for(key)}
         if not enabled_keys:
             return disabled_values
-        async with get_async_db() as db:
-            result = await db.execute(select(Config).where(Config.key.in_(enabled_keys)))
-            values = {row.key: row.value for row in result.scalars().all()}
-            return {
-                key: values.get(key, Config.default_value(key))
-                for key in keys
-                if key in values or key in Config.DEFAULTS or key in disabled_values
-            }
+        if CONFIG_CACHE.enabled:
+            cached = await CONFIG_CACHE.get_values()
+            values = {key: _copy_value(cached[key]) for key in enabled_keys if key in cached}
+        else:
+            async with get_async_db() as db:
+                result = await db.execute(select(Config).where(Config.key.in_(enabled_keys)))
+                values = {row.key: row.value for row in result.scalars().all()}
+        return {
+            key: values.get(key, Config.default_value(key))
+            for key in keys
+            if key in values or key in Config.DEFAULTS or key in disabled_values
+        }
 
     @staticmethod
     async def get_namespace(namespace: str) -> dict:
@@ -172,6 +276,12 @@ class Config(Base):
         }
         if not Config.PERSISTENT_ENABLED:
             return default_values
+        if CONFIG_CACHE.enabled:
+            prefix = f'{namespace}.'
+            cached = await CONFIG_CACHE.get_values()
+            values = {key: _copy_value(value) for key, value in cached.items() if key.startswith(prefix)}
+            values.update(default_values)
+            return values
         async with get_async_db() as db:
             result = await db.execute(select(Config).where(Config.key.like(f'{namespace}.%')))
             values = {row.key: row.value for row in result.scalars().all()}
@@ -183,6 +293,11 @@ class Config(Base):
         """Get all config as {key: value}."""
         if not Config.PERSISTENT_ENABLED:
             return dict(Config.DEFAULTS)
+        if CONFIG_CACHE.enabled:
+            values = copy.deepcopy(await CONFIG_CACHE.get_values())
+            if not Config.OAUTH_PERSISTENT_ENABLED:
+                values.update({key: value for key, value in Config.DEFAULTS.items() if key.startswith('oauth.')})
+            return values
         async with get_async_db() as db:
             result = await db.execute(select(Config))
             values = {row.key: row.value for row in result.scalars().all()}
@@ -214,17 +329,19 @@ class Config(Base):
                 else:
                     db.add(Config(key=key, value=value, updated_at=now))
             await db.commit()
+        await CONFIG_CACHE.invalidate()
 
     @staticmethod
     async def delete(key: str) -> bool:
         """Delete a config key. Returns True if it existed."""
         async with get_async_db() as db:
             row = await db.get(Config, key)
-            if row:
-                await db.delete(row)
-                await db.commit()
-                return True
-            return False
+            if not row:
+                return False
+            await db.delete(row)
+            await db.commit()
+        await CONFIG_CACHE.invalidate()
+        return True
 
     @staticmethod
     async def clear() -> None:
@@ -232,6 +349,7 @@ class Config(Base):
         async with get_async_db() as db:
             await db.execute(delete(Config))
             await db.commit()
+        await CONFIG_CACHE.invalidate()
 
     @staticmethod
     async def seed_defaults(defaults: dict) -> None:
@@ -253,9 +371,11 @@ class Config(Base):
                     existing_keys.add(key)
                     new_count += 1
 
-            if new_count:
-                await db.commit()
-                log.info('Seeded %d new config defaults', new_count)
+            if not new_count:
+                return
+            await db.commit()
+            log.info('Seeded %d new config defaults', new_count)
+        await CONFIG_CACHE.invalidate()
 
     @staticmethod
     async def rename_prefix(old_prefix: str, new_prefix: str) -> None:
@@ -290,6 +410,7 @@ class Config(Base):
                 new_prefix,
                 deleted_count,
             )
+        await CONFIG_CACHE.invalidate()
 
     @staticmethod
     async def repair_flattened_dict_configs() -> None:
@@ -355,6 +476,8 @@ class Config(Base):
             if orphan_keys:
                 await db.execute(delete(Config).where(Config.key.in_(orphan_keys)))
 
-            if repaired_keys or orphan_keys:
-                await db.commit()
-                log.info('Repaired flattened dict config rows for %s', ', '.join(repaired_keys))
+            if not repaired_keys and not orphan_keys:
+                return
+            await db.commit()
+            log.info('Repaired flattened dict config rows for %s', ', '.join(repaired_keys))
+        await CONFIG_CACHE.invalidate()
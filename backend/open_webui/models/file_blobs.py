@@ -0,0 +1,128 @@
+"""Content-addressed index of stored file objects.
+
+Every upload is hashed while it is stored.  ``FileBlobs.acquire`` maps the
+SHA-256 to the first stored object with that content and counts the files
+referencing it; later uploads of the same bytes reuse that object (their
+own copy is deleted) and ``FileBlobs.release`` only lets the object be
+deleted once no file references it.  Files stored before this table existed
+have no entry and own their object outright.
+"""
+
+import logging
+import time
+from typing import Optional
+
+from open_webui.internal.db import Base, get_async_db_context
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import BigInteger, Column, Integer, Text, delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+log = logging.getLogger(__name__)
+
+####################
+# FileBlob DB Schema
+####################
+
+
+class FileBlob(Base):
+    __tablename__ = 'file_blob'
+
+    # SHA-256 of the stored bytes
+    hash = Column(Text, primary_key=True)
+    path = Column(Text, nullable=False, unique=True)
+    size = Column(BigInteger, nullable=True)
+    ref_count = Column(Integer, nullable=False, default=0)
+
+    created_at = Column(BigInteger, nullable=False)
+    updated_at = Column(BigInteger, nullable=False)
+
+
+####################
+# Pydantic Models
+####################
+
+
+class FileBlobModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    hash: str
+    path: str
+    size: Optional[int] = None
+    ref_count: int
+
+    created_at: int
+    updated_at: int
+
+
+####################
+# FileBlobTable
+####################
+
+
+class FileBlobTable:
+    async def acquire(self, hash: str, path: str, size: Optional[int] = None, db: Optional[AsyncSession] = None) -> str:
+        """
+        Reference the stored object holding ``hash`` and return its path.
+
+        If no object holds this content yet, ``path`` (the upload just stored)
+        becomes that object.  A different returned path means ``path`` is a
+        redundant copy the caller should delete.
+        """
+        async with get_async_db_context(db) as db:
+            for _ in range(2):
+                now = int(time.time())
+                result = await db.execute(
+                    update(FileBlob)
+                    .where(FileBlob.hash == hash)
+                    .values(ref_count=FileBlob.ref_count + 1, updated_at=now)
+                )
+                if result.rowcount:
+                    existing = (await db.execute(select(FileBlob.path).where(FileBlob.hash == hash))).scalar()
+                    await db.commit()
+                    return existing
+
+                db.add(FileBlob(hash=hash, path=path, size=size, ref_count=1, created_at=now, updated_at=now))
+                try:
+                    await db.commit()
+                    return path
+                except IntegrityError:
+                    # Stored concurrently by another upload; reference that one.
+                    await db.rollback()
+            return path
+
+    async def release(self, path: str, db: Optional[AsyncSession] = None) -> bool:
+        """Drop one reference to the object at ``path``; ``True`` if it is no longer referenced."""
+        async with get_async_db_context(db) as db:
+            result = await db.execute(
+                update(FileBlob)
+                .where(FileBlob.path == path)
+                .values(ref_count=FileBlob.ref_count - 1, updated_at=int(time.time()))
+            )
+            if not result.rowcount:
+                await db.commit()
+                return True
+
+            result = await db.execute(delete(FileBlob).where(FileBlob.path == path, FileBlob.ref_count <= 0))
+            await db.commit()
+            return bool(result.rowcount)
+
+    async def get_blob_by_hash(self, hash: str, db: Optional[AsyncSession] = None) -> Optional[FileBlobModel]:
+        async with get_async_db_context(db) as db:
+            result = await db.execute(select(FileBlob).where(FileBlob.hash == hash))
+            blob = result.scalars().first()
+            return FileBlobModel.model_validate(blob) if blob else None
+
+    async def get_blob_by_path(self, path: str, db: Optional[AsyncSession] = None) -> Optional[FileBlobModel]:
+        async with get_async_db_context(db) as db:
+            result = await db.execute(select(FileBlob).where(FileBlob.path == path))
+            blob = result.scalars().first()
+            return FileBlobModel.model_validate(blob) if blob else None
+
+    async def delete_all_blobs(self, db: Optional[AsyncSession] = None) -> None:
+        async with get_async_db_context(db) as db:
+            await db.execute(delete(FileBlob))
+            await db.commit()
+
+
+FileBlobs = FileBlobTable()
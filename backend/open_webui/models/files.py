@@ -22,7 +22,7 @@ class File(Base):  # uploaded file record
     hash = Column(Text, nullable=True)
 
     filename = Column(Text)  # original upload filename
-    path = Column(Text, nullable=True)
+    path = Column(Text, nullable=True, index=True)  # shared by uploads of the same content
 
     data = Column(JSON, nullable=True)
     meta = Column(JSON, nullable=True)
@@ -443,6 +443,33 @@ class FilesTable:
                 log.warning(f'Error fetching pending files for knowledge {knowledge_id}: {e}')
                 return []
 
+    async def get_processed_file_by_path(
+        self,
+        path: str,
+        source_hash: str,
+        source_config_hash: str,
+        exclude_id: str | None = None,
+        db: AsyncSession | None = None,
+    ) -> FileModel | None:
+        """
+        Latest other file stored at ``path`` (the same content) whose processing
+        completed and whose content is still the text extracted from the object
+        with ``source_hash``, not edited since, using the extraction and chunking
+        settings with ``source_config_hash``.
+        """
+        async with get_async_db_context(db) as db:
+            stmt = select(File).filter(
+                File.path == path,
+                File.data['status'].as_string() == 'completed',
+                File.data['source_hash'].as_string() == source_hash,
+                File.data['source_config_hash'].as_string() == source_config_hash,
+            )
+            if exclude_id:
+                stmt = stmt.filter(File.id != exclude_id)
+            result = await db.execute(stmt.order_by(File.updated_at.desc()).limit(1))
+            file = result.scalars().first()
+            return FileModel.model_validate(file) if file else None
+
     async def delete_file_by_id(self, id: str, db: AsyncSession | None = None) -> bool:
         async with get_async_db_context(db) as db:
             try:
@@ -8,6 +8,7 @@ import time
 # local imports
 from open_webui.internal.db import Base, JSONField, get_async_db_context
 from open_webui.models.users import UserResponse, Users
+from open_webui.utils.model_list_cache import MODEL_LIST_CACHE
 from open_webui.utils.valves import decrypt_valves, encrypt_valves
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Boolean, Column, Index, String, Text, delete, select, update
@@ -130,6 +131,7 @@ class FunctionsTable:
                 db.add(result)
                 await db.commit()
                 await db.refresh(result)
+                await MODEL_LIST_CACHE.invalidate()
                 if result:
                     return FunctionModel.model_validate(result)
                 else:
@@ -175,6 +177,7 @@ class FunctionsTable:
                         await db.delete(func)
 
                 await db.commit()
+                await MODEL_LIST_CACHE.invalidate()
 
                 result = await db.execute(select(Function))
                 return [FunctionModel.model_validate(func) for func in result.scalars().all()]
@@ -316,6 +319,8 @@ class FunctionsTable:
                 function.updated_at = int(time.time())
                 await db.commit()
                 await db.refresh(function)
+                # Pipe valves can change which models a function provides.
+                await MODEL_LIST_CACHE.invalidate()
                 return FunctionModel.model_validate(function)
             except Exception:
                 return None
@@ -336,6 +341,7 @@ class FunctionsTable:
                     function.updated_at = int(time.time())
                     await db.commit()
                     await db.refresh(function)
+                    await MODEL_LIST_CACHE.invalidate()
                     return FunctionModel.model_validate(function)
                 else:
                     return None
@@ -398,6 +404,7 @@ class FunctionsTable:
                     )
                 )
                 await db.commit()
+                await MODEL_LIST_CACHE.invalidate()
                 function = await db.get(Function, id)
                 return FunctionModel.model_validate(function) if function else None
             except Exception:
@@ -413,6 +420,7 @@ class FunctionsTable:
                     )
                 )
                 await db.commit()
+                await MODEL_LIST_CACHE.invalidate()
                 return True
             except Exception:
                 return None
@@ -422,6 +430,7 @@ class FunctionsTable:
             try:
                 await db.execute(delete(Function).filter_by(id=id))
                 await db.commit()
+                await MODEL_LIST_CACHE.invalidate()
 
                 return True
             except Exception:
@@ -7,6 +7,7 @@ from typing import Optional
 from open_webui.env import DEFAULT_GROUP_SHARE_PERMISSION
 from open_webui.internal.db import Base, JSONField, get_async_db_context
 from open_webui.models.files import FileMetadataResponse
+from open_webui.utils.user_cache import USER_GROUPS_CACHE
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import (
     JSON,
@@ -301,6 +302,14 @@ class GroupTable:
             }
 
     async def get_groups_by_member_id(self, user_id: str, db: Optional[AsyncSession] = None) -> list[GroupModel]:
+        """Served from ``USER_GROUPS_CACHE``; every write below invalidates it."""
+
+        async def load(user_id: str) -> list[GroupModel]:
+            return await self._get_groups_by_member_id(user_id, db=db)
+
+        return await USER_GROUPS_CACHE.get_or_load(user_id, load)
+
+    async def _get_groups_by_member_id(self, user_id: str, db: Optional[AsyncSession] = None) -> list[GroupModel]:
         async with get_async_db_context(db) as db:
             result = await db.execute(
                 select(Group)
@@ -370,6 +379,9 @@ class GroupTable:
         self, group_id: str, user_ids: list[str], db: Optional[AsyncSession] = None
     ) -> None:
         async with get_async_db_context(db) as db:
+            result = await db.execute(select(GroupMember.user_id).filter(GroupMember.group_id == group_id))
+            previous_user_ids = result.scalars().all()
+
             # Delete existing members
             await db.execute(delete(GroupMember).filter(GroupMember.group_id == group_id))
 
@@ -389,6 +401,8 @@ class GroupTable:
             db.add_all(new_members)
             await db.commit()
 
+        await USER_GROUPS_CACHE.invalidate_many([*previous_user_ids, *user_ids])
+
     async def get_group_member_count_by_id(self, id: str, db: Optional[AsyncSession] = None) -> int:
         async with get_async_db_context(db) as db:
             result = await db.execute(select(func.count(GroupMember.user_id)).filter(GroupMember.group_id == id))
@@ -425,6 +439,8 @@ class GroupTable:
                     )
                 )
                 await db.commit()
+                # Permissions and membership of any user may have changed.
+                await USER_GROUPS_CACHE.invalidate_all()
                 return await self.get_group_by_id(id=id, db=db)
         except Exception as e:
             log.exception(e)
@@ -435,6 +451,7 @@ class GroupTable:
             async with get_async_db_context(db) as db:
                 await db.execute(delete(Group).filter_by(id=id))
                 await db.commit()
+                await USER_GROUPS_CACHE.invalidate_all()
                 return True
         except Exception:
             return False
@@ -444,6 +461,7 @@ class GroupTable:
             try:
                 await db.execute(delete(Group))
                 await db.commit()
+                await USER_GROUPS_CACHE.invalidate_all()
 
                 return True
             except Exception:
@@ -469,6 +487,7 @@ class GroupTable:
                     await db.execute(update(Group).filter_by(id=group.id).values(updated_at=int(time.time())))
 
                 await db.commit()
+                await USER_GROUPS_CACHE.invalidate(user_id)
                 return True
 
             except Exception:
@@ -562,6 +581,8 @@ class GroupTable:
                     await db.execute(update(Group).filter(Group.id.in_(groups_to_add)).values(updated_at=now))
 
                 await db.commit()
+                if groups_to_add or groups_to_remove:
+                    await USER_GROUPS_CACHE.invalidate(user_id)
                 return True
 
             except Exception as e:
@@ -603,6 +624,7 @@ class GroupTable:
                 group.updated_at = now
                 await db.commit()
                 await db.refresh(group)
+                await USER_GROUPS_CACHE.invalidate_many(user_ids or [])
 
                 return GroupModel.model_validate(group)
 
@@ -636,6 +658,7 @@ class GroupTable:
 
                 await db.commit()
                 await db.refresh(group)
+                await USER_GROUPS_CACHE.invalidate_many(user_ids)
                 return GroupModel.model_validate(group)
 
         except Exception as e:
@@ -9,6 +9,7 @@ from open_webui.internal.db import Base, JSONField, get_async_db_context
 from open_webui.models.access_grants import AccessGrantModel, AccessGrants
 from open_webui.models.groups import Groups
 from open_webui.models.users import User, UserModel, UserResponse, Users
+from open_webui.utils.model_list_cache import MODEL_LIST_CACHE
 from open_webui.utils.validate import validate_profile_image_url
 from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 from sqlalchemy import BigInteger, Boolean, Column, String, Text, cast, delete, func, or_, select, update
@@ -175,6 +176,7 @@ class ModelsTable:
                 await db.commit()
                 await db.refresh(result)
                 await AccessGrants.set_access_grants('model', result.id, form_data.access_grants, db=db)
+                await MODEL_LIST_CACHE.invalidate()
 
                 if result:
                     return await self._to_model_model(result, db=db)
@@ -484,6 +486,7 @@ class ModelsTable:
                 model.updated_at = int(time.time())
                 await db.commit()
                 await db.refresh(model)
+                await MODEL_LIST_CACHE.invalidate()
 
                 return await self._to_model_model(model, db=db)
             except Exception:
@@ -500,6 +503,7 @@ class ModelsTable:
                 await db.commit()
                 if model.access_grants is not None:
                     await AccessGrants.set_access_grants('model', id, model.access_grants, db=db)
+                await MODEL_LIST_CACHE.invalidate()
 
                 return await self.get_model_by_id(id, db=db)
         except Exception as e:
@@ -516,6 +520,7 @@ class ModelsTable:
                 model_obj.updated_at = int(time.time())
                 await db.commit()
                 await db.refresh(model_obj)
+                await MODEL_LIST_CACHE.invalidate()
                 return await self._to_model_model(model_obj, db=db)
         except Exception as e:
             log.exception(f'Failed to update the model updated_at by id {id}: {e}')
@@ -527,6 +532,7 @@ class ModelsTable:
                 await AccessGrants.revoke_all_access('model', id, db=db)
                 await db.execute(delete(Model).filter_by(id=id))
                 await db.commit()
+                await MODEL_LIST_CACHE.invalidate()
 
                 return True
         except Exception:
@@ -541,6 +547,7 @@ class ModelsTable:
                     await AccessGrants.revoke_all_access('model', model_id, db=db)
                 await db.execute(delete(Model))
                 await db.commit()
+                await MODEL_LIST_CACHE.invalidate()
 
                 return True
         except Exception:
@@ -589,6 +596,7 @@ class ModelsTable:
                         await db.delete(model)
 
                 await db.commit()
+                await MODEL_LIST_CACHE.invalidate()
 
                 result = await db.execute(select(Model))
                 all_models = result.scalars().all()
@@ -9,8 +9,22 @@ from open_webui.models.access_grants import AccessGrantModel, AccessGrants
 from open_webui.models.groups import Groups
 from open_webui.models.users import User, UserModel, UserResponse, Users
 from pydantic import BaseModel, ConfigDict, Field
-from sqlalchemy import JSON, BigInteger, Boolean, Column, ForeignKey, Text, delete, func, or_, select, update
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Boolean,
+    Column,
+    ForeignKey,
+    LargeBinary,
+    Text,
+    delete,
+    func,
+    or_,
+    select,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import deferred
 
 ####################
 # Note DB Schema
@@ -30,6 +44,12 @@ class Note(Base):
     created_at = Column(BigInteger)
     updated_at = Column(BigInteger)
 
+    # Merged Yjs state saved with the note content by collaborative editing;
+    # only valid while ydoc_updated_at == updated_at.  Deferred so note
+    # listings never load it.
+    ydoc = deferred(Column(LargeBinary, nullable=True))
+    ydoc_updated_at = Column(BigInteger, nullable=True)
+
 
 class NoteModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -295,7 +315,11 @@ class NoteTable:
             return await self._to_note_model(note, db=db) if note else None
 
     async def update_note_by_id(
-        self, id: str, form_data: NoteUpdateForm, db: Optional[AsyncSession] = None
+        self,
+        id: str,
+        form_data: NoteUpdateForm,
+        ydoc: Optional[bytes] = None,
+        db: Optional[AsyncSession] = None,
     ) -> Optional[NoteModel]:
         async with get_async_db_context(db) as db:
             result = await db.execute(select(Note).filter(Note.id == id))
@@ -316,10 +340,22 @@ class NoteTable:
                 await AccessGrants.set_access_grants('note', id, form_data['access_grants'], db=db)
 
             note.updated_at = int(time.time_ns())
+            if ydoc is not None:
+                note.ydoc = ydoc
+                note.ydoc_updated_at = note.updated_at
 
             await db.commit()
             return await self._to_note_model(note, db=db) if note else None
 
+    async def get_note_ydoc_by_id(self, id: str, db: Optional[AsyncSession] = None) -> Optional[bytes]:
+        """Saved Yjs state of the note, unless the note was changed without it since."""
+        async with get_async_db_context(db) as db:
+            result = await db.execute(select(Note.ydoc, Note.ydoc_updated_at, Note.updated_at).filter(Note.id == id))
+            row = result.first()
+            if row is None or row.ydoc is None or row.ydoc_updated_at != row.updated_at:
+                return None
+            return row.ydoc
+
     async def toggle_note_pinned_by_id(
         self, id: str, user_id: str, db: Optional[AsyncSession] = None
     ) -> Optional[NoteModel]:
@@ -64,7 +64,7 @@ class SharedChatsTable:
         Returns the SharedChatModel with the share token as its id.
         """
         async with get_async_db_context(db) as db:
-            from open_webui.models.chats import Chat
+            from open_webui.models.chats import Chat, Chats
 
             chat = await db.get(Chat, chat_id)
             if not chat:
@@ -78,7 +78,7 @@ class SharedChatsTable:
                 chat_id=chat_id,
                 user_id=user_id,
                 title=chat.title,
-                chat=chat.chat,
+                chat=await Chats.hydrate_chat(chat_id, chat.chat, db=db),
                 created_at=now,
                 updated_at=now,
             )
@@ -93,7 +93,7 @@ class SharedChatsTable:
         Re-snapshot: update the shared chat with the current state of the original chat.
         """
         async with get_async_db_context(db) as db:
-            from open_webui.models.chats import Chat
+            from open_webui.models.chats import Chat, Chats
 
             shared_chat = await db.get(SharedChat, share_id)
             if not shared_chat:
@@ -104,7 +104,7 @@ class SharedChatsTable:
                 return None
 
             shared_chat.title = chat.title
-            shared_chat.chat = chat.chat
+            shared_chat.chat = await Chats.hydrate_chat(chat.id, chat.chat, db=db)
             shared_chat.updated_at = int(time.time())
 
             await db.commit()
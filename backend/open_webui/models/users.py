@@ -8,6 +8,7 @@ from typing import Optional
 from open_webui.env import DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL
 from open_webui.internal.db import Base, JSONField, get_async_db_context
 from open_webui.utils.misc import throttle
+from open_webui.utils.user_cache import USER_CACHE
 from open_webui.utils.validate import validate_profile_image_url
 from pydantic import BaseModel, ConfigDict, field_validator, model_validator
 from sqlalchemy import (
@@ -317,6 +318,10 @@ class UsersTable:
             user = await session.get(User, id)
             return UserModel.model_validate(user) if user else None
 
+    async def get_cached_user_by_id(self, id: str) -> UserModel | None:
+        """``get_user_by_id`` through the short-lived ``USER_CACHE``, for request authentication."""
+        return await USER_CACHE.get_or_load(id, self.get_user_by_id)
+
     # api key auth helper
     async def get_user_by_api_key(
         self,
@@ -590,6 +595,7 @@ class UsersTable:
             user.role = role
             await session.commit()
             await session.refresh(user)
+            await USER_CACHE.invalidate(id)
             return UserModel.model_validate(user)
 
     async def update_user_status_by_id(
@@ -603,6 +609,7 @@ class UsersTable:
                 setattr(user, key, value)
             await session.commit()
             await session.refresh(user)
+            await USER_CACHE.invalidate(id)
             return UserModel.model_validate(user)
 
     async def update_user_profile_image_url_by_id(
@@ -623,6 +630,7 @@ class UsersTable:
             user.profile_image_url = profile_image_url
             await session.commit()
             await session.refresh(user)
+            await USER_CACHE.invalidate(id)
             return UserModel.model_validate(user)
 
     @throttle(DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL)
@@ -631,6 +639,20 @@ class UsersTable:
             await session.execute(update(User).where(User.id == id).values(last_active_at=int(time.time())))
             await session.commit()
 
+    async def update_last_active_by_ids(self, timestamps: dict[str, int], db: AsyncSession | None = None) -> None:
+        """Set ``last_active_at`` for many users with one UPDATE per batch of ids."""
+        ids = list(timestamps)
+        async with get_async_db_context(db) as session:
+            for start in range(0, len(ids), 500):
+                batch = ids[start : start + 500]
+                await session.execute(
+                    update(User)
+                    .where(User.id.in_(batch))
+                    .values(last_active_at=case({user_id: timestamps[user_id] for user_id in batch}, value=User.id))
+                    .execution_options(synchronize_session=False)
+                )
+            await session.commit()
+
     async def update_user_oauth_by_id(
         self, id: str, provider: str, sub: str, db: AsyncSession | None = None
     ) -> UserModel | None:
@@ -644,6 +666,7 @@ class UsersTable:
             user.oauth = oauth
             await session.commit()
             await session.refresh(user)
+            await USER_CACHE.invalidate(id)
             return UserModel.model_validate(user)
 
     async def update_user_scim_by_id(
@@ -663,6 +686,7 @@ class UsersTable:
             user.scim = scim
             await session.commit()
             await session.refresh(user)
+            await USER_CACHE.invalidate(id)
             return UserModel.model_validate(user)
 
     async def update_user_by_id(self, id: str, updated: dict, db: AsyncSession | None = None) -> UserModel | None:
@@ -674,6 +698,7 @@ class UsersTable:
                 setattr(user, key, value)
             await session.commit()
             await session.refresh(user)
+            await USER_CACHE.invalidate(id)
             return UserModel.model_validate(user)
 
     # settings update helper
@@ -689,6 +714,7 @@ class UsersTable:
             user.settings = user_settings
             await session.commit()
             await session.refresh(user)
+            await USER_CACHE.invalidate(id)
             return UserModel.model_validate(user)
 
     async def delete_user_by_id(self, id: str, db: AsyncSession | None = None) -> bool:
@@ -705,6 +731,7 @@ class UsersTable:
                 return False  # chats deletion failed
             await session.execute(delete(User).where(User.id == id))
             await session.commit()
+            await USER_CACHE.invalidate(id)
             return True
 
     async def get_user_api_key_by_id(self, id: str, db: AsyncSession | None = None) -> str | None:
@@ -0,0 +1,203 @@
+import logging
+import time
+from typing import Any, Optional
+from uuid import uuid4
+
+from open_webui.internal.db import Base, get_async_db_context
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import JSON, BigInteger, Column, Index, Integer, Text, delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+log = logging.getLogger(__name__)
+
+PENDING = 'pending'
+FAILED = 'failed'
+
+
+####################
+# WebhookDelivery DB Schema
+####################
+
+
+class WebhookDelivery(Base):
+    __tablename__ = 'webhook_delivery'
+
+    id = Column(Text, primary_key=True)
+    webhook_id = Column(Text, nullable=True)
+    url = Column(Text, nullable=False)
+    event = Column(Text, nullable=False)
+    message = Column(Text, nullable=False)
+    description = Column(Text, nullable=True)
+    payload = Column(JSON, nullable=False)
+
+    status = Column(Text, nullable=False)  # pending | failed
+    attempts = Column(Integer, nullable=False, default=0)
+    # Due time while pending; pushed forward by a lease while a worker posts it.
+    next_attempt_at = Column(BigInteger, nullable=False)
+    claim_token = Column(Text, nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(BigInteger, nullable=False)
+    updated_at = Column(BigInteger, nullable=False)
+
+    __table_args__ = (Index('ix_webhook_delivery_status_next_attempt', 'status', 'next_attempt_at'),)
+
+
+####################
+# Pydantic Models
+####################
+
+
+class WebhookDeliveryModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    webhook_id: Optional[str] = None
+    url: str
+    event: str
+    message: str
+    description: Optional[str] = None
+    payload: dict
+
+    status: str
+    attempts: int
+    next_attempt_at: int
+    last_error: Optional[str] = None
+
+    created_at: int
+    updated_at: int
+
+
+####################
+# WebhookDeliveryTable
+####################
+
+
+class WebhookDeliveryTable:
+    async def insert_many(self, deliveries: list[dict[str, Any]], db: Optional[AsyncSession] = None) -> int:
+        """Queue deliveries (``webhook_id``, ``url``, ``event``, ``message``, ``description``, ``payload``)."""
+        if not deliveries:
+            return 0
+        now = int(time.time())
+        rows = [
+            {
+                'id': str(uuid4()),
+                **delivery,
+                'status': PENDING,
+                'attempts': 0,
+                'next_attempt_at': now,
+                'created_at': now,
+                'updated_at': now,
+            }
+            for delivery in deliveries
+        ]
+        async with get_async_db_context(db) as db:
+            await db.execute(insert(WebhookDelivery), rows)
+            await db.commit()
+        return len(rows)
+
+    async def claim_due(
+        self, now: int, lease_until: int, limit: int = 100, db: Optional[AsyncSession] = None
+    ) -> list[WebhookDeliveryModel]:
+        """
+        Atomically claim due deliveries for posting.
+
+        Claimed rows are counted as attempted and become due again at
+        ``lease_until``, so a delivery whose worker dies is retried.  The
+        conditional UPDATE keeps two workers from claiming the same row;
+        on PostgreSQL, FOR UPDATE SKIP LOCKED avoids contention altogether.
+        """
+        async with get_async_db_context(db) as db:
+            stmt = (
+                select(WebhookDelivery.id)
+                .where(WebhookDelivery.status == PENDING, WebhookDelivery.next_attempt_at <= now)
+                .order_by(WebhookDelivery.next_attempt_at)
+                .limit(limit)
+            )
+            if db.bind.dialect.name == 'postgresql':
+                stmt = stmt.with_for_update(skip_locked=True)
+
+            ids = (await db.execute(stmt)).scalars().all()
+            if not ids:
+                return []
+
+            token = str(uuid4())
+            await db.execute(
+                update(WebhookDelivery)
+                .where(
+                    WebhookDelivery.id.in_(ids),
+                    WebhookDelivery.status == PENDING,
+                    WebhookDelivery.next_attempt_at <= now,
+                )
+                .values(
+                    attempts=WebhookDelivery.attempts + 1,
+                    next_attempt_at=lease_until,
+                    claim_token=token,
+                    updated_at=now,
+                )
+            )
+            result = await db.execute(
+                select(WebhookDelivery)
+                .where(WebhookDelivery.id.in_(ids), WebhookDelivery.claim_token == token)
+                .order_by(WebhookDelivery.created_at)
+            )
+            rows = result.scalars().all()
+            await db.commit()
+            return [WebhookDeliveryModel.model_validate(row) for row in rows]
+
+    async def delete_by_ids(self, ids: list[str], db: Optional[AsyncSession] = None) -> int:
+        if not ids:
+            return 0
+        async with get_async_db_context(db) as db:
+            result = await db.execute(delete(WebhookDelivery).where(WebhookDelivery.id.in_(ids)))
+            await db.commit()
+            return result.rowcount
+
+    async def reschedule(
+        self, id: str, next_attempt_at: int, error: Optional[str] = None, db: Optional[AsyncSession] = None
+    ) -> None:
+        async with get_async_db_context(db) as db:
+            await db.execute(
+                update(WebhookDelivery)
+                .where(WebhookDelivery.id == id)
+                .values(
+                    next_attempt_at=next_attempt_at,
+                    claim_token=None,
+                    last_error=error,
+                    updated_at=int(time.time()),
+                )
+            )
+            await db.commit()
+
+    async def mark_failed(self, id: str, error: Optional[str] = None, db: Optional[AsyncSession] = None) -> None:
+        async with get_async_db_context(db) as db:
+            await db.execute(
+                update(WebhookDelivery)
+                .where(WebhookDelivery.id == id)
+                .values(status=FAILED, claim_token=None, last_error=error, updated_at=int(time.time()))
+            )
+            await db.commit()
+
+    async def delete_failed_before(self, timestamp: int, db: Optional[AsyncSession] = None) -> int:
+        async with get_async_db_context(db) as db:
+            result = await db.execute(
+                delete(WebhookDelivery).where(WebhookDelivery.status == FAILED, WebhookDelivery.updated_at < timestamp)
+            )
+            await db.commit()
+            return result.rowcount
+
+    async def get_counts(self, now: int, db: Optional[AsyncSession] = None) -> dict[str, int]:
+        """Queue depth: ``pending`` (``due`` of them now, the rest waiting to retry or being posted) and ``failed``."""
+        async with get_async_db_context(db) as db:
+            result = await db.execute(select(WebhookDelivery.status, func.count()).group_by(WebhookDelivery.status))
+            counts = {PENDING: 0, FAILED: 0, **{status: count for status, count in result.all()}}
+            due = await db.execute(
+                select(func.count())
+                .select_from(WebhookDelivery)
+                .where(WebhookDelivery.status == PENDING, WebhookDelivery.next_attempt_at <= now)
+            )
+            counts['due'] = due.scalar() or 0
+            return counts
+
+
+WebhookDeliveries = WebhookDeliveryTable()
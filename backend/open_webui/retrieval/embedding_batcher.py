@@ -0,0 +1,127 @@
+"""Micro-batching for the local SentenceTransformers embedding engine.
+
+Without batching every RAG query runs its own ``encode`` call in a worker
+thread, so concurrent users end up with many single-text encodes competing
+for the GIL and CPU.  ``EmbeddingMicroBatcher`` holds requests for a few
+milliseconds, runs them as one ``encode`` call, and hands each caller its
+slice of the result.
+
+Batched encodes run on one dedicated inference thread, so they are
+serialized and never block the event loop or the default thread pool.
+Calls of at least ``RAG_EMBEDDING_MICRO_BATCH_SIZE`` texts (document
+ingestion) run in the default thread pool instead, as before, so queries
+never wait behind a whole document.
+
+Configurable via environment variables:
+    - RAG_EMBEDDING_MICRO_BATCH_SIZE (default 32) — texts per batched encode;
+      larger calls are encoded on their own; 0 disables batching
+    - RAG_EMBEDDING_MICRO_BATCH_WAIT_MS (default 5) — how long the first
+      request of a batch waits for company
+"""
+
+import asyncio
+import logging
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from open_webui.env import RAG_EMBEDDING_MICRO_BATCH_SIZE, RAG_EMBEDDING_MICRO_BATCH_WAIT_MS
+
+log = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='embedding-inference')
+
+
+class EmbeddingMicroBatcher:
+    def __init__(
+        self,
+        model: Any,
+        encode_batch_size: int,
+        max_batch_size: int = RAG_EMBEDDING_MICRO_BATCH_SIZE,
+        max_wait: float = RAG_EMBEDDING_MICRO_BATCH_WAIT_MS / 1000,
+    ):
+        # Weak, so the batcher registry does not keep a replaced model alive.
+        self._model = weakref.ref(model)
+        self.encode_batch_size = encode_batch_size
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+
+        # Requests are grouped by prefix, since the prefix is an encode() argument.
+        self._pending: dict[Optional[str], list[tuple[list[str], asyncio.Future]]] = {}
+        self._timers: dict[Optional[str], asyncio.TimerHandle] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def _encode(self, texts: list[str], prefix: Optional[str]) -> list[list[float]]:
+        model = self._model()
+        if model is None:
+            raise ValueError('Embedding model was unloaded')
+        return model.encode(
+            texts,
+            batch_size=self.encode_batch_size,
+            **({'prompt': prefix} if prefix else {}),
+        ).tolist()
+
+    async def _run(self, texts: list[str], prefix: Optional[str]) -> list[list[float]]:
+        return await asyncio.get_running_loop().run_in_executor(_executor, self._encode, texts, prefix)
+
+    async def embed(self, texts: list[str], prefix: Optional[str] = None) -> list[list[float]]:
+        if len(texts) >= self.max_batch_size:
+            # Off the inference thread, so micro-batched queries do not queue behind it.
+            return await asyncio.to_thread(self._encode, texts, prefix)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._pending.setdefault(prefix, [])
+        batch.append((texts, future))
+
+        if sum(len(request_texts) for request_texts, _ in batch) >= self.max_batch_size:
+            self._flush(prefix)
+        elif len(batch) == 1:
+            self._timers[prefix] = loop.call_later(self.max_wait, self._flush, prefix)
+
+        return await future
+
+    def _flush(self, prefix: Optional[str]):
+        timer = self._timers.pop(prefix, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = self._pending.pop(prefix, None)
+        if batch:
+            task = asyncio.create_task(self._run_batch(batch, prefix))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: list[tuple[list[str], asyncio.Future]], prefix: Optional[str]):
+        texts = [text for request_texts, _ in batch for text in request_texts]
+        log.debug(f'Embedding micro-batch of {len(texts)} texts from {len(batch)} requests')
+        try:
+            vectors = await self._run(texts, prefix)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        offset = 0
+        for request_texts, future in batch:
+            if not future.done():
+                future.set_result(vectors[offset : offset + len(request_texts)])
+            offset += len(request_texts)
+
+
+# One batcher per loaded model; entries go away with the model on reload.
+_batchers: 'weakref.WeakKeyDictionary[Any, EmbeddingMicroBatcher]' = weakref.WeakKeyDictionary()
+
+
+def get_embedding_batcher(model: Any, encode_batch_size: int) -> Optional[EmbeddingMicroBatcher]:
+    """Shared batcher for ``model``, or None when micro-batching is disabled."""
+    if RAG_EMBEDDING_MICRO_BATCH_SIZE <= 0:
+        return None
+
+    batcher = _batchers.get(model)
+    if batcher is None:
+        batcher = EmbeddingMicroBatcher(model, encode_batch_size)
+        _batchers[model] = batcher
+    batcher.encode_batch_size = encode_batch_size
+    return batcher
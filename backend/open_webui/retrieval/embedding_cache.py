@@ -0,0 +1,229 @@
+"""Cache for query embeddings.
+
+The same strings are embedded over and over: a user question is embedded
+once per collection searched, again on regeneration, and again when a tool
+call is retried.  ``cached_embedding_function`` wraps the function returned
+by ``get_embedding_function`` with a bounded in-process LRU (optionally
+backed by Redis so workers share entries) keyed by
+``(engine, model, url, prefix, text)``.  Concurrent misses for the same key
+share one embedding request.
+
+Configurable via environment variables:
+    - RAG_EMBEDDING_CACHE_SIZE (default 1000) — in-process entries; 0 disables
+    - RAG_EMBEDDING_CACHE_TTL (default 3600) — seconds an entry stays valid
+    - RAG_EMBEDDING_CACHE_MAX_BATCH (default 16) — larger calls (document
+      ingestion) bypass the cache
+    - ENABLE_RAG_EMBEDDING_CACHE_REDIS (default False) — second tier in Redis
+
+Hit/miss counters are in ``EMBEDDING_CACHE.stats()`` and exported as OTel
+metrics when metrics are enabled.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+from open_webui.env import (
+    ENABLE_RAG_EMBEDDING_CACHE_REDIS,
+    RAG_EMBEDDING_CACHE_MAX_BATCH,
+    RAG_EMBEDDING_CACHE_SIZE,
+    RAG_EMBEDDING_CACHE_TTL,
+    REDIS_KEY_PREFIX,
+)
+from open_webui.utils.redis import get_redis_client
+
+log = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    def __init__(self, max_size: int, ttl: int, use_redis: bool = False):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.use_redis = use_redis
+
+        # key -> (expires_at, vector); vectors are kept as compact float arrays.
+        self._entries: OrderedDict[str, tuple[float, array]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    @staticmethod
+    def make_key(namespace: tuple, prefix: Optional[str], text: str) -> str:
+        digest = hashlib.sha256(json.dumps([*namespace, prefix, text], ensure_ascii=False).encode('utf-8')).hexdigest()
+        return f'{REDIS_KEY_PREFIX}:embedding:{digest}'
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.redis_hits + self.misses
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'redis_hits': self.redis_hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.redis_hits) / lookups if lookups else 0.0,
+        }
+
+    def _get_local(self, key: str) -> Optional[list[float]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, vector = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return vector.tolist()
+
+    def _set_local(self, key: str, vector: list[float]):
+        self._entries[key] = (time.monotonic() + self.ttl, array('d', vector))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def _get_redis(self, keys: list[str]) -> list[Optional[list[float]]]:
+        redis = get_redis_client(async_mode=True) if self.use_redis else None
+        if redis is None or not keys:
+            return [None] * len(keys)
+        try:
+            values = await redis.mget(keys)
+            return [json.loads(value) if value else None for value in values]
+        except Exception as e:
+            log.debug(f'Embedding cache Redis lookup failed: {e}')
+            return [None] * len(keys)
+
+    async def _set_redis(self, items: dict[str, list[float]]):
+        redis = get_redis_client(async_mode=True) if self.use_redis else None
+        if redis is None or not items:
+            return
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for key, vector in items.items():
+                    pipe.set(key, json.dumps(vector), ex=self.ttl)
+                await pipe.execute()
+        except Exception as e:
+            log.debug(f'Embedding cache Redis store failed: {e}')
+
+    async def get_many(
+        self,
+        keys: list[str],
+        texts: list[str],
+        compute: Callable[[list[str]], Awaitable[Optional[list]]],
+    ) -> Optional[list]:
+        """Vectors for ``texts``, computing only the ones not cached or in flight.
+
+        Returns None if ``compute`` fails to produce embeddings.
+        """
+        results: dict[str, Any] = {}
+
+        for key in keys:
+            if key not in results:
+                vector = self._get_local(key)
+                if vector is not None:
+                    results[key] = vector
+                    self.hits += 1
+
+        missing = [key for key in dict.fromkeys(keys) if key not in results and key not in self._inflight]
+        if missing:
+            for key, vector in zip(missing, await self._get_redis(missing)):
+                if vector is not None:
+                    results[key] = vector
+                    self._set_local(key, vector)
+                    self.redis_hits += 1
+
+        # Keys another caller is already embedding; wait for theirs.
+        waiting = {
+            key: self._inflight[key] for key in dict.fromkeys(keys) if key not in results and key in self._inflight
+        }
+
+        owned = {key: text for key, text in zip(keys, texts) if key not in results and key not in waiting}
+        if owned:
+            self.misses += len(owned)
+            loop = asyncio.get_running_loop()
+            futures = {key: loop.create_future() for key in owned}
+            self._inflight.update(futures)
+            try:
+                vectors = await compute(list(owned.values()))
+                if vectors is None or len(vectors) != len(owned):
+                    # Waiters see None and return None, like an uncached failure.
+                    vectors = [None] * len(owned)
+                for key, vector in zip(owned, vectors):
+                    futures[key].set_result(vector)
+            except BaseException as e:
+                for future in futures.values():
+                    if future.done():
+                        continue
+                    if isinstance(e, asyncio.CancelledError):
+                        future.cancel()
+                    else:
+                        future.set_exception(e)
+                        # Mark retrieved so a failure nobody waited on is not logged.
+                        future.exception()
+                raise
+            finally:
+                for key in owned:
+                    self._inflight.pop(key, None)
+
+            if any(vector is None for vector in vectors):
+                return None
+            computed = dict(zip(owned, vectors))
+            for key, vector in computed.items():
+                self._set_local(key, vector)
+            results.update(computed)
+            await self._set_redis(computed)
+
+        for key, future in waiting.items():
+            try:
+                vector = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The caller computing it was cancelled; compute it ourselves.
+                vector = ((await compute([texts[keys.index(key)]])) or [None])[0]
+            if vector is None:
+                return None
+            results[key] = vector
+
+        return [results[key] for key in keys]
+
+
+EMBEDDING_CACHE = EmbeddingCache(
+    max_size=RAG_EMBEDDING_CACHE_SIZE,
+    ttl=RAG_EMBEDDING_CACHE_TTL,
+    use_redis=ENABLE_RAG_EMBEDDING_CACHE_REDIS,
+)
+
+
+def cached_embedding_function(embedding_function: Callable, namespace: tuple) -> Callable:
+    """Wrap an async ``(query, prefix=None, user=None)`` embedding function with ``EMBEDDING_CACHE``.
+
+    ``namespace`` identifies the embedding space, e.g. ``(engine, model, url)``.
+    """
+    if not EMBEDDING_CACHE.enabled:
+        return embedding_function
+
+    async def async_embedding_function(query, prefix=None, user=None):
+        texts = [query] if isinstance(query, str) else query
+        if not isinstance(texts, list) or not texts or len(texts) > RAG_EMBEDDING_CACHE_MAX_BATCH:
+            return await embedding_function(query, prefix, user)
+
+        keys = [EMBEDDING_CACHE.make_key(namespace, prefix, text) for text in texts]
+        vectors = await EMBEDDING_CACHE.get_many(
+            keys,
+            texts,
+            lambda missing: embedding_function(missing, prefix, user),
+        )
+        if vectors is None:
+            return None
+        return vectors[0] if isinstance(query, str) else vectors
+
+    return async_embedding_function
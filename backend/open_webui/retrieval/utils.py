@@ -31,22 +31,29 @@ from open_webui.env import (
     AIOHTTP_CLIENT_TIMEOUT,
     BYPASS_RETRIEVAL_ACCESS_CONTROL,
     ENABLE_FORWARD_USER_INFO_HEADERS,
+    ENABLE_RAG_BM25_INDEX,
+    ENABLE_RAG_CHUNK_EMBEDDING_REUSE,
     ENABLE_RETRIEVAL_UNSCOPED_COLLECTIONS,
     OFFLINE_MODE,
 )
 from open_webui.models.access_grants import AccessGrants
+from open_webui.models.bm25 import BM25Index, get_enriched_text
 from open_webui.models.chats import Chats
+from open_webui.models.chunk_embeddings import ChunkEmbeddings
 from open_webui.models.files import Files
 from open_webui.models.knowledge import Knowledges
 from open_webui.models.notes import Notes
 from open_webui.models.config import Config
 from open_webui.models.users import UserModel
+from open_webui.retrieval.embedding_batcher import get_embedding_batcher
+from open_webui.retrieval.embedding_cache import cached_embedding_function
 from open_webui.retrieval.loaders.youtube import YoutubeLoader
 from open_webui.retrieval.vector.async_client import ASYNC_VECTOR_DB_CLIENT
 from open_webui.retrieval.external import retrieve_external_knowledge
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
 from open_webui.retrieval.vector.main import GetResult, SearchResult
-from open_webui.retrieval.web.utils import get_web_loader
+from open_webui.retrieval.web.cache import WEB_FETCH_CACHE
+from open_webui.retrieval.web.utils import get_web_loader, is_text_content_type
 from open_webui.utils.access_control.files import has_access_to_file
 from open_webui.utils.headers import include_user_info_headers
 from open_webui.utils.misc import get_message_list
@@ -181,30 +188,43 @@ def _extract_text_from_binary_response(
         os.remove(tmp_path)
 
 
-def _is_text_content_type(content_type: str) -> bool:
-    """Return True if the content type should be handled by the web loader."""
-    ct = content_type.split(';')[0].strip().lower()
-    if ct.startswith('text/'):
-        return True
-    if any(t in ct for t in ['xml', 'json', 'javascript']):
-        return True
-    return not ct  # empty / missing → assume HTML
+async def get_content_from_url(request, url: str) -> tuple[str, list[Document]]:
+    from open_webui.retrieval.web.utils import validate_url
 
-
-async def get_content_from_url(request, url: str) -> str:
     loader_config = await get_loader_config()
 
-    # The rest of this function performs synchronous, blocking work: an SSRF-guarded
-    # `requests` probe and a synchronous document loader (`loader.load()`). Run it in a
-    # worker thread so the event loop stays free while waiting on network/parsing.
-    return await asyncio.to_thread(_get_content_from_url_sync, request, url, loader_config)
+    # Validate URL before making any request (blocks private IPs, non-HTTP, filter list),
+    # and before serving it from WEB_FETCH_CACHE: the filter list may have changed since.
+    await asyncio.to_thread(validate_url, url)
+
+    # The fetch performs synchronous, blocking work: an SSRF-guarded `requests` probe
+    # and a synchronous document loader (`loader.load()`). Run it in a worker thread
+    # so the event loop stays free while waiting on network/parsing.
+    uncached = []
 
+    async def fetch(urls: list[str]) -> dict[str, list[Document]]:
+        _, docs, cacheable = await asyncio.to_thread(_get_content_from_url_sync, request, url, loader_config)
+        if not cacheable:
+            uncached.extend(docs)
+            return {}
+        return {url: docs}
 
-def _get_content_from_url_sync(request, url: str, loader_config):
-    from open_webui.retrieval.web.utils import validate_url, _SSRFSafeAdapter
+    # Transcripts, extracted files and pages differ from what the web search loader stores for the URL.
+    if is_youtube_url(url):
+        namespace = ('youtube', loader_config.get('youtube_language'))
+    else:
+        namespace = ('url', loader_config.get('CONTENT_EXTRACTION_ENGINE'))
+    docs = (await WEB_FETCH_CACHE.load_many([url], fetch, namespace=namespace)).get(url, uncached)
+    content = ' '.join([doc.page_content for doc in docs])
+    return content, docs
 
-    # Validate URL before making any request (blocks private IPs, non-HTTP, filter list)
-    validate_url(url)
+
+def _get_content_from_url_sync(request, url: str, loader_config) -> tuple[str, list[Document], bool]:
+    """
+    ``(content, docs, cacheable)`` for ``url``; not cacheable when the URL could
+    not be fetched successfully and the web loader's result may be an error page.
+    """
+    from open_webui.retrieval.web.utils import _ssrf_safe_adapter
 
     # YouTube URLs (including youtu.be short links) should go straight to
     # YoutubeLoader, which uses youtube-transcript-api and never needs the
@@ -216,7 +236,7 @@ def _get_content_from_url_sync(request, url: str, loader_config):
         loader = get_loader(request, url, loader_config)
         docs = loader.load()
         content = ' '.join([doc.page_content for doc in docs])
-        return content, docs
+        return content, docs, True
 
     # Streamed GET to check Content-Type without downloading the body.
     # allow_redirects=False prevents redirect-based SSRF: validate_url() above is
@@ -226,8 +246,8 @@ def _get_content_from_url_sync(request, url: str, loader_config):
     try:
         # Probe through the connect-time SSRF guard; bare requests.get re-resolves (DNS-rebinding gap).
         session = requests.Session()
-        session.mount('http://', _SSRFSafeAdapter())
-        session.mount('https://', _SSRFSafeAdapter())
+        session.mount('http://', _ssrf_safe_adapter)
+        session.mount('https://', _ssrf_safe_adapter)
         response = session.get(url, stream=True, timeout=30, allow_redirects=AIOHTTP_CLIENT_ALLOW_REDIRECTS)
         response.raise_for_status()
         content_type = response.headers.get('Content-Type', '')
@@ -236,17 +256,17 @@ def _get_content_from_url_sync(request, url: str, loader_config):
         response = None
 
     # Text / HTML / unknown — use the configured web loader
-    if response is None or _is_text_content_type(content_type):
+    if response is None or is_text_content_type(content_type):
         if response is not None:
             response.close()
         loader = get_loader(request, url, loader_config)
         docs = loader.load()
         content = ' '.join([doc.page_content for doc in docs])
-        return content, docs
+        return content, docs, response is not None
 
     # Binary content (PDF, DOCX, XLSX, PPTX, etc.) — download and extract
     try:
-        return _extract_text_from_binary_response(request, response, url, loader_config)
+        return *_extract_text_from_binary_response(request, response, url, loader_config), True
     finally:
         response.close()
 
@@ -292,6 +312,74 @@ class VectorSearchRetriever(BaseRetriever):
         return _search_result_to_documents(result)
 
 
+class BM25IndexRetriever(BaseRetriever):
+    """Keyword retriever over the persistent per-collection BM25 index."""
+
+    collection_name: Any
+    top_k: int
+    enriched: bool = False
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> list[Document]:
+        # The index lives in the async database; returning nothing here would silently drop keyword results.
+        raise NotImplementedError('BM25IndexRetriever is async only; use ainvoke()')
+
+    async def _aget_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: CallbackManagerForRetrieverRun,
+    ) -> list[Document]:
+        results = await BM25Index.search(self.collection_name, query, self.top_k, enriched=self.enriched)
+        return [
+            Document(metadata={**metadata, CHUNK_HASH_KEY: _content_hash(text)}, page_content=text)
+            for text, metadata, _ in results
+        ]
+
+
+# Collections with a BM25 index build in flight from this process.
+_bm25_index_builds: set[str] = set()
+
+
+async def _build_bm25_index(collection_name: str) -> None:
+    async def load_items():
+        result = await ASYNC_VECTOR_DB_CLIENT.get(collection_name=collection_name)
+        if not result or not result.ids or not result.documents:
+            return []
+        return [
+            {'id': id, 'text': text, 'metadata': metadata}
+            for id, text, metadata in zip(result.ids[0], result.documents[0], result.metadatas[0])
+        ]
+
+    try:
+        await BM25Index.build(collection_name, load_items)
+    except Exception as e:
+        log.warning(f'Failed to build BM25 index for {collection_name}: {e}')
+    finally:
+        _bm25_index_builds.discard(collection_name)
+
+
+async def get_bm25_index_retriever(collection_name: str, k: int, enriched: bool) -> Optional[BM25IndexRetriever]:
+    """Retriever over the collection's persistent BM25 index, if it has one.
+
+    Collections without an index get one built in the background; until it
+    is ready callers fall back to building an in-memory ``BM25Retriever``.
+    """
+    if not ENABLE_RAG_BM25_INDEX:
+        return None
+
+    try:
+        if await BM25Index.is_ready(collection_name):
+            return BM25IndexRetriever(collection_name=collection_name, top_k=k, enriched=enriched)
+    except Exception as e:
+        log.warning(f'BM25 index unavailable for {collection_name}: {e}')
+        return None
+
+    if collection_name not in _bm25_index_builds:
+        _bm25_index_builds.add(collection_name)
+        asyncio.create_task(_build_bm25_index(collection_name))
+    return None
+
+
 def query_doc(collection_name: str, query_embedding: list[float], k: int, user: UserModel = None):
     try:
         log.debug(f'query_doc:doc {collection_name}')
@@ -325,37 +413,10 @@ def get_doc(collection_name: str, user: UserModel = None):
 
 
 def get_enriched_texts(collection_result: GetResult) -> list[str]:
-    enriched_texts = []
-    for idx, text in enumerate(collection_result.documents[0]):
-        metadata = collection_result.metadatas[0][idx]
-        metadata_parts = [text]
-
-        # Add filename (repeat twice for extra weight in BM25 scoring)
-        if metadata.get('name'):
-            filename = metadata['name']
-            filename_tokens = filename.replace('_', ' ').replace('-', ' ').replace('.', ' ')
-            metadata_parts.append(f'Filename: {filename} {filename_tokens} {filename_tokens}')
-
-        # Add title if available
-        if metadata.get('title'):
-            metadata_parts.append(f'Title: {metadata["title"]}')
-
-        # Add document section headings if available (from markdown splitter)
-        if metadata.get('headings') and isinstance(metadata['headings'], list):
-            headings = ' > '.join(str(h) for h in metadata['headings'])
-            metadata_parts.append(f'Section: {headings}')
-
-        # Add source URL/path if available
-        if metadata.get('source'):
-            metadata_parts.append(f'Source: {metadata["source"]}')
-
-        # Add snippet for web search results
-        if metadata.get('snippet'):
-            metadata_parts.append(f'Snippet: {metadata["snippet"]}')
-
-        enriched_texts.append(' '.join(metadata_parts))
-
-    return enriched_texts
+    return [
+        get_enriched_text(text, collection_result.metadatas[0][idx])
+        for idx, text in enumerate(collection_result.documents[0])
+    ]
 
 
 def _search_result_to_documents(result: SearchResult | None) -> list[Document]:
@@ -473,42 +534,47 @@ async def query_doc_with_hybrid_search(
             if native_result is not None:
                 return native_result
 
-        if collection_result is None:
-            collection_result = await ASYNC_VECTOR_DB_CLIENT.get(collection_name=collection_name)
+        # A persistent index answers with a postings lookup; otherwise build
+        # an in-memory BM25 retriever from the whole collection.
+        bm25_retriever = await get_bm25_index_retriever(collection_name, k, enriched=enable_enriched_texts)
 
-        # First check if collection_result has the required attributes
-        if (
-            not collection_result
-            or not hasattr(collection_result, 'documents')
-            or not hasattr(collection_result, 'metadatas')
-        ):
-            log.warning(f'query_doc_with_hybrid_search:no_docs {collection_name}')
-            return {'documents': [], 'metadatas': [], 'distances': []}
+        if bm25_retriever is None:
+            if collection_result is None:
+                collection_result = await ASYNC_VECTOR_DB_CLIENT.get(collection_name=collection_name)
 
-        # Now safely check the documents content after confirming attributes exist
-        if (
-            not collection_result.documents
-            or len(collection_result.documents) == 0
-            or not collection_result.documents[0]
-        ):
-            log.warning(f'query_doc_with_hybrid_search:no_docs {collection_name}')
-            return {'documents': [], 'metadatas': [], 'distances': []}
+            # First check if collection_result has the required attributes
+            if (
+                not collection_result
+                or not hasattr(collection_result, 'documents')
+                or not hasattr(collection_result, 'metadatas')
+            ):
+                log.warning(f'query_doc_with_hybrid_search:no_docs {collection_name}')
+                return {'documents': [], 'metadatas': [], 'distances': []}
+
+            # Now safely check the documents content after confirming attributes exist
+            if (
+                not collection_result.documents
+                or len(collection_result.documents) == 0
+                or not collection_result.documents[0]
+            ):
+                log.warning(f'query_doc_with_hybrid_search:no_docs {collection_name}')
+                return {'documents': [], 'metadatas': [], 'distances': []}
 
-        log.debug(f'query_doc_with_hybrid_search:doc {collection_name}')
+            original_texts = collection_result.documents[0]
+            bm25_metadatas = [
+                {**meta, CHUNK_HASH_KEY: _content_hash(original_texts[idx])}
+                for idx, meta in enumerate(collection_result.metadatas[0])
+            ]
 
-        original_texts = collection_result.documents[0]
-        bm25_metadatas = [
-            {**meta, CHUNK_HASH_KEY: _content_hash(original_texts[idx])}
-            for idx, meta in enumerate(collection_result.metadatas[0])
-        ]
+            bm25_texts = get_enriched_texts(collection_result) if enable_enriched_texts else original_texts
 
-        bm25_texts = get_enriched_texts(collection_result) if enable_enriched_texts else original_texts
+            bm25_retriever = BM25Retriever.from_texts(
+                texts=bm25_texts,
+                metadatas=bm25_metadatas,
+            )
+            bm25_retriever.k = k
 
-        bm25_retriever = BM25Retriever.from_texts(
-            texts=bm25_texts,
-            metadatas=bm25_metadatas,
-        )
-        bm25_retriever.k = k
+        log.debug(f'query_doc_with_hybrid_search:doc {collection_name}')
 
         vector_search_retriever = VectorSearchRetriever(
             collection_name=collection_name,
@@ -787,11 +853,21 @@ async def query_collection_with_hybrid_search(
         len(collection_names),
     )
 
+    # Collections with a persistent BM25 index are searched without their
+    # contents and are skipped here.
+    failed_collections = set()
+
     async def _fetch_collection(name: str):
         try:
-            return name, await ASYNC_VECTOR_DB_CLIENT.get(collection_name=name)
+            if ENABLE_RAG_BM25_INDEX and await BM25Index.is_ready(name):
+                return name, None
+            result = await ASYNC_VECTOR_DB_CLIENT.get(collection_name=name)
+            if result is None:
+                failed_collections.add(name)
+            return name, result
         except Exception as e:
             log.exception(f'Failed to fetch collection {name}: {e}')
+            failed_collections.add(name)
             return name, None
 
     collection_results = dict(await asyncio.gather(*(_fetch_collection(name) for name in collection_names)))
@@ -819,11 +895,11 @@ async def query_collection_with_hybrid_search(
             return None, e
 
     # Prepare tasks for all collections and queries
-    # Avoid running any tasks for collections that failed to fetch data (have assigned None)
+    # Avoid running any tasks for collections that failed to fetch data
     tasks = [
         (collection_name, query)
         for collection_name in collection_names
-        if collection_results[collection_name] is not None
+        if collection_name not in failed_collections
         for query in queries
     ]
 
@@ -1091,6 +1167,12 @@ def get_embedding_function(
                     'SentenceTransformer model name, or configure an external '
                     'RAG_EMBEDDING_ENGINE (ollama, openai, azure_openai).'
                 )
+
+            batcher = get_embedding_batcher(embedding_function, int(embedding_batch_size))
+            if batcher is not None:
+                vectors = await batcher.embed([query] if isinstance(query, str) else query, prefix)
+                return vectors[0] if isinstance(query, str) else vectors
+
             return await asyncio.to_thread(
                 (
                     lambda query, prefix=None: embedding_function.encode(
@@ -1103,7 +1185,7 @@ def get_embedding_function(
                 prefix,
             )
 
-        return async_embedding_function
+        return cached_embedding_function(async_embedding_function, (embedding_engine, embedding_model))
     elif embedding_engine in ['ollama', 'openai', 'azure_openai']:
         embedding_function = lambda query, prefix=None, user=None: generate_embeddings(
             engine=embedding_engine,
@@ -1156,7 +1238,7 @@ def get_embedding_function(
             else:
                 return await embedding_function(query, prefix, user)
 
-        return async_embedding_function
+        return cached_embedding_function(async_embedding_function, (embedding_engine, embedding_model, url))
     else:
         raise ValueError(f'Unknown embedding engine: {embedding_engine}')
 
@@ -1215,6 +1297,46 @@ async def generate_embeddings(
         return embeddings[0] if isinstance(text, str) else embeddings
 
 
+async def embed_chunks(
+    embedding_function,
+    texts: list[str],
+    prefix: Optional[str],
+    model: str,
+    user: UserModel = None,
+) -> Optional[list]:
+    """Embed document chunks, reusing stored embeddings of identical text.
+
+    ``model`` identifies the embedding space (engine, model and prefix);
+    only chunks without a stored embedding reach ``embedding_function``.
+    """
+    if not ENABLE_RAG_CHUNK_EMBEDDING_REUSE:
+        return await embedding_function(texts, prefix=prefix, user=user)
+
+    hashes = [_content_hash(text) for text in texts]
+    try:
+        vectors = await ChunkEmbeddings.get_vectors(model, hashes)
+    except Exception as e:
+        log.warning(f'Failed to look up stored chunk embeddings: {e}')
+        vectors = {}
+
+    missing = {hash: text for hash, text in zip(hashes, texts) if hash not in vectors}
+    log.info(f'embed_chunks: reusing {len(texts) - len(missing)} of {len(texts)} chunk embeddings')
+
+    if missing:
+        embeddings = await embedding_function(list(missing.values()), prefix=prefix, user=user)
+        if embeddings is None:
+            return None
+
+        computed = dict(zip(missing, embeddings))
+        try:
+            await ChunkEmbeddings.insert_vectors(model, computed)
+        except Exception as e:
+            log.warning(f'Failed to store chunk embeddings: {e}')
+        vectors.update(computed)
+
+    return [vectors[hash] for hash in hashes]
+
+
 def get_reranking_function(reranking_engine, reranking_model, reranking_function, reranking_batch_size=32):
     if reranking_function is None:
         return None
@@ -34,6 +34,14 @@ serialization lock here would defeat the responsiveness this facade
 exists to provide; any backend that genuinely cannot tolerate
 concurrent access should grow its own internal serialization.
 
+Persistent BM25 index
+---------------------
+Writes made through this facade are mirrored into the persistent BM25
+index (`open_webui.models.bm25`) for collections that have one, so
+hybrid search never has to rebuild it from the vector DB. Code that
+writes through the sync client directly must update the index itself
+(see `save_docs_to_vector_db`).
+
 API surface
 -----------
 Method signatures mirror `VectorDBBase` exactly. This is deliberate:
@@ -53,8 +61,10 @@ their own `asyncio.to_thread`, e.g. ::
 from __future__ import annotations
 
 import asyncio
+import logging
 from typing import Dict, List, Optional, Union
 
+from open_webui.models.bm25 import BM25Index
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
 from open_webui.retrieval.vector.main import (
     GetResult,
@@ -63,6 +73,24 @@ from open_webui.retrieval.vector.main import (
     VectorItem,
 )
 
+log = logging.getLogger(__name__)
+
+
+async def update_bm25_index(collection_name: str, update, *args, **kwargs) -> None:
+    """Apply a vector DB write to the BM25 index.
+
+    On failure the collection's index is dropped so the next hybrid query
+    rebuilds it rather than searching a stale one.
+    """
+    try:
+        await update(collection_name, *args, **kwargs)
+    except Exception as e:
+        log.warning(f'Failed to update BM25 index for {collection_name}, dropping it: {e}')
+        try:
+            await BM25Index.drop(collection_name)
+        except Exception as e:
+            log.error(f'Failed to drop BM25 index for {collection_name}: {e}')
+
 
 class AsyncVectorDBClient:
     """Awaitable mirror of `VectorDBBase` that off-loads each call to a thread.
@@ -90,13 +118,16 @@ class AsyncVectorDBClient:
         return await asyncio.to_thread(self._sync.has_collection, collection_name)
 
     async def delete_collection(self, collection_name: str) -> None:
-        return await asyncio.to_thread(self._sync.delete_collection, collection_name)
+        await asyncio.to_thread(self._sync.delete_collection, collection_name)
+        await update_bm25_index(collection_name, BM25Index.drop)
 
     async def insert(self, collection_name: str, items: List[VectorItem]) -> None:
-        return await asyncio.to_thread(self._sync.insert, collection_name, items)
+        await asyncio.to_thread(self._sync.insert, collection_name, items)
+        await update_bm25_index(collection_name, BM25Index.upsert, items)
 
     async def upsert(self, collection_name: str, items: List[VectorItem]) -> None:
-        return await asyncio.to_thread(self._sync.upsert, collection_name, items)
+        await asyncio.to_thread(self._sync.upsert, collection_name, items)
+        await update_bm25_index(collection_name, BM25Index.upsert, items)
 
     async def search(
         self,
@@ -143,10 +174,15 @@ class AsyncVectorDBClient:
         ids: Optional[List[str]] = None,
         filter: Optional[Dict] = None,
     ) -> None:
-        return await asyncio.to_thread(self._sync.delete, collection_name, ids, filter)
+        await asyncio.to_thread(self._sync.delete, collection_name, ids, filter)
+        await update_bm25_index(collection_name, BM25Index.delete, ids, filter)
 
     async def reset(self) -> None:
-        return await asyncio.to_thread(self._sync.reset)
+        await asyncio.to_thread(self._sync.reset)
+        try:
+            await BM25Index.reset()
+        except Exception as e:
+            log.error(f'Failed to reset BM25 index: {e}')
 
 
 ASYNC_VECTOR_DB_CLIENT = AsyncVectorDBClient(VECTOR_DB_CLIENT)
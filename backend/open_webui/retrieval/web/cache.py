@@ -0,0 +1,299 @@
+"""Cache for pages fetched by the web loaders.
+
+``process_web_search`` loaded every result page afresh, and ``process_web``
+and the builtin ``fetch_url`` tool fetched their URL again on each call, so
+users searching the same topic re-fetched the same pages within minutes.
+``WebContentCache`` keeps the documents extracted from a page for
+``WEB_FETCH_CACHE_TTL`` seconds, keyed by the normalized URL, the web
+loader engine and a namespace naming how the documents were produced
+(callers extracting differently, e.g. YouTube transcripts or binary files,
+must not see each other's documents):
+
+    - in Redis when it is configured, so all workers share entries
+    - otherwise as JSON files under ``CACHE_DIR/web_fetch``, at most
+      ``WEB_FETCH_CACHE_MAX_ENTRIES`` of them (oldest removed first)
+    - concurrent misses for the same URL share one fetch
+
+URLs are normalized by lowercasing the scheme and host and dropping the
+default port, the fragment and the order of query parameters.  Pages that
+yield no text are not stored.
+
+Configurable via environment variables:
+    - WEB_FETCH_CACHE_TTL (default 600) — seconds a page is reused; 0 disables
+    - WEB_FETCH_CACHE_MAX_ENTRIES (default 1000) — pages kept on disk
+
+Hit/miss counters are in ``WEB_FETCH_CACHE.stats()`` and exported as OTel
+metrics when metrics are enabled.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Awaitable, Callable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from uuid import uuid4
+
+from langchain_core.documents import Document
+from open_webui.config import CACHE_DIR, WEB_FETCH_CACHE_MAX_ENTRIES, WEB_FETCH_CACHE_TTL, WEB_LOADER_ENGINE
+from open_webui.env import REDIS_KEY_PREFIX
+from open_webui.utils.redis import get_redis_client
+
+log = logging.getLogger(__name__)
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url: str) -> str:
+    """``url`` in the form used for cache keys: same page, same string."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+
+    netloc = parts.hostname or ''
+    if ':' in netloc:
+        netloc = f'[{netloc}]'
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port is not None and port != DEFAULT_PORTS.get(scheme):
+        netloc = f'{netloc}:{port}'
+    userinfo = parts.netloc.rpartition('@')[0]
+    if userinfo:
+        netloc = f'{userinfo}@{netloc}'
+
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, netloc, parts.path or '/', query, ''))
+
+
+def serialize_documents(docs: list[Document]) -> list[dict]:
+    return [{'page_content': doc.page_content, 'metadata': doc.metadata} for doc in docs]
+
+
+def deserialize_documents(items: list[dict]) -> list[Document]:
+    return [Document(page_content=item['page_content'], metadata=item['metadata']) for item in items]
+
+
+class WebContentCache:
+    def __init__(self, directory: str, ttl: int, max_entries: int):
+        self.directory = str(directory)
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self._inflight: dict[str, asyncio.Future] = {}
+        # Files on disk, counted on first store.
+        self._count: Optional[int] = None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    @staticmethod
+    def make_key(url: str, namespace: tuple = (), engine: str = WEB_LOADER_ENGINE) -> str:
+        """Key for the documents produced from ``url`` by the path named ``namespace``."""
+        digest = hashlib.sha256(
+            json.dumps([engine, *namespace, normalize_url(url)], default=str).encode('utf-8')
+        ).hexdigest()
+        return f'{REDIS_KEY_PREFIX}:web_fetch:{digest}'
+
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key.rsplit(":", 1)[-1]}.json')
+
+    def _read_files(self, keys: list[str]) -> dict[str, list[Document]]:
+        results = {}
+        now = time.time()
+        for key in keys:
+            path = self._path(key)
+            try:
+                with open(path, encoding='utf-8') as f:
+                    entry = json.load(f)
+                if entry['expires_at'] < now:
+                    os.remove(path)
+                    continue
+                results[key] = deserialize_documents(entry['docs'])
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                log.debug(f'Failed to read cached page {path}: {e}')
+        return results
+
+    def _write_files(self, items: dict[str, list[Document]]):
+        os.makedirs(self.directory, exist_ok=True)
+        expires_at = time.time() + self.ttl
+        added = 0
+        for key, docs in items.items():
+            path = self._path(key)
+            part_path = f'{path}.{uuid4().hex}.part'
+            try:
+                existed = os.path.exists(path)
+                with open(part_path, 'w', encoding='utf-8') as f:
+                    json.dump(
+                        {'expires_at': expires_at, 'docs': serialize_documents(docs)},
+                        f,
+                        ensure_ascii=False,
+                        default=str,
+                    )
+                os.replace(part_path, path)
+                added += not existed
+            except OSError as e:
+                log.debug(f'Failed to cache page {path}: {e}')
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+
+        with self._lock:
+            if self._count is None:
+                self._count = sum(1 for name in os.listdir(self.directory) if name.endswith('.json'))
+            else:
+                self._count += added
+            if self._count > self.max_entries:
+                self._prune()
+
+    def _prune(self):
+        """Remove expired pages, then the oldest ones beyond ``max_entries``."""
+        now = time.time()
+        files = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith('.json'):
+                    files.append((entry.stat().st_mtime, entry.path))
+        files.sort()
+
+        removed = 0
+        for mtime, path in files:
+            if len(files) - removed <= self.max_entries and mtime + self.ttl >= now:
+                break
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                continue
+        self._count = len(files) - removed
+
+    async def _get(self, keys: list[str]) -> dict[str, list[Document]]:
+        if not keys:
+            return {}
+        redis = get_redis_client(async_mode=True)
+        if redis is None:
+            return await asyncio.to_thread(self._read_files, keys)
+        try:
+            values = await redis.mget(keys)
+            return {key: deserialize_documents(json.loads(value)) for key, value in zip(keys, values) if value}
+        except Exception as e:
+            log.debug(f'Web fetch cache Redis lookup failed: {e}')
+            return {}
+
+    async def _set(self, items: dict[str, list[Document]]):
+        items = {key: docs for key, docs in items.items() if any(doc.page_content.strip() for doc in docs)}
+        if not items:
+            return
+        redis = get_redis_client(async_mode=True)
+        if redis is None:
+            await asyncio.to_thread(self._write_files, items)
+            return
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for key, docs in items.items():
+                    pipe.set(key, json.dumps(serialize_documents(docs), ensure_ascii=False, default=str), ex=self.ttl)
+                await pipe.execute()
+        except Exception as e:
+            log.debug(f'Web fetch cache Redis store failed: {e}')
+
+    async def load_many(
+        self,
+        urls: list[str],
+        fetch: Callable[[list[str]], Awaitable[dict[str, list[Document]]]],
+        namespace: tuple = (),
+    ) -> dict[str, list[Document]]:
+        """Documents for ``urls``, fetching only the pages not cached or in flight.
+
+        ``fetch`` returns the documents of the pages it loaded by URL; pages it
+        leaves out are not cached and are missing from the result.  ``namespace``
+        identifies what ``fetch`` produces; see ``make_key``.
+        """
+        if not self.enabled:
+            return await fetch(urls)
+
+        keys = {url: self.make_key(url, namespace) for url in dict.fromkeys(urls)}
+        results = await self._get([key for key in dict.fromkeys(keys.values()) if key not in self._inflight])
+        self.hits += len(results)
+
+        # Pages another caller is already fetching; wait for theirs.
+        waiting = {key: self._inflight[key] for key in keys.values() if key not in results and key in self._inflight}
+
+        owned = {}
+        for url, key in keys.items():
+            if key not in results and key not in waiting:
+                owned.setdefault(key, url)
+        if owned:
+            self.misses += len(owned)
+            loop = asyncio.get_running_loop()
+            futures = {key: loop.create_future() for key in owned}
+            self._inflight.update(futures)
+            try:
+                loaded = {}
+                for url, docs in (await fetch(list(owned.values()))).items():
+                    key = self.make_key(url, namespace)
+                    if key in owned:
+                        loaded[key] = loaded.get(key, []) + docs
+                for key, future in futures.items():
+                    future.set_result(loaded.get(key))
+            except BaseException as e:
+                for future in futures.values():
+                    if future.done():
+                        continue
+                    if isinstance(e, asyncio.CancelledError):
+                        future.cancel()
+                    else:
+                        future.set_exception(e)
+                        # Mark retrieved so a failure nobody waited on is not logged.
+                        future.exception()
+                raise
+            finally:
+                for key in owned:
+                    self._inflight.pop(key, None)
+
+            results.update(loaded)
+            await self._set(loaded)
+
+        retry = []
+        for key, future in waiting.items():
+            try:
+                docs = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                docs = None
+            except Exception:
+                docs = None
+            if docs is None:
+                # Not loaded (or not cacheable) for the other caller; fetch it ourselves.
+                retry.extend(url for url, url_key in keys.items() if url_key == key)
+            else:
+                results[key] = docs
+        if retry:
+            for url, docs in (await fetch(retry)).items():
+                results.setdefault(self.make_key(url, namespace), docs)
+
+        # Each caller gets its own copies; loaders and callers mutate metadata.
+        return {
+            url: [Document(page_content=doc.page_content, metadata=dict(doc.metadata)) for doc in results[key]]
+            for url, key in keys.items()
+            if key in results
+        }
+
+
+WEB_FETCH_CACHE = WebContentCache(
+    os.path.join(CACHE_DIR, 'web_fetch'),
+    ttl=WEB_FETCH_CACHE_TTL,
+    max_entries=WEB_FETCH_CACHE_MAX_ENTRIES,
+)
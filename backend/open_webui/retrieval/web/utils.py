@@ -44,6 +44,8 @@ from open_webui.config import (
     TAVILY_API_KEY,
     TAVILY_EXTRACT_DEPTH,
     WEB_FETCH_FILTER_LIST,
+    WEB_FETCH_POOL_CONNECTIONS,
+    WEB_FETCH_POOL_CONNECTIONS_PER_HOST,
     WEB_LOADER_ENGINE,
     WEB_LOADER_TIMEOUT,
 )
@@ -52,11 +54,13 @@ from open_webui.env import (
     AIOHTTP_CLIENT_ALLOW_REDIRECTS,
     AIOHTTP_CLIENT_SESSION_SSL,
     AIOHTTP_CLIENT_TIMEOUT,
+    AIOHTTP_POOL_DNS_TTL,
     USER_AGENT,
 )
 from open_webui.retrieval.loaders.external_web import ExternalWebLoader
 from open_webui.retrieval.loaders.microsoft_web_iq import MicrosoftWebIQLoader
 from open_webui.retrieval.loaders.tavily import TavilyLoader
+from open_webui.retrieval.web.cache import WEB_FETCH_CACHE
 from open_webui.retrieval.web.firecrawl import scrape_firecrawl_url
 from open_webui.utils.misc import is_host_allowed
 
@@ -207,6 +211,61 @@ class _SSRFSafeResolver(aiohttp.resolver.DefaultResolver):
         return results
 
 
+# Shared by the requests sessions of all web loaders so connections to a host are reused.
+# Not blocking: beyond the per-host limit, connections are opened and closed per request.
+_ssrf_safe_adapter = _SSRFSafeAdapter(
+    pool_connections=WEB_FETCH_POOL_CONNECTIONS,
+    pool_maxsize=WEB_FETCH_POOL_CONNECTIONS_PER_HOST,
+)
+
+# trust_env -> shared session for SafeWebBaseLoader fetches
+_fetch_sessions: dict[bool, aiohttp.ClientSession] = {}
+
+
+async def get_web_fetch_session(trust_env: bool = False) -> aiohttp.ClientSession:
+    """The shared aiohttp session for web loader fetches, creating it lazily.
+
+    Connections are checked by _SSRFSafeResolver like get_ssrf_safe_session's, but
+    pooled (``WEB_FETCH_POOL_CONNECTIONS``, at most ``WEB_FETCH_POOL_CONNECTIONS_PER_HOST``
+    to one host) so DNS lookups and TLS sessions are reused across pages.  Cookies
+    set by responses are discarded so nothing leaks between users.  Callers must not
+    close it; see ``close_web_fetch_sessions``.
+    """
+    session = _fetch_sessions.get(trust_env)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                resolver=_SSRFSafeResolver(),
+                limit=WEB_FETCH_POOL_CONNECTIONS,
+                limit_per_host=WEB_FETCH_POOL_CONNECTIONS_PER_HOST,
+                ttl_dns_cache=AIOHTTP_POOL_DNS_TTL,
+                enable_cleanup_closed=True,
+            ),
+            cookie_jar=aiohttp.DummyCookieJar(),
+            trust_env=trust_env,
+        )
+        _fetch_sessions[trust_env] = session
+    return session
+
+
+async def close_web_fetch_sessions():
+    """Close the shared web fetch sessions.  Called during application shutdown."""
+    for session in _fetch_sessions.values():
+        if not session.closed:
+            await session.close()
+    _fetch_sessions.clear()
+
+
+def is_text_content_type(content_type: str) -> bool:
+    """Return True if the content type should be handled by the web loader."""
+    ct = content_type.split(';')[0].strip().lower()
+    if ct.startswith('text/'):
+        return True
+    if any(t in ct for t in ['xml', 'json', 'javascript']):
+        return True
+    return not ct  # empty / missing → assume HTML
+
+
 def get_ssrf_safe_session() -> aiohttp.ClientSession:
     """A one-off aiohttp session that re-validates the connect-time IP via _SSRFSafeResolver,
     defeating DNS rebinding. Use for validate_url-gated fetches of user-supplied URLs that must
@@ -725,6 +784,8 @@ class SafeWebBaseLoader(WebBaseLoader):
         """
         super().__init__(*args, **kwargs)
         self.trust_env = trust_env
+        # url -> Content-Type of the successful (2xx) responses fetched by _fetch()
+        self.content_types: Dict[str, str] = {}
 
         # Propagate USER_AGENT env var so that both the sync _scrape() and
         # async _fetch() paths present a real UA instead of python-requests/2.x
@@ -746,36 +807,37 @@ class SafeWebBaseLoader(WebBaseLoader):
             'allow_redirects': AIOHTTP_CLIENT_ALLOW_REDIRECTS,
         }
 
-        self.session.mount('http://', _SSRFSafeAdapter())
-        self.session.mount('https://', _SSRFSafeAdapter())
+        self.session.mount('http://', _ssrf_safe_adapter)
+        self.session.mount('https://', _ssrf_safe_adapter)
 
     async def _fetch(self, url: str, retries: int = 3, cooldown: int = 2, backoff: float = 1.5) -> str:
-        connector = aiohttp.TCPConnector(resolver=_SSRFSafeResolver())
-        async with aiohttp.ClientSession(trust_env=self.trust_env, connector=connector) as session:
-            for i in range(retries):
-                try:
-                    kwargs: Dict = dict(
-                        headers=self.session.headers,
-                        cookies=self.session.cookies.get_dict(),
-                    )
-                    if not self.session.verify:
-                        kwargs['ssl'] = False
-                    else:
-                        kwargs['ssl'] = AIOHTTP_CLIENT_SESSION_SSL
-
-                    async with session.get(
-                        url,
-                        **(self.requests_kwargs | kwargs),
-                    ) as response:
-                        if self.raise_for_status:
-                            response.raise_for_status()
-                        return await response.text()
-                except aiohttp.ClientConnectionError as e:
-                    if i == retries - 1:
-                        raise
-                    else:
-                        log.warning(f'Error fetching {url} with attempt {i + 1}/{retries}: {e}. Retrying...')
-                        await asyncio.sleep(cooldown * backoff**i)
+        session = await get_web_fetch_session(self.trust_env)
+        for i in range(retries):
+            try:
+                kwargs: Dict = dict(
+                    headers=self.session.headers,
+                    cookies=self.session.cookies.get_dict(),
+                )
+                if not self.session.verify:
+                    kwargs['ssl'] = False
+                else:
+                    kwargs['ssl'] = AIOHTTP_CLIENT_SESSION_SSL
+
+                async with session.get(
+                    url,
+                    **(self.requests_kwargs | kwargs),
+                ) as response:
+                    if self.raise_for_status:
+                        response.raise_for_status()
+                    if 200 <= response.status < 300:
+                        self.content_types[url] = response.headers.get('Content-Type', '')
+                    return await response.text()
+            except aiohttp.ClientConnectionError as e:
+                if i == retries - 1:
+                    raise
+                else:
+                    log.warning(f'Error fetching {url} with attempt {i + 1}/{retries}: {e}. Retrying...')
+                    await asyncio.sleep(cooldown * backoff**i)
         raise ValueError('retry count exceeded')
 
     def _unpack_fetch_results(self, results: Any, urls: List[str], parser: Union[str, None] = None) -> List[Any]:
@@ -922,3 +984,49 @@ def get_web_loader(
             f'Invalid WEB_LOADER_ENGINE: {WEB_LOADER_ENGINE}. '
             "Please set it to 'safe_web', 'playwright', 'firecrawl', 'tavily', 'external', or 'microsoft_web_iq'."
         )
+
+
+async def load_web_documents(
+    urls: Sequence[str],
+    verify_ssl: bool = True,
+    requests_per_second: int = 2,
+    trust_env: bool = False,
+) -> list[Document]:
+    """``get_web_loader(urls, ...).aload()``, reusing pages fetched recently (see WEB_FETCH_CACHE)."""
+    # Validated even when cached: the filter list may have changed since.
+    safe_urls = safe_validate_urls(urls)
+    if not safe_urls:
+        log.warning(f'All provided URLs were blocked or invalid: {urls}')
+        raise ValueError(ERROR_MESSAGES.INVALID_URL)
+
+    # Pages returned but not cached: failed fetches (empty documents with
+    # continue_on_failure), error responses and binary pages decoded as text.
+    uncached = []
+
+    async def fetch(missing: list[str]) -> dict[str, list[Document]]:
+        loader = get_web_loader(
+            missing,
+            verify_ssl=verify_ssl,
+            requests_per_second=requests_per_second,
+            trust_env=trust_env,
+        )
+        # Only SafeWebBaseLoader reports what it fetched; other engines return extracted text or nothing.
+        content_types = getattr(loader, 'content_types', None)
+        pages = {}
+        for doc in await loader.aload():
+            pages.setdefault(doc.metadata.get('source'), []).append(doc)
+
+        loaded = {}
+        for source, docs in pages.items():
+            if (
+                source
+                and any(doc.page_content.strip() for doc in docs)
+                and (content_types is None or (source in content_types and is_text_content_type(content_types[source])))
+            ):
+                loaded[source] = docs
+            else:
+                uncached.extend(docs)
+        return loaded
+
+    loaded = await WEB_FETCH_CACHE.load_many(list(safe_urls), fetch, namespace=('search',))
+    return [doc for url in safe_urls for doc in loaded.get(url, [])] + uncached
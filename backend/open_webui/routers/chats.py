@@ -46,7 +46,6 @@ log = logging.getLogger(__name__)
 
 router = APIRouter()
 
-SEARCH_FILTER_PREFIXES = ('tag:', 'folder:', 'pinned:', 'archived:', 'shared:')
 
 CHAT_CONFIG_KEYS = {
     'ENABLE_CONTEXT_COMPACTION': 'chat.context_compaction.enable',
@@ -65,43 +64,6 @@ class CompactChatForm(BaseModel):
     model: str | None = None
 
 
-def chat_search_content_text(text: str) -> str:
-    words = text.lower().strip().split(' ')
-    return ' '.join(word for word in words if not word.startswith(SEARCH_FILTER_PREFIXES)).strip()
-
-
-def chat_search_snippet(chat: dict, search_text: str, max_length: int = 200) -> str | None:
-    if not search_text:
-        return None
-
-    messages = chat.get('messages', [])
-    if isinstance(messages, dict):
-        messages = messages.values()
-
-    for message in messages:
-        if not isinstance(message, dict):
-            continue
-
-        content = message.get('content')
-        if not isinstance(content, str):
-            continue
-
-        index = content.lower().find(search_text)
-        if index == -1:
-            continue
-
-        start = max(index - max_length // 2, 0)
-        end = min(start + max_length, len(content))
-        if index + len(search_text) > end:
-            end = min(index + len(search_text), len(content))
-            start = max(end - max_length, 0)
-
-        snippet = ' '.join(content[start:end].split())
-        return f'{"..." if start else ""}{snippet}{"..." if end < len(content) else ""}'
-
-    return None
-
-
 async def get_chat_config_values() -> dict:
     values = await Config.get_many(*CHAT_CONFIG_KEYS.values())
     return {field: values[storage_key] for field, storage_key in CHAT_CONFIG_KEYS.items() if storage_key in values}
@@ -741,10 +703,7 @@ async def search_user_chats(
     limit = 60
     skip = (page - 1) * limit
 
-    search_text = chat_search_content_text(text)
-    chat_list = []
-    for chat in await Chats.get_chats_by_user_id_and_search_text(user.id, text, skip=skip, limit=limit, db=db):
-        chat_list.append(ChatTitleIdResponse(**chat.model_dump(), snippet=chat_search_snippet(chat.chat, search_text)))
+    chat_list = await Chats.get_chats_by_user_id_and_search_text(user.id, text, skip=skip, limit=limit, db=db)
 
     # Delete tag if no chat is found
     words = text.strip().split(' ')
@@ -1220,13 +1179,13 @@ async def update_chat_by_id(
                 form_data.chat.get('history'),
             )
 
-        chat = await Chats.update_chat_by_id(id, updated_chat, db=db)
-
         # Reconcile chat_message rows without inferring deletes from missing IDs.
-        # Message deletion has its own endpoint below.
+        # Message deletion has its own endpoint below.  Bodies are stripped from
+        # the blob only once their rows hold them, so a failed write never loses content.
         messages = (updated_chat.get('history') or {}).get('messages') or {}
-        if messages:
-            await Chats.reconcile_messages_by_chat_id(id, user.id, messages)
+        written = await Chats.reconcile_messages_by_chat_id(id, user.id, messages) if messages else set()
+
+        chat = await Chats.update_chat_by_id(id, Chats.strip_history_bodies(updated_chat, written), db=db)
 
         await publish_event(
             request,
@@ -1235,7 +1194,8 @@ async def update_chat_by_id(
             subject_id=id,
             data={'title': chat.title},
         )
-        return ChatResponse(**chat.model_dump())
+        # Respond with the hydrated history, as loaded.
+        return ChatResponse(**{**chat.model_dump(), 'chat': updated_chat})
     else:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -1,6 +1,5 @@
 import asyncio
 import errno
-import hashlib
 import json
 import logging
 import os
@@ -21,7 +20,7 @@ from fastapi import (
     UploadFile,
     status,
 )
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from open_webui.config import BYPASS_ADMIN_ACCESS_CONTROL, STORAGE_LOCAL_CACHE, STORAGE_PROVIDER, UPLOAD_DIR
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.events import EVENTS, publish_event
@@ -30,6 +29,7 @@ from open_webui.models.access_grants import AccessGrants
 from open_webui.models.channels import Channels
 from open_webui.models.config import Config
 from open_webui.models.chats import Chats
+from open_webui.models.file_blobs import FileBlobs
 from open_webui.models.files import (
     FileForm,
     FileListResponse,
@@ -45,7 +45,7 @@ from open_webui.routers.audio import transcribe
 from open_webui.routers.retrieval import ProcessFileForm, process_file
 from open_webui.storage.provider import Storage
 from open_webui.utils.auth import get_admin_user, get_verified_user
-from open_webui.utils.misc import strict_match_mime_type
+from open_webui.utils.misc import etag_matches, strict_match_mime_type
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -94,6 +94,12 @@ def _is_text_file(file_path: str, chunk_size: int = 8192) -> bool:
         return False
 
 
+async def delete_stored_file(file_path: str) -> None:
+    """Delete a file's stored object, unless other files with the same content still use it."""
+    if await FileBlobs.release(file_path):
+        await asyncio.to_thread(Storage.delete_file, file_path)
+
+
 def _cleanup_local_cache(file_path: str) -> None:
     """Remove the local cached copy of a cloud-stored file after processing."""
     if STORAGE_LOCAL_CACHE or STORAGE_PROVIDER == 'local':
@@ -333,7 +339,7 @@ async def upload_file_handler(
             'OpenWebUI-File-Id': id,
         }
         try:
-            contents, file_path = await asyncio.to_thread(Storage.upload_file, file.file, filename, tags)
+            size, sha256, file_path = await asyncio.to_thread(Storage.upload_file, file.file, filename, tags)
         except OSError as e:
             if e.errno != errno.ENAMETOOLONG:
                 log.exception(e)
@@ -345,7 +351,7 @@ async def upload_file_handler(
             file.file.seek(0)
             filename = f'{id}.{file_extension}' if file_extension else id
             try:
-                contents, file_path = await asyncio.to_thread(Storage.upload_file, file.file, filename, tags)
+                size, sha256, file_path = await asyncio.to_thread(Storage.upload_file, file.file, filename, tags)
             except OSError as e:
                 log.exception(e)
                 raise HTTPException(
@@ -353,40 +359,59 @@ async def upload_file_handler(
                     detail=ERROR_MESSAGES.DEFAULT(e.strerror or 'Error uploading file'),
                 )
         max_size = await Config.get('rag.file.max_size')
-        if max_size and len(contents) > int(max_size) * 1024 * 1024:
+        if max_size and size > int(max_size) * 1024 * 1024:
             await asyncio.to_thread(Storage.delete_file, file_path)
             raise HTTPException(
                 status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
                 detail=ERROR_MESSAGES.FILE_TOO_LARGE(size=f'{max_size} MB'),
             )
 
-        # SHA-256 of raw uploaded bytes for incremental sync diffing.
+        # Identical content is stored once: share the existing object and drop this copy.
+        try:
+            stored_path = await FileBlobs.acquire(sha256, file_path, size)
+        except Exception as e:
+            log.warning(f'Failed to deduplicate {filename}: {e}')
+            stored_path = file_path
+        if stored_path != file_path:
+            await asyncio.to_thread(Storage.delete_file, file_path)
+            file_path = stored_path
+
+        # SHA-256 of raw uploaded bytes (computed while storing) for incremental sync diffing.
         # If the client pre-computed and sent file_hash, use that.
-        file_hash = file_metadata.get('file_hash') or await asyncio.to_thread(
-            lambda: hashlib.sha256(contents).hexdigest()
-        )
+        file_hash = file_metadata.get('file_hash') or sha256
 
-        file_item = await Files.insert_new_file(
-            user.id,
-            FileForm(
-                **{
-                    'id': id,
-                    'filename': name,
-                    'path': file_path,
-                    'data': {
-                        **({'status': 'pending'} if process else {}),
-                    },
-                    'meta': {
-                        'name': name,
-                        'content_type': (file.content_type if isinstance(file.content_type, str) else None),
-                        'size': len(contents),
-                        'file_hash': file_hash,
-                        'data': file_metadata,
-                    },
-                }
-            ),
-            db=db,
-        )
+        file_item = None
+        try:
+            file_item = await Files.insert_new_file(
+                user.id,
+                FileForm(
+                    **{
+                        'id': id,
+                        'filename': name,
+                        'path': file_path,
+                        'data': {
+                            **({'status': 'pending'} if process else {}),
+                        },
+                        'meta': {
+                            'name': name,
+                            'content_type': (file.content_type if isinstance(file.content_type, str) else None),
+                            'size': size,
+                            'file_hash': file_hash,
+                            'data': file_metadata,
+                        },
+                    }
+                ),
+                db=db,
+            )
+        finally:
+            if file_item is None:
+                # Drop the reference taken above (and the object, if nothing else uses it).
+                await delete_stored_file(file_path)
+        if file_item is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=ERROR_MESSAGES.DEFAULT('Error uploading file'),
+            )
 
         if 'channel_id' in file_metadata:
             channel = await Channels.get_channel_by_id_and_user_id(file_metadata['channel_id'], user.id, db=db)
@@ -536,6 +561,7 @@ async def delete_all_files(
     result = await Files.delete_all_files(db=db)
     if result:
         try:
+            await FileBlobs.delete_all_blobs(db=db)
             await asyncio.to_thread(Storage.delete_all_files)
             await ASYNC_VECTOR_DB_CLIENT.reset()
         except Exception as e:
@@ -749,8 +775,87 @@ async def update_file_data_content_by_id(
 ############################
 
 
+def get_file_etag(file: FileModel) -> str:
+    """Strong ETag from the content hash; a file's stored bytes never change."""
+    file_hash = (file.meta or {}).get('file_hash') or file.id
+    return f'"{file_hash}"'
+
+
+def parse_byte_range(range_header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """
+    Inclusive ``(start, end)`` of a single ``bytes=`` range, or ``None`` to send
+    the whole file (no, malformed or multiple ranges).  A range outside the
+    file raises 416.
+    """
+    if not range_header or not range_header.startswith('bytes=') or ',' in range_header:
+        return None
+    first, _, last = range_header.removeprefix('bytes=').strip().partition('-')
+    try:
+        if first:
+            start, end = int(first), int(last) if last else size - 1
+            if last and end < start:
+                return None
+        else:
+            start, end = size - int(last), size - 1
+    except ValueError:
+        return None
+
+    start, end = max(start, 0), min(end, size - 1)
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={'Content-Range': f'bytes */{size}'},
+        )
+    return start, end
+
+
+async def get_file_content_response(
+    request: Request, file: FileModel, headers: Optional[dict] = None, media_type: Optional[str] = None
+) -> Response:
+    """
+    Serve a file's stored content with ETag revalidation and byte ranges.
+
+    A matching ``If-None-Match`` is answered with 304 before storage is
+    touched.  Ranges of files in S3 / GCS / Azure are streamed from the
+    bucket (or a fresh local copy) without downloading the whole object;
+    everything else is served from the local copy, which handles ranges too.
+    """
+    etag = get_file_etag(file)
+    cache_headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+    if etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+    headers = {**(headers or {}), **cache_headers}
+
+    size = (file.meta or {}).get('size')
+    if_range = request.headers.get('if-range')
+    if STORAGE_PROVIDER != 'local' and size and (not if_range or if_range == etag):
+        byte_range = parse_byte_range(request.headers.get('range'), size)
+        if byte_range is not None:
+            start, end = byte_range
+            return StreamingResponse(
+                Storage.iter_file_range(file.path, start, end),
+                status_code=status.HTTP_206_PARTIAL_CONTENT,
+                media_type=media_type,
+                headers={
+                    **headers,
+                    'Accept-Ranges': 'bytes',
+                    'Content-Range': f'bytes {start}-{end}/{size}',
+                    'Content-Length': str(end - start + 1),
+                },
+            )
+
+    file_path = Path(await asyncio.to_thread(Storage.get_file, file.path))
+    if not file_path.is_file():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ERROR_MESSAGES.NOT_FOUND,
+        )
+    return FileResponse(file_path, headers=headers, media_type=media_type)
+
+
 @router.get('/{id}/content')
 async def get_file_content_by_id(
+    request: Request,
     id: str,
     user=Depends(get_verified_user),
     attachment: bool = Query(False),
@@ -766,36 +871,22 @@ async def get_file_content_by_id(
 
     if file.user_id == user.id or user.role == 'admin' or await has_access_to_file(id, 'read', user, db=db):
         try:
-            file_path = await asyncio.to_thread(Storage.get_file, file.path)
-            file_path = Path(file_path)
-
-            # Check if the file already exists in the cache
-            if file_path.is_file():
-                # Handle Unicode filenames
-                filename = file.meta.get('name', file.filename)
-                encoded_filename = quote(filename)  # RFC5987 encoding
-
-                content_type = file.meta.get('content_type')
-                filename = file.meta.get('name', file.filename)
-                encoded_filename = quote(filename)
-                headers = {}
-
-                if attachment:
+            # Handle Unicode filenames
+            content_type = file.meta.get('content_type')
+            filename = file.meta.get('name', file.filename)
+            encoded_filename = quote(filename)  # RFC5987 encoding
+            headers = {}
+
+            if attachment:
+                headers['Content-Disposition'] = f"attachment; filename*=UTF-8''{encoded_filename}"
+            else:
+                if content_type == 'application/pdf' or filename.lower().endswith('.pdf'):
+                    headers['Content-Disposition'] = f"inline; filename*=UTF-8''{encoded_filename}"
+                    content_type = 'application/pdf'
+                elif content_type != 'text/plain':
                     headers['Content-Disposition'] = f"attachment; filename*=UTF-8''{encoded_filename}"
-                else:
-                    if content_type == 'application/pdf' or filename.lower().endswith('.pdf'):
-                        headers['Content-Disposition'] = f"inline; filename*=UTF-8''{encoded_filename}"
-                        content_type = 'application/pdf'
-                    elif content_type != 'text/plain':
-                        headers['Content-Disposition'] = f"attachment; filename*=UTF-8''{encoded_filename}"
-
-                return FileResponse(file_path, headers=headers, media_type=content_type)
 
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=ERROR_MESSAGES.NOT_FOUND,
-                )
+            return await get_file_content_response(request, file, headers=headers, media_type=content_type)
         except HTTPException as e:
             raise e
         except Exception as e:
@@ -814,7 +905,7 @@ async def get_file_content_by_id(
 
 @router.get('/{id}/content/html')
 async def get_html_file_content_by_id(
-    id: str, user=Depends(get_verified_user), db: AsyncSession = Depends(get_async_session)
+    request: Request, id: str, user=Depends(get_verified_user), db: AsyncSession = Depends(get_async_session)
 ):
     file = await Files.get_file_by_id(id, db=db)
 
@@ -833,18 +924,7 @@ async def get_html_file_content_by_id(
 
     if file.user_id == user.id or user.role == 'admin' or await has_access_to_file(id, 'read', user, db=db):
         try:
-            file_path = await asyncio.to_thread(Storage.get_file, file.path)
-            file_path = Path(file_path)
-
-            # Check if the file already exists in the cache
-            if file_path.is_file():
-                log.info(f'file_path: {file_path}')
-                return FileResponse(file_path)
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=ERROR_MESSAGES.NOT_FOUND,
-                )
+            return await get_file_content_response(request, file)
         except HTTPException as e:
             raise e
         except Exception as e:
@@ -863,7 +943,7 @@ async def get_html_file_content_by_id(
 
 @router.get('/{id}/content/{file_name}')
 async def get_file_content_by_id(
-    id: str, user=Depends(get_verified_user), db: AsyncSession = Depends(get_async_session)
+    request: Request, id: str, user=Depends(get_verified_user), db: AsyncSession = Depends(get_async_session)
 ):
     file = await Files.get_file_by_id(id, db=db)
 
@@ -882,17 +962,7 @@ async def get_file_content_by_id(
         headers = {'Content-Disposition': f"attachment; filename*=UTF-8''{encoded_filename}"}
 
         if file_path:
-            file_path = await asyncio.to_thread(Storage.get_file, file_path)
-            file_path = Path(file_path)
-
-            # Check if the file already exists in the cache
-            if file_path.is_file():
-                return FileResponse(file_path, headers=headers)
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=ERROR_MESSAGES.NOT_FOUND,
-                )
+            return await get_file_content_response(request, file, headers=headers)
         else:
             # File path doesn’t exist, return the content as .txt if possible
             file_content = file.data.get('content', '')
@@ -996,7 +1066,7 @@ async def delete_file_by_id(
         result = await Files.delete_file_by_id(id, db=db)
         if result:
             try:
-                await asyncio.to_thread(Storage.delete_file, file.path)
+                await delete_stored_file(file.path)
                 await ASYNC_VECTOR_DB_CLIENT.delete(collection_name=f'file-{id}')
             except Exception as e:
                 log.exception(e)
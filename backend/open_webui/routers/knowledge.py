@@ -32,13 +32,13 @@ from open_webui.models.knowledge import (
 from open_webui.models.models import ModelForm, Models
 from open_webui.retrieval.vector.async_client import ASYNC_VECTOR_DB_CLIENT
 from open_webui.retrieval.external import retrieve_external_knowledge, retrieve_external_knowledge_for_connection
+from open_webui.routers.files import delete_stored_file
 from open_webui.routers.retrieval import (
     BatchProcessFilesForm,
     ProcessFileForm,
     process_file,
     process_files_batch,
 )
-from open_webui.storage.provider import Storage
 from open_webui.utils.access_control import filter_allowed_access_grants, has_permission
 from open_webui.utils.access_control.files import has_access_to_file
 from open_webui.utils.auth import get_admin_user, get_verified_user
@@ -1954,7 +1954,7 @@ async def sync_knowledge_cleanup(
         if file.user_id == user.id or user.role == 'admin':
             await Files.delete_file_by_id(file_id, db=db)
             try:
-                await asyncio.to_thread(Storage.delete_file, file.path)
+                await delete_stored_file(file.path)
             except Exception:
                 pass
 
@@ -29,6 +29,7 @@ from open_webui.env import (
     ENABLE_FORWARD_USER_INFO_HEADERS,
     FORWARD_SESSION_INFO_HEADER_CHAT_ID,
     MODELS_CACHE_TTL,
+    OLLAMA_ROUTING_COLD_LOAD_PENALTY,
 )
 from open_webui.internal.db import get_async_session
 from open_webui.models.access_grants import AccessGrants
@@ -38,6 +39,8 @@ from open_webui.models.models import Models
 from open_webui.models.users import UserModel
 from open_webui.utils.access_control import check_model_access
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.utils.connection_health import CONNECTION_HEALTH, send_connection_request
+from open_webui.utils.connection_load import CONNECTION_LOAD, RESIDENT_MODELS
 from open_webui.utils.headers import get_custom_headers, include_user_info_headers
 from open_webui.utils.misc import calculate_sha256
 from open_webui.utils.payload import (
@@ -46,6 +49,7 @@ from open_webui.utils.payload import (
     apply_system_prompt_to_body,
 )
 from open_webui.utils.session_pool import cleanup_response, get_session, stream_wrapper
+from open_webui.utils.upstream_models import UPSTREAM_MODELS, is_user_independent
 
 log = logging.getLogger(__name__)
 
@@ -67,6 +71,11 @@ async def send_get_request(
     user: UserModel | None = None,
 ):
     """Issue a GET request to an Ollama backend and return JSON, or *None* on failure."""
+    if not CONNECTION_HEALTH.allow(url):
+        log.debug(f'Skipping {url}: connection unavailable after repeated failures')
+        return None
+
+    status = None
     try:
         session = await get_session()
         headers: dict = {
@@ -83,9 +92,13 @@ async def send_get_request(
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
             timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST),
         ) as r:
+            status = r.status
+            CONNECTION_HEALTH.record_status(url, status)
             return await r.json()
     except Exception as exc:
         log.error(f'Connection error: {exc}')
+        if status is None:
+            CONNECTION_HEALTH.record_failure(url, str(exc) or type(exc).__name__)
         return None
 
 
@@ -121,7 +134,9 @@ async def send_request(
         if api_config and api_config.get('headers'):
             headers.update(get_custom_headers(api_config['headers'], user, metadata, request=request))
 
-        r = await session.request(
+        r = await send_connection_request(
+            session,
+            url,
             method,
             url,
             data=payload,
@@ -288,6 +303,25 @@ async def get_config(
     return await get_ollama_config_values()
 
 
+@router.get('/connections/status')
+async def get_connections_status(
+    request: Request,
+    user=Depends(get_admin_user),
+) -> dict:
+    """Each backend's health, and when its model list was last fetched."""
+    _, base_urls, _ = await get_ollama_runtime_config()
+    return {
+        'connections': [
+            {
+                **status,
+                'health': CONNECTION_HEALTH.get_status(status['url']),
+                'load': CONNECTION_LOAD.get_status(status['url']),
+            }
+            for status in UPSTREAM_MODELS.get_status('ollama', base_urls)
+        ]
+    }
+
+
 class OllamaConfigForm(BaseModel):
     """Payload for updating the Ollama connection configuration."""
 
@@ -350,6 +384,65 @@ def merge_models_lists(model_lists) -> list[dict]:
     return list(merged.values())
 
 
+async def get_connection_models(idx: int, url: str, key: str | None = None, user: UserModel | None = None):
+    """``/api/tags`` of backend ``idx``, served through ``UPSTREAM_MODELS``."""
+    if not CONNECTION_HEALTH.is_available(url):
+        # Leave the backend's models out rather than route to a backend that cannot be reached.
+        return None
+    return await UPSTREAM_MODELS.fetch(
+        'ollama',
+        idx,
+        url,
+        lambda: send_get_request(f'{url}/api/tags', key, user=user),
+        identity=key,
+        shared=is_user_independent(),
+    )
+
+
+async def choose_url_idx(url_idxs: list[int], model: str | None = None) -> int:
+    """Pick the least-loaded backend serving a model.
+
+    Failing backends are skipped, and backends that do not have ``model`` loaded yet are
+    penalized by ``OLLAMA_ROUTING_COLD_LOAD_PENALTY`` (see utils/connection_load.py).
+    """
+    base_urls = await Config.get('ollama.base_urls', [])
+    url_idxs = [idx for idx in url_idxs if idx < len(base_urls)] or url_idxs
+    candidates = [idx for idx in url_idxs if idx < len(base_urls) and CONNECTION_HEALTH.is_available(base_urls[idx])]
+    if not candidates:
+        # With every backend failing, try one anyway: its circuit decides whether a probe goes out.
+        return random.choice(url_idxs)
+    if len(candidates) == 1:
+        return candidates[0]
+
+    urls = [base_urls[idx] for idx in candidates]
+    names = [None] * len(candidates)
+    penalties = None
+    if model and OLLAMA_ROUTING_COLD_LOAD_PENALTY > 0:
+        api_configs = await Config.get('ollama.api_configs', {})
+        loads = []
+        for i, (idx, url) in enumerate(zip(candidates, urls)):
+            api_config = resolve_api_config(api_configs, idx, url)
+            prefix_id = api_config.get('prefix_id')
+            names[i] = model.removeprefix(f'{prefix_id}.') if prefix_id else model
+            loads.append(
+                RESIDENT_MODELS.get(
+                    url,
+                    lambda url=url, key=api_config.get('key'): send_get_request(f'{url}/api/ps', key),
+                )
+            )
+        resident = await asyncio.gather(*loads)
+        # Unknown residency (a failed /api/ps) is not held against the backend.
+        penalties = [
+            0 if models is None or name in models else OLLAMA_ROUTING_COLD_LOAD_PENALTY
+            for name, models in zip(names, resident)
+        ]
+
+    i = CONNECTION_LOAD.choose(urls, penalties)
+    if names[i]:
+        RESIDENT_MODELS.mark(urls[i], names[i])
+    return candidates[i]
+
+
 def resolve_api_config(api_configs: dict, idx: int, url: str) -> dict:
     """Look up the API config for a backend by numeric index, falling back to URL key (legacy)."""
     return api_configs.get(str(idx), api_configs.get(url, {}))
@@ -376,17 +469,16 @@ async def get_all_models(request: Request, user: UserModel | None = None):
     api_configs = await Config.get('ollama.api_configs', {})
     for idx, url in enumerate(base_urls):
         api_config = resolve_api_config(api_configs, idx, url)
-        if not api_config:
-            tasks.append(send_get_request(f'{url}/api/tags', user=user))
-        elif api_config.get('enable', True):
-            tasks.append(send_get_request(f'{url}/api/tags', api_config.get('key'), user=user))
+        if not api_config or api_config.get('enable', True):
+            tasks.append(get_connection_models(idx, url, api_config.get('key'), user=user))
         else:
             tasks.append(asyncio.ensure_future(asyncio.sleep(0, None)))
 
     responses = await asyncio.gather(*tasks)
 
-    # Track which backends failed so we can skip them for /api/ps
-    failed_idxs: set[int] = set()
+    # Track which backends failed so we can skip them for /api/ps; a backend
+    # served from its last known-good list may still be down.
+    failed_idxs: set[int] = {idx for idx, url in enumerate(base_urls) if UPSTREAM_MODELS.is_failing('ollama', idx, url)}
 
     # Post-process each response: apply prefix_id, tags, model filtering
     for idx, response in enumerate(responses):
@@ -822,7 +914,7 @@ async def show_model_info(
     if model not in models:
         raise HTTPException(status_code=400, detail=ERROR_MESSAGES.MODEL_NOT_FOUND(model))
 
-    url_idx = random.choice(models[model]['urls'])
+    url_idx = await choose_url_idx(models[model]['urls'])
     url = (await Config.get('ollama.base_urls', []))[url_idx]
     key = get_api_key(url_idx, url, (await Config.get('ollama.api_configs', {})))
 
@@ -869,7 +961,7 @@ async def embed(
             models = request.app.state.OLLAMA_MODELS
         if model not in models:
             raise HTTPException(status_code=400, detail=ERROR_MESSAGES.MODEL_NOT_FOUND(form_data.model))
-        url_idx = random.choice(models[model]['urls'])
+        url_idx = await choose_url_idx(models[model]['urls'], model)
 
     url = (await Config.get('ollama.base_urls', []))[url_idx]
     api_config = (await Config.get('ollama.api_configs', {})).get(
@@ -923,7 +1015,7 @@ async def embeddings(
             models = request.app.state.OLLAMA_MODELS
         if model not in models:
             raise HTTPException(status_code=400, detail=ERROR_MESSAGES.MODEL_NOT_FOUND(form_data.model))
-        url_idx = random.choice(models[model]['urls'])
+        url_idx = await choose_url_idx(models[model]['urls'], model)
 
     url = (await Config.get('ollama.base_urls', []))[url_idx]
     api_config = (await Config.get('ollama.api_configs', {})).get(
@@ -982,7 +1074,7 @@ async def generate_completion(
         model = form_data.model
         if model not in models:
             raise HTTPException(status_code=400, detail=ERROR_MESSAGES.MODEL_NOT_FOUND(form_data.model))
-        url_idx = random.choice(models[model]['urls'])
+        url_idx = await choose_url_idx(models[model]['urls'], model)
 
     url = (await Config.get('ollama.base_urls', []))[url_idx]
     api_config = (await Config.get('ollama.api_configs', {})).get(
@@ -1056,7 +1148,7 @@ async def get_ollama_url(request: Request, model: str, url_idx: int | None = Non
                 status_code=400,
                 detail=ERROR_MESSAGES.MODEL_NOT_FOUND(model),
             )
-        url_idx = random.choice(models[model].get('urls', []))
+        url_idx = await choose_url_idx(models[model].get('urls', []), model)
     url = (await Config.get('ollama.base_urls', []))[url_idx]
     return url, url_idx
 
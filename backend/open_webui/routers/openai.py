@@ -42,6 +42,8 @@ from open_webui.models.users import UserModel
 from open_webui.utils.access_control import check_model_access, has_connection_access, has_permission
 from open_webui.utils.anthropic import get_anthropic_models, is_anthropic_url
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.utils.connection_health import CONNECTION_HEALTH, send_connection_request
+from open_webui.utils.connection_load import CONNECTION_LOAD
 from open_webui.utils.headers import get_custom_headers, include_user_info_headers
 from open_webui.utils.misc import (
     convert_logit_bias_input_to_json,
@@ -56,6 +58,7 @@ from open_webui.utils.session_pool import (
     get_session,
     stream_wrapper,
 )
+from open_webui.utils.upstream_models import UPSTREAM_MODELS, is_user_independent
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -89,7 +92,12 @@ async def send_get_request(
     user: UserModel = None,
     config=None,
 ):
+    if not CONNECTION_HEALTH.allow(url):
+        log.debug(f'Skipping {url}: connection unavailable after repeated failures')
+        return None
+
     timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST)
+    status = None
     try:
         async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
             if request and config:
@@ -109,10 +117,14 @@ async def send_get_request(
                 cookies=cookies,
                 ssl=AIOHTTP_CLIENT_SESSION_SSL,
             ) as response:
+                status = response.status
+                CONNECTION_HEALTH.record_status(url, status)
                 return await response.json()
     except Exception as e:
         # Handle connection error here
         log.error(f'Connection error: {e}')
+        if status is None:
+            CONNECTION_HEALTH.record_failure(url, str(e) or type(e).__name__)
         return None
 
 
@@ -128,6 +140,28 @@ async def get_models_request(
     return await send_get_request(request, f'{url}/models', key, user=user, config=config)
 
 
+async def get_connection_models(
+    request: Request,
+    idx: int,
+    url: str,
+    key=None,
+    user: UserModel = None,
+    config=None,
+):
+    """``get_models_request`` for connection ``idx``, served through ``UPSTREAM_MODELS``."""
+    if not CONNECTION_HEALTH.is_available(url):
+        # Leave the connection's models out rather than offer models that cannot be reached.
+        return None
+    return await UPSTREAM_MODELS.fetch(
+        'openai',
+        idx,
+        url,
+        lambda: get_models_request(request, url, key, user=user, config=config),
+        identity=[key, config],
+        shared=is_user_independent(config),
+    )
+
+
 def openai_reasoning_model_handler(payload):
     """
     Handle reasoning model specific parameters
@@ -293,6 +327,26 @@ async def normalize_openai_api_keys(api_base_urls: list[str], api_keys: list[str
     return api_keys
 
 
+# Connections serving the same model id are pooled only if requests to them are built the same way.
+ROUTING_CONFIG_FIELDS = ('api_type', 'azure', 'provider', 'prefix_id')
+
+
+async def choose_url_idx(model: dict) -> int:
+    """Pick the least-loaded connection serving ``model``, skipping failing ones."""
+    url_idxs = model.get('urlIdxs') or [model['urlIdx']]
+    if len(url_idxs) == 1:
+        return url_idxs[0]
+
+    _, api_base_urls, _, _ = await get_openai_runtime_config()
+    candidates = [
+        idx for idx in url_idxs if idx < len(api_base_urls) and CONNECTION_HEALTH.is_available(api_base_urls[idx])
+    ]
+    if not candidates:
+        # Every connection is failing: the first one's circuit decides whether a probe goes out.
+        return model['urlIdx']
+    return candidates[CONNECTION_LOAD.choose([api_base_urls[idx] for idx in candidates])]
+
+
 async def get_openai_connection(idx: int) -> tuple[str, str, dict]:
     _, api_base_urls, api_keys, api_configs = await get_openai_runtime_config()
     url = api_base_urls[idx]
@@ -354,6 +408,22 @@ async def update_config(request: Request, form_data: OpenAIConfigForm, user=Depe
     }
 
 
+@router.get('/connections/status')
+async def get_connections_status(request: Request, user=Depends(get_admin_user)):
+    """Each connection's health, and when its model list was last fetched."""
+    _, api_base_urls, _, _ = await get_openai_runtime_config()
+    return {
+        'connections': [
+            {
+                **status,
+                'health': CONNECTION_HEALTH.get_status(status['url']),
+                'load': CONNECTION_LOAD.get_status(status['url']),
+            }
+            for status in UPSTREAM_MODELS.get_status('openai', api_base_urls)
+        ]
+    }
+
+
 @router.post('/audio/speech')
 async def speech(request: Request, user=Depends(get_verified_user)):
     if user.role != 'admin' and not await has_permission(user.id, 'chat.tts', await Config.get('user.permissions')):
@@ -442,7 +512,7 @@ async def get_all_models_responses(request: Request, user: UserModel) -> list:
     request_tasks = []
     for idx, url in enumerate(api_base_urls):
         if (str(idx) not in api_configs) and (url not in api_configs):  # Legacy support
-            request_tasks.append(get_models_request(request, url, api_keys[idx], user=user))
+            request_tasks.append(get_connection_models(request, idx, url, api_keys[idx], user=user))
         else:
             api_config = api_configs.get(
                 str(idx),
@@ -454,7 +524,9 @@ async def get_all_models_responses(request: Request, user: UserModel) -> list:
 
             if enable:
                 if len(model_ids) == 0:
-                    request_tasks.append(get_models_request(request, url, api_keys[idx], user=user, config=api_config))
+                    request_tasks.append(
+                        get_connection_models(request, idx, url, api_keys[idx], user=user, config=api_config)
+                    )
                 else:
                     model_list = {
                         'object': 'list',
@@ -592,7 +664,15 @@ async def get_all_models(request: Request, user: UserModel) -> dict[str, list]:
                         # Skip unwanted OpenAI models
                         continue
 
-                    if model_id and model_id not in models:
+                    if model_id in models:
+                        # Served by several connections: requests are routed to the least-loaded one,
+                        # as long as they take the same request format.
+                        first_idx = models[model_id]['urlIdx']
+                        api_config = api_configs.get(str(idx), api_configs.get(base_url, {}))
+                        first_config = api_configs.get(str(first_idx), api_configs.get(api_base_urls[first_idx], {}))
+                        if all(api_config.get(field) == first_config.get(field) for field in ROUTING_CONFIG_FIELDS):
+                            models[model_id]['urlIdxs'].append(idx)
+                    elif model_id:
                         api_config = api_configs.get(str(idx), api_configs.get(base_url, {}))
                         provider = model.get('provider', '')
                         merged = {
@@ -603,6 +683,7 @@ async def get_all_models(request: Request, user: UserModel) -> dict[str, list]:
                             'connection_type': model.get('connection_type', 'external'),
                             'provider': provider,
                             'urlIdx': idx,
+                            'urlIdxs': [idx],
                         }
 
                         loaded = get_llamacpp_model_loaded_state(
@@ -1159,7 +1240,7 @@ async def generate_chat_completion(
     model = models.get(model_id)
 
     if model:
-        idx = model['urlIdx']
+        idx = await choose_url_idx(model)
     else:
         raise HTTPException(
             status_code=404,
@@ -1255,7 +1336,9 @@ async def generate_chat_completion(
     try:
         session = await get_session()
 
-        r = await session.request(
+        r = await send_connection_request(
+            session,
+            url,
             method='POST',
             url=request_url,
             data=payload,
@@ -1340,6 +1423,8 @@ async def generate_chat_completion(
                 response = convert_responses_result(response)
 
             return response
+    except HTTPException:
+        raise
     except Exception as e:
         log.exception(e)
 
@@ -1375,7 +1460,7 @@ async def embeddings(request: Request, form_data: dict, user):
         await get_all_models(request, user=user)
         models = request.app.state.OPENAI_MODELS
     if model_id in models:
-        idx = models[model_id]['urlIdx']
+        idx = await choose_url_idx(models[model_id])
 
     url, key, api_config = await get_openai_connection(idx)
 
@@ -1407,7 +1492,9 @@ async def embeddings(request: Request, form_data: dict, user):
 
     try:
         session = await get_session()
-        r = await session.request(
+        r = await send_connection_request(
+            session,
+            url,
             method='POST',
             url=embeddings_url,
             data=body,
@@ -1447,6 +1534,8 @@ async def embeddings(request: Request, form_data: dict, user):
                     return PlainTextResponse(status_code=r.status, content=response_data)
 
             return response_data
+    except HTTPException:
+        raise
     except Exception as e:
         log.exception(e)
         raise HTTPException(
@@ -1504,7 +1593,7 @@ async def responses(
             await get_all_models(request, user=user)
             models = request.app.state.OPENAI_MODELS
         if model_id in models:
-            idx = models[model_id]['urlIdx']
+            idx = await choose_url_idx(models[model_id])
 
     url, key, api_config = await get_openai_connection(idx)
 
@@ -1532,7 +1621,9 @@ async def responses(
             request_url = f'{url}/responses'
 
         session = await get_session()
-        r = await session.request(
+        r = await send_connection_request(
+            session,
+            url,
             method='POST',
             url=request_url,
             data=body,
@@ -1618,7 +1709,7 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
             await get_all_models(request, user=user)
             models = request.app.state.OPENAI_MODELS
         if model_id in models:
-            idx = models[model_id]['urlIdx']
+            idx = await choose_url_idx(models[model_id])
 
     url, key, api_config = await get_openai_connection(idx)
     base_url = url
@@ -1653,7 +1744,9 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
             request_url = f'{url}/{path}'
 
         session = await get_session()
-        r = await session.request(
+        r = await send_connection_request(
+            session,
+            base_url,
             method=request.method,
             url=request_url,
             data=body,
@@ -58,6 +58,8 @@ from open_webui.env import (
 )
 from open_webui.events import EVENTS, publish_event
 from open_webui.internal.db import get_async_db, get_async_session
+from open_webui.models.bm25 import BM25Index
+from open_webui.models.file_blobs import FileBlobs
 from open_webui.models.files import FileModel, Files, FileUpdateForm
 from open_webui.models.knowledge import Knowledges
 from open_webui.models.config import Config
@@ -66,6 +68,7 @@ from open_webui.models.config import Config
 from open_webui.retrieval.loaders.youtube import YoutubeLoader
 from open_webui.retrieval.utils import (
     build_loader_from_config,
+    embed_chunks,
     get_loader_config,
     filter_accessible_collections,
     get_content_from_url,
@@ -77,7 +80,7 @@ from open_webui.retrieval.utils import (
     query_doc,
     query_doc_with_hybrid_search,
 )
-from open_webui.retrieval.vector.async_client import ASYNC_VECTOR_DB_CLIENT
+from open_webui.retrieval.vector.async_client import ASYNC_VECTOR_DB_CLIENT, update_bm25_index
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
 from open_webui.retrieval.vector.utils import filter_metadata
 from open_webui.retrieval.web.azure import search_azure
@@ -109,7 +112,7 @@ from open_webui.retrieval.web.serply import search_serply
 from open_webui.retrieval.web.serpstack import search_serpstack
 from open_webui.retrieval.web.sougou import search_sougou
 from open_webui.retrieval.web.tavily import search_tavily
-from open_webui.retrieval.web.utils import get_web_loader
+from open_webui.retrieval.web.utils import load_web_documents
 from open_webui.retrieval.web.yacy import search_yacy
 from open_webui.retrieval.web.yandex import search_yandex
 from open_webui.retrieval.web.ydc import search_youcom
@@ -1726,6 +1729,10 @@ def save_docs_to_vector_db(
 
             if overwrite:
                 VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
+                asyncio.run_coroutine_threadsafe(
+                    update_bm25_index(collection_name, BM25Index.drop),
+                    request.app.state.main_loop,
+                ).result()
                 log.info(f'deleting existing collection {collection_name}')
             elif add is False:
                 log.info(f'collection {collection_name} already exists, overwrite is False and add is False')
@@ -1766,10 +1773,15 @@ def save_docs_to_vector_db(
         # This allows the main loop to stay responsive to health checks during long operations
         embedding_timeout = RAG_EMBEDDING_TIMEOUT
 
+        embedding_space = ':'.join(
+            [config.RAG_EMBEDDING_ENGINE, config.RAG_EMBEDDING_MODEL, RAG_EMBEDDING_CONTENT_PREFIX or '']
+        )
         future = asyncio.run_coroutine_threadsafe(
-            embedding_function(
+            embed_chunks(
+                embedding_function,
                 list(map(lambda x: x.replace('\n', ' '), texts)),
                 prefix=RAG_EMBEDDING_CONTENT_PREFIX,
+                model=embedding_space,
                 user=user,
             ),
             request.app.state.main_loop,
@@ -1792,6 +1804,10 @@ def save_docs_to_vector_db(
             collection_name=collection_name,
             items=items,
         )
+        asyncio.run_coroutine_threadsafe(
+            update_bm25_index(collection_name, BM25Index.upsert, items),
+            request.app.state.main_loop,
+        ).result()
 
         log.info(f'added {len(items)} items to collection {collection_name}')
         return True
@@ -1800,6 +1816,77 @@ def save_docs_to_vector_db(
         raise e
 
 
+# Retrieval settings that change how extracted text is split into chunks.
+CHUNKING_CONFIG_KEYS = (
+    'TEXT_SPLITTER',
+    'ENABLE_MARKDOWN_HEADER_TEXT_SPLITTER',
+    'CHUNK_SIZE',
+    'CHUNK_MIN_SIZE_TARGET',
+    'CHUNK_OVERLAP',
+    'TIKTOKEN_ENCODING_NAME',
+    'RAG_TOKENIZER_MODEL',
+)
+
+
+def get_source_config_hash(loader_config: dict, config: RetrievalConfig) -> str:
+    """
+    SHA-256 of the settings a file's text and chunks were produced with: the
+    extraction engine and its loader settings, and the text splitter.  API keys
+    and tokens are left out, since rotating them does not change the output.
+    """
+    settings = {
+        key: value for key, value in loader_config.items() if key.isupper() and not key.endswith(('_KEY', '_TOKEN'))
+    }
+    settings.update({key: getattr(config, key, None) for key in CHUNKING_CONFIG_KEYS})
+    return calculate_sha256_string(json.dumps(settings, sort_keys=True, default=str))
+
+
+async def get_reusable_docs(
+    file: FileModel,
+    source_hash: str,
+    source_config_hash: str,
+    config: RetrievalConfig,
+    db: AsyncSession | None = None,
+) -> tuple[list[Document], str] | None:
+    """
+    Chunks and text extracted from another file stored at ``file.path`` (an
+    upload of the same content, SHA-256 ``source_hash``), relabelled for
+    ``file``; ``None`` if there are none.  Files whose content was edited
+    since extraction, or that were extracted or chunked with other settings
+    (``source_config_hash``), are not reused.  The chunks' embeddings are
+    reused from the chunk embedding store.
+    """
+    donor = await Files.get_processed_file_by_path(
+        file.path, source_hash, source_config_hash, exclude_id=file.id, db=db
+    )
+    if donor is None or not (donor.data or {}).get('content'):
+        return None
+
+    text_content = donor.data['content']
+    labels = {
+        'name': file.filename,
+        'created_by': file.user_id,
+        'file_id': file.id,
+        'source': file.filename,
+    }
+    if config.BYPASS_EMBEDDING_AND_RETRIEVAL:
+        return [Document(page_content=text_content, metadata={**file.meta, **labels})], text_content
+
+    try:
+        result = await ASYNC_VECTOR_DB_CLIENT.query(collection_name=f'file-{donor.id}', filter={'file_id': donor.id})
+    except Exception as e:
+        log.debug(f'No reusable chunks for {file.id} in file-{donor.id}: {e}')
+        return None
+    if result is None or not result.ids or not result.ids[0]:
+        return None
+
+    docs = [
+        Document(page_content=document, metadata={**(metadata or {}), **labels})
+        for document, metadata in zip(result.documents[0], result.metadatas[0])
+    ]
+    return docs, text_content
+
+
 class ProcessFileForm(BaseModel):
     file_id: str
     content: str | None = None
@@ -1828,6 +1915,11 @@ async def process_file(
     if file:
         try:
             collection_name = form_data.collection_name
+            reused = None
+            # SHA-256 of the stored object the content was extracted from, unmodified, and of the
+            # settings it was extracted and chunked with; None once the content is replaced.
+            # Only such content is reused for duplicates.
+            data = {}
 
             if collection_name is None:
                 collection_name = f'file-{file.id}'
@@ -1845,6 +1937,9 @@ async def process_file(
                     # Audio file upload pipeline
                     pass
 
+                data['source_hash'] = None
+                data['source_config_hash'] = None
+
                 docs = [
                     Document(
                         page_content=form_data.content.replace('<br/>', '\n'),
@@ -1894,50 +1989,60 @@ async def process_file(
                 # Process the file and save the content
                 # Usage: /files/
                 file_path = file.path
-                if file_path:
-                    file_path = await asyncio.to_thread(Storage.get_file, file_path)
-                    loader_config = await get_loader_config()
-                    loader = build_loader_from_config(request, loader_config)
-                    loader.user = user
-                    loader.metadata = {
-                        'file_id': file.id,
-                        'file_name': file.filename,
-                        'file_content_type': file.meta.get('content_type'),
-                    }
-                    docs = await loader.aload(file.filename, file.meta.get('content_type'), file_path)
-
-                    docs = [
-                        Document(
-                            page_content=doc.page_content,
-                            metadata={
-                                **filter_metadata(doc.metadata),
-                                'name': file.filename,
-                                'created_by': file.user_id,
-                                'file_id': file.id,
-                                'source': file.filename,
-                            },
-                        )
-                        for doc in docs
-                    ]
+                loader_config = await get_loader_config()
+                blob = await FileBlobs.get_blob_by_path(file_path, db=db) if file_path else None
+                if blob:
+                    data['source_hash'] = blob.hash
+                    data['source_config_hash'] = get_source_config_hash(loader_config, config)
+                    # An earlier upload of the same content (stored at the same path) was already extracted
+                    reused = await get_reusable_docs(file, blob.hash, data['source_config_hash'], config, db=db)
+                if reused:
+                    docs, text_content = reused
+                    log.info(f'Reusing content extracted from an earlier upload of {file.filename}')
                 else:
-                    docs = [
-                        Document(
-                            page_content=file.data.get('content', ''),
-                            metadata={
-                                **file.meta,
-                                'name': file.filename,
-                                'created_by': file.user_id,
-                                'file_id': file.id,
-                                'source': file.filename,
-                            },
-                        )
-                    ]
-                text_content = ' '.join([doc.page_content for doc in docs])
+                    if file_path:
+                        file_path = await asyncio.to_thread(Storage.get_file, file_path)
+                        loader = build_loader_from_config(request, loader_config)
+                        loader.user = user
+                        loader.metadata = {
+                            'file_id': file.id,
+                            'file_name': file.filename,
+                            'file_content_type': file.meta.get('content_type'),
+                        }
+                        docs = await loader.aload(file.filename, file.meta.get('content_type'), file_path)
+
+                        docs = [
+                            Document(
+                                page_content=doc.page_content,
+                                metadata={
+                                    **filter_metadata(doc.metadata),
+                                    'name': file.filename,
+                                    'created_by': file.user_id,
+                                    'file_id': file.id,
+                                    'source': file.filename,
+                                },
+                            )
+                            for doc in docs
+                        ]
+                    else:
+                        docs = [
+                            Document(
+                                page_content=file.data.get('content', ''),
+                                metadata={
+                                    **file.meta,
+                                    'name': file.filename,
+                                    'created_by': file.user_id,
+                                    'file_id': file.id,
+                                    'source': file.filename,
+                                },
+                            )
+                        ]
+                    text_content = ' '.join([doc.page_content for doc in docs])
 
             log.debug(f'text_content: {text_content}')
             await Files.update_file_data_by_id(
                 file.id,
-                {'content': text_content},
+                {'content': text_content, **data},
                 db=db,
             )
             hash = calculate_sha256_string(text_content)
@@ -1983,6 +2088,8 @@ async def process_file(
                             'hash': hash,
                         },
                         add=(True if form_data.collection_name else False),
+                        # Reused chunks are already split
+                        split=not reused,
                         user=user,
                     )
                     log.info(f'added {len(docs)} items to collection {collection_name}')
@@ -2604,13 +2711,12 @@ async def process_web_search(request: Request, form_data: SearchForm, user=Depen
                 if hasattr(result, 'snippet') and result.snippet is not None
             ]
         else:
-            loader = get_web_loader(
+            docs = await load_web_documents(
                 urls,
                 verify_ssl=config.ENABLE_WEB_LOADER_SSL_VERIFICATION,
                 requests_per_second=config.WEB_LOADER_CONCURRENT_REQUESTS,
                 trust_env=config.WEB_SEARCH_TRUST_ENV,
             )
-            docs = await loader.aload()
 
         urls = [
             doc.metadata.get('source') for doc in docs if doc.metadata.get('source')
@@ -7,7 +7,6 @@ import sys
 import time
 from typing import Dict
 
-import pycrdt as Y
 import socketio
 from open_webui.config import (
     CORS_ALLOW_ORIGIN,
@@ -18,8 +17,10 @@ from open_webui.env import (
     REDIS_KEY_PREFIX,
     VERSION,
     WEBSOCKET_EVENT_CALLER_TIMEOUT,
+    WEBSOCKET_EVENT_EMITTER_FLUSH_INTERVAL,
     WEBSOCKET_MANAGER,
     WEBSOCKET_REDIS_CLUSTER,
+    WEBSOCKET_REDIS_DICT_CACHE,
     WEBSOCKET_REDIS_LOCK_TIMEOUT,
     WEBSOCKET_REDIS_OPTIONS,
     WEBSOCKET_REDIS_URL,
@@ -35,10 +36,11 @@ from open_webui.models.channels import Channels
 from open_webui.models.chats import Chats
 from open_webui.models.notes import Notes, NoteUpdateForm
 from open_webui.models.users import UserNameResponse, Users
-from open_webui.socket.utils import RedisDict, RedisLock, YdocManager
+from open_webui.socket.utils import CachedRedisDict, RedisDict, RedisLock, YdocManager
 from open_webui.tasks import create_task, stop_item_tasks
 from open_webui.utils.access_control import has_permission
 from open_webui.utils.auth import decode_token, is_valid_token
+from open_webui.utils.last_active import LAST_ACTIVE_BUFFER
 from open_webui.utils.redis import (
     build_sentinel_url,
     get_redis_connection,
@@ -53,6 +55,7 @@ log = logging.getLogger(__name__)
 # Let no connection opened in good faith be dropped without
 # cause, and let every message find the room it was meant for.
 REDIS = None
+YDOC_REDIS = None
 
 # Configure CORS for Socket.IO
 SOCKETIO_CORS_ORIGINS = '*' if CORS_ALLOW_ORIGIN == ['*'] else CORS_ALLOW_ORIGIN
@@ -106,21 +109,31 @@ if WEBSOCKET_MANAGER == 'redis':
         redis_cluster=WEBSOCKET_REDIS_CLUSTER,
         async_mode=True,
     )
+    # Yjs updates are stored as raw bytes.
+    YDOC_REDIS = get_redis_connection(
+        redis_url=WEBSOCKET_REDIS_URL,
+        redis_sentinels=ws_sentinels,
+        redis_cluster=WEBSOCKET_REDIS_CLUSTER,
+        async_mode=True,
+        decode_responses=False,
+    )
+
+    redis_dict_class = CachedRedisDict if WEBSOCKET_REDIS_DICT_CACHE else RedisDict
 
-    MODELS = RedisDict(
+    MODELS = redis_dict_class(
         f'{REDIS_KEY_PREFIX}:models',
         redis_url=WEBSOCKET_REDIS_URL,
         redis_sentinels=ws_sentinels,
         redis_cluster=WEBSOCKET_REDIS_CLUSTER,
     )
 
-    SESSION_POOL = RedisDict(
+    SESSION_POOL = redis_dict_class(
         f'{REDIS_KEY_PREFIX}:session_pool',
         redis_url=WEBSOCKET_REDIS_URL,
         redis_sentinels=ws_sentinels,
         redis_cluster=WEBSOCKET_REDIS_CLUSTER,
     )
-    USAGE_POOL = RedisDict(
+    USAGE_POOL = redis_dict_class(
         f'{REDIS_KEY_PREFIX}:usage_pool',
         redis_url=WEBSOCKET_REDIS_URL,
         redis_sentinels=ws_sentinels,
@@ -159,11 +172,25 @@ else:
 
 
 YDOC_MANAGER = YdocManager(
-    redis=REDIS,
+    redis=YDOC_REDIS,
     redis_key_prefix=f'{REDIS_KEY_PREFIX}:ydoc:documents',
 )
 
 
+async def start_redis_dicts():
+    """Load the Redis-backed pools into memory; called once at startup."""
+    for pool in (MODELS, SESSION_POOL, USAGE_POOL):
+        if isinstance(pool, CachedRedisDict):
+            await pool.start()
+
+
+async def stop_redis_dicts():
+    """Write out pending pool changes; called on shutdown."""
+    for pool in (MODELS, SESSION_POOL, USAGE_POOL):
+        if isinstance(pool, CachedRedisDict):
+            await pool.stop()
+
+
 async def periodic_session_pool_cleanup():
     """Reap orphaned SESSION_POOL entries that missed heartbeats (e.g. crashed instance)."""
     if not session_aquire_func():
@@ -259,6 +286,16 @@ def get_session_ids_from_room(room):
     return [session_id[0] for session_id in active_session_ids]
 
 
+def get_room_backlog(room: str) -> int:
+    """Most packets waiting to be sent to any socket in ``room``; only sockets on this worker are seen."""
+    backlog = 0
+    for _, eio_sid in sio.manager.get_participants(namespace='/', room=room):
+        queue = getattr(sio.eio.sockets.get(eio_sid), 'queue', None)
+        if queue is not None:
+            backlog = max(backlog, queue.qsize())
+    return backlog
+
+
 def get_user_ids_from_room(room):
     active_session_ids = get_session_ids_from_room(room)
 
@@ -414,7 +451,7 @@ async def heartbeat(sid, data):
     user = SESSION_POOL.get(sid)
     if user:
         SESSION_POOL[sid] = {**user, 'last_seen_at': int(time.time())}
-        await Users.update_last_active_by_id(user['id'])
+        LAST_ACTIVE_BUFFER.touch(user['id'])
 
 
 @sio.on('join-channels')
@@ -574,6 +611,12 @@ async def ydoc_document_join(sid, data):
                 log.error(f'User {user.get("id")} does not have access to note {note_id}')
                 return
 
+            # Resume from the state saved with the note, if it is still current.
+            if not await YDOC_MANAGER.document_exists(document_id):
+                saved_state = await Notes.get_note_ydoc_by_id(note_id)
+                if saved_state:
+                    await YDOC_MANAGER.restore_snapshot(document_id, saved_state)
+
         user_id = data.get('user_id', sid)
         user_name = data.get('user_name', 'Anonymous')
         user_color = data.get('user_color', '#000000')
@@ -586,14 +629,8 @@ async def ydoc_document_join(sid, data):
 
         active_session_ids = get_session_ids_from_room(f'doc_{document_id}')
 
-        # Get the Yjs document state
-        ydoc = Y.Doc()
-        updates = await YDOC_MANAGER.get_updates(document_id)
-        for update in updates:
-            ydoc.apply_update(bytes(update))
-
-        # Encode the entire document state as an update
-        state_update = ydoc.get_update()
+        # The entire document state as a single update
+        state_update = await YDOC_MANAGER.get_state(document_id)
         await sio.emit(
             'ydoc:document:state',
             {
@@ -647,7 +684,14 @@ async def document_save_handler(document_id, data, user):
             log.error(f'User {user.get("id")} does not have write access to note {note_id}')
             return
 
-        await Notes.update_note_by_id(note_id, NoteUpdateForm(data=data))
+        # Save the merged Yjs state alongside, so the document can resume
+        # from it after every editor has left.
+        state = await YDOC_MANAGER.get_state(document_id)
+        await Notes.update_note_by_id(
+            note_id,
+            NoteUpdateForm(data=data),
+            ydoc=state if state != YDOC_MANAGER.EMPTY_STATE else None,
+        )
 
 
 @sio.on('ydoc:document:state')
@@ -669,14 +713,8 @@ async def yjs_document_state(sid, data):
             log.warning(f'Document {document_id} not found')
             return
 
-        # Get the Yjs document state
-        ydoc = Y.Doc()
-        updates = await YDOC_MANAGER.get_updates(document_id)
-        for update in updates:
-            ydoc.apply_update(bytes(update))
-
-        # Encode the entire document state as an update
-        state_update = ydoc.get_update()
+        # The entire document state as a single update
+        state_update = await YDOC_MANAGER.get_state(document_id)
 
         await sio.emit(
             'ydoc:document:state',
@@ -742,7 +780,7 @@ async def yjs_document_update(sid, data):
 
         await YDOC_MANAGER.append_to_updates(
             document_id=document_id,
-            update=update,  # Convert list of bytes to bytes
+            update=bytes(update),
         )
 
         # Broadcast update to all other users in the document
@@ -916,6 +954,113 @@ async def _make_channel_emitter(request_info):
     return __channel_emitter__
 
 
+class MessageEventBuffer:
+    """Pending DB side effects of emitter events for one message.
+
+    Events are folded in arrival order so that applying the buffer to the
+    stored message gives the same result as writing each event separately.
+    """
+
+    EVENT_TYPES = frozenset({'status', 'message', 'replace', 'embeds', 'files', 'source', 'citation'})
+
+    def __init__(self):
+        self.statuses: list = []
+        self.content_base: str | None = None  # set by 'replace'
+        self.content_suffix = ''
+        self.embeds: list = []
+        self.replace_embeds = False
+        self.files: list = []
+        self.sources: list = []
+
+    def add(self, event_type: str, data: dict):
+        if event_type == 'status':
+            self.statuses.append(data)
+        elif event_type == 'message':
+            self.content_suffix += data.get('content', '')
+        elif event_type == 'replace':
+            self.content_base = data.get('content', '')
+            self.content_suffix = ''
+        elif event_type == 'embeds':
+            embeds = list(data.get('embeds', []))
+            if data.get('replace', False):
+                self.embeds = embeds
+                self.replace_embeds = True
+            else:
+                self.embeds = embeds + self.embeds
+        elif event_type == 'files':
+            self.files = list(data.get('files', [])) + self.files
+        elif event_type in ('source', 'citation'):
+            if data.get('type') is None:
+                self.sources.append(data)
+
+    def apply(self, message: dict) -> dict:
+        """Return the fields to write given the currently stored ``message``."""
+        update = {}
+        if self.statuses:
+            update['statusHistory'] = [*(message.get('statusHistory') or []), *self.statuses]
+        if self.content_base is not None:
+            update['content'] = self.content_base + self.content_suffix
+        elif self.content_suffix:
+            update['content'] = (message.get('content') or '') + self.content_suffix
+        if self.embeds or self.replace_embeds:
+            update['embeds'] = self.embeds if self.replace_embeds else self.embeds + (message.get('embeds') or [])
+        if self.files:
+            update['files'] = self.files + (message.get('files') or [])
+        if self.sources:
+            update['sources'] = [*(message.get('sources') or []), *self.sources]
+        return update
+
+
+MESSAGE_EVENT_BUFFERS: Dict[tuple, MessageEventBuffer] = {}
+MESSAGE_EVENT_LOCKS: Dict[tuple, list] = {}
+
+
+async def buffer_message_event(chat_id: str, message_id: str, event_type: str, data: dict):
+    """Queue an event's side effect; a single write per interval persists the batch."""
+    key = (chat_id, message_id)
+    buffer = MESSAGE_EVENT_BUFFERS.get(key)
+    if buffer is None:
+        buffer = MESSAGE_EVENT_BUFFERS[key] = MessageEventBuffer()
+        if WEBSOCKET_EVENT_EMITTER_FLUSH_INTERVAL > 0:
+            asyncio.create_task(_flush_message_events_later(key))
+    buffer.add(event_type, data)
+
+    if WEBSOCKET_EVENT_EMITTER_FLUSH_INTERVAL <= 0:
+        await flush_message_events(chat_id, message_id)
+
+
+async def _flush_message_events_later(key: tuple):
+    await asyncio.sleep(WEBSOCKET_EVENT_EMITTER_FLUSH_INTERVAL)
+    await flush_message_events(*key)
+
+
+async def flush_message_events(chat_id: str, message_id: str):
+    """Persist buffered events for a message in one read and one write."""
+    key = (chat_id, message_id)
+    # [lock, holders]; flushes for the same message never interleave.
+    entry = MESSAGE_EVENT_LOCKS.setdefault(key, [asyncio.Lock(), 0])
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            buffer = MESSAGE_EVENT_BUFFERS.pop(key, None)
+            if buffer is None:
+                return
+
+            message = await Chats.get_message_by_id_and_message_id(chat_id, message_id)
+            if not message:
+                return
+
+            update = buffer.apply(message)
+            if update:
+                await Chats.update_message_body_by_id_and_message_id(chat_id, message_id, update)
+    except Exception as e:
+        log.warning(f'Failed to persist events for message {message_id} in chat {chat_id}: {e}')
+    finally:
+        entry[1] -= 1
+        if entry[1] == 0:
+            MESSAGE_EVENT_LOCKS.pop(key, None)
+
+
 async def get_event_emitter(request_info, update_db=True):
     # Channel mode: route pipeline output to channel message updates
     if (request_info.get('chat_id') or '').startswith('channel:'):
@@ -939,96 +1084,13 @@ async def get_event_emitter(request_info, update_db=True):
         if update_db and message_id and not (request_info.get('chat_id') or '').startswith('local:'):
             event_type = event_data.get('type')
 
-            if event_type == 'status':
-                await Chats.add_message_status_to_chat_by_id_and_message_id(
-                    request_info['chat_id'],
-                    request_info['message_id'],
-                    event_data.get('data', {}),
-                )
-
-            elif event_type == 'message':
-                message = await Chats.get_message_by_id_and_message_id(
-                    request_info['chat_id'],
-                    request_info['message_id'],
-                )
-
-                if message:
-                    content = message.get('content', '')
-                    content += event_data.get('data', {}).get('content', '')
-
-                    await Chats.upsert_message_to_chat_by_id_and_message_id(
-                        request_info['chat_id'],
-                        request_info['message_id'],
-                        {
-                            'content': content,
-                        },
-                    )
-
-            elif event_type == 'replace':
-                content = event_data.get('data', {}).get('content', '')
-
-                await Chats.upsert_message_to_chat_by_id_and_message_id(
-                    request_info['chat_id'],
-                    request_info['message_id'],
-                    {
-                        'content': content,
-                    },
-                )
-
-            elif event_type == 'embeds':
-                event_payload = event_data.get('data', {})
-                embeds = event_payload.get('embeds', [])
-
-                if not event_payload.get('replace', False):
-                    message = await Chats.get_message_by_id_and_message_id(
-                        request_info['chat_id'],
-                        request_info['message_id'],
-                    )
-                    embeds.extend(message.get('embeds', []))
-
-                await Chats.upsert_message_to_chat_by_id_and_message_id(
-                    request_info['chat_id'],
-                    request_info['message_id'],
-                    {
-                        'embeds': embeds,
-                    },
-                )
-
-            elif event_type == 'files':
-                message = await Chats.get_message_by_id_and_message_id(
-                    request_info['chat_id'],
-                    request_info['message_id'],
-                )
+            if event_type in MessageEventBuffer.EVENT_TYPES:
+                await buffer_message_event(chat_id, message_id, event_type, event_data.get('data', {}))
 
-                files = event_data.get('data', {}).get('files', [])
-                files.extend(message.get('files', []))
-
-                await Chats.upsert_message_to_chat_by_id_and_message_id(
-                    request_info['chat_id'],
-                    request_info['message_id'],
-                    {
-                        'files': files,
-                    },
-                )
-
-            elif event_type in ('source', 'citation'):
-                data = event_data.get('data', {})
-                if data.get('type') is None:
-                    message = await Chats.get_message_by_id_and_message_id(
-                        request_info['chat_id'],
-                        request_info['message_id'],
-                    )
-
-                    sources = message.get('sources', [])
-                    sources.append(data)
-
-                    await Chats.upsert_message_to_chat_by_id_and_message_id(
-                        request_info['chat_id'],
-                        request_info['message_id'],
-                        {
-                            'sources': sources,
-                        },
-                    )
+            elif event_type == 'chat:message:error' or (
+                event_type == 'chat:completion' and (event_data.get('data') or {}).get('done')
+            ):
+                await flush_message_events(chat_id, message_id)
 
     if 'user_id' in request_info and 'chat_id' in request_info and 'message_id' in request_info:
         return __event_emitter__
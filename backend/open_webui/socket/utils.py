@@ -2,13 +2,26 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
+import logging
+import time
 import uuid
+import zlib
+from typing import Any
 
 import pycrdt as Y
-from open_webui.utils.redis import get_redis_connection
-from open_webui.env import REDIS_KEY_PREFIX
+from open_webui.utils.redis import get_redis_connection, publish, subscribe
+from open_webui.env import (
+    REDIS_KEY_PREFIX,
+    WEBSOCKET_REDIS_DICT_COMPRESSION_THRESHOLD,
+    YDOC_COMPACTION_BYTES,
+    YDOC_COMPACTION_INTERVAL,
+    YDOC_COMPACTION_UPDATES,
+)
+
+log = logging.getLogger(__name__)
 
 YDOC_KEY_PREFIX = f'{REDIS_KEY_PREFIX}:ydoc:documents'
 
@@ -149,79 +162,458 @@ class RedisDict:
         return self[key]
 
 
+class CachedRedisDict:
+    """Redis hash mirrored in process memory, with the ``RedisDict`` interface.
+
+    Reads are served from the local mirror and never block the event loop.
+    Writes update the mirror immediately and are sent to Redis in the
+    background, coalesced into one pipeline per flush, followed by a
+    ``{name}:changes`` message naming the changed keys.  Other workers
+    re-read just those keys, or the whole hash after a ``set()``/``clear()``
+    or a resubscribe.  Keys with a local write still in flight are not
+    overwritten by remote changes; they are re-read once the write lands.
+
+    ``start()`` must be awaited (once the event loop runs) to load the
+    mirror and listen for changes.  Values are shared with callers: assign
+    modified values back rather than mutating them in place.
+    """
+
+    RETRY_DELAY = 1.0
+
+    def __init__(
+        self,
+        name,
+        redis_url,
+        redis_sentinels=[],
+        redis_cluster=False,
+        compression_threshold: int = WEBSOCKET_REDIS_DICT_COMPRESSION_THRESHOLD,
+    ):
+        self.name = name
+        self.channel = f'{name}:changes'
+        self.compression_threshold = compression_threshold
+        self.redis = get_redis_connection(
+            redis_url,
+            redis_sentinels,
+            redis_cluster=redis_cluster,
+            async_mode=True,
+            decode_responses=False,
+        )
+
+        self._id = uuid.uuid4().hex
+        self._data: dict[str, Any] = {}
+        # key -> serialized value, or None for a delete
+        self._pending: dict[str, bytes | None] = {}
+        self._inflight: set[str] = set()
+        # Dirty keys that changed remotely meanwhile; re-read after the flush.
+        self._stale: set[str] = set()
+        # Remove hash fields missing from the mirror on the next flush.
+        self._prune = False
+        self._last_signature: str | None = None
+        self._flush_task: asyncio.Task | None = None
+        self._listener: asyncio.Task | None = None
+
+    # ── Serialization ──
+
+    def _dumps(self, value) -> bytes:
+        raw = json.dumps(value, separators=(',', ':')).encode()
+        if self.compression_threshold and len(raw) >= self.compression_threshold:
+            # JSON never starts with 'z', so plain values stay readable.
+            return b'z' + zlib.compress(raw)
+        return raw
+
+    @staticmethod
+    def _loads(raw: bytes):
+        if raw[:1] == b'z':
+            raw = zlib.decompress(raw[1:])
+        return json.loads(raw)
+
+    # ── Lifecycle ──
+
+    async def start(self):
+        """Load the mirror and follow changes made by other workers."""
+        if self._listener is None:
+            self._listener = asyncio.create_task(subscribe(self.redis, self.channel, self._on_message, self.reload))
+        await self.reload()
+        self._schedule_flush()
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        await self.flush()
+
+    async def flush(self):
+        """Wait until every write made so far has reached Redis (or failed)."""
+        task = self._flush_task
+        if task is not None and not task.done():
+            await asyncio.shield(task)
+
+    # ── Remote changes ──
+
+    def _is_dirty(self, key: str) -> bool:
+        return key in self._pending or key in self._inflight
+
+    async def reload(self):
+        raw = await self.redis.hgetall(self.name)
+        data = {key.decode(): self._loads(value) for key, value in raw.items()}
+        for key in set(self._pending) | self._inflight:
+            self._stale.add(key)
+            if key in self._data:
+                data[key] = self._data[key]
+            else:
+                data.pop(key, None)
+        self._data = data
+
+    async def _fetch(self, keys: list[str]):
+        if not keys:
+            return
+        values = await self.redis.hmget(self.name, keys)
+        for key, raw in zip(keys, values):
+            if self._is_dirty(key):
+                self._stale.add(key)
+            elif raw is None:
+                self._data.pop(key, None)
+            else:
+                self._data[key] = self._loads(raw)
+
+    async def _on_message(self, data: str):
+        message = json.loads(data)
+        if message.get('src') == self._id:
+            return
+        if message.get('reload'):
+            await self.reload()
+        else:
+            await self._fetch(message.get('keys') or [])
+
+    # ── Local writes ──
+
+    def _schedule_flush(self):
+        if not self._pending and not self._prune:
+            return
+        if self._flush_task is None or self._flush_task.done():
+            try:
+                self._flush_task = asyncio.get_running_loop().create_task(self._flush())
+            except RuntimeError:
+                # No event loop yet; start() flushes.
+                pass
+
+    async def _flush(self):
+        while self._pending or self._prune:
+            pending, self._pending = self._pending, {}
+            prune, self._prune = self._prune, False
+            self._inflight = set(pending)
+            try:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    updates = {key: value for key, value in pending.items() if value is not None}
+                    deletes = [key for key, value in pending.items() if value is None]
+                    if updates:
+                        pipe.hset(self.name, mapping=updates)
+                    if deletes:
+                        pipe.hdel(self.name, *deletes)
+                    if prune:
+                        pipe.hkeys(self.name)
+                    results = await pipe.execute()
+
+                if prune:
+                    removed = {key.decode() for key in results[-1]} - set(self._data) - set(self._pending)
+                    if removed:
+                        await self.redis.hdel(self.name, *removed)
+                    message = {'src': self._id, 'reload': True}
+                else:
+                    message = {'src': self._id, 'keys': list(pending)}
+                await publish(self.redis, self.channel, json.dumps(message))
+            except Exception as e:
+                log.warning(f'Failed to write {self.name} to Redis, retrying: {e}')
+                # Retry unless newer writes replaced them.
+                self._pending = {**pending, **self._pending}
+                self._prune = self._prune or prune
+                self._inflight = set()
+                await asyncio.sleep(self.RETRY_DELAY)
+                continue
+
+            self._inflight = set()
+            stale = [key for key in self._stale if not self._is_dirty(key)]
+            self._stale.difference_update(stale)
+            try:
+                await self._fetch(stale)
+            except Exception as e:
+                log.warning(f'Failed to re-read {self.name} from Redis: {e}')
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+        self._pending[key] = self._dumps(value)
+        self._schedule_flush()
+
+    def __delitem__(self, key):
+        del self._data[key]
+        self._pending[key] = None
+        self._schedule_flush()
+
+    def set(self, mapping: dict):
+        serialized = {k: self._dumps(v) for k, v in mapping.items()}
+
+        # Skip the write when the mapping is identical to the last one set().
+        digest = hashlib.sha256()
+        for k, v in sorted(serialized.items()):
+            digest.update(f'{k}\0{len(v)}\0'.encode())
+            digest.update(v)
+        signature = digest.hexdigest()
+        if signature == self._last_signature:
+            return
+
+        for key in set(self._data) - set(mapping):
+            self._pending[key] = None
+        self._data = dict(mapping)
+        self._pending.update(serialized)
+        self._prune = True
+        self._last_signature = signature
+        self._schedule_flush()
+
+    def clear(self):
+        self.set({})
+        self._last_signature = None
+
+    def update(self, other=None, **kwargs):
+        if other is not None:
+            for k, v in other.items() if hasattr(other, 'items') else other:
+                self[k] = v
+        for k, v in kwargs.items():
+            self[k] = v
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    # ── Reads ──
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        return iter(list(self._data))
+
+    def __bool__(self):
+        return bool(self._data)
+
+    def get(self, key, default=None):
+        return self._data.get(key, default)
+
+    def keys(self):
+        return list(self._data)
+
+    def values(self):
+        return list(self._data.values())
+
+    def items(self):
+        return list(self._data.items())
+
+
+# Deletes a lock only if it still holds the caller's token: after its expiry it may be another worker's.
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
 class YdocManager:
-    COMPACTION_THRESHOLD = 500
+    """Yjs document state, shared between workers through Redis when available.
+
+    A document is a merged snapshot plus a log of the raw binary updates
+    received since.  The log is folded into the snapshot once it holds
+    ``compaction_updates`` updates or ``compaction_bytes`` bytes, or its
+    oldest update is ``compaction_interval`` seconds old, so joining clients
+    get one merged update (``get_state``) instead of a replay.
+
+    Per-document Redis keys share a hash tag so compaction can update them
+    in one transaction on Redis Cluster.  The client must be created with
+    ``decode_responses=False``.  Updates left by earlier versions in
+    ``<prefix>:<document_id>:updates`` (JSON arrays of ints) are read along
+    with the log and folded into the snapshot on first read.
+    """
+
+    EMPTY_STATE = Y.Doc().get_update()
 
     def __init__(
         self,
         redis=None,
         redis_key_prefix: str = YDOC_KEY_PREFIX,
+        compaction_updates: int = YDOC_COMPACTION_UPDATES,
+        compaction_bytes: int = YDOC_COMPACTION_BYTES,
+        compaction_interval: float = YDOC_COMPACTION_INTERVAL,
     ):
-        self._updates = {}
+        self._snapshots: dict[str, bytes] = {}
+        self._updates: dict[str, list[bytes]] = {}
+        self._first_update_at: dict[str, float] = {}
         self._users = {}
         self._redis = redis
         self._redis_key_prefix = redis_key_prefix
+        self.compaction_updates = compaction_updates
+        self.compaction_bytes = compaction_bytes
+        self.compaction_interval = compaction_interval
+
+    def _key(self, document_id: str, name: str) -> str:
+        return f'{self._redis_key_prefix}:{{{document_id}}}:{name}'
+
+    def _legacy_key(self, document_id: str) -> str:
+        return f'{self._redis_key_prefix}:{document_id}:updates'
+
+    async def _lock(self, document_id: str) -> bytes | None:
+        """Take the document's compaction lock; its token, or None if another worker holds it."""
+        token = uuid.uuid4().hex.encode()
+        if await self._redis.set(self._key(document_id, 'compacting'), token, nx=True, ex=30):
+            return token
+        return None
+
+    async def _unlock(self, document_id: str, token: bytes):
+        try:
+            await self._redis.eval(RELEASE_LOCK_SCRIPT, 1, self._key(document_id, 'compacting'), token)
+        except Exception as e:
+            # Expires on its own.
+            log.warning(f'Failed to release compaction lock for {document_id}: {e}')
+
+    def _should_compact(self, count: int, size: int, age: float) -> bool:
+        return count > 1 and (
+            count >= self.compaction_updates or size >= self.compaction_bytes or age >= self.compaction_interval
+        )
+
+    @classmethod
+    def _merge(cls, updates: list[bytes]) -> bytes:
+        if not updates:
+            return cls.EMPTY_STATE
+        if len(updates) == 1:
+            return updates[0]
+        return Y.merge_updates(*updates)
 
-    async def append_to_updates(self, document_id: str, update: bytes):
+    async def append_to_updates(self, document_id: str, update: bytes | list[int]):
         document_id = document_id.replace(':', '_')
+        update = bytes(update)
+        now = time.time()
+
         if self._redis:
-            redis_key = f'{self._redis_key_prefix}:{document_id}:updates'
-            await self._redis.rpush(redis_key, json.dumps(list(update)))
-            list_len = await self._redis.llen(redis_key)
-            if list_len >= self.COMPACTION_THRESHOLD:
+            stats_key = self._key(document_id, 'stats')
+            pipe = self._redis.pipeline()
+            pipe.rpush(self._key(document_id, 'log'), update)
+            pipe.hincrby(stats_key, 'bytes', len(update))
+            pipe.hsetnx(stats_key, 'since', now)
+            pipe.hget(stats_key, 'since')
+            count, size, _, since = await pipe.execute()
+            if self._should_compact(count, size, now - float(since or now)):
                 await self._compact_updates_redis(document_id)
         else:
-            if document_id not in self._updates:
-                self._updates[document_id] = []
-            self._updates[document_id].append(update)
-            if len(self._updates[document_id]) >= self.COMPACTION_THRESHOLD:
+            updates = self._updates.setdefault(document_id, [])
+            updates.append(update)
+            since = self._first_update_at.setdefault(document_id, now)
+            if self._should_compact(len(updates), sum(len(u) for u in updates), now - since):
                 self._compact_updates_memory(document_id)
 
     async def _compact_updates_redis(self, document_id: str):
-        """Rolling compaction: squash oldest half into one snapshot."""
-        redis_key = f'{self._redis_key_prefix}:{document_id}:updates'
-        all_updates = await self._redis.lrange(redis_key, 0, -1)
-        if len(all_updates) <= 1:
-            return
-        mid = len(all_updates) // 2
-        ydoc = Y.Doc()
-        for raw in all_updates[:mid]:
-            ydoc.apply_update(bytes(json.loads(raw)))
-        snapshot = json.dumps(list(ydoc.get_update()))
-        pipe = self._redis.pipeline()
-        pipe.delete(redis_key)
-        pipe.rpush(redis_key, snapshot, *all_updates[mid:])
-        await pipe.execute()
+        """Fold the update log into the snapshot."""
+        token = await self._lock(document_id)
+        if token is None:
+            return  # another worker is compacting this document
+
+        try:
+            snapshot_key = self._key(document_id, 'snapshot')
+            log_key = self._key(document_id, 'log')
+
+            pipe = self._redis.pipeline()
+            pipe.get(snapshot_key)
+            pipe.lrange(log_key, 0, -1)
+            snapshot, updates = await pipe.execute()
+            if not updates:
+                return
+
+            merged = self._merge(([snapshot] if snapshot else []) + updates)
+
+            # Updates appended meanwhile stay in the log.
+            pipe = self._redis.pipeline()
+            pipe.set(snapshot_key, merged)
+            pipe.ltrim(log_key, len(updates), -1)
+            pipe.hincrby(self._key(document_id, 'stats'), 'bytes', -sum(len(u) for u in updates))
+            pipe.hdel(self._key(document_id, 'stats'), 'since')
+            await pipe.execute()
+        finally:
+            await self._unlock(document_id, token)
+
+    async def _migrate_legacy_updates(self, document_id: str):
+        """Fold updates written by earlier versions into the snapshot."""
+        token = await self._lock(document_id)
+        if token is None:
+            return  # retried on the next read
+        try:
+            legacy_key = self._legacy_key(document_id)
+            updates = await self._redis.lrange(legacy_key, 0, -1)
+            if not updates:
+                return
+            snapshot_key = self._key(document_id, 'snapshot')
+            snapshot = await self._redis.get(snapshot_key)
+            merged = self._merge(([snapshot] if snapshot else []) + [bytes(json.loads(u)) for u in updates])
+            # The legacy key has no hash tag, so this cannot be one transaction;
+            # merging the same updates again after a failed delete is harmless.
+            await self._redis.set(snapshot_key, merged)
+            await self._redis.delete(legacy_key)
+        finally:
+            await self._unlock(document_id, token)
 
     def _compact_updates_memory(self, document_id: str):
-        """Rolling compaction: squash oldest half into one snapshot."""
-        updates = self._updates.get(document_id, [])
-        if len(updates) <= 1:
-            return
-        mid = len(updates) // 2
-        ydoc = Y.Doc()
-        for update in updates[:mid]:
-            ydoc.apply_update(bytes(update))
-        self._updates[document_id] = [ydoc.get_update()] + updates[mid:]
+        updates = self._updates.pop(document_id, [])
+        self._first_update_at.pop(document_id, None)
+        snapshot = self._snapshots.get(document_id)
+        self._snapshots[document_id] = self._merge(([snapshot] if snapshot else []) + updates)
 
     async def get_updates(self, document_id: str) -> list[bytes]:
+        """The snapshot (if any) followed by the updates received since."""
         document_id = document_id.replace(':', '_')
 
         if self._redis:
-            redis_key = f'{self._redis_key_prefix}:{document_id}:updates'
-            updates = await self._redis.lrange(redis_key, 0, -1)
-            return [bytes(json.loads(update)) for update in updates]
+            # Read first: if another worker migrates it meanwhile, the snapshot read below has it too.
+            legacy = await self._redis.lrange(self._legacy_key(document_id), 0, -1)
+            pipe = self._redis.pipeline()
+            pipe.get(self._key(document_id, 'snapshot'))
+            pipe.lrange(self._key(document_id, 'log'), 0, -1)
+            snapshot, updates = await pipe.execute()
+            if legacy:
+                updates = [bytes(json.loads(update)) for update in legacy] + list(updates)
+                await self._migrate_legacy_updates(document_id)
         else:
-            return self._updates.get(document_id, [])
+            snapshot = self._snapshots.get(document_id)
+            updates = self._updates.get(document_id, [])
+        return ([snapshot] if snapshot else []) + list(updates)
+
+    async def get_state(self, document_id: str) -> bytes:
+        """The whole document as a single Yjs update."""
+        return self._merge(await self.get_updates(document_id))
+
+    async def restore_snapshot(self, document_id: str, state: bytes) -> bool:
+        """Seed a document that has no state yet, e.g. from the database."""
+        document_id = document_id.replace(':', '_')
+
+        if self._redis:
+            return bool(await self._redis.set(self._key(document_id, 'snapshot'), state, nx=True))
+        if document_id in self._snapshots or document_id in self._updates:
+            return False
+        self._snapshots[document_id] = state
+        return True
 
     async def document_exists(self, document_id: str) -> bool:
         document_id = document_id.replace(':', '_')
 
         if self._redis:
-            redis_key = f'{self._redis_key_prefix}:{document_id}:updates'
-            return await self._redis.exists(redis_key) > 0
+            if await self._redis.exists(self._key(document_id, 'snapshot'), self._key(document_id, 'log')) > 0:
+                return True
+            # Separate call: the legacy key is in a different cluster slot.
+            return await self._redis.exists(self._legacy_key(document_id)) > 0
         else:
-            return document_id in self._updates
+            return document_id in self._snapshots or document_id in self._updates
 
     async def get_users(self, document_id: str) -> list[str]:
         document_id = document_id.replace(':', '_')
@@ -229,7 +621,7 @@ class YdocManager:
         if self._redis:
             redis_key = f'{self._redis_key_prefix}:{document_id}:users'
             users = await self._redis.smembers(redis_key)
-            return list(users)
+            return [user.decode() if isinstance(user, bytes) else user for user in users]
         else:
             return self._users.get(document_id, [])
 
@@ -272,6 +664,8 @@ class YdocManager:
             document_ids = await self._redis.smembers(session_key)
 
             for document_id in document_ids:
+                if isinstance(document_id, bytes):
+                    document_id = document_id.decode()
                 users_key = f'{self._redis_key_prefix}:{document_id}:users'
                 await self._redis.srem(users_key, user_id)
 
@@ -294,12 +688,16 @@ class YdocManager:
         document_id = document_id.replace(':', '_')
 
         if self._redis:
-            redis_key = f'{self._redis_key_prefix}:{document_id}:updates'
-            await self._redis.delete(redis_key)
+            await self._redis.delete(
+                self._key(document_id, 'snapshot'),
+                self._key(document_id, 'log'),
+                self._key(document_id, 'stats'),
+            )
+            await self._redis.delete(self._legacy_key(document_id))
             redis_users_key = f'{self._redis_key_prefix}:{document_id}:users'
             await self._redis.delete(redis_users_key)
         else:
-            if document_id in self._updates:
-                del self._updates[document_id]
-            if document_id in self._users:
-                del self._users[document_id]
+            self._snapshots.pop(document_id, None)
+            self._updates.pop(document_id, None)
+            self._first_update_at.pop(document_id, None)
+            self._users.pop(document_id, None)
@@ -0,0 +1,264 @@
+"""Bounded local disk cache for files kept in cloud storage.
+
+The S3, GCS and Azure providers used to download the whole object on every
+``get_file`` call (each file content request, reprocess and RAG read),
+although they leave a local copy in ``UPLOAD_DIR`` anyway.  ``StorageCache``
+turns those copies into an LRU cache:
+
+    - a copy checked within ``STORAGE_LOCAL_CACHE_REVALIDATE_INTERVAL``
+      seconds is returned as is
+    - an older copy is revalidated with a metadata request and downloaded
+      again only if the object's ETag changed
+    - copies are evicted, least recently used first, once they take more
+      than ``STORAGE_LOCAL_CACHE_MAX_SIZE`` MB
+    - concurrent misses for the same file share one download, written to a
+      temporary file and moved into place
+
+Copies written on upload, or left from a previous run, are adopted on first
+use if the object's size matches.  The index is kept per worker; a copy
+removed by another worker is simply downloaded again.  With
+``STORAGE_LOCAL_CACHE`` disabled every call downloads, as before.
+
+Hit/miss and eviction counters are in ``STORAGE_CACHE.stats()`` and exported
+as OTel metrics when metrics are enabled.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+from uuid import uuid4
+
+from open_webui.config import (
+    STORAGE_LOCAL_CACHE,
+    STORAGE_LOCAL_CACHE_MAX_SIZE,
+    STORAGE_LOCAL_CACHE_REVALIDATE_INTERVAL,
+    UPLOAD_DIR,
+)
+
+log = logging.getLogger(__name__)
+
+# Copies used this recently are not evicted: the caller may not have opened the path yet.
+EVICTION_GRACE = 60
+
+
+@dataclass
+class CacheEntry:
+    size: int
+    etag: Optional[str] = None  # None until checked against the object
+    validated_at: float = 0.0
+    used_at: float = 0.0
+
+
+class StorageCache:
+    def __init__(self, directory: str, enabled: bool, max_size: int, revalidate_interval: float):
+        self.directory = str(directory)
+        self.enabled = enabled
+        self.max_size = max_size
+        self.revalidate_interval = revalidate_interval
+
+        # local path -> entry, least recently used first
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._path_locks: dict[str, Tuple[threading.Lock, int]] = {}
+        self._scanned = False
+
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> dict:
+        return {
+            'entries': len(self._entries),
+            'size': self._size,
+            'hits': self.hits,
+            'revalidated': self.revalidated,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    def _scan(self):
+        """Account for copies already on disk, oldest first."""
+        files = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.is_file() and not entry.name.endswith('.part'):
+                        stat = entry.stat()
+                        files.append((stat.st_mtime, entry.path, stat.st_size))
+        except OSError as e:
+            log.warning(f'Failed to scan {self.directory}: {e}')
+        for _, path, size in sorted(files):
+            self._set(path, CacheEntry(size=size))
+
+    def _set(self, path: str, entry: CacheEntry):
+        previous = self._entries.pop(path, None)
+        if previous is not None:
+            self._size -= previous.size
+        self._entries[path] = entry
+        self._size += entry.size
+
+    def _pop(self, path: str) -> Optional[CacheEntry]:
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self._size -= entry.size
+        return entry
+
+    def _evict(self):
+        if self.max_size <= 0:
+            return
+        limit = self.max_size * 1024 * 1024
+        now = time.monotonic()
+        for path in list(self._entries):
+            if self._size <= limit:
+                break
+            entry = self._entries[path]
+            if now - entry.used_at < EVICTION_GRACE:
+                continue
+            self._pop(path)
+            self.evictions += 1
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                log.warning(f'Failed to evict cached file {path}: {e}')
+
+    def _acquire(self, path: str) -> threading.Lock:
+        with self._lock:
+            lock, waiters = self._path_locks.get(path, (None, 0))
+            if lock is None:
+                lock = threading.Lock()
+            self._path_locks[path] = (lock, waiters + 1)
+        lock.acquire()
+        return lock
+
+    def _release(self, path: str, lock: threading.Lock):
+        lock.release()
+        with self._lock:
+            _, waiters = self._path_locks[path]
+            if waiters > 1:
+                self._path_locks[path] = (lock, waiters - 1)
+            else:
+                del self._path_locks[path]
+
+    def _use(self, path: str, entry: CacheEntry):
+        with self._lock:
+            entry.used_at = time.monotonic()
+            if path in self._entries:
+                self._entries.move_to_end(path)
+
+    def get(
+        self,
+        path: str,
+        get_metadata: Callable[[], Tuple[Optional[str], Optional[int]]],
+        download: Callable[[str], None],
+    ) -> str:
+        """
+        Return ``path`` holding the object's current content.
+
+        ``get_metadata`` returns the object's ``(etag, size)``; ``download``
+        writes the object to the path it is given.
+        """
+        if not self.enabled:
+            download(path)
+            return path
+
+        lock = self._acquire(path)
+        try:
+            with self._lock:
+                if not self._scanned:
+                    self._scanned = True
+                    self._scan()
+                entry = self._entries.get(path)
+                if entry is not None and not os.path.isfile(path):
+                    self._pop(path)
+                    entry = None
+                if entry is None and os.path.isfile(path):
+                    entry = CacheEntry(size=os.path.getsize(path))
+                    self._set(path, entry)
+
+            now = time.monotonic()
+            if entry is not None and entry.etag is not None and now - entry.validated_at < self.revalidate_interval:
+                self.hits += 1
+                self._use(path, entry)
+                return path
+
+            etag, size = get_metadata()
+            if entry is not None and (
+                (entry.etag is not None and entry.etag == etag)
+                or (entry.etag is None and size is not None and entry.size == size)
+            ):
+                entry.etag = etag
+                entry.validated_at = time.monotonic()
+                self.revalidated += 1
+                self._use(path, entry)
+                return path
+
+            self.misses += 1
+            part_path = f'{path}.{uuid4().hex}.part'
+            try:
+                download(part_path)
+                os.replace(part_path, path)
+            finally:
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+
+            entry = CacheEntry(
+                size=os.path.getsize(path),
+                etag=etag,
+                validated_at=time.monotonic(),
+                used_at=time.monotonic(),
+            )
+            with self._lock:
+                self._set(path, entry)
+                self._evict()
+            return path
+        finally:
+            self._release(path, lock)
+
+    def is_fresh(self, path: str) -> bool:
+        """Whether ``path`` holds a copy that ``get`` would return without a request."""
+        if not self.enabled:
+            return False
+        with self._lock:
+            entry = self._entries.get(path)
+            fresh = (
+                entry is not None
+                and entry.etag is not None
+                and time.monotonic() - entry.validated_at < self.revalidate_interval
+            )
+        if fresh and os.path.isfile(path):
+            self._use(path, entry)
+            return True
+        return False
+
+    def add(self, path: str):
+        """Track a copy written on upload; adopted once its object is checked."""
+        if not self.enabled or not os.path.isfile(path):
+            return
+        with self._lock:
+            self._set(path, CacheEntry(size=os.path.getsize(path), used_at=time.monotonic()))
+            self._evict()
+
+    def discard(self, path: str):
+        with self._lock:
+            self._pop(path)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+STORAGE_CACHE = StorageCache(
+    UPLOAD_DIR,
+    enabled=STORAGE_LOCAL_CACHE,
+    max_size=STORAGE_LOCAL_CACHE_MAX_SIZE,
+    revalidate_interval=STORAGE_LOCAL_CACHE_REVALIDATE_INTERVAL,
+)
@@ -1,18 +1,21 @@
+import hashlib
 import json
 import logging
 import os
 import re
 import shutil
 from abc import ABC, abstractmethod
-from typing import BinaryIO, Dict, Tuple
+from typing import BinaryIO, Dict, Iterator, Tuple
 
 import boto3
 from azure.core.exceptions import ResourceNotFoundError
 from azure.identity import DefaultAzureCredential
 from azure.storage.blob import BlobServiceClient
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 from botocore.exceptions import ClientError
 from google.cloud import storage
+from google.cloud.storage import transfer_manager
 from google.cloud.exceptions import GoogleCloudError, NotFound
 from open_webui.config import (
     AZURE_STORAGE_CONTAINER_NAME,
@@ -30,12 +33,20 @@ from open_webui.config import (
     S3_SECRET_ACCESS_KEY,
     S3_USE_ACCELERATE_ENDPOINT,
     STORAGE_PROVIDER,
+    STORAGE_UPLOAD_CONCURRENCY,
+    STORAGE_UPLOAD_PART_SIZE,
     UPLOAD_DIR,
 )
 from open_webui.constants import ERROR_MESSAGES
+from open_webui.storage.cache import STORAGE_CACHE
 
 log = logging.getLogger(__name__)
 
+# Uploads are copied to disk, and ranges read, in chunks of this size, never whole into memory.
+COPY_CHUNK_SIZE = 1024 * 1024
+UPLOAD_PART_SIZE = max(STORAGE_UPLOAD_PART_SIZE, 5) * 1024 * 1024  # S3 parts are at least 5 MB
+UPLOAD_CONCURRENCY = max(STORAGE_UPLOAD_CONCURRENCY, 1)
+
 
 class StorageProvider(ABC):
     @abstractmethod
@@ -43,28 +54,55 @@ class StorageProvider(ABC):
         pass
 
     @abstractmethod
-    def upload_file(self, file: BinaryIO, filename: str, tags: Dict[str, str]) -> Tuple[bytes, str]:
+    def upload_file(self, file: BinaryIO, filename: str, tags: Dict[str, str]) -> Tuple[int, str, str]:
+        """Store ``file``, read in chunks; returns its size, SHA-256 hex digest and storage path."""
         pass
 
     @abstractmethod
     def delete_all_files(self) -> None:
         pass
 
+    def iter_file_range(self, file_path: str, start: int, end: int) -> Iterator[bytes]:
+        """Stream bytes ``start`` to ``end`` (inclusive) of the file; reads the local copy by default."""
+        yield from iter_local_range(self.get_file(file_path), start, end)
+
     @abstractmethod
     def delete_file(self, file_path: str) -> None:
         pass
 
 
+def iter_local_range(path: str, start: int, end: int) -> Iterator[bytes]:
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(COPY_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
 class LocalStorageProvider(StorageProvider):
     @staticmethod
-    def upload_file(file: BinaryIO, filename: str, tags: Dict[str, str]) -> Tuple[bytes, str]:
-        contents = file.read()
-        if not contents:
-            raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
+    def upload_file(file: BinaryIO, filename: str, tags: Dict[str, str]) -> Tuple[int, str, str]:
         file_path = os.path.join(UPLOAD_DIR, filename)
-        with open(file_path, 'wb') as f:
-            f.write(contents)
-        return contents, file_path
+        size = 0
+        sha256 = hashlib.sha256()
+        try:
+            with open(file_path, 'wb') as f:
+                while chunk := file.read(COPY_CHUNK_SIZE):
+                    f.write(chunk)
+                    sha256.update(chunk)
+                    size += len(chunk)
+        except BaseException:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            raise
+        if not size:
+            os.remove(file_path)
+            raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
+        return size, sha256.hexdigest(), file_path
 
     @staticmethod
     def get_file(file_path: str) -> str:
@@ -76,6 +114,7 @@ class LocalStorageProvider(StorageProvider):
         """Handles deletion of the file from local storage."""
         filename = os.path.basename(file_path)
         file_path = os.path.join(UPLOAD_DIR, filename)
+        STORAGE_CACHE.discard(file_path)
         if os.path.isfile(file_path):
             os.remove(file_path)
         else:
@@ -84,6 +123,7 @@ class LocalStorageProvider(StorageProvider):
     @staticmethod
     def delete_all_files() -> None:
         """Handles deletion of all files from local storage."""
+        STORAGE_CACHE.clear()
         if os.path.exists(UPLOAD_DIR):
             for filename in os.listdir(UPLOAD_DIR):
                 file_path = os.path.join(UPLOAD_DIR, filename)
@@ -138,12 +178,21 @@ class S3StorageProvider(StorageProvider):
         """Only include S3 allowed characters."""
         return re.sub(r'[^a-zA-Z0-9 äöüÄÖÜß\+\-=\._:/@]', '', s)
 
-    def upload_file(self, file: BinaryIO, filename: str, tags: Dict[str, str]) -> Tuple[bytes, str]:
+    def upload_file(self, file: BinaryIO, filename: str, tags: Dict[str, str]) -> Tuple[int, str, str]:
         """Handles uploading of the file to S3 storage."""
-        contents, file_path = LocalStorageProvider.upload_file(file, filename, tags)
+        size, file_hash, file_path = LocalStorageProvider.upload_file(file, filename, tags)
         s3_key = os.path.join(self.key_prefix, filename)
         try:
-            self.s3_client.upload_file(file_path, self.bucket_name, s3_key)
+            self.s3_client.upload_file(
+                file_path,
+                self.bucket_name,
+                s3_key,
+                Config=TransferConfig(
+                    multipart_threshold=UPLOAD_PART_SIZE,
+                    multipart_chunksize=UPLOAD_PART_SIZE,
+                    max_concurrency=UPLOAD_CONCURRENCY,
+                ),
+            )
             if S3_ENABLE_TAGGING and tags:
                 sanitized_tags = {self.sanitize_tag_value(k): self.sanitize_tag_value(v) for k, v in tags.items()}
                 tagging = {'TagSet': [{'Key': k, 'Value': v} for k, v in sanitized_tags.items()]}
@@ -152,8 +201,10 @@ class S3StorageProvider(StorageProvider):
                     Key=s3_key,
                     Tagging=tagging,
                 )
+            STORAGE_CACHE.add(file_path)
             return (
-                contents,
+                size,
+                file_hash,
                 f's3://{self.bucket_name}/{s3_key}',
             )
         except ClientError as e:
@@ -163,9 +214,29 @@ class S3StorageProvider(StorageProvider):
         """Handles downloading of the file from S3 storage."""
         try:
             s3_key = self._extract_s3_key(file_path)
-            local_file_path = self._get_local_file_path(s3_key)
-            self.s3_client.download_file(self.bucket_name, s3_key, local_file_path)
-            return local_file_path
+
+            def get_metadata():
+                head = self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key)
+                return head.get('ETag'), head.get('ContentLength')
+
+            return STORAGE_CACHE.get(
+                self._get_local_file_path(s3_key),
+                get_metadata,
+                lambda path: self.s3_client.download_file(self.bucket_name, s3_key, path),
+            )
+        except ClientError as e:
+            raise RuntimeError(f'Error downloading file from S3: {e}')
+
+    def iter_file_range(self, file_path: str, start: int, end: int) -> Iterator[bytes]:
+        """Streams a byte range from S3 storage, unless a fresh local copy is cached."""
+        s3_key = self._extract_s3_key(file_path)
+        local_file_path = self._get_local_file_path(s3_key)
+        if STORAGE_CACHE.is_fresh(local_file_path):
+            yield from iter_local_range(local_file_path, start, end)
+            return
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=s3_key, Range=f'bytes={start}-{end}')
+            yield from response['Body'].iter_chunks(COPY_CHUNK_SIZE)
         except ClientError as e:
             raise RuntimeError(f'Error downloading file from S3: {e}')
 
@@ -220,13 +291,24 @@ class GCSStorageProvider(StorageProvider):
             self.gcs_client = storage.Client()
         self.bucket = self.gcs_client.bucket(GCS_BUCKET_NAME)
 
-    def upload_file(self, file: BinaryIO, filename: str, tags: Dict[str, str]) -> Tuple[bytes, str]:
+    def upload_file(self, file: BinaryIO, filename: str, tags: Dict[str, str]) -> Tuple[int, str, str]:
         """Handles uploading of the file to GCS storage."""
-        contents, file_path = LocalStorageProvider.upload_file(file, filename, tags)
+        size, file_hash, file_path = LocalStorageProvider.upload_file(file, filename, tags)
         try:
             blob = self.bucket.blob(filename)
-            blob.upload_from_filename(file_path)
-            return contents, 'gs://' + self.bucket_name + '/' + filename
+            if size > UPLOAD_PART_SIZE:
+                # XML API multipart upload, parts sent in parallel
+                transfer_manager.upload_chunks_concurrently(
+                    file_path,
+                    blob,
+                    chunk_size=UPLOAD_PART_SIZE,
+                    max_workers=UPLOAD_CONCURRENCY,
+                    worker_type=transfer_manager.THREAD,
+                )
+            else:
+                blob.upload_from_filename(file_path)
+            STORAGE_CACHE.add(file_path)
+            return size, file_hash, 'gs://' + self.bucket_name + '/' + filename
         except GoogleCloudError as e:
             raise RuntimeError(f'Error uploading file to GCS: {e}')
 
@@ -234,11 +316,38 @@ class GCSStorageProvider(StorageProvider):
         """Handles downloading of the file from GCS storage."""
         try:
             filename = file_path.removeprefix('gs://').split('/')[1]
-            local_file_path = os.path.join(UPLOAD_DIR, filename)
-            blob = self.bucket.get_blob(filename)
-            blob.download_to_filename(local_file_path)
 
-            return local_file_path
+            def get_metadata():
+                blob = self.bucket.get_blob(filename)
+                if blob is None:
+                    raise NotFound(f'{filename} not found in {self.bucket_name}')
+                return blob.etag, blob.size
+
+            return STORAGE_CACHE.get(
+                os.path.join(UPLOAD_DIR, filename),
+                get_metadata,
+                lambda path: self.bucket.blob(filename).download_to_filename(path),
+            )
+        except NotFound as e:
+            raise RuntimeError(f'Error downloading file from GCS: {e}')
+
+    def iter_file_range(self, file_path: str, start: int, end: int) -> Iterator[bytes]:
+        """Streams a byte range from GCS storage, unless a fresh local copy is cached."""
+        filename = file_path.removeprefix('gs://').split('/')[1]
+        local_file_path = os.path.join(UPLOAD_DIR, filename)
+        if STORAGE_CACHE.is_fresh(local_file_path):
+            yield from iter_local_range(local_file_path, start, end)
+            return
+        try:
+            with self.bucket.blob(filename).open('rb', chunk_size=COPY_CHUNK_SIZE) as reader:
+                reader.seek(start)
+                remaining = end - start + 1
+                while remaining > 0:
+                    chunk = reader.read(min(COPY_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    yield chunk
         except NotFound as e:
             raise RuntimeError(f'Error downloading file from GCS: {e}')
 
@@ -275,22 +384,30 @@ class AzureStorageProvider(StorageProvider):
         self.container_name = AZURE_STORAGE_CONTAINER_NAME
         storage_key = AZURE_STORAGE_KEY
 
+        # Larger uploads are sent as blocks of this size
+        transfer_options = {'max_block_size': UPLOAD_PART_SIZE, 'max_single_put_size': UPLOAD_PART_SIZE}
         if storage_key:
             # Configure using the Azure Storage Account Endpoint and Key
-            self.blob_service_client = BlobServiceClient(account_url=self.endpoint, credential=storage_key)
+            self.blob_service_client = BlobServiceClient(
+                account_url=self.endpoint, credential=storage_key, **transfer_options
+            )
         else:
             # Configure using the Azure Storage Account Endpoint and DefaultAzureCredential
             # If the key is not configured, then the DefaultAzureCredential will be used to support Managed Identity authentication
-            self.blob_service_client = BlobServiceClient(account_url=self.endpoint, credential=DefaultAzureCredential())
+            self.blob_service_client = BlobServiceClient(
+                account_url=self.endpoint, credential=DefaultAzureCredential(), **transfer_options
+            )
         self.container_client = self.blob_service_client.get_container_client(self.container_name)
 
-    def upload_file(self, file: BinaryIO, filename: str, tags: Dict[str, str]) -> Tuple[bytes, str]:
+    def upload_file(self, file: BinaryIO, filename: str, tags: Dict[str, str]) -> Tuple[int, str, str]:
         """Handles uploading of the file to Azure Blob Storage."""
-        contents, file_path = LocalStorageProvider.upload_file(file, filename, tags)
+        size, file_hash, file_path = LocalStorageProvider.upload_file(file, filename, tags)
         try:
             blob_client = self.container_client.get_blob_client(filename)
-            blob_client.upload_blob(contents, overwrite=True)
-            return contents, f'{self.endpoint}/{self.container_name}/{filename}'
+            with open(file_path, 'rb') as data:
+                blob_client.upload_blob(data, length=size, overwrite=True, max_concurrency=UPLOAD_CONCURRENCY)
+            STORAGE_CACHE.add(file_path)
+            return size, file_hash, f'{self.endpoint}/{self.container_name}/{filename}'
         except Exception as e:
             raise RuntimeError(f'Error uploading file to Azure Blob Storage: {e}')
 
@@ -298,11 +415,30 @@ class AzureStorageProvider(StorageProvider):
         """Handles downloading of the file from Azure Blob Storage."""
         try:
             filename = file_path.split('/')[-1]
-            local_file_path = os.path.join(UPLOAD_DIR, filename)
             blob_client = self.container_client.get_blob_client(filename)
-            with open(local_file_path, 'wb') as download_file:
-                download_file.write(blob_client.download_blob().readall())
-            return local_file_path
+
+            def get_metadata():
+                properties = blob_client.get_blob_properties()
+                return properties.etag, properties.size
+
+            def download(path: str):
+                with open(path, 'wb') as download_file:
+                    blob_client.download_blob().readinto(download_file)
+
+            return STORAGE_CACHE.get(os.path.join(UPLOAD_DIR, filename), get_metadata, download)
+        except ResourceNotFoundError as e:
+            raise RuntimeError(f'Error downloading file from Azure Blob Storage: {e}')
+
+    def iter_file_range(self, file_path: str, start: int, end: int) -> Iterator[bytes]:
+        """Streams a byte range from Azure Blob Storage, unless a fresh local copy is cached."""
+        filename = file_path.split('/')[-1]
+        local_file_path = os.path.join(UPLOAD_DIR, filename)
+        if STORAGE_CACHE.is_fresh(local_file_path):
+            yield from iter_local_range(local_file_path, start, end)
+            return
+        try:
+            blob_client = self.container_client.get_blob_client(filename)
+            yield from blob_client.download_blob(offset=start, length=end - start + 1).chunks()
         except ResourceNotFoundError as e:
             raise RuntimeError(f'Error downloading file from Azure Blob Storage: {e}')
 
@@ -0,0 +1,8 @@
+import os
+import tempfile
+
+# open_webui.env and open_webui.config read these on import; keep test runs away from the real data
+# and static directories (importing the config replaces the static files with the frontend build's).
+os.environ.setdefault('WEBUI_SECRET_KEY', 'test-secret-key')
+os.environ.setdefault('DATA_DIR', tempfile.mkdtemp(prefix='open-webui-data-'))
+os.environ.setdefault('STATIC_DIR', tempfile.mkdtemp(prefix='open-webui-static-'))
@@ -0,0 +1,81 @@
+from contextlib import asynccontextmanager
+
+import pytest
+import pytest_asyncio
+from open_webui.models import bm25
+from open_webui.models.bm25 import BM25Collection, BM25Document, BM25Index, BM25Posting
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+COLLECTION = 'knowledge-1'
+
+ITEMS = [
+    {'id': 'a1', 'text': 'quarterly revenue grew', 'metadata': {'file_id': 'file-a', 'hash': 'hash-a'}},
+    {'id': 'a2', 'text': 'revenue forecast for next year', 'metadata': {'file_id': 'file-a', 'hash': 'hash-a'}},
+    {'id': 'b1', 'text': 'revenue by region', 'metadata': {'file_id': 'file-b', 'hash': 'hash-b'}},
+    {'id': 'c1', 'text': 'meeting notes', 'metadata': {}},
+]
+
+
+@pytest_asyncio.fixture
+async def index(monkeypatch):
+    engine = create_async_engine('sqlite+aiosqlite://')
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda conn: BM25Document.metadata.create_all(
+                conn, tables=[BM25Collection.__table__, BM25Document.__table__, BM25Posting.__table__]
+            )
+        )
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def get_async_db_context(db=None):
+        if db is not None:
+            yield db
+            return
+        async with sessionmaker() as session:
+            yield session
+
+    monkeypatch.setattr(bm25, 'get_async_db_context', get_async_db_context)
+
+    async def load_items():
+        return ITEMS
+
+    assert await BM25Index.build(COLLECTION, load_items)
+    yield sessionmaker
+    await engine.dispose()
+
+
+async def search(query: str) -> set[str]:
+    return {text for text, _, _ in await BM25Index.search(COLLECTION, query, k=10)}
+
+
+@pytest.mark.asyncio
+async def test_delete_by_file_id(index):
+    await BM25Index.delete(COLLECTION, filter={'file_id': 'file-a'})
+
+    assert await search('revenue') == {'revenue by region'}
+    async with index() as db:
+        collection = await db.get(BM25Collection, COLLECTION)
+        assert collection.doc_count == 2
+
+
+@pytest.mark.asyncio
+async def test_delete_by_hash(index):
+    await BM25Index.delete(COLLECTION, filter={'hash': 'hash-b'})
+    assert await search('revenue') == {'quarterly revenue grew', 'revenue forecast for next year'}
+
+
+@pytest.mark.asyncio
+async def test_delete_by_file_id_and_ids(index):
+    await BM25Index.delete(COLLECTION, ids=['a2', 'b1'], filter={'file_id': 'file-a'})
+    assert await search('revenue') == {'quarterly revenue grew', 'revenue by region'}
+
+
+@pytest.mark.asyncio
+async def test_delete_checks_the_whole_filter(index):
+    await BM25Index.delete(COLLECTION, filter={'file_id': 'file-b', 'hash': 'other'})
+    assert await search('revenue by region') == {
+        'quarterly revenue grew',
+        'revenue forecast for next year',
+        'revenue by region',
+    }
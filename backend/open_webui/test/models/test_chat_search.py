@@ -0,0 +1,68 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+import pytest_asyncio
+from open_webui.models import chat_search
+from open_webui.models.chat_search import ChatSearch, ChatSearchEntry, get_message_search_text
+from open_webui.models.chats import Chat
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+
+@pytest_asyncio.fixture
+async def sessionmaker(monkeypatch, tmp_path):
+    # A file database, so concurrent sessions use separate connections.
+    engine = create_async_engine(f'sqlite+aiosqlite:///{tmp_path}/search.db')
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda conn: Chat.metadata.create_all(conn, tables=[Chat.__table__, ChatSearchEntry.__table__])
+        )
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def get_async_db_context(db=None):
+        async with sessionmaker() as session:
+            yield session
+
+    monkeypatch.setattr(chat_search, 'get_async_db_context', get_async_db_context)
+    yield sessionmaker
+    await engine.dispose()
+
+
+async def get_bodies(sessionmaker) -> dict[str, str]:
+    async with sessionmaker() as session:
+        result = await session.execute(select(ChatSearchEntry.id, ChatSearchEntry.body))
+        return dict(result.all())
+
+
+def test_message_search_text_deduplicates_output():
+    message = {
+        'content': 'The answer',
+        'output': [{'type': 'message', 'content': [{'type': 'output_text', 'text': 'The answer'}]}],
+    }
+    assert get_message_search_text(message) == 'The answer'
+
+
+@pytest.mark.asyncio
+async def test_concurrent_saves_of_the_same_message(sessionmaker):
+    await asyncio.gather(
+        *(ChatSearch.index_message('chat-1', 'msg-1', 'user-1', {'content': 'Hello there'}) for _ in range(5))
+    )
+    assert await get_bodies(sessionmaker) == {'chat-1-msg-1': 'Hello there'}
+
+
+@pytest.mark.asyncio
+async def test_upsert_replaces_the_body(sessionmaker):
+    await ChatSearch.index_message('chat-1', 'msg-1', 'user-1', {'content': 'Draft'})
+    await ChatSearch.index_message('chat-1', 'msg-1', 'user-1', {'content': 'Final answer'})
+    await ChatSearch.index_title('chat-1', 'user-1', None)
+    assert await get_bodies(sessionmaker) == {'chat-1-msg-1': 'Final answer', 'chat-1-': ''}
+
+
+@pytest.mark.asyncio
+async def test_backfill_writes_keep_existing_entries(sessionmaker):
+    await ChatSearch.index_message('chat-1', 'msg-1', 'user-1', {'content': 'Live save'})
+    await ChatSearch.index_message('chat-1', 'msg-1', 'user-1', {'content': 'Stale snapshot'}, overwrite=False)
+    await ChatSearch.index_message('chat-1', 'msg-2', 'user-1', {'content': 'Backfilled'}, overwrite=False)
+    assert await get_bodies(sessionmaker) == {'chat-1-msg-1': 'Live save', 'chat-1-msg-2': 'Backfilled'}
@@ -0,0 +1,73 @@
+from contextlib import asynccontextmanager
+
+import pytest
+import pytest_asyncio
+from open_webui.models import file_blobs
+from open_webui.models.file_blobs import FileBlob, FileBlobs
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+HASH = 'a' * 64
+
+
+@pytest_asyncio.fixture
+async def db(monkeypatch):
+    engine = create_async_engine('sqlite+aiosqlite://')
+    async with engine.begin() as conn:
+        await conn.run_sync(FileBlob.__table__.create)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def get_async_db_context(db=None):
+        async with sessionmaker() as session:
+            yield session
+
+    monkeypatch.setattr(file_blobs, 'get_async_db_context', get_async_db_context)
+    yield
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_first_upload_becomes_the_blob(db):
+    assert await FileBlobs.acquire(HASH, 'uploads/one.pdf', size=10) == 'uploads/one.pdf'
+
+    blob = await FileBlobs.get_blob_by_hash(HASH)
+    assert blob.path == 'uploads/one.pdf'
+    assert blob.size == 10
+    assert blob.ref_count == 1
+    assert (await FileBlobs.get_blob_by_path('uploads/one.pdf')).hash == HASH
+
+
+@pytest.mark.asyncio
+async def test_duplicate_upload_reuses_the_blob(db):
+    await FileBlobs.acquire(HASH, 'uploads/one.pdf')
+    assert await FileBlobs.acquire(HASH, 'uploads/two.pdf') == 'uploads/one.pdf'
+
+    assert (await FileBlobs.get_blob_by_hash(HASH)).ref_count == 2
+    assert await FileBlobs.get_blob_by_path('uploads/two.pdf') is None
+
+
+@pytest.mark.asyncio
+async def test_blob_is_released_with_its_last_reference(db):
+    await FileBlobs.acquire(HASH, 'uploads/one.pdf')
+    await FileBlobs.acquire(HASH, 'uploads/two.pdf')
+
+    assert not await FileBlobs.release('uploads/one.pdf')
+    assert (await FileBlobs.get_blob_by_hash(HASH)).ref_count == 1
+
+    assert await FileBlobs.release('uploads/one.pdf')
+    assert await FileBlobs.get_blob_by_hash(HASH) is None
+
+
+@pytest.mark.asyncio
+async def test_untracked_objects_can_be_deleted(db):
+    # Stored before blobs were tracked: the file owns its object.
+    assert await FileBlobs.release('uploads/legacy.pdf')
+
+
+@pytest.mark.asyncio
+async def test_blobs_are_keyed_by_content(db):
+    await FileBlobs.acquire(HASH, 'uploads/one.pdf')
+    assert await FileBlobs.acquire('b' * 64, 'uploads/other.pdf') == 'uploads/other.pdf'
+
+    assert await FileBlobs.release('uploads/other.pdf')
+    assert (await FileBlobs.get_blob_by_hash(HASH)).ref_count == 1
@@ -0,0 +1,78 @@
+from contextlib import asynccontextmanager
+
+import pytest
+import pytest_asyncio
+from open_webui.models import files
+from open_webui.models.files import File, Files
+from open_webui.routers.retrieval import RetrievalConfig, get_source_config_hash
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+PATH = 'uploads/handbook.pdf'
+SOURCE_HASH = 'a' * 64
+
+LOADER_CONFIG = {'CONTENT_EXTRACTION_ENGINE': '', 'TIKA_SERVER_URL': None, 'DOCLING_API_KEY': 'secret'}
+CONFIG = {'TEXT_SPLITTER': 'character', 'CHUNK_SIZE': 1000, 'CHUNK_OVERLAP': 100}
+
+
+@pytest_asyncio.fixture
+async def db(monkeypatch):
+    engine = create_async_engine('sqlite+aiosqlite://')
+    async with engine.begin() as conn:
+        await conn.run_sync(File.__table__.create)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def get_async_db_context(db=None):
+        async with sessionmaker() as session:
+            yield session
+
+    monkeypatch.setattr(files, 'get_async_db_context', get_async_db_context)
+    yield sessionmaker
+    await engine.dispose()
+
+
+async def add_file(sessionmaker, id: str, **data):
+    async with sessionmaker() as session:
+        session.add(
+            File(
+                id=id,
+                user_id='user-1',
+                filename='handbook.pdf',
+                path=PATH,
+                data={'status': 'completed', 'content': 'Handbook', **data},
+                created_at=0,
+                updated_at=0,
+            )
+        )
+        await session.commit()
+
+
+def test_source_config_hash_follows_extraction_and_chunking_settings():
+    source_config_hash = get_source_config_hash(LOADER_CONFIG, RetrievalConfig(CONFIG))
+
+    assert get_source_config_hash(dict(LOADER_CONFIG), RetrievalConfig(dict(CONFIG))) == source_config_hash
+    assert (
+        get_source_config_hash({**LOADER_CONFIG, 'CONTENT_EXTRACTION_ENGINE': 'tika'}, RetrievalConfig(CONFIG))
+        != source_config_hash
+    )
+    assert get_source_config_hash(LOADER_CONFIG, RetrievalConfig({**CONFIG, 'CHUNK_SIZE': 500})) != source_config_hash
+    assert get_source_config_hash(LOADER_CONFIG, RetrievalConfig({**CONFIG, 'CHUNK_OVERLAP': 0})) != source_config_hash
+    assert (
+        get_source_config_hash({**LOADER_CONFIG, 'DOCLING_API_KEY': 'rotated'}, RetrievalConfig(CONFIG))
+        == source_config_hash
+    )
+
+
+@pytest.mark.asyncio
+async def test_processed_file_must_match_the_source_config(db):
+    await add_file(db, 'file-1', source_hash=SOURCE_HASH, source_config_hash='config-1')
+
+    donor = await Files.get_processed_file_by_path(PATH, SOURCE_HASH, 'config-1', exclude_id='file-2')
+    assert donor.id == 'file-1'
+    assert await Files.get_processed_file_by_path(PATH, SOURCE_HASH, 'config-2', exclude_id='file-2') is None
+
+
+@pytest.mark.asyncio
+async def test_processed_file_without_a_source_config_is_not_reused(db):
+    await add_file(db, 'file-1', source_hash=SOURCE_HASH)
+    assert await Files.get_processed_file_by_path(PATH, SOURCE_HASH, 'config-1', exclude_id='file-2') is None
@@ -0,0 +1,162 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+from langchain_core.documents import Document
+from open_webui.retrieval.web import cache
+from open_webui.retrieval.web.cache import WebContentCache, normalize_url
+
+URL = 'https://example.com/article'
+
+
+@pytest.fixture
+def web_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(cache, 'get_redis_client', lambda async_mode=False: None)
+    web_cache = WebContentCache(tmp_path, ttl=600, max_entries=100)
+
+    # Read inline rather than in a thread, so concurrent calls interleave deterministically.
+    async def get(keys):
+        return web_cache._read_files(keys)
+
+    monkeypatch.setattr(web_cache, '_get', get)
+    return web_cache
+
+
+class Fetcher:
+    """Fetches pages after ``release`` is set, counting the URLs it was asked for."""
+
+    def __init__(self, pages: dict[str, str] = None, error: Exception = None):
+        self.pages = pages
+        self.error = error
+        self.calls: list[list[str]] = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self, urls: list[str]) -> dict[str, list[Document]]:
+        self.calls.append(urls)
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        return {
+            url: [Document(page_content=(self.pages or {}).get(url, f'Content of {url}'), metadata={'source': url})]
+            for url in urls
+            if self.pages is None or url in self.pages
+        }
+
+
+def test_normalize_url():
+    assert normalize_url('HTTPS://Example.COM:443/a?b=2&a=1#top') == 'https://example.com/a?a=1&b=2'
+    assert normalize_url('http://example.com') == 'http://example.com/'
+    assert normalize_url('http://example.com:8080/') == 'http://example.com:8080/'
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_fetch(web_cache):
+    fetch = Fetcher()
+    fetch.release.clear()
+
+    first = asyncio.create_task(web_cache.load_many([URL], fetch))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(web_cache.load_many([URL, 'https://example.com/other'], fetch))
+    await asyncio.sleep(0)
+    fetch.release.set()
+
+    results = await asyncio.gather(first, second)
+    assert fetch.calls == [[URL], ['https://example.com/other']]
+    assert results[0][URL][0].page_content == results[1][URL][0].page_content
+    assert web_cache.stats() == {'hits': 0, 'misses': 2}
+
+
+@pytest.mark.asyncio
+async def test_waiters_get_their_own_copies(web_cache):
+    fetch = Fetcher()
+    fetch.release.clear()
+
+    first = asyncio.create_task(web_cache.load_many([URL], fetch))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(web_cache.load_many([URL], fetch))
+    await asyncio.sleep(0)
+    fetch.release.set()
+
+    results = await asyncio.gather(first, second)
+    results[0][URL][0].metadata['score'] = 1.0
+    assert 'score' not in results[1][URL][0].metadata
+
+
+@pytest.mark.asyncio
+async def test_cached_pages_are_not_fetched_again(web_cache):
+    fetch = Fetcher()
+    await web_cache.load_many([URL], fetch)
+    results = await web_cache.load_many(['https://EXAMPLE.com/article#comments'], fetch)
+
+    assert fetch.calls == [[URL]]
+    assert results['https://EXAMPLE.com/article#comments'][0].page_content == f'Content of {URL}'
+    assert web_cache.stats() == {'hits': 1, 'misses': 1}
+
+
+@pytest.mark.asyncio
+async def test_pages_without_text_are_not_cached(web_cache):
+    fetch = Fetcher(pages={URL: '  '})
+    await web_cache.load_many([URL], fetch)
+    await web_cache.load_many([URL], fetch)
+    assert len(fetch.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_waiter_fetches_itself_when_the_owner_fails(web_cache):
+    failing = Fetcher(error=ConnectionError('reset'))
+    failing.release.clear()
+    fetch = Fetcher()
+
+    first = asyncio.create_task(web_cache.load_many([URL], failing))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(web_cache.load_many([URL], fetch))
+    await asyncio.sleep(0)
+    failing.release.set()
+
+    with pytest.raises(ConnectionError):
+        await first
+    assert (await second)[URL][0].page_content == f'Content of {URL}'
+    assert fetch.calls == [[URL]]
+
+
+@pytest.mark.asyncio
+async def test_waiter_fetches_itself_when_the_owner_is_cancelled(web_cache):
+    slow = Fetcher()
+    slow.release.clear()
+    fetch = Fetcher()
+
+    first = asyncio.create_task(web_cache.load_many([URL], slow))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(web_cache.load_many([URL], fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert (await second)[URL][0].page_content == f'Content of {URL}'
+    assert fetch.calls == [[URL]]
+
+
+@pytest.mark.asyncio
+async def test_namespaces_do_not_share_pages(web_cache):
+    fetch = Fetcher()
+    await web_cache.load_many([URL], fetch, namespace=('url', ''))
+    await web_cache.load_many([URL], fetch, namespace=('youtube', 'en'))
+    assert fetch.calls == [[URL], [URL]]
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_always_fetches(tmp_path):
+    fetch = Fetcher()
+    web_cache = WebContentCache(tmp_path, ttl=0, max_entries=100)
+    await web_cache.load_many([URL], fetch)
+    await web_cache.load_many([URL], fetch)
+    assert len(fetch.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_pages_beyond_max_entries_are_pruned(web_cache):
+    web_cache.max_entries = 2
+    fetch = Fetcher()
+    for i in range(4):
+        await web_cache.load_many([f'{URL}/{i}'], fetch)
+    assert len(list(Path(web_cache.directory).glob('*.json'))) <= 2
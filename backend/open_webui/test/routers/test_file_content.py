@@ -0,0 +1,141 @@
+import pytest
+from fastapi import HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
+from open_webui.models.files import FileModel
+from open_webui.routers import files
+from open_webui.routers.files import get_file_content_response, get_file_etag, parse_byte_range
+from open_webui.utils.misc import etag_matches
+from starlette.requests import Request
+
+SIZE = 1000
+
+
+def make_request(**headers) -> Request:
+    return Request(
+        {
+            'type': 'http',
+            'method': 'GET',
+            'path': '/api/v1/files/file-1/content',
+            'headers': [(name.replace('_', '-').encode(), value.encode()) for name, value in headers.items()],
+        }
+    )
+
+
+def make_file(**meta) -> FileModel:
+    return FileModel(
+        id='file-1',
+        user_id='user-1',
+        filename='report.pdf',
+        path='s3://bucket/report.pdf',
+        meta={'file_hash': 'abc123', 'size': SIZE, **meta},
+        created_at=0,
+        updated_at=0,
+    )
+
+
+class FakeStorage:
+    def __init__(self, path=None):
+        self.path = path
+        self.ranges = []
+
+    def get_file(self, file_path):
+        if self.path is None:
+            raise AssertionError('storage should not be read')
+        return str(self.path)
+
+    async def iter_file_range(self, file_path, start, end):
+        self.ranges.append((start, end))
+        yield b'x' * (end - start + 1)
+
+
+@pytest.mark.parametrize(
+    'header,expected',
+    [
+        ('bytes=0-99', (0, 99)),
+        ('bytes=500-', (500, 999)),
+        ('bytes=-100', (900, 999)),
+        ('bytes=900-5000', (900, 999)),
+        ('bytes=-5000', (0, 999)),
+        ('bytes= 10-20', (10, 20)),
+    ],
+)
+def test_parse_byte_range(header, expected):
+    assert parse_byte_range(header, SIZE) == expected
+
+
+@pytest.mark.parametrize(
+    'header',
+    [None, '', 'items=0-99', 'bytes=0-1,5-6', 'bytes=abc-', 'bytes=5-1', 'bytes=-'],
+)
+def test_parse_byte_range_sends_whole_file_when_unusable(header):
+    assert parse_byte_range(header, SIZE) is None
+
+
+@pytest.mark.parametrize('header', ['bytes=1000-', 'bytes=5000-6000', 'bytes=-0'])
+def test_parse_byte_range_rejects_ranges_outside_the_file(header):
+    with pytest.raises(HTTPException) as exc_info:
+        parse_byte_range(header, SIZE)
+    assert exc_info.value.status_code == 416
+    assert exc_info.value.headers == {'Content-Range': f'bytes */{SIZE}'}
+
+
+@pytest.mark.parametrize(
+    'if_none_match,matches',
+    [
+        (None, False),
+        ('"abc123"', True),
+        ('W/"abc123"', True),
+        ('"other", "abc123"', True),
+        ('*', True),
+        ('"other"', False),
+        ('abc123', False),
+    ],
+)
+def test_etag_matches(if_none_match, matches):
+    assert etag_matches(if_none_match, '"abc123"') is matches
+
+
+def test_etag_falls_back_to_file_id():
+    assert get_file_etag(make_file()) == '"abc123"'
+    assert get_file_etag(make_file(file_hash=None)) == '"file-1"'
+
+
+@pytest.mark.asyncio
+async def test_matching_etag_is_answered_without_reading_storage(monkeypatch):
+    monkeypatch.setattr(files, 'Storage', FakeStorage())
+
+    response = await get_file_content_response(make_request(if_none_match='W/"abc123"'), make_file())
+    assert response.status_code == 304
+    assert response.headers['etag'] == '"abc123"'
+    assert response.headers['cache-control'] == 'private, no-cache'
+
+
+@pytest.mark.asyncio
+async def test_remote_range_is_streamed_from_storage(monkeypatch):
+    storage = FakeStorage()
+    monkeypatch.setattr(files, 'Storage', storage)
+    monkeypatch.setattr(files, 'STORAGE_PROVIDER', 's3')
+
+    response = await get_file_content_response(make_request(range='bytes=100-199'), make_file())
+    assert isinstance(response, StreamingResponse)
+    assert response.status_code == 206
+    assert response.headers['content-range'] == f'bytes 100-199/{SIZE}'
+    assert response.headers['content-length'] == '100'
+    assert response.headers['etag'] == '"abc123"'
+
+    body = b''.join([chunk async for chunk in response.body_iterator])
+    assert len(body) == 100
+    assert storage.ranges == [(100, 199)]
+
+
+@pytest.mark.asyncio
+async def test_stale_if_range_sends_the_whole_file(monkeypatch, tmp_path):
+    path = tmp_path / 'report.pdf'
+    path.write_bytes(b'x' * SIZE)
+    monkeypatch.setattr(files, 'Storage', FakeStorage(path))
+    monkeypatch.setattr(files, 'STORAGE_PROVIDER', 's3')
+
+    response = await get_file_content_response(make_request(range='bytes=100-199', if_range='"previous"'), make_file())
+    assert isinstance(response, FileResponse)
+    assert response.status_code == 200
+    assert response.headers['etag'] == '"abc123"'
@@ -0,0 +1,155 @@
+import pytest
+from fastapi import HTTPException
+from open_webui.utils import connection_health
+from open_webui.utils.connection_health import CLOSED, HALF_OPEN, OPEN, ConnectionHealth
+
+URL = 'http://ollama-1:11434'
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(connection_health.time, 'monotonic', clock)
+    return clock
+
+
+@pytest.fixture
+def health(clock):
+    return ConnectionHealth(failure_threshold=3, backoff=5, max_backoff=20)
+
+
+def fail(health: ConnectionHealth, times: int, url: str = URL):
+    for _ in range(times):
+        health.record_failure(url, 'Connection refused')
+
+
+def test_opens_after_consecutive_failures(health):
+    fail(health, 2)
+    assert health.get_status(URL)['state'] == CLOSED
+    assert health.allow(URL)
+
+    fail(health, 1)
+    status = health.get_status(URL)
+    assert status['state'] == OPEN
+    assert status['consecutive_failures'] == 3
+    assert status['retry_in'] == 5
+    assert status['last_error'] == 'Connection refused'
+    assert not health.allow(URL)
+    assert not health.is_available(URL)
+
+
+def test_success_resets_failure_count(health):
+    fail(health, 2)
+    health.record_success(URL)
+    fail(health, 2)
+    assert health.get_status(URL)['state'] == CLOSED
+
+
+def test_lets_a_single_probe_through_once_the_backoff_passes(health, clock):
+    fail(health, 3)
+    clock.now += 5
+
+    # Checking availability does not start the probe.
+    assert health.is_available(URL)
+    assert health.get_status(URL)['state'] == OPEN
+
+    assert health.allow(URL)
+    assert health.get_status(URL)['state'] == HALF_OPEN
+    assert not health.allow(URL)
+
+
+def test_probe_success_closes_the_circuit(health, clock):
+    fail(health, 3)
+    clock.now += 5
+    assert health.allow(URL)
+
+    health.record_success(URL)
+    status = health.get_status(URL)
+    assert status['state'] == CLOSED
+    assert status['consecutive_failures'] == 0
+    assert status['last_error'] is None
+    assert health.allow(URL)
+
+
+def test_probe_failure_doubles_the_backoff_up_to_the_maximum(health, clock):
+    fail(health, 3)
+    for expected in (10, 20, 20):
+        clock.now += health.get_status(URL)['retry_in']
+        assert health.allow(URL)
+        fail(health, 1)
+        status = health.get_status(URL)
+        assert status['state'] == OPEN
+        assert status['retry_in'] == expected
+
+
+def test_probe_that_never_reports_back_is_retried(health, clock):
+    fail(health, 3)
+    clock.now += 5
+    assert health.allow(URL)
+    assert not health.allow(URL)
+
+    clock.now += 5
+    assert health.allow(URL)
+
+
+def test_only_unavailable_statuses_count_as_failures(health):
+    for status in (502, 503, 504):
+        health.record_status(URL, status)
+    assert health.get_status(URL)['state'] == OPEN
+
+    health.record_status(URL, 404)
+    assert health.get_status(URL)['state'] == CLOSED
+
+
+def test_circuits_are_per_host(health):
+    fail(health, 3, f'{URL}/api/chat')
+    assert not health.is_available(f'{URL}/api/tags')
+    assert health.is_available('http://ollama-2:11434')
+
+
+def test_threshold_zero_disables_the_breaker(clock):
+    health = ConnectionHealth(failure_threshold=0, backoff=5, max_backoff=20)
+    fail(health, 10)
+    assert health.allow(URL)
+    assert health.get_status(URL)['state'] == CLOSED
+
+
+class FakeResponse:
+    def __init__(self, status: int):
+        self.status = status
+
+
+class FakeSession:
+    def __init__(self, status: int = 200, error: Exception = None):
+        self.status = status
+        self.error = error
+        self.calls = 0
+
+    async def request(self, method, url, **kwargs):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return FakeResponse(self.status)
+
+
+@pytest.mark.asyncio
+async def test_send_connection_request_refuses_open_circuits(monkeypatch, health):
+    monkeypatch.setattr(connection_health, 'CONNECTION_HEALTH', health)
+
+    session = FakeSession(error=ConnectionRefusedError())
+    for _ in range(3):
+        with pytest.raises(ConnectionRefusedError):
+            await connection_health.send_connection_request(session, URL, 'GET', f'{URL}/api/tags')
+
+    with pytest.raises(HTTPException) as exc_info:
+        await connection_health.send_connection_request(session, URL, 'GET', f'{URL}/api/tags')
+    assert exc_info.value.status_code == 503
+    assert session.calls == 3
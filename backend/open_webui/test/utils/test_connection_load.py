@@ -0,0 +1,193 @@
+import gc
+
+import pytest
+from open_webui.routers import ollama, openai
+from open_webui.utils.connection_health import ConnectionHealth
+from open_webui.utils.connection_load import ConnectionLoad, ResidentModels
+
+URLS = ['http://ollama-1:11434', 'http://ollama-2:11434', 'http://ollama-3:11434']
+
+
+class FakeResponse:
+    pass
+
+
+def test_choose_prefers_fewest_requests_in_flight():
+    load = ConnectionLoad()
+    load.acquire(URLS[0])
+    load.acquire(URLS[0])
+    load.acquire(URLS[2])
+    assert load.choose(URLS) == 1
+
+
+def test_choose_weighs_requests_by_latency():
+    load = ConnectionLoad()
+    load.record_latency(URLS[0], 0.5)
+    load.record_latency(URLS[1], 4.0)
+    # (2 + 1) * 0.5 beats (0 + 1) * 4.0
+    load.acquire(URLS[0])
+    load.acquire(URLS[0])
+    assert load.choose(URLS[:2]) == 0
+
+
+def test_choose_assumes_average_latency_for_unmeasured_connections():
+    load = ConnectionLoad()
+    load.record_latency(URLS[0], 2.0)
+    load.record_latency(URLS[1], 4.0)
+    assert load.choose(URLS) == 0
+
+    load.acquire(URLS[0])
+    # ollama-3 scores 1 * 3.0, ollama-1 2 * 2.0, ollama-2 1 * 4.0
+    assert load.choose(URLS) == 2
+
+
+def test_choose_applies_penalties():
+    load = ConnectionLoad()
+    load.acquire(URLS[1])
+    assert load.choose(URLS[:2], penalties=[2, 0]) == 1
+
+
+def test_choose_breaks_ties_at_random():
+    load = ConnectionLoad()
+    load.acquire(URLS[2])
+    assert {load.choose(URLS) for _ in range(200)} == {0, 1}
+
+
+def test_latency_is_smoothed():
+    load = ConnectionLoad()
+    load.record_latency(URLS[0], 1.0)
+    load.record_latency(URLS[0], 2.0)
+    assert load.get_status(URLS[0])['latency'] == 1.3
+
+
+def test_tracked_responses_are_released_once():
+    load = ConnectionLoad()
+    response = FakeResponse()
+    load.acquire(URLS[0])
+    load.track(response, URLS[0])
+    assert load.in_flight(f'{URLS[0]}/api/chat') == 1
+
+    load.release_response(response)
+    load.release_response(response)
+    assert load.in_flight(URLS[0]) == 0
+
+
+def test_tracked_responses_are_released_when_collected():
+    load = ConnectionLoad()
+    load.acquire(URLS[0])
+    load.track(FakeResponse(), URLS[0])
+    gc.collect()
+    assert load.in_flight(URLS[0]) == 0
+
+
+@pytest.mark.asyncio
+async def test_resident_models_share_one_load():
+    resident = ResidentModels(ttl=10)
+    calls = []
+
+    async def load():
+        calls.append(1)
+        return {'models': [{'model': 'llama3:8b', 'name': 'llama3:8b'}]}
+
+    assert await resident.get(URLS[0], load) == {'llama3:8b'}
+    assert await resident.get(URLS[0], load) == {'llama3:8b'}
+    assert len(calls) == 1
+
+    resident.mark(URLS[0], 'qwen3:4b')
+    assert await resident.get(URLS[0], load) == {'llama3:8b', 'qwen3:4b'}
+
+
+@pytest.fixture
+def routing(monkeypatch):
+    load = ConnectionLoad()
+    health = ConnectionHealth(failure_threshold=1, backoff=60, max_backoff=60)
+    for module in (openai, ollama):
+        monkeypatch.setattr(module, 'CONNECTION_LOAD', load)
+        monkeypatch.setattr(module, 'CONNECTION_HEALTH', health)
+    return load, health
+
+
+@pytest.fixture
+def openai_urls(monkeypatch):
+    async def get_openai_runtime_config():
+        return True, URLS, ['', '', ''], {}
+
+    monkeypatch.setattr(openai, 'get_openai_runtime_config', get_openai_runtime_config)
+
+
+@pytest.mark.asyncio
+async def test_openai_routes_to_least_loaded_connection(routing, openai_urls):
+    load, _ = routing
+    load.acquire(URLS[0])
+    load.acquire(URLS[1])
+    assert await openai.choose_url_idx({'urlIdx': 0, 'urlIdxs': [0, 1, 2]}) == 2
+
+
+@pytest.mark.asyncio
+async def test_openai_skips_failing_connections(routing, openai_urls):
+    load, health = routing
+    load.acquire(URLS[1])
+    health.record_failure(URLS[0])
+    assert await openai.choose_url_idx({'urlIdx': 0, 'urlIdxs': [0, 1]}) == 1
+
+
+@pytest.mark.asyncio
+async def test_openai_falls_back_to_first_connection_when_all_fail(routing, openai_urls):
+    _, health = routing
+    for url in URLS:
+        health.record_failure(url)
+    assert await openai.choose_url_idx({'urlIdx': 1, 'urlIdxs': [1, 2]}) == 1
+
+
+@pytest.fixture
+def ollama_config(monkeypatch):
+    config = {'ollama.base_urls': URLS, 'ollama.api_configs': {}}
+
+    async def get(key, default=None):
+        return config.get(key, default)
+
+    monkeypatch.setattr(ollama.Config, 'get', get)
+    monkeypatch.setattr(ollama, 'RESIDENT_MODELS', ResidentModels(ttl=10))
+    return config
+
+
+@pytest.mark.asyncio
+async def test_ollama_penalizes_backends_without_the_model_loaded(monkeypatch, routing, ollama_config):
+    load, _ = routing
+    monkeypatch.setattr(ollama, 'OLLAMA_ROUTING_COLD_LOAD_PENALTY', 2)
+
+    async def send_get_request(url, key=None):
+        if url.startswith(URLS[1]):
+            return {'models': [{'model': 'llama3:8b'}]}
+        return {'models': []}
+
+    monkeypatch.setattr(ollama, 'send_get_request', send_get_request)
+
+    # Two requests in flight on a backend with the model loaded beat a cold load.
+    load.acquire(URLS[1])
+    assert await ollama.choose_url_idx([0, 1, 2], 'llama3:8b') == 1
+
+    load.acquire(URLS[1])
+    load.acquire(URLS[1])
+    assert await ollama.choose_url_idx([0, 1, 2], 'llama3:8b') in (0, 2)
+
+
+@pytest.mark.asyncio
+async def test_ollama_does_not_penalize_unknown_residency(monkeypatch, routing, ollama_config):
+    load, _ = routing
+    monkeypatch.setattr(ollama, 'OLLAMA_ROUTING_COLD_LOAD_PENALTY', 2)
+
+    async def send_get_request(url, key=None):
+        raise ConnectionError('ps unavailable')
+
+    monkeypatch.setattr(ollama, 'send_get_request', send_get_request)
+    load.acquire(URLS[0])
+    assert await ollama.choose_url_idx([0, 1], 'llama3:8b') == 1
+
+
+@pytest.mark.asyncio
+async def test_ollama_skips_failing_backends(routing, ollama_config):
+    _, health = routing
+    health.record_failure(URLS[0])
+    health.record_failure(URLS[2])
+    assert await ollama.choose_url_idx([0, 1, 2]) == 1
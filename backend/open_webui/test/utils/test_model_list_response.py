@@ -0,0 +1,81 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from open_webui.utils import models
+from open_webui.utils.model_list_cache import ModelListCache
+from starlette.requests import Request
+
+URL = 'https://llm.example.com/v1'
+
+
+def make_request() -> Request:
+    return Request({'type': 'http', 'method': 'GET', 'path': '/api/models', 'headers': []})
+
+
+def make_user(id: str) -> SimpleNamespace:
+    return SimpleNamespace(id=id, role='user')
+
+
+@pytest.fixture
+def connection(monkeypatch):
+    """One OpenAI connection whose config the test sets; the model list depends on the caller."""
+    api_config = {}
+    calls = []
+
+    async def get_openai_runtime_config():
+        return True, [URL], [''], {'0': api_config}
+
+    async def get_ollama_runtime_config():
+        return False, [], {}
+
+    async def get_model_list(request, refresh=False, user=None):
+        calls.append(user.id)
+        return [{'id': f'model-for-{user.id}'}]
+
+    async def get_filtered_models(models, user):
+        return models
+
+    async def get_groups_by_member_id(user_id):
+        return []
+
+    monkeypatch.setattr(models.openai, 'get_openai_runtime_config', get_openai_runtime_config)
+    monkeypatch.setattr(models.ollama, 'get_ollama_runtime_config', get_ollama_runtime_config)
+    monkeypatch.setattr(models, 'get_model_list', get_model_list)
+    monkeypatch.setattr(models, 'get_filtered_models', get_filtered_models)
+    monkeypatch.setattr(models.Groups, 'get_groups_by_member_id', get_groups_by_member_id)
+    monkeypatch.setattr(models, 'MODEL_LIST_CACHE', ModelListCache(ttl=60, max_size=100))
+    return SimpleNamespace(api_config=api_config, calls=calls)
+
+
+async def get_model_ids(user) -> list[str]:
+    response = await models.get_model_list_response(make_request(), user=user)
+    return [model['id'] for model in json.loads(response.body)['data']]
+
+
+@pytest.mark.asyncio
+async def test_user_dependent_connection_is_fetched_per_user(connection):
+    connection.api_config['auth_type'] = 'system_oauth'
+
+    assert await get_model_ids(make_user('alice')) == ['model-for-alice']
+    assert await get_model_ids(make_user('bob')) == ['model-for-bob']
+    assert connection.calls == ['alice', 'bob']
+
+    # Each user's own response is still cached.
+    assert await get_model_ids(make_user('alice')) == ['model-for-alice']
+    assert connection.calls == ['alice', 'bob']
+
+
+@pytest.mark.asyncio
+async def test_user_independent_connection_shares_one_list(connection):
+    connection.api_config['auth_type'] = 'bearer'
+
+    assert await get_model_ids(make_user('alice')) == ['model-for-alice']
+    assert await get_model_ids(make_user('bob')) == ['model-for-alice']
+    assert connection.calls == ['alice']
+
+
+@pytest.mark.asyncio
+async def test_disabled_user_dependent_connection_is_ignored(connection):
+    connection.api_config.update({'auth_type': 'session', 'enable': False})
+    assert not await models.has_user_dependent_connections()
@@ -0,0 +1,109 @@
+import asyncio
+from types import SimpleNamespace
+
+import aiohttp
+import pytest
+from open_webui.models.webhook_deliveries import WebhookDeliveryModel
+from open_webui.utils import webhook_dispatch
+from open_webui.utils.webhook_dispatch import WebhookDispatcher, is_permanent_failure
+
+
+def response_error(status: int) -> aiohttp.ClientResponseError:
+    return aiohttp.ClientResponseError(SimpleNamespace(real_url='https://hooks.example.com'), (), status=status)
+
+
+def make_delivery(attempts: int = 1) -> WebhookDeliveryModel:
+    return WebhookDeliveryModel(
+        id='delivery-1',
+        webhook_id='webhook-1',
+        url='https://hooks.example.com',
+        event='chat.created',
+        message='New chat',
+        payload={},
+        status='pending',
+        attempts=attempts,
+        next_attempt_at=0,
+        created_at=0,
+        updated_at=0,
+    )
+
+
+class FakeDeliveries:
+    def __init__(self):
+        self.failed = []
+        self.rescheduled = []
+
+    async def mark_failed(self, id, error=None):
+        self.failed.append((id, error))
+
+    async def reschedule(self, id, next_attempt_at, error=None):
+        self.rescheduled.append((id, next_attempt_at, error))
+
+
+@pytest.fixture
+def deliveries(monkeypatch):
+    deliveries = FakeDeliveries()
+    monkeypatch.setattr(webhook_dispatch, 'WebhookDeliveries', deliveries)
+    return deliveries
+
+
+@pytest.mark.parametrize('status', [400, 401, 403, 404, 410, 422])
+def test_client_errors_are_permanent(status):
+    assert is_permanent_failure(response_error(status))
+
+
+@pytest.mark.parametrize('status', [408, 429, 500, 502, 503])
+def test_timeouts_rate_limits_and_server_errors_are_retried(status):
+    assert not is_permanent_failure(response_error(status))
+
+
+@pytest.mark.parametrize(
+    'error',
+    [aiohttp.ClientConnectionError('refused'), asyncio.TimeoutError(), ValueError('bad payload')],
+)
+def test_errors_without_a_response_are_retried(error):
+    assert not is_permanent_failure(error)
+
+
+def test_retry_delay_doubles_up_to_the_maximum(monkeypatch):
+    monkeypatch.setattr(webhook_dispatch.random, 'uniform', lambda low, high: 1.0)
+    dispatcher = WebhookDispatcher(backoff=5, max_backoff=60)
+    assert [dispatcher._retry_delay(attempts) for attempts in range(1, 7)] == [5, 10, 20, 40, 60, 60]
+
+
+def test_retry_delay_is_jittered():
+    dispatcher = WebhookDispatcher(backoff=10, max_backoff=60)
+    delays = [dispatcher._retry_delay(2) for _ in range(100)]
+    assert all(16 <= delay <= 24 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+@pytest.mark.asyncio
+async def test_retryable_failure_is_rescheduled(monkeypatch, deliveries):
+    monkeypatch.setattr(webhook_dispatch.time, 'time', lambda: 1000)
+    monkeypatch.setattr(webhook_dispatch.random, 'uniform', lambda low, high: 1.0)
+    dispatcher = WebhookDispatcher(max_attempts=3, backoff=5, max_backoff=60)
+
+    await dispatcher._fail(make_delivery(attempts=2), response_error(503))
+    assert deliveries.rescheduled == [('delivery-1', 1010, 'ClientResponseError: ' + str(response_error(503)))]
+    assert deliveries.failed == []
+    assert dispatcher.retried_count == 1
+
+
+@pytest.mark.asyncio
+async def test_permanent_failure_is_not_retried(deliveries):
+    dispatcher = WebhookDispatcher(max_attempts=3)
+
+    await dispatcher._fail(make_delivery(attempts=1), response_error(404))
+    assert [id for id, _ in deliveries.failed] == ['delivery-1']
+    assert deliveries.rescheduled == []
+    assert dispatcher.failed_count == 1
+
+
+@pytest.mark.asyncio
+async def test_last_attempt_is_not_retried(deliveries):
+    dispatcher = WebhookDispatcher(max_attempts=3)
+
+    await dispatcher._fail(make_delivery(attempts=3), asyncio.TimeoutError())
+    assert deliveries.failed == [('delivery-1', 'TimeoutError')]
+    assert deliveries.rescheduled == []
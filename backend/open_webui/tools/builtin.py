@@ -1248,21 +1248,8 @@ async def search_chats(
             if end_timestamp and chat.updated_at > end_timestamp:
                 continue
 
-            # Find a matching message snippet
-            snippet = ''
-            messages = (getattr(chat, 'chat', None) or {}).get('history', {}).get('messages', {})
-            lower_query = query.lower()
-
-            for msg_id, msg in messages.items():
-                content = msg.get('content', '')
-                if isinstance(content, str) and lower_query in content.lower():
-                    idx = content.lower().find(lower_query)
-                    start = max(0, idx - 50)
-                    end = min(len(content), idx + len(query) + 100)
-                    snippet = ('...' if start > 0 else '') + content[start:end] + ('...' if end < len(content) else '')
-                    break
-
-            if not snippet and lower_query in chat.title.lower():
+            snippet = chat.snippet or ''
+            if not snippet and query.lower() in chat.title.lower():
                 snippet = f'Title match: {chat.title}'
 
             results.append(
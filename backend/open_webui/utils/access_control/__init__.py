@@ -1,4 +1,3 @@
-import json
 from typing import Any
 
 from open_webui.config import DEFAULT_USER_PERMISSIONS
@@ -13,6 +12,18 @@ from open_webui.models.users import UserModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
+def copy_permissions(permissions: Any) -> Any:
+    """
+    Copy a permissions tree (nested dicts and lists of JSON values).
+    Cheaper than a JSON round trip, which used to run on every permission check.
+    """
+    if isinstance(permissions, dict):
+        return {key: copy_permissions(value) for key, value in permissions.items()}
+    if isinstance(permissions, list):
+        return [copy_permissions(value) for value in permissions]
+    return permissions
+
+
 def fill_missing_permissions(permissions: dict[str, Any], default_permissions: dict[str, Any]) -> dict[str, Any]:
     """
     Recursively fills in missing properties in the permissions dictionary
@@ -55,7 +66,7 @@ async def get_permissions(
     user_groups = await Groups.get_groups_by_member_id(user_id, db=db)
 
     # Deep copy default permissions to avoid modifying the original dict
-    permissions = json.loads(json.dumps(default_permissions))
+    permissions = copy_permissions(default_permissions)
 
     # Combine permissions from all user groups
     for group in user_groups:
@@ -40,6 +40,7 @@ from open_webui.models.auths import Auths
 from open_webui.models.config import Config
 from open_webui.models.users import Users
 from open_webui.utils.access_control import has_permission
+from open_webui.utils.last_active import LAST_ACTIVE_BUFFER
 from pytz import UTC
 
 log = logging.getLogger(__name__)
@@ -371,7 +372,7 @@ async def get_current_user(
                     detail='Invalid token',
                 )
 
-            user = await Users.get_user_by_id(data['id'])
+            user = await Users.get_cached_user_by_id(data['id'])
             if user is None:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -397,11 +398,8 @@ async def get_current_user(
                         current_span.set_attribute('client.user.role', user.role)
                         current_span.set_attribute('client.auth.type', 'jwt')
 
-                # Refresh the user's last active timestamp
-                # Fire-and-forget via asyncio.create_task to avoid blocking
-                import asyncio
-
-                asyncio.create_task(Users.update_last_active_by_id(user.id))
+                # Refresh the user's last active timestamp (written in bulk later)
+                LAST_ACTIVE_BUFFER.touch(user.id)
             return user
         else:
             raise HTTPException(
@@ -471,7 +469,7 @@ async def get_current_user_by_api_key(request, api_key: str):
             current_span.set_attribute('client.user.role', user.role)
             current_span.set_attribute('client.auth.type', 'api_key')
 
-    await Users.update_last_active_by_id(user.id)
+    LAST_ACTIVE_BUFFER.touch(user.id)
     return user
 
 
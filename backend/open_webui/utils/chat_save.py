@@ -0,0 +1,126 @@
+"""Write-behind buffer for realtime chat saves.
+
+With ``ENABLE_REALTIME_CHAT_SAVE`` the streaming handler used to persist the
+full output on every delta.  ``MessageWriteBuffer`` keeps only the latest
+snapshot per message in memory and writes it back on a timer or once enough
+new content has accumulated, so the database sees a handful of writes per
+response instead of one per token.
+
+Configurable via environment variables:
+    - REALTIME_CHAT_SAVE_FLUSH_INTERVAL (default 1.0) — max seconds between
+      writes while streaming; 0 writes on every update
+    - REALTIME_CHAT_SAVE_FLUSH_BYTES (default 16384) — write early once this
+      many bytes of new content are pending
+
+Usage:
+    buffer = MessageWriteBuffer(chat_id, message_id)
+    buffer.update({'output': output}, nbytes=len(delta))
+    ...
+    await buffer.close({'done': True})  # final state is always written
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from open_webui.env import (
+    REALTIME_CHAT_SAVE_FLUSH_BYTES,
+    REALTIME_CHAT_SAVE_FLUSH_INTERVAL,
+)
+from open_webui.models.chats import Chats
+
+log = logging.getLogger(__name__)
+
+
+class MessageWriteBuffer:
+    """Coalesces snapshot writes for one chat message.
+
+    Only the most recent value of each key is kept.  At most one write is in
+    flight at a time; updates that arrive during a write are picked up by the
+    next one.  ``close()`` flushes whatever is pending together with the final
+    fields in a single write and waits for it, so the final state is durable
+    once it returns.
+    """
+
+    def __init__(
+        self,
+        chat_id: str,
+        message_id: str,
+        interval: float = REALTIME_CHAT_SAVE_FLUSH_INTERVAL,
+        max_bytes: int = REALTIME_CHAT_SAVE_FLUSH_BYTES,
+    ):
+        self.chat_id = chat_id
+        self.message_id = message_id
+        self.interval = interval
+        self.max_bytes = max_bytes
+
+        self._pending: dict = {}
+        self._pending_bytes = 0
+        self._last_flush = time.monotonic()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    def update(self, data: dict, nbytes: int = 0):
+        """Record the latest snapshot; schedules a write without awaiting it."""
+        if self._closed:
+            return
+
+        self._pending.update(data)
+        self._pending_bytes += nbytes
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        elif self._pending_bytes >= self.max_bytes:
+            self._wake.set()
+
+    async def _run(self):
+        while self._pending:
+            # Wait out the interval, or less once enough new content is pending.
+            delay = self.interval - (time.monotonic() - self._last_flush)
+            if delay > 0 and self._pending_bytes < self.max_bytes and not self._closed:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+            self._wake.clear()
+            await self._flush()
+            if self._closed:
+                return
+
+    async def _flush(self):
+        if not self._pending:
+            return
+
+        data, self._pending = self._pending, {}
+        self._pending_bytes = 0
+        self._last_flush = time.monotonic()
+        try:
+            await Chats.upsert_message_to_chat_by_id_and_message_id(self.chat_id, self.message_id, data)
+        except Exception as e:
+            log.warning('Realtime save failed for message %s in chat %s: %s', self.message_id, self.chat_id, e)
+            # Keep the snapshot for the next write unless newer data replaced it.
+            self._pending = {**data, **self._pending}
+
+    async def flush(self):
+        """Write pending data now and wait for it.
+
+        Waits for any in-flight write first, so writes never land out of
+        order.
+        """
+        task = self._task
+        if task is not None and not task.done():
+            self._wake.set()
+            await asyncio.shield(task)
+        await self._flush()
+
+    async def close(self, final: Optional[dict] = None):
+        """Write pending data plus ``final`` and stop accepting updates.
+
+        Safe to call more than once; later calls only write their ``final``.
+        """
+        self._closed = True
+        if final:
+            self._pending.update(final)
+        await self.flush()
@@ -0,0 +1,208 @@
+"""Health tracking and circuit breaking for OpenAI and Ollama connections.
+
+A connection that is down used to be retried by every model refresh and
+completion until the request timed out.  ``ConnectionHealth`` counts
+consecutive failures per connection (keyed by ``scheme://host``):
+
+    - closed: requests pass; ``CONNECTION_CIRCUIT_FAILURE_THRESHOLD``
+      consecutive failures open the circuit
+    - open: requests are refused immediately until the probe delay passes
+    - half-open: a single request is let through as a probe; success closes
+      the circuit, failure reopens it and doubles the probe delay (from
+      ``CONNECTION_CIRCUIT_BACKOFF`` up to ``CONNECTION_CIRCUIT_MAX_BACKOFF``)
+
+Only connection errors, timeouts and 502/503/504 responses count as failures;
+any other response proves the connection is reachable.  State is kept per
+worker.
+
+Configurable via environment variables:
+    - CONNECTION_CIRCUIT_FAILURE_THRESHOLD (default 3) — 0 disables
+    - CONNECTION_CIRCUIT_BACKOFF (default 5) — seconds before the first probe
+    - CONNECTION_CIRCUIT_MAX_BACKOFF (default 300) — longest probe delay
+"""
+
+import logging
+import time
+from typing import Optional
+
+from fastapi import HTTPException
+from open_webui.constants import ERROR_MESSAGES
+from open_webui.env import (
+    CONNECTION_CIRCUIT_BACKOFF,
+    CONNECTION_CIRCUIT_FAILURE_THRESHOLD,
+    CONNECTION_CIRCUIT_MAX_BACKOFF,
+)
+from open_webui.utils.connection_load import CONNECTION_LOAD, connection_key
+
+log = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Upstream statuses that mean the connection (or what is behind it) is down.
+FAILURE_STATUSES = {502, 503, 504}
+
+
+class CircuitState:
+    __slots__ = (
+        'state',
+        'consecutive_failures',
+        'backoff',
+        'retry_at',
+        'probe_started_at',
+        'last_success_at',
+        'last_failure_at',
+        'last_error',
+    )
+
+    def __init__(self):
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.backoff = 0.0
+        # monotonic time the next probe is allowed
+        self.retry_at = 0.0
+        self.probe_started_at: Optional[float] = None
+        # wall-clock timestamps, for admins
+        self.last_success_at: Optional[int] = None
+        self.last_failure_at: Optional[int] = None
+        self.last_error: Optional[str] = None
+
+
+class ConnectionHealth:
+    def __init__(
+        self,
+        failure_threshold: int = CONNECTION_CIRCUIT_FAILURE_THRESHOLD,
+        backoff: float = CONNECTION_CIRCUIT_BACKOFF,
+        max_backoff: float = CONNECTION_CIRCUIT_MAX_BACKOFF,
+    ):
+        self.failure_threshold = failure_threshold
+        self.base_backoff = backoff
+        self.max_backoff = max_backoff
+
+        self._circuits: dict[str, CircuitState] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.failure_threshold > 0
+
+    def _get(self, url: str) -> CircuitState:
+        key = connection_key(url)
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = self._circuits[key] = CircuitState()
+        return circuit
+
+    def is_available(self, url: str) -> bool:
+        """Whether a request to ``url`` would be let through; changes nothing."""
+        if not self.enabled:
+            return True
+        circuit = self._circuits.get(connection_key(url))
+        if circuit is None or circuit.state == CLOSED:
+            return True
+        return self._probe_due(circuit)
+
+    def _probe_due(self, circuit: CircuitState) -> bool:
+        now = time.monotonic()
+        if circuit.state == HALF_OPEN:
+            # A probe that never reported back does not block the connection forever.
+            return circuit.probe_started_at is None or now - circuit.probe_started_at >= circuit.backoff
+        return now >= circuit.retry_at
+
+    def allow(self, url: str) -> bool:
+        """Whether to send a request to ``url`` now; lets one probe through an open circuit."""
+        if not self.enabled:
+            return True
+        circuit = self._get(url)
+        if circuit.state == CLOSED:
+            return True
+        if not self._probe_due(circuit):
+            return False
+        circuit.state = HALF_OPEN
+        circuit.probe_started_at = time.monotonic()
+        return True
+
+    def record_success(self, url: str):
+        if not self.enabled:
+            return
+        circuit = self._get(url)
+        if circuit.state != CLOSED:
+            log.info(f'Connection {connection_key(url)} recovered')
+        circuit.state = CLOSED
+        circuit.consecutive_failures = 0
+        circuit.backoff = 0.0
+        circuit.probe_started_at = None
+        circuit.last_success_at = int(time.time())
+        circuit.last_error = None
+
+    def record_failure(self, url: str, error: str = ''):
+        if not self.enabled:
+            return
+        circuit = self._get(url)
+        circuit.consecutive_failures += 1
+        circuit.last_failure_at = int(time.time())
+        circuit.last_error = error or 'Connection failed'
+
+        if circuit.state == HALF_OPEN:
+            circuit.backoff = min(circuit.backoff * 2, self.max_backoff)
+        elif circuit.state == CLOSED and circuit.consecutive_failures >= self.failure_threshold:
+            circuit.backoff = self.base_backoff
+            log.warning(
+                f'Connection {connection_key(url)} failed {circuit.consecutive_failures} times in a row; '
+                f'skipping it for {circuit.backoff:.0f}s'
+            )
+        else:
+            return
+        circuit.state = OPEN
+        circuit.probe_started_at = None
+        circuit.retry_at = time.monotonic() + circuit.backoff
+
+    def record_status(self, url: str, status: int):
+        """Record an HTTP response from ``url``."""
+        if status in FAILURE_STATUSES:
+            self.record_failure(url, f'HTTP {status}')
+        else:
+            self.record_success(url)
+
+    def get_status(self, url: str) -> dict:
+        circuit = self._circuits.get(connection_key(url))
+        if circuit is None:
+            return {'state': CLOSED, 'consecutive_failures': 0, 'retry_in': None}
+        retry_in = None
+        if circuit.state == OPEN:
+            retry_in = max(0, round(circuit.retry_at - time.monotonic()))
+        return {
+            'state': circuit.state,
+            'consecutive_failures': circuit.consecutive_failures,
+            'retry_in': retry_in,
+            'last_success_at': circuit.last_success_at,
+            'last_failure_at': circuit.last_failure_at,
+            'last_error': circuit.last_error,
+        }
+
+
+CONNECTION_HEALTH = ConnectionHealth()
+
+
+async def send_connection_request(session, connection_url: str, method: str, url: str, **kwargs):
+    """``session.request`` to a URL of connection ``connection_url``, through ``CONNECTION_HEALTH``.
+
+    Raises a 503 ``HTTPException`` without contacting the connection while its circuit is open.
+    The request counts towards the connection's load in ``CONNECTION_LOAD`` until the response
+    is passed to ``cleanup_response``.
+    """
+    if not CONNECTION_HEALTH.allow(connection_url):
+        raise HTTPException(status_code=503, detail=ERROR_MESSAGES.CONNECTION_UNAVAILABLE)
+    CONNECTION_LOAD.acquire(connection_url)
+    started_at = time.monotonic()
+    try:
+        r = await session.request(method, url, **kwargs)
+    except Exception as e:
+        CONNECTION_LOAD.release(connection_url)
+        CONNECTION_HEALTH.record_failure(connection_url, str(e) or type(e).__name__)
+        raise
+    CONNECTION_LOAD.track(r, connection_url)
+    CONNECTION_HEALTH.record_status(connection_url, r.status)
+    if r.status not in FAILURE_STATUSES:
+        CONNECTION_LOAD.record_latency(connection_url, time.monotonic() - started_at)
+    return r
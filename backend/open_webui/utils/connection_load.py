@@ -0,0 +1,158 @@
+"""Least-loaded routing between connections serving the same model.
+
+Several Ollama backends (or OpenAI-compatible connections) can expose the same
+model; requests used to be sent to one of them at random.  ``ConnectionLoad``
+tracks, per connection (keyed by ``scheme://host``):
+
+    - in-flight requests, from the moment a request is sent until its
+      response (streamed or not) is released
+    - an exponentially weighted average of the time until response headers
+
+``choose`` picks the connection with the lowest ``(in-flight + 1) * latency``;
+connections without measurements are assumed to be as fast as the others.
+For Ollama, ``ResidentModels`` caches each backend's ``/api/ps`` so that a
+backend which would have to load the model first counts as
+``OLLAMA_ROUTING_COLD_LOAD_PENALTY`` extra requests.  State is kept per
+worker.
+
+Configurable via environment variables:
+    - OLLAMA_ROUTING_COLD_LOAD_PENALTY (default 2) — extra requests a cold
+      load is worth; 0 ignores residency
+    - OLLAMA_RESIDENT_MODELS_TTL (default 10) — seconds a backend's loaded
+      models are reused
+"""
+
+import asyncio
+import logging
+import random
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Optional
+from urllib.parse import urlparse
+
+from open_webui.env import OLLAMA_RESIDENT_MODELS_TTL
+
+log = logging.getLogger(__name__)
+
+# Weight of the newest sample in the latency average.
+LATENCY_SMOOTHING = 0.3
+
+
+def connection_key(url: str) -> str:
+    parsed = urlparse(url)
+    if not parsed.netloc:
+        return url
+    return f'{parsed.scheme}://{parsed.netloc}'
+
+
+class ConnectionLoad:
+    def __init__(self):
+        self._in_flight: dict[str, int] = {}
+        # seconds until response headers, averaged
+        self._latency: dict[str, float] = {}
+        # response -> finalizer releasing its request
+        self._responses: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def acquire(self, url: str):
+        key = connection_key(url)
+        self._in_flight[key] = self._in_flight.get(key, 0) + 1
+
+    def release(self, url: str):
+        key = connection_key(url)
+        in_flight = self._in_flight.get(key, 0) - 1
+        if in_flight > 0:
+            self._in_flight[key] = in_flight
+        else:
+            self._in_flight.pop(key, None)
+
+    def track(self, response: Any, url: str):
+        """Keep the request counted until ``release_response`` (or until ``response`` is garbage collected)."""
+        self._responses[response] = weakref.finalize(response, self.release, url)
+
+    def release_response(self, response: Any):
+        finalizer = self._responses.pop(response, None)
+        if finalizer is not None:
+            finalizer()
+
+    def record_latency(self, url: str, seconds: float):
+        key = connection_key(url)
+        previous = self._latency.get(key)
+        if previous is None:
+            self._latency[key] = seconds
+        else:
+            self._latency[key] = previous + LATENCY_SMOOTHING * (seconds - previous)
+
+    def in_flight(self, url: str) -> int:
+        return self._in_flight.get(connection_key(url), 0)
+
+    def choose(self, urls: list[str], penalties: Optional[list[float]] = None) -> int:
+        """Index of the least-loaded of ``urls``; ``penalties`` are extra requests per url."""
+        if len(urls) == 1:
+            return 0
+
+        latencies = [self._latency.get(connection_key(url)) for url in urls]
+        known = [latency for latency in latencies if latency is not None]
+        default_latency = sum(known) / len(known) if known else 1.0
+
+        scores = [
+            (self.in_flight(url) + 1 + (penalties[i] if penalties else 0))
+            * (latency if latency is not None else default_latency)
+            for i, (url, latency) in enumerate(zip(urls, latencies))
+        ]
+        best = min(scores)
+        return random.choice([i for i, score in enumerate(scores) if score == best])
+
+    def get_status(self, url: str) -> dict:
+        latency = self._latency.get(connection_key(url))
+        return {
+            'in_flight': self.in_flight(url),
+            'latency': round(latency, 3) if latency is not None else None,
+        }
+
+
+CONNECTION_LOAD = ConnectionLoad()
+
+
+class ResidentModels:
+    """Models each Ollama backend has loaded, refreshed at most every ``ttl`` seconds."""
+
+    def __init__(self, ttl: float = OLLAMA_RESIDENT_MODELS_TTL):
+        self.ttl = ttl
+
+        # url -> (expires_at, model names, or None when /api/ps failed)
+        self._entries: dict[str, tuple[float, Optional[set[str]]]] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    async def _load(self, url: str, load: Callable[[], Awaitable[Optional[dict]]]) -> Optional[set[str]]:
+        try:
+            response = await load()
+        except Exception as e:
+            log.debug(f'Failed to get loaded models from {url}: {e}')
+            response = None
+        models = None
+        if isinstance(response, dict):
+            models = set()
+            for model in response.get('models', []):
+                models.update(name for name in (model.get('model'), model.get('name')) if name)
+        self._entries[url] = (time.monotonic() + self.ttl, models)
+        return models
+
+    async def get(self, url: str, load: Callable[[], Awaitable[Optional[dict]]]) -> Optional[set[str]]:
+        """Names of the models loaded on ``url``, or ``None`` if unknown; concurrent misses share one ``load``."""
+        entry = self._entries.get(url)
+        if entry is not None and entry[0] >= time.monotonic():
+            return entry[1]
+
+        task = self._tasks.get(url)
+        if task is None or task.done():
+            task = self._tasks[url] = asyncio.create_task(self._load(url, load))
+        return await asyncio.shield(task)
+
+    def mark(self, url: str, model: str):
+        """Record that ``url`` is loading ``model`` for a request routed there."""
+        entry = self._entries.get(url)
+        if entry is not None and entry[1] is not None:
+            entry[1].add(model)
+
+
+RESIDENT_MODELS = ResidentModels()
@@ -0,0 +1,116 @@
+"""Coalesced writes of users' last-active timestamps.
+
+Every authenticated request and socket heartbeat used to issue its own
+``UPDATE user SET last_active_at``.  ``LastActiveBuffer`` only records the
+latest timestamp per user in memory and writes all of them with one bulk
+UPDATE every few seconds.
+
+With Redis, each worker merges its timestamps into a shared sorted set
+(keeping the newest per user) and whichever worker claims the set first
+writes it, so the database sees about one UPDATE per interval for the whole
+deployment.  Activity checks read the database, so they lag by at most one
+interval — well inside the three-minute "active" window.
+
+Configurable via environment variables:
+    - USER_LAST_ACTIVE_FLUSH_INTERVAL (default 10) — seconds between writes;
+      0 writes on every request
+
+Usage:
+    LAST_ACTIVE_BUFFER.touch(user.id)
+    ...
+    await LAST_ACTIVE_BUFFER.close()  # on shutdown
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+from uuid import uuid4
+
+from open_webui.env import REDIS_KEY_PREFIX, USER_LAST_ACTIVE_FLUSH_INTERVAL
+from open_webui.models.users import Users
+from open_webui.utils.redis import get_redis_client
+
+log = logging.getLogger(__name__)
+
+# Both keys share a hash tag so RENAME works on Redis Cluster.
+REDIS_LAST_ACTIVE_KEY = f'{REDIS_KEY_PREFIX}:{{users:last_active}}'
+
+
+class LastActiveBuffer:
+    def __init__(self, interval: float = USER_LAST_ACTIVE_FLUSH_INTERVAL):
+        self.interval = interval
+
+        self._pending: dict[str, int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0
+
+    def touch(self, user_id: str):
+        """Record activity for ``user_id``; written on the next flush, never awaited."""
+        if not self.enabled:
+            asyncio.create_task(Users.update_last_active_by_id(user_id))
+            return
+
+        self._pending[user_id] = int(time.time())
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+            if not self._pending:
+                return
+
+    async def _take_shared(self, redis, pending: dict[str, int]) -> dict[str, int]:
+        """Merge ``pending`` into Redis and claim whatever is there to write."""
+        if pending:
+            await redis.zadd(REDIS_LAST_ACTIVE_KEY, pending, gt=True)
+
+        # RENAME is atomic: each entry is claimed by exactly one worker.
+        claimed_key = f'{REDIS_LAST_ACTIVE_KEY}:flushing:{uuid4()}'
+        try:
+            await redis.rename(REDIS_LAST_ACTIVE_KEY, claimed_key)
+        except Exception:
+            # Nothing pending, or another worker claimed it first.
+            return {}
+
+        try:
+            entries = await redis.zrange(claimed_key, 0, -1, withscores=True)
+        finally:
+            await redis.delete(claimed_key)
+        return {user_id: int(score) for user_id, score in entries}
+
+    async def flush(self):
+        pending, self._pending = self._pending, {}
+
+        timestamps = pending
+        redis = get_redis_client(async_mode=True)
+        if redis is not None:
+            try:
+                timestamps = await self._take_shared(redis, pending)
+            except Exception as e:
+                log.debug(f'Shared last-active flush failed, writing locally: {e}')
+                timestamps = pending
+
+        if not timestamps:
+            return
+        try:
+            await Users.update_last_active_by_ids(timestamps)
+        except Exception as e:
+            log.warning(f'Failed to write last-active timestamps for {len(timestamps)} user(s): {e}')
+            # Retry on the next flush unless newer activity replaced them.
+            for user_id, timestamp in timestamps.items():
+                self._pending[user_id] = max(timestamp, self._pending.get(user_id, 0))
+
+    async def close(self):
+        """Write what is pending now; called on shutdown."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        await self.flush()
+
+
+LAST_ACTIVE_BUFFER = LastActiveBuffer()
@@ -71,10 +71,12 @@ from open_webui.routers.tasks import (
 from open_webui.socket.main import (
     get_event_call,
     get_event_emitter,
+    get_room_backlog,
 )
 from open_webui.utils.access_control import has_connection_access, has_permission
 from open_webui.utils.access_control.files import get_accessible_folder_files
 from open_webui.utils.chat import generate_chat_completion
+from open_webui.utils.chat_save import MessageWriteBuffer
 from open_webui.utils.code_interpreter import execute_code_jupyter
 from open_webui.utils.context_compaction import compact_messages_for_request
 from open_webui.utils.files import (
@@ -114,6 +116,7 @@ from open_webui.utils.payload import apply_system_prompt_to_body, resolve_system
 from open_webui.utils.plugin import load_function_module_by_id
 from open_webui.utils.response import merge_usage, normalize_usage
 from open_webui.utils.sanitize import sanitize_code
+from open_webui.utils.stream_coalescer import StreamCoalescer
 from open_webui.utils.task import (
     get_task_model_id,
     rag_template,
@@ -3898,6 +3901,14 @@ async def streaming_chat_response_handler(response, ctx):
             def full_output():
                 return prior_output + output if prior_output else output
 
+            # Realtime saves go through a write-behind buffer so streaming
+            # deltas are coalesced into a few writes per response.
+            realtime_save = (
+                MessageWriteBuffer(metadata['chat_id'], metadata['message_id'])
+                if ENABLE_REALTIME_CHAT_SAVE and not metadata.get('chat_id', '').startswith('channel:')
+                else None
+            )
+
             reasoning_tags_param = metadata.get('params', {}).get('reasoning_tags')
             DETECT_REASONING_TAGS = reasoning_tags_param is not False
 
@@ -3955,44 +3966,21 @@ async def streaming_chat_response_handler(response, ctx):
 
                     response_tool_calls = []
 
-                    delta_count = 0
-                    delta_chunk_size = max(
-                        CHAT_RESPONSE_STREAM_DELTA_CHUNK_SIZE,
-                        int(metadata.get('params', {}).get('stream_delta_chunk_size') or 1),
+                    delta_coalescer = StreamCoalescer(
+                        event_emitter,
+                        room=f'user:{metadata["user_id"]}' if metadata.get('user_id') else None,
+                        get_backlog=get_room_backlog,
+                        chunk_size=max(
+                            CHAT_RESPONSE_STREAM_DELTA_CHUNK_SIZE,
+                            int(metadata.get('params', {}).get('stream_delta_chunk_size') or 1),
+                        ),
                     )
-                    last_delta_data = None
-                    last_delta_type = None
 
-                    async def flush_pending_delta_data(threshold: int = 0):
-                        nonlocal delta_count
-                        nonlocal last_delta_data
-                        nonlocal last_delta_type
-
-                        if delta_count >= threshold and last_delta_data:
-                            await event_emitter(
-                                {
-                                    'type': 'chat:completion',
-                                    'data': last_delta_data,
-                                }
-                            )
-                            delta_count = 0
-                            last_delta_data = None
-                            last_delta_type = None
+                    async def flush_pending_delta_data():
+                        await delta_coalescer.flush()
 
                     async def queue_pending_delta_data(delta_data: dict, delta_type: str):
-                        nonlocal delta_count
-                        nonlocal last_delta_data
-                        nonlocal last_delta_type
-
-                        if last_delta_type and last_delta_type != delta_type:
-                            await flush_pending_delta_data()
-
-                        delta_count += 1
-                        last_delta_data = delta_data
-                        last_delta_type = delta_type
-
-                        if delta_count >= delta_chunk_size:
-                            await flush_pending_delta_data(delta_chunk_size)
+                        await delta_coalescer.queue(delta_data, delta_type)
 
                     async for line in response.body_iterator:
                         line = line.decode('utf-8', 'replace') if isinstance(line, bytes) else line
@@ -4012,7 +4000,9 @@ async def streaming_chat_response_handler(response, ctx):
                                 raw_error = raw_obj.get('error') if isinstance(raw_obj, dict) else None
                                 if raw_error:
                                     try:
-                                        Chats.upsert_message_to_chat_by_id_and_message_id(
+                                        if realtime_save:
+                                            await realtime_save.flush()
+                                        await Chats.upsert_message_to_chat_by_id_and_message_id(
                                             metadata['chat_id'],
                                             metadata['message_id'],
                                             {
@@ -4501,30 +4491,23 @@ async def streaming_chat_response_handler(response, ctx):
                                             if end:
                                                 break
 
-                                        if ENABLE_REALTIME_CHAT_SAVE and not metadata.get('chat_id', '').startswith(
-                                            'channel:'
-                                        ):
-                                            # Save message in the database
-                                            await Chats.upsert_message_to_chat_by_id_and_message_id(
-                                                metadata['chat_id'],
-                                                metadata['message_id'],
-                                                {
-                                                    'output': full_output(),
-                                                },
+                                        if realtime_save:
+                                            # Save message in the database (buffered)
+                                            realtime_save.update(
+                                                {'output': full_output()},
+                                                nbytes=len(value.encode('utf-8')),
                                             )
-                                            data = {
-                                                'output': full_output(),
-                                            }
-                                            delta_type = 'content'
-                                        else:
-                                            data = {
-                                                'output': full_output(),
-                                            }
-                                            delta_type = 'content'
+
+                                        data = {
+                                            'output': full_output(),
+                                        }
+                                        delta_type = 'content'
 
                                 if delta:
                                     await queue_pending_delta_data(data, delta_type)
                                 else:
+                                    # A scheduled delta must not arrive after this event.
+                                    await flush_pending_delta_data()
                                     await event_emitter(
                                         {
                                             'type': 'chat:completion',
@@ -5234,17 +5217,14 @@ async def streaming_chat_response_handler(response, ctx):
                                 **({'usage': usage} if usage else {}),
                             },
                         )
-                    elif usage:
-                        await Chats.upsert_message_to_chat_by_id_and_message_id(
-                            metadata['chat_id'],
-                            metadata['message_id'],
-                            {'done': True, 'usage': usage},
-                        )
                     else:
-                        await Chats.upsert_message_to_chat_by_id_and_message_id(
-                            metadata['chat_id'],
-                            metadata['message_id'],
-                            {'done': True},
+                        # Flush the last buffered snapshot together with the final state.
+                        await realtime_save.close(
+                            {
+                                'done': True,
+                                'output': full_output(),
+                                **({'usage': usage} if usage else {}),
+                            }
                         )
 
                 # Send a webhook notification if the user is not active
@@ -5303,17 +5283,20 @@ async def streaming_chat_response_handler(response, ctx):
                                 },
                             )
                         else:
-                            await Chats.upsert_message_to_chat_by_id_and_message_id(
-                                metadata['chat_id'],
-                                metadata['message_id'],
-                                {'done': True},
-                            )
+                            await realtime_save.close({'done': True, 'output': full_output()})
 
                 try:
                     await asyncio.shield(save_cancelled_state())
                 except (asyncio.CancelledError, Exception):
                     pass
                 raise  # re-raise CancelledError for proper propagation
+            finally:
+                # Errors escaping the handler must not drop buffered output.
+                if realtime_save:
+                    try:
+                        await asyncio.shield(realtime_save.close())
+                    except (asyncio.CancelledError, Exception):
+                        pass
 
             if response.background is not None:
                 await response.background()
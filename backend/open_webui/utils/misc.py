@@ -1142,3 +1142,13 @@ def stream_chunks_handler(stream: aiohttp.StreamReader):
             yield buffer + b'\n'
 
     return yield_safe_stream_chunks()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*' or candidate.removeprefix('W/') == etag:
+            return True
+    return False
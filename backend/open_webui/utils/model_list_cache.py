@@ -0,0 +1,201 @@
+"""Cached ``/api/models`` responses.
+
+Building the model list aggregates every connection, loads all custom models
+and functions, and then filters the result through the user's access grants.
+``ModelListCache`` keeps two levels:
+
+    - the aggregated, unfiltered list, shared by all users and rebuilt at most
+      every ``MODEL_LIST_CACHE_TTL`` seconds; skipped while any connection
+      returns a different list per user (see ``is_user_independent``)
+    - each user's filtered response, serialized once with an ETag, keyed by the
+      registry version, the user's role and a hash of the user's group ids, and
+      checked against the aggregated list again once it is older than
+      ``MODEL_LIST_CACHE_TTL``
+
+The registry version is bumped, here and on every other worker, whenever a
+model, function or model access grant is written or a rebuilt list differs
+from the previous one.  A request whose ``If-None-Match`` matches the cached
+ETag gets ``304 Not Modified`` without any recomputation.
+
+Configurable via environment variables:
+    - MODEL_LIST_CACHE_TTL (default 10) — seconds the aggregated list is
+      reused; 0 disables both levels
+    - MODEL_LIST_CACHE_SIZE (default 10000) — maximum cached user responses
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from open_webui.env import MODEL_LIST_CACHE_SIZE, MODEL_LIST_CACHE_TTL, REDIS_KEY_PREFIX
+from open_webui.utils.misc import etag_matches
+from open_webui.utils.redis import get_redis_client, publish, subscribe
+from starlette.responses import Response
+
+log = logging.getLogger(__name__)
+
+REDIS_MODEL_LIST_INVALIDATE_CHANNEL = f'{REDIS_KEY_PREFIX}:models:invalidate'
+
+
+class ModelListEntry:
+    """One user's serialized response; immutable once built."""
+
+    __slots__ = ('key', 'fingerprint', 'expires_at', 'body', 'etag')
+
+    def __init__(self, key: tuple, content: Any, fingerprint: Optional[str] = None, expires_at: float = 0.0):
+        self.key = key
+        # fingerprint of the aggregated list the response was filtered from
+        self.fingerprint = fingerprint
+        self.expires_at = expires_at
+        self.body = JSONResponse(jsonable_encoder(content)).body
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+
+    def response(self, request: Request) -> Response:
+        # no-cache: browsers may keep the body but must revalidate every time.
+        headers = {'ETag': self.etag, 'Cache-Control': 'private, no-cache'}
+        if etag_matches(request.headers.get('if-none-match'), self.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.body, media_type='application/json', headers=headers)
+
+
+class ModelListCache:
+    def __init__(self, ttl: float = MODEL_LIST_CACHE_TTL, max_size: int = MODEL_LIST_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.version = 0
+
+        # (key, expires_at, models) for the shared, unfiltered list
+        self._models: Optional[tuple[Hashable, float, list[dict]]] = None
+        self._fingerprint: Optional[str] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+        # user id -> response
+        self._entries: OrderedDict[str, ModelListEntry] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_size > 0
+
+    def key(self, *parts: Hashable) -> tuple:
+        """A cache key that stops matching once the registry version changes."""
+        return (self.version, *parts)
+
+    def _fresh_models(self, key: tuple) -> Optional[list[dict]]:
+        if self._models is None:
+            return None
+        cached_key, expires_at, models = self._models
+        if cached_key != key or expires_at < time.monotonic():
+            return None
+        return models
+
+    async def get_models(
+        self,
+        load: Callable[[], Awaitable[list[dict]]],
+        *parts: Hashable,
+        refresh: bool = False,
+    ) -> list[dict]:
+        """The shared list; concurrent misses wait for a single ``load``.
+
+        ``parts`` are whatever else the list depends on (e.g. the config version).
+        """
+        if not self.enabled:
+            return await load()
+
+        if not refresh:
+            models = self._fresh_models(self.key(*parts))
+            if models is not None:
+                return models
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not refresh:
+                models = self._fresh_models(self.key(*parts))
+                if models is not None:
+                    return models
+
+            version = self.version
+            models = await load()
+            if version != self.version:
+                # Invalidated while loading; the result may already be stale.
+                return models
+
+            fingerprint = hashlib.sha256(json.dumps(models, sort_keys=True, default=str).encode()).hexdigest()
+            if self._fingerprint is not None and fingerprint != self._fingerprint:
+                # The upstream list changed: every cached response is outdated.
+                await self.invalidate()
+            self._fingerprint = fingerprint
+            self._models = (self.key(*parts), time.monotonic() + self.ttl, models)
+            return models
+
+    def get(self, user_id: str, key: tuple) -> Optional[ModelListEntry]:
+        """The user's response, unless it is older than the TTL; see ``revalidate``."""
+        entry = self._entries.get(user_id)
+        if entry is None or entry.key != key or entry.expires_at < time.monotonic():
+            return None
+        self._entries.move_to_end(user_id)
+        return entry
+
+    def revalidate(self, user_id: str, key: tuple) -> Optional[ModelListEntry]:
+        """
+        The user's expired response if it was filtered from the current
+        aggregated list (call after ``get_models``), renewed for another TTL.
+        """
+        entry = self._entries.get(user_id)
+        if entry is None or entry.key != key or self._fingerprint is None or entry.fingerprint != self._fingerprint:
+            return None
+        entry.expires_at = time.monotonic() + self.ttl
+        self._entries.move_to_end(user_id)
+        return entry
+
+    def set(self, user_id: str, key: tuple, content: Any, shared: bool = True) -> ModelListEntry:
+        """Cache the user's response; ``shared=False`` if it was not filtered from ``get_models``."""
+        entry = ModelListEntry(key, content, self._fingerprint if shared else None, time.monotonic() + self.ttl)
+        if not self.enabled:
+            return entry
+
+        self._entries[user_id] = entry
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return entry
+
+    def reset(self):
+        self.version += 1
+        self._models = None
+        self._entries.clear()
+
+    async def invalidate(self):
+        """Drop every cached list here and on every other worker."""
+        self.reset()
+        if not self.enabled:
+            return
+
+        redis = get_redis_client(async_mode=True)
+        if redis is None:
+            return
+        try:
+            await publish(redis, REDIS_MODEL_LIST_INVALIDATE_CHANNEL, str(self.version))
+        except Exception as e:
+            log.warning(f'Failed to publish model list invalidation: {e}')
+
+
+MODEL_LIST_CACHE = ModelListCache()
+
+
+async def redis_model_list_cache_listener(app):
+    """Drop model lists invalidated by other workers."""
+    if MODEL_LIST_CACHE.enabled:
+        await subscribe(
+            app.state.redis,
+            REDIS_MODEL_LIST_INVALIDATE_CHANNEL,
+            lambda _: MODEL_LIST_CACHE.reset(),
+            MODEL_LIST_CACHE.reset,
+        )
@@ -1,5 +1,7 @@
 import asyncio
 import copy
+import hashlib
+import json
 import logging
 import sys
 
@@ -12,18 +14,21 @@ from open_webui.config import (
 from open_webui.env import BYPASS_MODEL_ACCESS_CONTROL, GLOBAL_LOG_LEVEL
 from open_webui.functions import get_function_models
 from open_webui.models.access_grants import AccessGrants
-from open_webui.models.config import Config
+from open_webui.models.config import CONFIG_CACHE, Config
 from open_webui.models.functions import Functions
 from open_webui.models.groups import Groups
 from open_webui.models.models import Models
 from open_webui.models.users import UserModel
 from open_webui.routers import ollama, openai
-from open_webui.socket.utils import RedisDict
+from open_webui.socket.utils import CachedRedisDict, RedisDict
 from open_webui.utils.access_control import has_access, has_base_model_access
+from open_webui.utils.model_list_cache import MODEL_LIST_CACHE
+from open_webui.utils.upstream_models import is_user_independent
 from open_webui.utils.plugin import (
     get_functions_cache,
     get_function_module_from_cache,
 )
+from starlette.responses import Response
 
 logging.basicConfig(stream=sys.stdout, level=GLOBAL_LOG_LEVEL)
 log = logging.getLogger(__name__)
@@ -371,7 +376,7 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
     log.debug(f'get_all_models() returned {len(models)} models')
 
     models_dict = {model['id']: model for model in models}
-    if isinstance(request.app.state.MODELS, RedisDict):
+    if isinstance(request.app.state.MODELS, (RedisDict, CachedRedisDict)):
         try:
             request.app.state.MODELS.set(models_dict)
         except Exception as e:
@@ -470,3 +475,94 @@ async def get_filtered_models(models, user, db=None):
         return filtered_models
     else:
         return models
+
+
+async def get_model_list(request: Request, refresh: bool = False, user: UserModel = None) -> list[dict]:
+    """The ``/api/models`` list before access filtering, in display order."""
+    all_models = await get_all_models(request, refresh=refresh, user=user)
+
+    models = []
+    for model in all_models:
+        # Filter out filter pipelines
+        if 'pipeline' in model and model['pipeline'].get('type', None) == 'filter':
+            continue
+
+        # Remove profile image URL to reduce payload size
+        if model.get('info', {}).get('meta', {}).get('profile_image_url'):
+            model['info']['meta'].pop('profile_image_url', None)
+
+        try:
+            model_tags = [tag.get('name') for tag in model.get('info', {}).get('meta', {}).get('tags', [])]
+            tags = [tag.get('name') for tag in model.get('tags', [])]
+
+            # Deduplicate in a stable order, so the response (and its ETag) is the same on every worker
+            tags = list(dict.fromkeys(model_tags + tags))
+            model['tags'] = [{'name': tag} for tag in tags]
+        except Exception as e:
+            log.debug(f'Error processing model tags: {e}')
+            model['tags'] = []
+            pass
+
+        models.append(model)
+
+    # Chat requests resolve models by ID from request.app.state.MODELS, where
+    # duplicate IDs collapse to the last model. Return the same effective list.
+    models = list({model['id']: model for model in models}.values())
+
+    model_order_list = await Config.get('ui.model_order_list')
+    if model_order_list:
+        model_order_dict = {model_id: i for i, model_id in enumerate(model_order_list)}
+        # Sort models by order list priority, with fallback for those not in the list
+        models.sort(
+            key=lambda model: (
+                model_order_dict.get(model.get('id', ''), float('inf')),
+                (model.get('name', '') or ''),
+            )
+        )
+
+    return models
+
+
+async def has_user_dependent_connections() -> bool:
+    """Whether any enabled connection returns a different model list per user; see ``is_user_independent``."""
+    enable_openai_api, api_base_urls, _, api_configs = await openai.get_openai_runtime_config()
+    if enable_openai_api:
+        for idx, url in enumerate(api_base_urls):
+            api_config = api_configs.get(str(idx), api_configs.get(url, {}))
+            if api_config.get('enable', True) and not is_user_independent(api_config):
+                return True
+
+    enable_ollama_api, base_urls, _ = await ollama.get_ollama_runtime_config()
+    return bool(enable_ollama_api and base_urls and not is_user_independent())
+
+
+async def get_model_list_response(request: Request, refresh: bool = False, user: UserModel = None) -> Response:
+    """``/api/models`` for ``user``, served from ``MODEL_LIST_CACHE`` with an ETag."""
+    user_group_ids = sorted(group.id for group in await Groups.get_groups_by_member_id(user.id))
+    groups_hash = hashlib.sha256('\n'.join(user_group_ids).encode()).hexdigest()
+
+    # Entries are still stored per user: ownership and user-level grants make every list user-specific.
+    key = MODEL_LIST_CACHE.key(CONFIG_CACHE.version, user.role, groups_hash)
+    entry = None if refresh else MODEL_LIST_CACHE.get(user.id, key)
+    # The shared list is built from the first caller's credentials; only use it if every user gets the same one.
+    shared = not await has_user_dependent_connections()
+    if entry is None:
+        if shared:
+            models = await MODEL_LIST_CACHE.get_models(
+                lambda: get_model_list(request, refresh=refresh, user=user),
+                CONFIG_CACHE.version,
+                refresh=refresh,
+            )
+            # An expired response stays valid while the upstream list is unchanged.
+            entry = None if refresh else MODEL_LIST_CACHE.revalidate(user.id, key)
+        else:
+            models = await get_model_list(request, refresh=refresh, user=user)
+    if entry is None:
+        models = await get_filtered_models(models, user)
+
+        log.debug(
+            f'/api/models returned filtered models accessible to the user: {json.dumps([model.get("id") for model in models])}'
+        )
+        entry = MODEL_LIST_CACHE.set(user.id, key, {'data': models}, shared=shared)
+
+    return entry.response(request)
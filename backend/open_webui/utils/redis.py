@@ -104,6 +104,54 @@ def get_redis_client(async_mode: bool = False) -> Any | None:
         return None
 
 
+async def publish(redis: Any, channel: str, message: str) -> None:
+    """PUBLISH ``message`` on ``channel``, on standalone, Sentinel and Cluster clients."""
+    # RedisCluster doesn't expose publish() directly, but the
+    # PUBLISH command broadcasts across all cluster nodes server-side.
+    if hasattr(redis, 'nodes_manager'):
+        await redis.execute_command('PUBLISH', channel, message)
+    else:
+        await redis.publish(channel, message)
+
+
+async def subscribe(redis: Any, channel: str, on_message, on_reset=None, retry_delay: float = 1.0) -> None:
+    """Call ``on_message(data)`` for every message on ``channel``, until cancelled.
+
+    Resubscribes after connection errors.  ``on_reset()`` is called on every
+    (re)subscribe, since messages published while disconnected are lost;
+    invalidation listeners use it to drop everything they cache.  Both
+    callbacks may be sync or async.
+    """
+
+    async def call(callback, *args):
+        result = callback(*args)
+        if inspect.isawaitable(result):
+            await result
+
+    while True:
+        try:
+            pubsub = redis.pubsub()
+            await pubsub.subscribe(channel)
+            if on_reset is not None:
+                await call(on_reset)
+
+            async for message in pubsub.listen():
+                if message['type'] != 'message':
+                    continue
+                data = message['data']
+                await call(on_message, data.decode() if isinstance(data, bytes) else data)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.warning(f'Redis subscription to {channel} failed, resubscribing: {e}')
+            if on_reset is not None:
+                try:
+                    await call(on_reset)
+                except Exception:
+                    pass
+            await asyncio.sleep(retry_delay)
+
+
 # ---------------------------------------------------------------------------
 # Sentinel proxy with automatic failover retry
 # ---------------------------------------------------------------------------
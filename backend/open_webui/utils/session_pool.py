@@ -33,6 +33,7 @@ from open_webui.env import (
     AIOHTTP_POOL_CONNECTIONS_PER_HOST,
     AIOHTTP_POOL_DNS_TTL,
 )
+from open_webui.utils.connection_load import CONNECTION_LOAD
 
 log = logging.getLogger(__name__)
 
@@ -91,6 +92,8 @@ async def cleanup_response(
     one-off session, pass it here to close it after the response.
     """
     if response:
+        # Stop counting the request towards its connection's load (see utils/connection_load.py).
+        CONNECTION_LOAD.release_response(response)
         if not response.closed:
             # aiohttp 3.9+ made ClientResponse.close() synchronous (returns None).
             # Older versions returned a coroutine.  Handle both gracefully.
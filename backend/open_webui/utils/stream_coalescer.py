@@ -0,0 +1,143 @@
+"""Slow-consumer-aware coalescing of ``chat:completion`` stream emits.
+
+Every ``chat:completion`` delta event carries the full state of the message
+being generated (``{'output': ...}``), so intermediate events can be dropped
+without losing anything.  Deltas used to be emitted every
+``CHAT_RESPONSE_STREAM_DELTA_CHUNK_SIZE`` tokens however fast the client read
+them; a client on a slow link built up a socket backlog and fell further and
+further behind.  ``StreamCoalescer`` keeps only the latest pending event and
+emits it:
+
+    - at most once per flush interval (trailing emits are scheduled, so the
+      latest state always goes out), and once
+      ``CHAT_RESPONSE_STREAM_DELTA_CHUNK_SIZE`` deltas have been queued
+    - immediately when the kind of delta changes (content / tool call) or
+      on ``flush()``
+
+The interval is kept per user room, shared by that user's concurrent
+streams: it doubles (up to ``CHAT_RESPONSE_STREAM_MAX_FLUSH_INTERVAL``)
+while a socket in the room has packets waiting to be sent or an emit takes
+longer than the interval, and shrinks back once the client keeps up.  A
+client that falls behind therefore receives fewer, newer snapshots.  The
+send backlog is only visible for sockets connected to this worker; emit
+duration covers the others.
+
+Configurable via environment variables:
+    - CHAT_RESPONSE_STREAM_FLUSH_INTERVAL (default 0.05) — seconds between
+      emits while the client keeps up; 0 emits by chunk size only
+    - CHAT_RESPONSE_STREAM_MAX_FLUSH_INTERVAL (default 1) — longest interval
+      for a slow client
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from open_webui.env import CHAT_RESPONSE_STREAM_FLUSH_INTERVAL, CHAT_RESPONSE_STREAM_MAX_FLUSH_INTERVAL
+
+log = logging.getLogger(__name__)
+
+# Packets queued for a socket beyond which its client counts as behind.
+MAX_BACKLOG = 2
+# Factor the interval shrinks by per emit once the client keeps up.
+RECOVERY = 0.75
+
+# room -> current flush interval, for rooms slowed down above the base interval
+_room_intervals: dict[str, float] = {}
+
+
+class StreamCoalescer:
+    def __init__(
+        self,
+        emit: Callable[[dict], Awaitable[Any]],
+        room: Optional[str] = None,
+        get_backlog: Optional[Callable[[str], int]] = None,
+        chunk_size: int = 1,
+        interval: float = CHAT_RESPONSE_STREAM_FLUSH_INTERVAL,
+        max_interval: float = CHAT_RESPONSE_STREAM_MAX_FLUSH_INTERVAL,
+    ):
+        self.emit = emit
+        self.room = room
+        self.get_backlog = get_backlog
+        self.chunk_size = max(chunk_size, 1)
+        self.interval = max(interval, 0)
+        self.max_interval = max(max_interval, self.interval)
+
+        self._data: Optional[dict] = None
+        self._kind: Optional[str] = None
+        self._count = 0
+        self._flushed_at = 0.0
+        self._timer: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    def get_interval(self) -> float:
+        if self.room is None:
+            return self.interval
+        return _room_intervals.get(self.room, self.interval)
+
+    def _adapt(self, emit_seconds: float):
+        if self.room is None or self.interval <= 0:
+            return
+
+        backlog = 0
+        if self.get_backlog is not None:
+            try:
+                backlog = self.get_backlog(self.room)
+            except Exception as e:
+                log.debug(f'Failed to get socket backlog for {self.room}: {e}')
+
+        interval = self.get_interval()
+        if backlog > MAX_BACKLOG or emit_seconds > interval:
+            _room_intervals[self.room] = min(interval * 2, self.max_interval)
+        elif interval > self.interval:
+            interval *= RECOVERY
+            if interval > self.interval:
+                _room_intervals[self.room] = interval
+            else:
+                _room_intervals.pop(self.room, None)
+
+    async def queue(self, data: dict, kind: str):
+        """Replace the pending event with ``data``; emitted once due."""
+        if self._kind is not None and self._kind != kind:
+            await self.flush()
+
+        self._data = data
+        self._kind = kind
+        self._count += 1
+        if self._count < self.chunk_size:
+            return
+
+        wait = self._flushed_at + self.get_interval() - time.monotonic()
+        if wait <= 0:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later(wait))
+
+    async def _flush_later(self, delay: float):
+        await asyncio.sleep(delay)
+        # From here on the flush must not be cancelled by a concurrent one.
+        self._timer = None
+        try:
+            await self.flush()
+        except Exception as e:
+            log.debug(f'Failed to emit coalesced chat:completion: {e}')
+
+    async def flush(self):
+        """Emit the pending event, if any, now."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        async with self._lock:
+            data = self._data
+            self._data = None
+            self._kind = None
+            self._count = 0
+            if not data:
+                return
+
+            start = time.monotonic()
+            await self.emit({'type': 'chat:completion', 'data': data})
+            self._flushed_at = time.monotonic()
+            self._adapt(self._flushed_at - start)
@@ -8,6 +8,12 @@ Metrics collected:
 
 * http.server.requests (counter)
 * http.server.duration (histogram, milliseconds)
+* webui.rag.embedding_cache.lookups (observable counter, by ``result``)
+* webui.webhooks.queue.depth (observable gauge, by ``status``)
+* webui.storage.cache.lookups (observable counter, by ``result``)
+* webui.storage.cache.evictions (observable counter)
+* webui.storage.cache.size (observable gauge, bytes)
+* webui.web_fetch.cache.lookups (observable counter, by ``result``)
 
 Attributes used: http.method, http.route, http.status_code
 
@@ -34,6 +40,10 @@ from open_webui.env import (
     OTEL_SERVICE_NAME,
 )
 from open_webui.models.users import User
+from open_webui.models.webhook_deliveries import FAILED, PENDING, WebhookDelivery
+from open_webui.retrieval.embedding_cache import EMBEDDING_CACHE
+from open_webui.retrieval.web.cache import WEB_FETCH_CACHE
+from open_webui.storage.cache import STORAGE_CACHE
 from opentelemetry import metrics
 from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import (
     OTLPMetricExporter,
@@ -91,6 +101,21 @@ def _count_users_active_today(db_engine: Engine) -> Optional[int]:
         ).scalar()
 
 
+def _count_webhook_deliveries(db_engine: Engine) -> dict[str, int]:
+    """Return queued webhook deliveries: ``due`` now, ``pending`` retries and leases, ``failed`` (sync)."""
+    now = int(time.time())
+    with Session(db_engine) as session:
+        counts = dict(
+            session.execute(select(WebhookDelivery.status, func.count()).group_by(WebhookDelivery.status)).all()
+        )
+        due = session.execute(
+            select(func.count())
+            .select_from(WebhookDelivery)
+            .filter(WebhookDelivery.status == PENDING, WebhookDelivery.next_attempt_at <= now)
+        ).scalar()
+    return {'due': due or 0, 'pending': counts.get(PENDING, 0) - (due or 0), 'failed': counts.get(FAILED, 0)}
+
+
 def _build_meter_provider(resource: Resource) -> MeterProvider:
     """Return a configured MeterProvider."""
     headers = []
@@ -138,6 +163,28 @@ def _build_meter_provider(resource: Resource) -> MeterProvider:
         View(
             instrument_name='webui.users.active.today',
         ),
+        View(
+            instrument_name='webui.rag.embedding_cache.lookups',
+            attribute_keys=['result'],
+        ),
+        View(
+            instrument_name='webui.webhooks.queue.depth',
+            attribute_keys=['status'],
+        ),
+        View(
+            instrument_name='webui.storage.cache.lookups',
+            attribute_keys=['result'],
+        ),
+        View(
+            instrument_name='webui.storage.cache.evictions',
+        ),
+        View(
+            instrument_name='webui.storage.cache.size',
+        ),
+        View(
+            instrument_name='webui.web_fetch.cache.lookups',
+            attribute_keys=['result'],
+        ),
     ]
 
     provider = MeterProvider(
@@ -222,6 +269,80 @@ def setup_metrics(app: FastAPI, resource: Resource, db_engine: Engine) -> None:
         callbacks=[observe_users_active_today],
     )
 
+    def observe_embedding_cache_lookups(
+        options: metrics.CallbackOptions,
+    ) -> Iterable[metrics.Observation]:
+        stats = EMBEDDING_CACHE.stats()
+        yield metrics.Observation(value=stats['hits'], attributes={'result': 'hit'})
+        yield metrics.Observation(value=stats['redis_hits'], attributes={'result': 'redis_hit'})
+        yield metrics.Observation(value=stats['misses'], attributes={'result': 'miss'})
+
+    meter.create_observable_counter(
+        name='webui.rag.embedding_cache.lookups',
+        description='Query embedding cache lookups by result',
+        unit='1',
+        callbacks=[observe_embedding_cache_lookups],
+    )
+
+    def observe_webhook_queue_depth(
+        options: metrics.CallbackOptions,
+    ) -> Iterable[metrics.Observation]:
+        try:
+            for status, value in _count_webhook_deliveries(db_engine).items():
+                yield metrics.Observation(value=value, attributes={'status': status})
+        except Exception:
+            logger.debug('Failed to observe webhook queue depth', exc_info=True)
+
+    meter.create_observable_gauge(
+        name='webui.webhooks.queue.depth',
+        description='Queued event webhook deliveries by status',
+        unit='1',
+        callbacks=[observe_webhook_queue_depth],
+    )
+
+    def observe_storage_cache_lookups(
+        options: metrics.CallbackOptions,
+    ) -> Iterable[metrics.Observation]:
+        stats = STORAGE_CACHE.stats()
+        yield metrics.Observation(value=stats['hits'], attributes={'result': 'hit'})
+        yield metrics.Observation(value=stats['revalidated'], attributes={'result': 'revalidated'})
+        yield metrics.Observation(value=stats['misses'], attributes={'result': 'miss'})
+
+    meter.create_observable_counter(
+        name='webui.storage.cache.lookups',
+        description='Local storage cache lookups by result',
+        unit='1',
+        callbacks=[observe_storage_cache_lookups],
+    )
+
+    meter.create_observable_counter(
+        name='webui.storage.cache.evictions',
+        description='Files evicted from the local storage cache',
+        unit='1',
+        callbacks=[lambda options: [metrics.Observation(value=STORAGE_CACHE.stats()['evictions'])]],
+    )
+
+    meter.create_observable_gauge(
+        name='webui.storage.cache.size',
+        description='Size of the files in the local storage cache',
+        unit='By',
+        callbacks=[lambda options: [metrics.Observation(value=STORAGE_CACHE.stats()['size'])]],
+    )
+
+    def observe_web_fetch_cache_lookups(
+        options: metrics.CallbackOptions,
+    ) -> Iterable[metrics.Observation]:
+        stats = WEB_FETCH_CACHE.stats()
+        yield metrics.Observation(value=stats['hits'], attributes={'result': 'hit'})
+        yield metrics.Observation(value=stats['misses'], attributes={'result': 'miss'})
+
+    meter.create_observable_counter(
+        name='webui.web_fetch.cache.lookups',
+        description='Web page cache lookups by result',
+        unit='1',
+        callbacks=[observe_web_fetch_cache_lookups],
+    )
+
     # FastAPI middleware
     @app.middleware('http')
     async def _metrics_middleware(request: Request, call_next):
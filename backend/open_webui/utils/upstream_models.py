@@ -0,0 +1,253 @@
+"""Stale-while-revalidate model lists for OpenAI and Ollama connections.
+
+Aggregating models used to fetch every configured connection inline whenever
+the ``aiocache`` TTL had expired, so an unlucky request waited for the slowest
+(or a timing-out) connection.  ``UpstreamModelLists`` keeps the last response
+of each connection that was fetched successfully and serves it immediately:
+
+    - a connection seen for the first time is fetched inline
+    - an entry older than ``MODELS_REFRESH_INTERVAL`` is refreshed in the
+      background, each connection on its own, while the old list is served
+    - a failed refresh keeps serving the last known-good list
+    - ``refresh_models_periodically`` refreshes every connection on a schedule
+      and rebuilds the model registry when any list changed
+
+Connections whose responses depend on the requesting user (forwarded user
+headers, session or OAuth credentials, templated custom headers) are always
+fetched inline.  ``with UPSTREAM_MODELS.forced():`` fetches inline for explicit
+refreshes.  Per-connection status is exposed to admins through the
+``/connections/status`` routes of the OpenAI and Ollama routers.
+
+Configurable via environment variables:
+    - MODELS_REFRESH_INTERVAL (default 60) — seconds between refreshes of a
+      connection's list; 0 fetches inline on every aggregation
+"""
+
+import asyncio
+import contextlib
+import copy
+import hashlib
+import json
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Optional
+
+from open_webui.env import ENABLE_FORWARD_USER_INFO_HEADERS, MODELS_REFRESH_INTERVAL
+from open_webui.utils.model_list_cache import MODEL_LIST_CACHE
+
+log = logging.getLogger(__name__)
+
+# Auth types that send the requesting user's own credentials.
+USER_AUTH_TYPES = {'session', 'system_oauth'}
+
+_forced: ContextVar[bool] = ContextVar('upstream_models_forced', default=False)
+
+
+def _fingerprint(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def is_response_ok(response: Any) -> bool:
+    return bool(response) and not (isinstance(response, dict) and 'error' in response)
+
+
+def is_user_independent(config: Optional[dict] = None) -> bool:
+    """Whether a connection returns the same model list for every user."""
+    if ENABLE_FORWARD_USER_INFO_HEADERS:
+        return False
+    config = config or {}
+    if config.get('auth_type') in USER_AUTH_TYPES:
+        return False
+    headers = config.get('headers')
+    if isinstance(headers, dict) and any('{{' in str(value) for value in headers.values()):
+        return False
+    return True
+
+
+class ConnectionModels:
+    __slots__ = (
+        'fetch',
+        'response',
+        'fingerprint',
+        'refreshed_at',
+        'used_at',
+        'task',
+    )
+
+    def __init__(self, fetch: Callable[[], Awaitable[Any]]):
+        self.fetch = fetch
+        # Last known-good response, never handed out directly: callers rewrite it.
+        self.response: Any = None
+        self.fingerprint: Optional[str] = None
+        # monotonic time of the last attempt, successful or not
+        self.refreshed_at = 0.0
+        self.used_at = 0.0
+        self.task: Optional[asyncio.Task] = None
+
+
+class UpstreamModelLists:
+    def __init__(self, interval: float = MODELS_REFRESH_INTERVAL):
+        self.interval = interval
+
+        # (provider, idx, url, identity digest) -> entry
+        self._entries: dict[tuple, ConnectionModels] = {}
+        # (provider, idx, url) -> status shown to admins
+        self._status: dict[tuple, dict] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0
+
+    @contextlib.contextmanager
+    def forced(self):
+        """Fetch inline within this block, e.g. for ``?refresh=true``."""
+        token = _forced.set(True)
+        try:
+            yield
+        finally:
+            _forced.reset(token)
+
+    def _record(self, provider: str, idx: int, url: str, response: Any, shared: bool):
+        status = self._status.setdefault(
+            (provider, idx, url),
+            {'last_success_at': None, 'last_failure_at': None, 'last_error': None},
+        )
+        now = int(time.time())
+        status['last_attempt_at'] = now
+        status['shared'] = shared
+        if is_response_ok(response):
+            status['last_success_at'] = now
+            status['last_error'] = None
+        else:
+            status['last_failure_at'] = now
+            error = response.get('error') if isinstance(response, dict) else None
+            status['last_error'] = str(error) if error else 'No response'
+
+    def is_failing(self, provider: str, idx: int, url: str) -> bool:
+        """Whether the last attempt to reach the connection failed."""
+        status = self._status.get((provider, idx, url))
+        return status is not None and status.get('last_error') is not None
+
+    def get_status(self, provider: str, urls: list[str]) -> list[dict]:
+        statuses = []
+        for idx, url in enumerate(urls):
+            status = self._status.get((provider, idx, url), {})
+            statuses.append(
+                {
+                    'idx': idx,
+                    'url': url,
+                    'last_attempt_at': status.get('last_attempt_at'),
+                    'last_success_at': status.get('last_success_at'),
+                    'last_failure_at': status.get('last_failure_at'),
+                    'last_error': status.get('last_error'),
+                    'shared': status.get('shared'),
+                }
+            )
+        return statuses
+
+    async def _refresh(self, key: tuple, entry: ConnectionModels) -> bool:
+        """Fetch one connection; returns whether its list changed."""
+        provider, idx, url, _ = key
+        entry.refreshed_at = time.monotonic()
+        try:
+            response = await entry.fetch()
+        except Exception as e:
+            log.warning(f'Failed to refresh models from {url}: {e}')
+            response = {'error': str(e)}
+        self._record(provider, idx, url, response, shared=True)
+
+        if not is_response_ok(response):
+            return False
+        fingerprint = _fingerprint(response)
+        changed = fingerprint != entry.fingerprint
+        entry.response = response
+        entry.fingerprint = fingerprint
+        return changed
+
+    def _refresh_in_background(self, key: tuple, entry: ConnectionModels) -> asyncio.Task:
+        if entry.task is None or entry.task.done():
+            entry.task = asyncio.create_task(self._refresh(key, entry))
+        return entry.task
+
+    async def fetch(
+        self,
+        provider: str,
+        idx: int,
+        url: str,
+        fetch: Callable[[], Awaitable[Any]],
+        identity: Any = None,
+        shared: bool = True,
+    ) -> Any:
+        """The connection's model list response, served from the last known-good list when possible.
+
+        ``identity`` is whatever else the response depends on (API key, connection
+        config); a change starts a new entry.
+        """
+        if not (self.enabled and shared) or _forced.get():
+            response = await fetch()
+            self._record(provider, idx, url, response, shared=shared)
+            if self.enabled and shared and is_response_ok(response):
+                # An explicit refresh also updates what later requests are served.
+                key = (provider, idx, url, _fingerprint(identity))
+                entry = self._entries.setdefault(key, ConnectionModels(fetch))
+                entry.fetch, entry.response, entry.fingerprint = fetch, response, _fingerprint(response)
+                entry.refreshed_at = entry.used_at = time.monotonic()
+            return response
+
+        key = (provider, idx, url, _fingerprint(identity))
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = ConnectionModels(fetch)
+
+        # Keep the newest closure: it carries the current request and credentials.
+        entry.fetch = fetch
+        entry.used_at = time.monotonic()
+
+        if entry.response is None:
+            # Nothing to serve yet; concurrent callers share one request.
+            await self._refresh_in_background(key, entry)
+            if entry.response is None:
+                return None
+        elif time.monotonic() - entry.refreshed_at >= self.interval:
+            self._refresh_in_background(key, entry)
+
+        return copy.deepcopy(entry.response)
+
+    async def refresh_all(self) -> bool:
+        """Refresh every connection in use, each independently; returns whether any list changed."""
+        now = time.monotonic()
+        # Entries the aggregation stopped asking for belong to removed or reconfigured connections.
+        for key in [key for key, entry in self._entries.items() if now - entry.used_at > 3 * self.interval]:
+            self._entries.pop(key)
+
+        results = await asyncio.gather(
+            *(self._refresh_in_background(key, entry) for key, entry in list(self._entries.items())),
+            return_exceptions=True,
+        )
+        return any(result is True for result in results)
+
+
+UPSTREAM_MODELS = UpstreamModelLists()
+
+
+async def refresh_models_periodically(request):
+    """Keep connection model lists and the model registry warm.
+
+    ``request`` is a stand-in request bound to the app, as used at startup.
+    """
+    from open_webui.utils.models import get_all_models
+
+    if not UPSTREAM_MODELS.enabled:
+        return
+
+    while True:
+        await asyncio.sleep(UPSTREAM_MODELS.interval)
+        try:
+            if await UPSTREAM_MODELS.refresh_all():
+                await get_all_models(request, refresh=True)
+                await MODEL_LIST_CACHE.invalidate()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.warning(f'Background model refresh failed: {e}')
@@ -0,0 +1,169 @@
+"""Short-lived per-user caches.
+
+``get_current_user`` runs on every request and used to load the user row
+each time; access-control checks load the user's groups just as often.
+``UserCache`` keeps values by user id for a few seconds.  Every write that
+affects an entry evicts it locally and publishes the ids (or ``*`` for
+all) on a Redis channel so other workers evict it too; the TTL bounds staleness
+if an invalidation is missed (e.g. while Redis reconnects).
+
+Two caches are kept:
+    - ``USER_CACHE`` — ``UserModel`` by id, invalidated by ``UsersTable`` writes
+    - ``USER_GROUPS_CACHE`` — the user's ``GroupModel`` list, invalidated by
+      ``GroupTable`` writes
+
+Configurable via environment variables:
+    - USER_CACHE_TTL (default 10) — seconds a user stays valid; 0 disables
+    - USER_CACHE_SIZE (default 10000) — maximum entries per cache
+    - USER_GROUPS_CACHE_TTL (default 60) — seconds a group list stays valid;
+      0 disables
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+from open_webui.env import REDIS_KEY_PREFIX, USER_CACHE_SIZE, USER_CACHE_TTL, USER_GROUPS_CACHE_TTL
+from open_webui.utils.redis import get_redis_client, publish, subscribe
+
+log = logging.getLogger(__name__)
+
+REDIS_USER_INVALIDATE_CHANNEL = f'{REDIS_KEY_PREFIX}:users:invalidate'
+REDIS_USER_GROUPS_INVALIDATE_CHANNEL = f'{REDIS_KEY_PREFIX}:users:groups:invalidate'
+
+INVALIDATE_ALL = '*'
+
+
+def _copy_model(value: Any) -> Any:
+    return value.model_copy(deep=True)
+
+
+def _copy_models(values: list) -> list:
+    return [value.model_copy(deep=True) for value in values]
+
+
+class UserCache:
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        channel: str = REDIS_USER_INVALIDATE_CHANNEL,
+        copy: Callable[[Any], Any] = _copy_model,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.channel = channel
+        # Callers may modify what they get; never hand out the cached value.
+        self.copy = copy
+
+        # id -> (expires_at, value)
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        # Bumped on every eviction, so a load that raced an update is not cached.
+        self._generation = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_size > 0
+
+    def get(self, id: str) -> Optional[Any]:
+        entry = self._entries.get(id)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[id]
+            return None
+        self._entries.move_to_end(id)
+        return self.copy(value)
+
+    def set(self, id: str, value: Any, generation: int):
+        if generation != self._generation:
+            return
+        self._entries[id] = (time.monotonic() + self.ttl, self.copy(value))
+        self._entries.move_to_end(id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get_or_load(self, id: str, load: Callable[[str], Awaitable[Optional[Any]]]) -> Optional[Any]:
+        if not self.enabled:
+            return await load(id)
+
+        value = self.get(id)
+        if value is not None:
+            return value
+
+        generation = self._generation
+        value = await load(id)
+        if value is not None:
+            self.set(id, value, generation)
+        return value
+
+    def evict(self, id: str):
+        self._generation += 1
+        self._entries.pop(id, None)
+
+    def clear(self):
+        self._generation += 1
+        self._entries.clear()
+
+    async def _publish(self, message: str):
+        if not self.enabled:
+            return
+
+        redis = get_redis_client(async_mode=True)
+        if redis is None:
+            return
+        try:
+            await publish(redis, self.channel, message)
+        except Exception as e:
+            log.warning(f'Failed to publish cache invalidation on {self.channel} for {message}: {e}')
+
+    async def invalidate(self, id: str):
+        """Evict ``id`` here and on every other worker."""
+        self.evict(id)
+        await self._publish(id)
+
+    async def invalidate_many(self, ids: Iterable[str]):
+        """Evict all of ``ids`` here and on every other worker, with one message."""
+        ids = set(ids)
+        if not ids:
+            return
+        for id in ids:
+            self.evict(id)
+        await self._publish('\n'.join(ids))
+
+    async def invalidate_all(self):
+        """Drop every entry here and on every other worker."""
+        self.clear()
+        await self._publish(INVALIDATE_ALL)
+
+    def _on_message(self, message: str):
+        if message == INVALIDATE_ALL:
+            return self.clear()
+        for id in message.split('\n'):
+            self.evict(id)
+
+    async def listen(self, redis):
+        """Apply invalidations published by other workers."""
+        if self.enabled:
+            await subscribe(redis, self.channel, self._on_message, self.clear)
+
+
+USER_CACHE = UserCache(max_size=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+
+USER_GROUPS_CACHE = UserCache(
+    max_size=USER_CACHE_SIZE,
+    ttl=USER_GROUPS_CACHE_TTL,
+    channel=REDIS_USER_GROUPS_INVALIDATE_CHANNEL,
+    copy=_copy_models,
+)
+
+
+async def redis_user_cache_listener(app):
+    """Evict users and group memberships invalidated by other workers."""
+    await asyncio.gather(
+        USER_CACHE.listen(app.state.redis),
+        USER_GROUPS_CACHE.listen(app.state.redis),
+    )
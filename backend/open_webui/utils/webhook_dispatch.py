@@ -0,0 +1,270 @@
+"""Durable, bounded-concurrency delivery of event webhooks.
+
+Every event used to start its own task that re-read the webhook config and
+posted to each webhook in turn, without retries; bulk operations (SCIM syncs,
+mass deletes) started thousands of concurrent posts and lost whatever failed.
+``WebhookDispatcher`` instead:
+
+    - buffers events in memory and, once per loop iteration, matches them
+      against the webhook config (read once) and queues one row per delivery
+      in the ``webhook_delivery`` table with a single INSERT
+    - claims due rows in batches (safe across workers and instances) and posts
+      them with at most ``WEBHOOK_DISPATCH_CONCURRENCY`` posts in flight per
+      worker, ``WEBHOOK_ENDPOINT_CONCURRENCY`` of them to the same URL
+    - deletes delivered rows in batches and retries failed ones with
+      exponential backoff; after ``WEBHOOK_MAX_ATTEMPTS`` attempts, or on a
+      4xx response other than 408/429, a row is kept as ``failed`` for a week
+
+Queued rows survive restarts; a row claimed by a worker that dies is retried
+once its lease expires, so delivery is at least once.  Queue depth is exposed
+through ``GET /api/events/webhooks/queue`` and the
+``webui.webhooks.queue.depth`` metric.
+
+Configurable via environment variables:
+    - WEBHOOK_DISPATCH_CONCURRENCY (default 16) — posts in flight per worker
+    - WEBHOOK_ENDPOINT_CONCURRENCY (default 4) — posts in flight per URL and worker
+    - WEBHOOK_DISPATCH_BATCH_SIZE (default 100) — rows inserted / claimed per query
+    - WEBHOOK_DISPATCH_POLL_INTERVAL (default 2) — seconds between polls for due rows
+    - WEBHOOK_MAX_ATTEMPTS (default 8) — attempts before a delivery is given up
+    - WEBHOOK_RETRY_BACKOFF (default 5) — seconds before the first retry, doubling
+    - WEBHOOK_RETRY_MAX_BACKOFF (default 3600) — longest delay between retries
+
+Usage:
+    WEBHOOK_DISPATCHER.enqueue(app, event)  # from the event sink, never awaited
+    ...
+    app.state.webhook_dispatcher = asyncio.create_task(WEBHOOK_DISPATCHER.run(app))
+    ...
+    await WEBHOOK_DISPATCHER.close()  # on shutdown
+"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Optional
+
+import aiohttp
+from open_webui.env import (
+    WEBHOOK_DISPATCH_BATCH_SIZE,
+    WEBHOOK_DISPATCH_CONCURRENCY,
+    WEBHOOK_DISPATCH_POLL_INTERVAL,
+    WEBHOOK_ENDPOINT_CONCURRENCY,
+    WEBHOOK_MAX_ATTEMPTS,
+    WEBHOOK_RETRY_BACKOFF,
+    WEBHOOK_RETRY_MAX_BACKOFF,
+)
+from open_webui.events import Event, get_webhook_deliveries
+from open_webui.models.webhook_deliveries import WebhookDeliveries, WebhookDeliveryModel
+from open_webui.utils.webhook import send_webhook
+
+log = logging.getLogger(__name__)
+
+# A single post is abandoned (and retried) after this many seconds.
+DELIVERY_TIMEOUT = 30
+# How long a claimed row is reserved for its worker; covers queueing behind a slow endpoint.
+DELIVERY_LEASE = 900
+FAILED_RETENTION = 7 * 24 * 3600
+PRUNE_INTERVAL = 3600
+# Events kept in memory while the database is unreachable.
+MAX_BUFFERED_EVENTS = 10000
+
+
+def is_permanent_failure(error: Exception) -> bool:
+    """Whether retrying cannot help: the receiver rejected the request itself."""
+    return (
+        isinstance(error, aiohttp.ClientResponseError) and 400 <= error.status < 500 and error.status not in (408, 429)
+    )
+
+
+class WebhookDispatcher:
+    def __init__(
+        self,
+        concurrency: int = WEBHOOK_DISPATCH_CONCURRENCY,
+        endpoint_concurrency: int = WEBHOOK_ENDPOINT_CONCURRENCY,
+        batch_size: int = WEBHOOK_DISPATCH_BATCH_SIZE,
+        poll_interval: float = WEBHOOK_DISPATCH_POLL_INTERVAL,
+        max_attempts: int = WEBHOOK_MAX_ATTEMPTS,
+        backoff: float = WEBHOOK_RETRY_BACKOFF,
+        max_backoff: float = WEBHOOK_RETRY_MAX_BACKOFF,
+    ):
+        self.concurrency = max(concurrency, 1)
+        self.endpoint_concurrency = max(endpoint_concurrency, 1)
+        self.batch_size = max(batch_size, 1)
+        self.poll_interval = poll_interval
+        self.max_attempts = max(max_attempts, 1)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self._app: Any = None
+        self._events: list[Event] = []
+        self._delivered: list[str] = []
+        self._posts: set[asyncio.Task] = set()
+        self._endpoints: dict[str, asyncio.Semaphore] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._pruned_at = 0.0
+
+        # Totals since startup, for metrics.
+        self.delivered_count = 0
+        self.retried_count = 0
+        self.failed_count = 0
+
+    def _wakeup(self):
+        if self._wake is not None:
+            self._wake.set()
+
+    def enqueue(self, app: Any, event: Event):
+        """Queue ``event`` for every matching webhook; written on the next loop iteration."""
+        self._app = app
+        self._events.append(event)
+        self._wakeup()
+
+    async def flush(self):
+        """Write buffered events to the queue table."""
+        events, self._events = self._events, []
+        if not events:
+            return
+        try:
+            deliveries = await get_webhook_deliveries(events)
+            for start in range(0, len(deliveries), self.batch_size):
+                await WebhookDeliveries.insert_many(deliveries[start : start + self.batch_size])
+        except Exception as e:
+            # Keep the events for the next flush, dropping the oldest past the bound. A partially
+            # written batch is written again: delivery is at least once.
+            log.warning(f'Failed to queue webhook deliveries for {len(events)} event(s): {e}')
+            self._events = (events + self._events)[-MAX_BUFFERED_EVENTS:]
+
+    def _retry_delay(self, attempts: int) -> float:
+        delay = min(self.backoff * 2 ** (attempts - 1), self.max_backoff)
+        return delay * random.uniform(0.8, 1.2)
+
+    async def _post(self, delivery: WebhookDeliveryModel):
+        endpoint = self._endpoints.get(delivery.url)
+        if endpoint is None:
+            endpoint = self._endpoints[delivery.url] = asyncio.Semaphore(self.endpoint_concurrency)
+
+        async with endpoint, self._slots:
+            try:
+                name = getattr(getattr(self._app, 'state', None), 'WEBUI_NAME', 'Open WebUI')
+                await asyncio.wait_for(
+                    send_webhook(
+                        name,
+                        delivery.url,
+                        delivery.message,
+                        delivery.payload,
+                        description=delivery.description,
+                    ),
+                    timeout=DELIVERY_TIMEOUT,
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await self._fail(delivery, e)
+                return
+
+        self._delivered.append(delivery.id)
+        self.delivered_count += 1
+        if len(self._delivered) >= self.batch_size:
+            self._wakeup()
+
+    async def _fail(self, delivery: WebhookDeliveryModel, error: Exception):
+        message = f'{type(error).__name__}: {error}' if str(error) else type(error).__name__
+        try:
+            if delivery.attempts >= self.max_attempts or is_permanent_failure(error):
+                log.warning(
+                    f'Webhook {delivery.webhook_id} gave up on {delivery.event} after {delivery.attempts} attempt(s): '
+                    f'{message}'
+                )
+                self.failed_count += 1
+                await WebhookDeliveries.mark_failed(delivery.id, message)
+            else:
+                log.info(f'Webhook {delivery.webhook_id} failed for {delivery.event}, will retry: {message}')
+                self.retried_count += 1
+                await WebhookDeliveries.reschedule(
+                    delivery.id, int(time.time() + self._retry_delay(delivery.attempts)), message
+                )
+        except Exception as e:
+            # The lease expires and the delivery is retried anyway.
+            log.warning(f'Failed to record webhook delivery failure for {delivery.id}: {e}')
+
+    async def _complete(self):
+        delivered, self._delivered = self._delivered, []
+        if not delivered:
+            return
+        try:
+            await WebhookDeliveries.delete_by_ids(delivered)
+        except Exception as e:
+            log.warning(f'Failed to remove {len(delivered)} delivered webhook(s): {e}')
+            self._delivered.extend(delivered)
+
+    async def _claim(self):
+        # Claim no more than can be posted soon, so rows do not sit leased here while other workers idle.
+        room = min(self.batch_size, 2 * self.concurrency - len(self._posts))
+        if room <= 0:
+            return
+        now = int(time.time())
+        deliveries = await WebhookDeliveries.claim_due(now, now + DELIVERY_LEASE, limit=room)
+        for delivery in deliveries:
+            task = asyncio.create_task(self._post(delivery))
+            self._posts.add(task)
+            task.add_done_callback(self._on_post_done)
+
+    def _on_post_done(self, task: asyncio.Task):
+        self._posts.discard(task)
+        # Room to claim more.
+        self._wakeup()
+
+    async def _prune(self):
+        if time.monotonic() - self._pruned_at < PRUNE_INTERVAL:
+            return
+        self._pruned_at = time.monotonic()
+        deleted = await WebhookDeliveries.delete_failed_before(int(time.time()) - FAILED_RETENTION)
+        if deleted:
+            log.info(f'Removed {deleted} failed webhook deliveries older than a week')
+
+    async def run(self, app: Any):
+        self._app = app
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._wake = asyncio.Event()
+
+        while True:
+            self._wake.clear()
+            try:
+                await self.flush()
+                await self._complete()
+                await self._claim()
+                await self._prune()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.warning(f'Webhook dispatch failed: {e}')
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def close(self):
+        """Stop posting and write what is pending now; called on shutdown.
+
+        Deliveries being posted stay claimed and are retried once their lease expires.
+        """
+        for task in list(self._posts):
+            task.cancel()
+        await asyncio.gather(*self._posts, return_exceptions=True)
+        await self.flush()
+        await self._complete()
+
+    async def get_stats(self) -> dict[str, int]:
+        counts = await WebhookDeliveries.get_counts(int(time.time()))
+        return {
+            **counts,
+            'buffered': len(self._events),
+            'in_flight': len(self._posts),
+            'delivered_total': self.delivered_count,
+            'retried_total': self.retried_count,
+            'failed_total': self.failed_count,
+        }
+
+
+WEBHOOK_DISPATCHER = WebhookDispatcher()